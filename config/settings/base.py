@@ -40,6 +40,13 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 # Renouveler la session à chaque requête (le compteur de 2h repart à zéro)
 SESSION_SAVE_EVERY_REQUEST = True
 
+# Option : visiteurs anonymes en cookie signé (aucune ligne django_session),
+# staff connecté en base + cache. Voir saisie_equipes/sessions.py
+# SESSION_ENGINE = 'saisie_equipes.sessions'
+
+# Sessions expirées : purgées par lots (python manage.py purger_sessions,
+# ou tâche purger_sessions du planificateur), pas par clearsessions
+
 # Nom du cookie de session (identifiable pour debug)
 SESSION_COOKIE_NAME = 'volleychamp_session'
 
@@ -79,17 +86,28 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'saisie_equipes.connexions.MesureConnexionsMiddleware',
+    'saisie_equipes.replicas.CoherenceReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'saisie_equipes.salle_attente.SalleAttenteMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# ═══════════════════════════════════════════════════
+# 📖 RÉPLIQUE EN LECTURE (voir saisie_equipes/replicas.py)
+# ═══════════════════════════════════════════════════
+
+DATABASE_ROUTERS = ['saisie_equipes.replicas.RouteurReplica']
+REPLICA_LECTURE = False          # True si DATABASES contient l'alias 'replica'
+REPLICA_DELAI_COHERENCE = 10     # Secondes de lecture sur 'default' après un POST
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -144,6 +162,50 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ═══════════════════════════════════════════════════
+# 📧 FILE D'ENVOI DES EMAILS (python manage.py envoyer_emails)
+# ═══════════════════════════════════════════════════
+
+EMAILS_PAR_MINUTE = 30        # Limite du fournisseur SMTP
+EMAILS_MAX_TENTATIVES = 5     # Au-delà : statut ECHEC
+EMAILS_TAILLE_LOT = 50        # Messages réservés par lot
+
+# ═══════════════════════════════════════════════════
+# ⚙️ TRAVAUX EN ARRIÈRE-PLAN (python manage.py run_jobs)
+# ═══════════════════════════════════════════════════
+
+# Fichiers des jobs (exports avec les emails des clubs, imports) : hors
+# MEDIA_ROOT, servis seulement par la vue staff (voir saisie_equipes/stockage.py)
+JOBS_STOCKAGE = BASE_DIR / 'prive' / 'jobs'
+JOBS_DUREE_CONSERVATION_JOURS = 7   # Résultats supprimés ensuite (tâche purger_resultats_jobs)
+
+# ═══════════════════════════════════════════════════
+# 📥 RÉCEPTION DIFFÉRÉE DES DÉCLARATIONS (python manage.py traiter_declarations)
+# ═══════════════════════════════════════════════════
+
+# True pendant les pics : la vue n'écrit qu'une ligne DeclarationRecue,
+# les déclarations sont créées par lots hors requête (voir saisie_equipes/reception.py)
+DECLARATIONS_DIFFEREES = False
+DECLARATIONS_TAILLE_LOT = 20  # Déclarations enregistrées par transaction
+
+# ═══════════════════════════════════════════════════
+# 🚫 DOMAINES EMAIL JETABLES (voir saisie_equipes/domaines_jetables.py)
+# ═══════════════════════════════════════════════════
+
+# Un domaine par ligne, relu sans redémarrage quand le fichier change
+DOMAINES_JETABLES_FICHIER = BASE_DIR / 'saisie_equipes' / 'donnees' / 'domaines_jetables.txt'
+
+# ═══════════════════════════════════════════════════
+# 🚦 SALLE D'ATTENTE (voir saisie_equipes/salle_attente.py)
+# ═══════════════════════════════════════════════════
+
+# Valeurs par défaut : le staff les modifie depuis la page « Métriques »
+SALLE_ATTENTE_ACTIVE = False
+SALLE_ATTENTE_MAX_SIMULTANES = 8
+
+# Noms des routes protégées (pages coûteuses ouvertes par tous à la même heure)
+SALLE_ATTENTE_ROUTES = ['declaration', 'candidature_form']
+
 # ═══════════════════════════════════════════════════
 # 💬 MESSAGES DJANGO
 # ═══════════════════════════════════════════════════
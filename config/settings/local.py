@@ -3,6 +3,8 @@ Configuration Django pour l'environnement de développement local
 """
 from .base import *
 
+import os
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -11,11 +13,20 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0', '192.168.1.23']
 # Database pour développement local
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'saisie_equipes.db.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # Réplique simulée : copie de db.sqlite3 (voir saisie_equipes/replicas.py)
+    'replica': {
+        'ENGINE': 'saisie_equipes.db.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+# Lectures publiques sur la réplique : REPLICA=1 python manage.py runserver
+REPLICA_LECTURE = bool(os.environ.get('REPLICA'))
+
 # Configuration email pour développement (affichage console)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -14,10 +14,24 @@ ALLOWED_HOSTS = [
     'votre-domaine.com',  # Ajoutez votre domaine custom si vous en avez un
 ]
 
+# ═══════════════════════════════════════════════════
+# 🔌 CONNEXIONS PERSISTANTES
+# ═══════════════════════════════════════════════════
+# MySQL coupe une connexion inactive depuis wait_timeout (300 s chez
+# PythonAnywhere). La durée de vie d'une connexion est plafonnée en
+# dessous : une connexion réutilisée n'a jamais pu être coupée par le
+# serveur. Le health check couvre les autres coupures (redémarrage MySQL).
+MYSQL_WAIT_TIMEOUT = config('MYSQL_WAIT_TIMEOUT', default=300, cast=int)
+DB_CONN_MAX_AGE = min(
+    config('DB_CONN_MAX_AGE', default=240, cast=int),
+    MYSQL_WAIT_TIMEOUT - 30,
+)
+
 # Base de données MySQL pour production
+# (moteur mysql de Django, ouverture des connexions chronométrée)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'saisie_equipes.db.mysql',
         'NAME': config('DB_NAME', default='GkoProd$default'),
         'USER': config('DB_USER', default='GkoProd'),
         'PASSWORD': config('DB_PASSWORD'),  # Pas de default pour sécurité
@@ -26,10 +40,26 @@ DATABASES = {
         'OPTIONS': {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            # Serveur injoignable : OperationalError en quelques secondes,
+            # les pages publiques passent en mode dégradé (voir resilience.py)
+            'connect_timeout': 5,
         },
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Réplique MySQL en lecture (pages publiques, voir saisie_equipes/replicas.py)
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+    }
+REPLICA_LECTURE = bool(DB_REPLICA_HOST)
+
 # Configuration des fichiers statiques pour production
 STATIC_ROOT = '/home/GkoProd/mysite/staticfiles'
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
@@ -1,11 +1,22 @@
 import csv
-import io
+import uuid
 from django.contrib import admin, messages
+from django.contrib.admin.forms import AdminAuthenticationForm
+from django.core.exceptions import ValidationError
 from django.shortcuts import render, redirect
 from django.urls import path
 from django.http import HttpResponse
-from django.db.models import Count, Sum, Q
-from .models import Declaration, Club, Tournoi, Candidature, StatutCandidature
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import (
+    Declaration, Club, Tournoi, Candidature, StatutCandidature, Equipe, EmailOutbox, StatutEmail, Job, VerrouTache,
+    DeclarationRecue, StatutReception, StatutDeclaration,
+)
+from .services_candidatures import valider_candidatures, refuser_candidatures
+from .jobs import lancer_job
+from .stockage import stockage_jobs
+from .autocompletion import rechercher_clubs
+from . import tentatives_connexion
 
 
 # ═══════════════════════════════════════════════════
@@ -16,6 +27,27 @@ admin.site.site_header = "Administration VolleyChamp"  # ← Titre en haut
 admin.site.site_title = "VolleyChamp Admin"           # ← Titre de l'onglet navigateur
 admin.site.index_title = "Gestion du championnat volley jeunes"     # ← Titre page d'accueil
 
+
+class ConnexionAdminForm(AdminAuthenticationForm):
+    """Connexion à l'admin : refusée avant authenticate() après trop d'échecs"""
+
+    def clean(self):
+        restant = tentatives_connexion.verifier(self.request, self.cleaned_data.get('username'))
+        if restant:
+            raise ValidationError(tentatives_connexion.message_blocage(restant), code='trop_de_tentatives')
+        return super().clean()
+
+
+admin.site.login_form = ConnexionAdminForm
+
+class EquipeInline(admin.TabularInline):
+    """Équipes d'une déclaration (le tournoi est recopié depuis la déclaration)"""
+    model = Equipe
+    extra = 0
+    fields = ('ordre', 'nom', 'poule')
+    ordering = ('ordre',)
+
+
 # Register your models here.
 @admin.register(Declaration)
 class DeclarationAdmin(admin.ModelAdmin):
@@ -24,9 +56,11 @@ class DeclarationAdmin(admin.ModelAdmin):
         "declarant",
         "nombre_equipes",
         "get_tournoi_display",
+        "statut",
         "date_declaration",
     )
     list_filter = (
+        "statut",
         "tournoi",
         "tournoi__categorie_age",
         "tournoi__sexe",
@@ -34,6 +68,33 @@ class DeclarationAdmin(admin.ModelAdmin):
     )
     search_fields = ("club__nom", "declarant", "tournoi__lieu")
     date_hierarchy = "date_declaration"
+    list_select_related = ("club", "tournoi__club_organisateur")
+    inlines = [EquipeInline]
+    actions = ['retirer_declarations']
+
+    def retirer_declarations(self, request, queryset):
+        """Retire les déclarations (places libérées, liste d'attente promue)"""
+        nb_retirees = 0
+        for declaration in queryset.select_related('tournoi'):
+            if declaration.retirer():
+                nb_retirees += 1
+
+        self.message_user(
+            request,
+            f"🔙 {nb_retirees} déclaration(s) retirée(s)."
+        )
+    retirer_declarations.short_description = "🔙 Retirer les déclarations sélectionnées"
+
+    def save_formset(self, request, form, formset, change):
+        """Renseigne Equipe.tournoi (copie dénormalisée) avant l'enregistrement"""
+        if formset.model is Equipe:
+            for equipe in formset.save(commit=False):
+                equipe.tournoi_id = form.instance.tournoi_id
+                equipe.save()
+            for equipe in formset.deleted_objects:
+                equipe.delete()
+            return
+        super().save_formset(request, form, formset, change)
 
     def get_tournoi_display(self, obj):
         """Affiche le tournoi avec un lien cliquable"""
@@ -51,6 +112,14 @@ class ClubAdmin(admin.ModelAdmin):
     search_fields = ['nom']
     ordering = ['nom']
 
+    def get_search_results(self, request, queryset, search_term):
+        """Recherche tolérante aux fautes (index de l'autocomplétion), en plus du icontains"""
+        resultats, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            ids = [club_id for club_id, _ in rechercher_clubs(search_term, limite=50)]
+            resultats |= queryset.filter(pk__in=ids)
+        return resultats, may_have_duplicates
+
     # Action pour télécharger le template CSV
     actions = ['export_template_csv']
 
@@ -96,62 +165,13 @@ class ClubAdmin(admin.ModelAdmin):
                 self.message_user(request, "❌ Le fichier doit être au format CSV.", level=messages.ERROR)
                 return render(request, 'admin/saisie_equipes/club/import_csv.html')
 
-            try:
-                # Lire et décoder le fichier CSV
-                decoded_file = csv_file.read().decode('utf-8')
-                io_string = io.StringIO(decoded_file)
-                reader = csv.DictReader(io_string)
-
-                # Vérifier les colonnes
-                if 'nom_club' not in reader.fieldnames:
-                    self.message_user(request, "❌ La colonne 'nom_club' est manquante dans le CSV.", level=messages.ERROR)
-                    return render(request, 'admin/saisie_equipes/club/import_csv.html')
-
-                # Compteurs
-                nb_nouveaux = 0
-                nb_existants = 0
-                erreurs = []
-
-                # Traiter chaque ligne
-                for numero_ligne, row in enumerate(reader, start=2):  # start=2 car ligne 1 = headers
-                    try:
-                        nom_club = row['nom_club'].strip()
-
-                        if not nom_club:
-                            erreurs.append(f"Ligne {numero_ligne}: Nom de club vide")
-                            continue
-
-                        # Créer le club s'il n'existe pas déjà
-                        club, created = Club.objects.get_or_create(nom=nom_club)
-
-                        if created:
-                            nb_nouveaux += 1
-                        else:
-                            nb_existants += 1
+            # Le fichier est déposé dans le stockage privé des jobs puis traité
+            # par run_jobs : la requête ne lit pas le CSV elle-même
+            chemin = stockage_jobs.save(f"entrees/clubs_{uuid.uuid4().hex}.csv", csv_file)
+            job = lancer_job('import_clubs', request.user, fichier=chemin)
 
-                    except Exception as e:
-                        erreurs.append(f"Ligne {numero_ligne}: {str(e)}")
-
-                # Messages de résultat
-                if nb_nouveaux > 0:
-                    self.message_user(request, f"✅ {nb_nouveaux} nouveau(x) club(s) ajouté(s) avec succès.")
-
-                if nb_existants > 0:
-                    self.message_user(request, f"ℹ️ {nb_existants} club(s) étai(en)t déjà existant(s).")
-
-                if erreurs:
-                    self.message_user(request, f"⚠️ {len(erreurs)} erreur(s) détectée(s):", level=messages.WARNING)
-                    for erreur in erreurs[:5]:  # Limiter à 5 erreurs affichées
-                        self.message_user(request, f"• {erreur}", level=messages.ERROR)
-                    if len(erreurs) > 5:
-                        self.message_user(request, f"... et {len(erreurs) - 5} autres erreurs.", level=messages.ERROR)
-
-                # Rediriger vers la liste des clubs si tout s'est bien passé
-                if len(erreurs) == 0:
-                    return redirect('..')
-
-            except Exception as e:
-                self.message_user(request, f"❌ Erreur lors de la lecture du fichier CSV: {str(e)}", level=messages.ERROR)
+            self.message_user(request, "📥 Import lancé en arrière-plan : suivez sa progression ci-dessous.")
+            return redirect('staff:job_detail', job_id=job.id)
 
         # Afficher le formulaire d'import
         return render(request, 'admin/saisie_equipes/club/import_csv.html', {
@@ -203,6 +223,7 @@ class TournoiAdmin(admin.ModelAdmin):
         'est_publie',
         'get_nb_declarations',
         'get_nb_equipes_total',
+        'capacite_max',
         'get_nb_candidatures_display'  # ← NOUVEAU
     )
     list_filter = (
@@ -229,6 +250,9 @@ class TournoiAdmin(admin.ModelAdmin):
         ('🏢 Organisation', {
             'fields': ('club_organisateur', 'lieu', 'statut', 'est_publie')
         }),
+        ('🎟️ Capacité', {
+            'fields': ('capacite_max', 'nb_equipes_inscrites')
+        }),
         ('📝 Remarques', {
             'fields': ('remarques',),
             'classes': ('collapse',)
@@ -239,14 +263,17 @@ class TournoiAdmin(admin.ModelAdmin):
         })
     )
 
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'nb_equipes_inscrites')
 
     def get_queryset(self, request):
         """Surcharge pour annoter tous les compteurs en une seule requête SQL"""
         qs = super().get_queryset(request)
         return qs.annotate(
-            _nb_declarations=Count('declarations', distinct=True),
-            _nb_equipes=Sum('declarations__nombre_equipes'),
+            _nb_declarations=Count(
+                'declarations',
+                filter=Q(declarations__statut=StatutDeclaration.INSCRITE),
+                distinct=True
+            ),
             _nb_cand_total=Count('candidatures', distinct=True),
             _nb_cand_en_attente=Count(
                 'candidatures',
@@ -272,10 +299,10 @@ class TournoiAdmin(admin.ModelAdmin):
     get_nb_declarations.admin_order_field = '_nb_declarations'
 
     def get_nb_equipes_total(self, obj):
-        """Utilise la valeur annotée — zéro requête supplémentaire"""
-        return obj._nb_equipes or 0
+        """Compteur d'équipes inscrites — zéro requête supplémentaire"""
+        return obj.nb_equipes_inscrites
     get_nb_equipes_total.short_description = '👥 Équipes'
-    get_nb_equipes_total.admin_order_field = '_nb_equipes'
+    get_nb_equipes_total.admin_order_field = 'nb_equipes_inscrites'
 
     def get_nb_candidatures_display(self, obj):
         """Utilise les valeurs annotées — zéro requête supplémentaire"""
@@ -308,6 +335,10 @@ class TournoiAdmin(admin.ModelAdmin):
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
 
+        # La capacité a pu augmenter : inscrire la liste d'attente
+        if change and 'capacite_max' in form.changed_data:
+            obj.promouvoir_liste_attente()
+
 # ═══════════════════════════════════════════════════
 # 📋 GESTION DES CANDIDATURES
 # ═══════════════════════════════════════════════════
@@ -360,28 +391,130 @@ class CandidatureAdmin(admin.ModelAdmin):
     actions = ['valider_candidatures', 'refuser_candidatures']
 
     def valider_candidatures(self, request, queryset):
-        """Action pour valider des candidatures"""
-        nb_validees = 0
-        for candidature in queryset.filter(statut=StatutCandidature.EN_ATTENTE):
-            candidature.valider(request.user)
-            nb_validees += 1
+        """Action pour valider des candidatures (les concurrentes sont refusées)"""
+        resultat = valider_candidatures(
+            queryset.values_list('pk', flat=True), request.user
+        )
 
         self.message_user(
             request,
-            f"✅ {nb_validees} candidature(s) validée(s) avec succès."
+            f"✅ {resultat['validees']} candidature(s) validée(s) avec succès, "
+            f"{resultat['refusees_auto']} candidature(s) concurrente(s) refusée(s), "
+            f"{resultat['ignorees']} ignorée(s)."
         )
     valider_candidatures.short_description = "✅ Valider les candidatures sélectionnées"
 
     def refuser_candidatures(self, request, queryset):
         """Action pour refuser des candidatures"""
         # Note : Pour une vraie utilisation, il faudrait un formulaire pour saisir la raison
-        nb_refusees = 0
-        for candidature in queryset.filter(statut=StatutCandidature.EN_ATTENTE):
-            candidature.refuser(request.user, "Refusé par action groupée")
-            nb_refusees += 1
+        resultat = refuser_candidatures(queryset.values_list('pk', flat=True), request.user)
 
         self.message_user(
             request,
-            f"❌ {nb_refusees} candidature(s) refusée(s)."
+            f"❌ {resultat['refusees']} candidature(s) refusée(s)."
+        )
+    refuser_candidatures.short_description = "❌ Refuser les candidatures sélectionnées"
+
+# ═══════════════════════════════════════════════════
+# 📧 FILE D'ENVOI DES EMAILS
+# ═══════════════════════════════════════════════════
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    """Suivi de la file d'envoi (les emails sont écrits par l'application, pas ici)"""
+
+    list_display = ('created_at', 'modele', 'destinataire', 'sujet', 'statut', 'tentatives', 'prochain_essai', 'envoye_le')
+    list_filter = ('statut', 'modele')
+    search_fields = ('destinataire', 'sujet')
+    date_hierarchy = 'created_at'
+
+    readonly_fields = ('modele', 'destinataire', 'sujet', 'corps', 'statut', 'tentatives',
+                       'prochain_essai', 'derniere_erreur', 'created_at', 'envoye_le')
+
+    actions = ['renvoyer_emails']
+
+    def has_add_permission(self, request):
+        return False
+
+    def renvoyer_emails(self, request, queryset):
+        """Remet en file des emails en échec (nouvelle série de tentatives)"""
+        nb = queryset.filter(statut=StatutEmail.ECHEC).update(
+            statut=StatutEmail.EN_ATTENTE,
+            tentatives=0,
+            prochain_essai=timezone.now(),
         )
-    refuser_candidatures.short_description = "❌ Refuser les candidatures sélectionnées"
\ No newline at end of file
+        self.message_user(request, f"📧 {nb} email(s) remis en file.")
+    renvoyer_emails.short_description = "📧 Renvoyer les emails en échec"
+
+
+# ═══════════════════════════════════════════════════
+# 📥 RÉCEPTION DIFFÉRÉE DES DÉCLARATIONS
+# ═══════════════════════════════════════════════════
+
+@admin.register(DeclarationRecue)
+class DeclarationRecueAdmin(admin.ModelAdmin):
+    """Suivi de la file (écrite par le formulaire public, vidée par traiter_declarations)"""
+
+    list_display = ('created_at', 'club', 'tournoi', 'nombre_equipes', 'declarant', 'statut',
+                    'tentatives', 'traitee_le', 'declaration')
+    list_filter = ('statut',)
+    search_fields = ('declarant', 'email_club', 'club__nom')
+    date_hierarchy = 'created_at'
+    list_select_related = ('club', 'tournoi__club_organisateur', 'declaration__club',
+                           'declaration__tournoi__club_organisateur')
+
+    readonly_fields = ('tournoi', 'club', 'nombre_equipes', 'equipes', 'declarant', 'email_club',
+                       'remarques', 'cle_soumission', 'statut', 'tentatives', 'prochain_essai',
+                       'declaration', 'derniere_erreur', 'created_at', 'traitee_le')
+
+    actions = ['remettre_en_file']
+
+    def has_add_permission(self, request):
+        return False
+
+    def remettre_en_file(self, request, queryset):
+        """Nouvelle série de tentatives pour des déclarations en échec"""
+        nb = queryset.filter(statut=StatutReception.ECHEC).update(
+            statut=StatutReception.EN_ATTENTE,
+            tentatives=0,
+            prochain_essai=timezone.now(),
+        )
+        self.message_user(request, f"📥 {nb} déclaration(s) remise(s) en file.")
+    remettre_en_file.short_description = "📥 Remettre en file les déclarations en échec"
+
+
+# ═══════════════════════════════════════════════════
+# ⚙️ TRAVAUX EN ARRIÈRE-PLAN
+# ═══════════════════════════════════════════════════
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Suivi des jobs (créés par les vues staff, exécutés par run_jobs)"""
+
+    list_display = ('id', 'type_job', 'statut', 'progression', 'message', 'cree_par', 'created_at', 'fin')
+    list_filter = ('statut', 'type_job')
+    date_hierarchy = 'created_at'
+
+    readonly_fields = ('type_job', 'parametres', 'statut', 'progression', 'message', 'resultat',
+                       'erreur', 'cree_par', 'created_at', 'debut', 'fin', 'reserve_jusqua')
+
+    def has_add_permission(self, request):
+        return False
+
+
+# ═══════════════════════════════════════════════════
+# ⏰ TÂCHES PÉRIODIQUES
+# ═══════════════════════════════════════════════════
+
+@admin.register(VerrouTache)
+class VerrouTacheAdmin(admin.ModelAdmin):
+    """État des tâches du planificateur (prochaine exécution modifiable)"""
+
+    list_display = ('nom', 'derniere_execution', 'derniere_duree', 'dernier_resultat',
+                    'prochaine_execution', 'bail_jusqua', 'proprietaire', 'nb_executions')
+
+    readonly_fields = ('nom', 'proprietaire', 'bail_jusqua', 'derniere_execution', 'derniere_duree',
+                       'dernier_resultat', 'derniere_erreur', 'nb_executions')
+
+    def has_add_permission(self, request):
+        return False
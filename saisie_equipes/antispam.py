@@ -0,0 +1,359 @@
+"""
+═══════════════════════════════════════════════════
+🛡️ ANTI-SPAM DES FORMULAIRES PUBLICS (PIPELINE DE RÈGLES)
+═══════════════════════════════════════════════════
+
+Une règle = une fonction décorée par @regle(nom, cout, poids, message),
+qui reçoit le contexte de la soumission et retourne True si elle est
+touchée. Les règles de l'application sont en bas de ce fichier.
+
+evaluer() passe les règles de la moins coûteuse à la plus coûteuse et
+additionne les poids des règles touchées ; dès que le score atteint
+SEUIL_BLOCAGE, la soumission est rejetée sans évaluer la suite :
+- honeypot, délai de saisie et nombre d'envois (session) d'abord
+- puis le contenu (expressions régulières compilées une fois)
+Tout cela avant la moindre requête SQL du formulaire (is_valid()).
+
+Une règle de poids SEUIL_BLOCAGE bloque seule ; les indices plus
+faibles (un lien dans les remarques...) ne bloquent qu'à plusieurs :
+un seul est laissé à la validation du formulaire, qui l'explique au
+visiteur champ par champ.
+
+Une seule configuration (CHAMPS) pour tous les formulaires publics ;
+compteurs par règle en cache, partagés entre workers (page staff
+« Métriques »).
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .domaines_jetables import est_jetable
+from .mesures import incrementer
+
+logger = logging.getLogger('saisie_equipes')
+
+# Score à partir duquel une soumission est rejetée
+SEUIL_BLOCAGE = 10
+
+# Délai de saisie accepté (depuis l'affichage du formulaire)
+DELAI_MIN = timedelta(seconds=3)
+DELAI_MAX = timedelta(minutes=30)
+
+# Envois acceptés par session et par adresse IP
+MAX_SOUMISSIONS = 5
+
+CLE_DEBUT_FORMULAIRE = 'form_start_time'
+
+# Clés de soumission des derniers envois acceptés (un renvoi n'est pas un nouvel envoi)
+CLE_SOUMISSIONS_ACCEPTEES = 'soumissions_acceptees'
+
+# Champs POST lus par les règles, pour tous les formulaires publics
+CHAMPS = {
+    'honeypot': 'website',
+    'noms': ('declarant',),
+    'emails': ('email_club', 'email_contact'),
+    'textes': ('declarant', 'lieu', 'remarques'),
+    'prefixes_textes': ('nom_equipe_',),
+}
+
+# ═══════════════════════════════════════════════════
+# 🔤 MOTIFS (partagés avec les validations des formulaires)
+# ═══════════════════════════════════════════════════
+
+MOTIF_URL = re.compile(r'https?://|www\.', re.IGNORECASE)
+MOTIF_LIEN = re.compile(r'https?://|www\.|\.(?:com|org|net)\b', re.IGNORECASE)
+MOTIF_SCRIPT = re.compile(r'<script|javascript:', re.IGNORECASE)
+MOTIF_LIEN_OU_SCRIPT = re.compile(r'https?://|www\.|<script|javascript:', re.IGNORECASE)
+
+# Cinq fois la même lettre minuscule : « aaaaa »
+MOTIF_REPETITION = re.compile(r'([a-z])\1{4}')
+
+VALEURS_PAR_DEFAUT = frozenset({
+    'inconnu', 'unknown', 'test', 'exemple', 'example',
+    'admin', 'administrateur', 'user', 'utilisateur',
+})
+
+EMAILS_PAR_DEFAUT = frozenset({
+    'inconnu@exemple.com', 'unknown@example.com', 'test@test.com',
+    'admin@admin.com', 'user@user.com', 'example@example.com',
+    'test@example.com', 'noreply@example.com',
+})
+
+
+# ═══════════════════════════════════════════════════
+# 📋 REGISTRE DES RÈGLES
+# ═══════════════════════════════════════════════════
+
+class Regle:
+    def __init__(self, nom, fonction, cout, poids, message, niveau, description):
+        self.nom = nom
+        self.fonction = fonction
+        self.cout = cout
+        self.poids = poids
+        self.message = message
+        self.niveau = niveau
+        self.description = description
+
+
+REGLES = {}
+_regles_triees = []
+
+
+def regle(nom, cout, poids, message, niveau=messages.ERROR):
+    """
+    Décorateur : enregistre une règle anti-spam
+
+    Args:
+        cout: ordre d'évaluation (les moins coûteuses d'abord)
+        poids: points ajoutés au score si la règle est touchée
+        message: affiché au visiteur si cette règle décide du rejet
+        niveau: niveau du message (django.contrib.messages)
+    """
+    def enregistrer(fonction):
+        REGLES[nom] = Regle(
+            nom, fonction, cout, poids, message, niveau,
+            (fonction.__doc__ or '').strip().split('\n')[0],
+        )
+        _regles_triees[:] = sorted(REGLES.values(), key=lambda r: (r.cout, r.nom))
+        return fonction
+    return enregistrer
+
+
+class Contexte:
+    """Soumission en cours d'évaluation : lectures de session et de POST mises en cache"""
+
+    def __init__(self, request, formulaire):
+        self.request = request
+        self.formulaire = formulaire
+        self.donnees = request.POST
+
+    def valeurs(self, role):
+        return [self.donnees.get(champ, '') for champ in CHAMPS[role] if self.donnees.get(champ)]
+
+    @cached_property
+    def textes(self):
+        textes = self.valeurs('textes')
+        for prefixe in CHAMPS['prefixes_textes']:
+            textes.extend(
+                valeur for champ, valeur in self.donnees.items()
+                if champ.startswith(prefixe) and valeur
+            )
+        return textes
+
+    @cached_property
+    def est_renvoi(self):
+        """Même clé de soumission qu'un envoi déjà accepté pour cette session (double clic, F5)"""
+        cle = self.donnees.get('cle_soumission')
+        return bool(cle) and cle in self.request.session.get(CLE_SOUMISSIONS_ACCEPTEES, [])
+
+    @cached_property
+    def delai(self):
+        """Temps depuis l'affichage du formulaire, None si inconnu, 'invalide' si illisible"""
+        debut = self.request.session.get(CLE_DEBUT_FORMULAIRE)
+        if not debut:
+            return None
+        try:
+            return timezone.now().replace(tzinfo=None) - datetime.fromisoformat(debut)
+        except (ValueError, TypeError):
+            return 'invalide'
+
+
+class Verdict:
+    def __init__(self, score, touchees, seuil):
+        self.score = score
+        self.touchees = touchees
+        self.bloque = score >= seuil
+        # La règle la plus lourde explique le rejet
+        self.regle = max(touchees, key=lambda r: r.poids) if touchees else None
+
+    @property
+    def message(self):
+        return self.regle.message if self.regle else ''
+
+    @property
+    def niveau(self):
+        return self.regle.niveau if self.regle else messages.INFO
+
+
+def evaluer(request, formulaire, seuil=SEUIL_BLOCAGE):
+    """
+    Passe les règles sur une soumission (POST), sans toucher à la base
+
+    Args:
+        formulaire: nom court du formulaire ('declaration', 'candidature')
+
+    Returns:
+        Verdict: .bloque, .message et .niveau pour le visiteur
+    """
+    contexte = Contexte(request, formulaire)
+    score = 0
+    touchees = []
+
+    for r in _regles_triees:
+        if r.fonction(contexte):
+            touchees.append(r)
+            score += r.poids
+            incrementer(f'antispam:regle:{r.nom}')
+            if score >= seuil:
+                break
+
+    verdict = Verdict(score, touchees, seuil)
+    incrementer(f'antispam:evaluations:{formulaire}')
+    if verdict.bloque:
+        incrementer(f'antispam:bloques:{formulaire}')
+        logger.info(
+            f"Anti-spam : envoi {formulaire} rejeté (score {score}, "
+            f"{', '.join(r.nom for r in touchees)}) depuis {request.META.get('REMOTE_ADDR')}"
+        )
+    return verdict
+
+
+def statistiques(formulaires=('declaration', 'candidature')):
+    """
+    Compteurs partagés (cache), pour la page staff « Métriques »
+
+    Returns:
+        dict: {'regles': [...], 'formulaires': [...]}
+    """
+    cles = [f'antispam:regle:{nom}' for nom in REGLES]
+    cles += [f'antispam:{type_}:{f}' for f in formulaires for type_ in ('evaluations', 'bloques')]
+    valeurs = cache.get_many(cles)
+
+    return {
+        'regles': [
+            {
+                'nom': r.nom,
+                'description': r.description,
+                'cout': r.cout,
+                'poids': r.poids,
+                'touchee': valeurs.get(f'antispam:regle:{r.nom}', 0),
+            }
+            for r in _regles_triees
+        ],
+        'formulaires': [
+            {
+                'nom': f,
+                'evaluations': valeurs.get(f'antispam:evaluations:{f}', 0),
+                'bloques': valeurs.get(f'antispam:bloques:{f}', 0),
+            }
+            for f in formulaires
+        ],
+        'seuil': SEUIL_BLOCAGE,
+    }
+
+
+# ═══════════════════════════════════════════════════
+# 🕐 SESSION : DÉBUT DE SAISIE ET ENVOIS
+# ═══════════════════════════════════════════════════
+
+def _cle_soumissions(request):
+    ip_address = request.META.get('REMOTE_ADDR', 'unknown')
+    return f'submissions_{ip_address.replace(".", "_")}'
+
+
+def demarrer_formulaire(request):
+    """Affichage d'un formulaire vierge : point de départ du délai de saisie"""
+    request.session[CLE_DEBUT_FORMULAIRE] = timezone.now().replace(tzinfo=None).isoformat()
+
+
+def enregistrer_soumission(request, cle_soumission=None):
+    """
+    Soumission acceptée et enregistrée : un envoi de plus pour cette session
+
+    Sa clé de soumission est retenue : un renvoi du même formulaire reçoit
+    la confirmation idempotente au lieu d'être compté dans limite_envois.
+    """
+    cle = _cle_soumissions(request)
+    request.session[cle] = request.session.get(cle, 0) + 1
+    if cle_soumission:
+        acceptees = request.session.get(CLE_SOUMISSIONS_ACCEPTEES, [])
+        request.session[CLE_SOUMISSIONS_ACCEPTEES] = (acceptees + [str(cle_soumission)])[-MAX_SOUMISSIONS:]
+    request.session.set_expiry(3600)
+    request.session.pop(CLE_DEBUT_FORMULAIRE, None)
+
+
+# ═══════════════════════════════════════════════════
+# 📏 RÈGLES (du moins coûteux au plus coûteux)
+# ═══════════════════════════════════════════════════
+
+@regle('honeypot', cout=0, poids=SEUIL_BLOCAGE, message="Requête invalide détectée")
+def regle_honeypot(contexte):
+    """Champ invisible rempli (robot)"""
+    return bool(contexte.donnees.get(CHAMPS['honeypot']))
+
+
+@regle('trop_rapide', cout=1, poids=SEUIL_BLOCAGE,
+       message="⚠️ Veuillez prendre le temps de remplir le formulaire correctement.")
+def regle_trop_rapide(contexte):
+    """Envoyé moins de 3 s après l'affichage"""
+    return isinstance(contexte.delai, timedelta) and contexte.delai < DELAI_MIN
+
+
+@regle('session_expiree', cout=1, poids=SEUIL_BLOCAGE, niveau=messages.WARNING,
+       message="⏰ Session expirée pour des raisons de sécurité. Veuillez recommencer.")
+def regle_session_expiree(contexte):
+    """Envoyé plus de 30 min après l'affichage"""
+    return isinstance(contexte.delai, timedelta) and contexte.delai > DELAI_MAX
+
+
+@regle('session_invalide', cout=1, poids=SEUIL_BLOCAGE, niveau=messages.WARNING,
+       message="Session invalide détectée. Formulaire réinitialisé.")
+def regle_session_invalide(contexte):
+    """Heure d'affichage illisible dans la session"""
+    return contexte.delai == 'invalide'
+
+
+@regle('limite_envois', cout=2, poids=SEUIL_BLOCAGE,
+       message="🚫 Vous avez atteint la limite d'envois pour cette session. Réessayez plus tard.")
+def regle_limite_envois(contexte):
+    """Déjà 5 envois depuis cette session et cette adresse IP (hors renvoi d'un envoi accepté)"""
+    return (
+        contexte.request.session.get(_cle_soumissions(contexte.request), 0) >= MAX_SOUMISSIONS
+        and not contexte.est_renvoi
+    )
+
+
+MESSAGE_CONTENU = "🚫 Votre envoi ressemble à du spam : retirez les liens et vérifiez vos informations."
+
+
+@regle('valeur_par_defaut', cout=3, poids=5, message=MESSAGE_CONTENU)
+def regle_valeur_par_defaut(contexte):
+    """Nom ou email de remplissage (« test », test@test.com)"""
+    return (
+        any(nom.lower().strip() in VALEURS_PAR_DEFAUT for nom in contexte.valeurs('noms'))
+        or any(email.lower().strip() in EMAILS_PAR_DEFAUT for email in contexte.valeurs('emails'))
+    )
+
+
+@regle('email_jetable', cout=4, poids=5, message=MESSAGE_CONTENU)
+def regle_email_jetable(contexte):
+    """Adresse email d'un domaine jetable"""
+    return any(
+        est_jetable(email.rpartition('@')[2].strip())
+        for email in contexte.valeurs('emails')
+        if '@' in email
+    )
+
+
+@regle('script', cout=10, poids=SEUIL_BLOCAGE, message="Requête invalide détectée")
+def regle_script(contexte):
+    """Balise <script> ou lien javascript: dans un texte"""
+    return any(MOTIF_SCRIPT.search(texte) for texte in contexte.textes)
+
+
+@regle('liens', cout=10, poids=5, message=MESSAGE_CONTENU)
+def regle_liens(contexte):
+    """Lien (http://, www., .com...) dans un texte"""
+    return any(MOTIF_LIEN.search(texte) for texte in contexte.textes)
+
+
+@regle('repetitions', cout=10, poids=5, message=MESSAGE_CONTENU)
+def regle_repetitions(contexte):
+    """Cinq fois la même lettre dans un nom (« aaaaa »)"""
+    return any(MOTIF_REPETITION.search(nom) for nom in contexte.valeurs('noms'))
@@ -0,0 +1,377 @@
+"""
+═══════════════════════════════════════════════════
+🔌 API JSON EN LECTURE SEULE (v1)
+═══════════════════════════════════════════════════
+
+Pour les sites des clubs et les mobiles, qui analysaient jusqu'ici le
+HTML des pages de consultation.
+
+    GET /api/v1/tournois/?periode=a_venir|passes
+    GET /api/v1/tournois/<id>/
+    GET /api/v1/tournois/<id>/declarations/   (effectifs, sans email ni déclarant)
+    GET /api/v1/tournois/<id>/candidatures/   (statut public, sans coordonnées)
+
+Paramètres communs :
+- fields=date,statut,... : seuls ces champs (et id) sont renvoyés ET
+  calculés (pas d'agrégat ni de jointure pour un champ non demandé)
+- limite=50 (200 au plus) et curseur : pagination par clé (date, id)
+  ou id ; « suivant » donne l'URL de la page suivante, ou null
+
+Réponses construites depuis des projections .values() (pas d'instances
+de modèles), avec un ETag fort tiré des versions des tournois (voir
+syntheses.py) : un client qui renvoie If-None-Match reçoit 304 sans
+qu'aucune réponse ne soit construite, et Cache-Control public.
+
+Lectures sur la base principale, jamais sur la réplique : l'ETag vient
+de la version courante du tournoi, une réplique en retard publierait
+des données périmées sous cet ETag, gardées par les clients jusqu'à la
+prochaine écriture (même raison que sur_base_principale() dans
+syntheses.py).
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+
+from .models import (
+    Candidature, Declaration, Equipe, StatutCandidature, StatutDeclaration, Tournoi,
+)
+from .syntheses import get_repartitions_poules, get_versions_tournois
+
+# Change le format des réponses : les anciens ETags ne doivent plus correspondre
+VERSION_API = 1
+
+LIMITE_DEFAUT = 50
+LIMITE_MAX = 200
+
+# Cache-Control: max-age (secondes) ; au-delà, le client revalide avec l'ETag
+DUREE_CACHE_HTTP = 60
+
+# Champ de l'API → chemin de .values()
+COLONNES_TOURNOI = {
+    'titre': 'titre',
+    'date': 'date',
+    'categorie_age': 'categorie_age',
+    'sexe': 'sexe',
+    'zone': 'zone',
+    'statut': 'statut',
+    'lieu': 'lieu',
+    'club_organisateur': 'club_organisateur__nom',
+    'capacite_max': 'capacite_max',
+    'nb_equipes_inscrites': 'nb_equipes_inscrites',
+}
+
+# Agrégats sur les déclarations, calculés seulement si demandés
+ANNOTATIONS_TOURNOI = {
+    'nb_declarations': lambda: Count(
+        'declarations', filter=Q(declarations__statut=StatutDeclaration.INSCRITE),
+    ),
+    'nb_equipes_liste_attente': lambda: Sum(
+        'declarations__nombre_equipes',
+        filter=Q(declarations__statut=StatutDeclaration.LISTE_ATTENTE),
+        default=0,
+    ),
+}
+
+# Calculés en Python : colonnes nécessaires
+CALCULES_TOURNOI = {
+    'places_restantes': ('capacite_max', 'nb_equipes_inscrites'),
+    'poules': (),
+}
+
+CHAMPS_TOURNOI = ('id', *COLONNES_TOURNOI, *ANNOTATIONS_TOURNOI, *CALCULES_TOURNOI)
+
+COLONNES_DECLARATION = {
+    'club': 'club__nom',
+    'nombre_equipes': 'nombre_equipes',
+    'statut': 'statut',
+    'date_declaration': 'date_declaration',
+}
+CHAMPS_DECLARATION = ('id', *COLONNES_DECLARATION, 'equipes')
+
+COLONNES_CANDIDATURE = {
+    'club': 'club__nom',
+    'statut': 'statut',
+    'date_candidature': 'created_at',
+    'date_traitement': 'date_traitement',
+}
+CHAMPS_CANDIDATURE = ('id', *COLONNES_CANDIDATURE)
+
+
+class ErreurApi(Exception):
+    """Requête invalide : renvoyée en JSON {'erreur': ...} avec ce code HTTP"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def vue_api(view_func):
+    """GET / HEAD seulement, erreurs en JSON (lectures sur default, voir l'en-tête)"""
+    @require_safe
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except ErreurApi as e:
+            return JsonResponse({'erreur': str(e)}, status=e.status, json_dumps_params={'ensure_ascii': False})
+
+    return wrapper
+
+
+# ═══════════════════════════════════════════════════
+# 🧰 PARAMÈTRES, CURSEURS, ETAGS
+# ═══════════════════════════════════════════════════
+
+def get_champs(request, disponibles):
+    """Champs demandés par ?fields= (tous par défaut), id toujours en tête"""
+    valeur = request.GET.get('fields', '').strip()
+    if not valeur:
+        return list(disponibles)
+
+    demandes = [champ.strip() for champ in valeur.split(',') if champ.strip()]
+    inconnus = [champ for champ in demandes if champ not in disponibles]
+    if inconnus:
+        raise ErreurApi(
+            f"Champ(s) inconnu(s) : {', '.join(inconnus)}. Disponibles : {', '.join(disponibles)}."
+        )
+    return list(dict.fromkeys(['id', *demandes]))
+
+
+def get_limite(request):
+    valeur = request.GET.get('limite', '')
+    if not valeur:
+        return LIMITE_DEFAUT
+    if not valeur.isdigit() or int(valeur) < 1:
+        raise ErreurApi("« limite » doit être un entier positif.")
+    return min(int(valeur), LIMITE_MAX)
+
+
+def encoder_curseur(valeurs):
+    brut = json.dumps(valeurs, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(brut).decode().rstrip('=')
+
+
+def decoder_curseur(request):
+    """Valeurs du curseur de la requête, ou None (première page)"""
+    curseur = request.GET.get('curseur', '')
+    if not curseur:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)))
+    except (binascii.Error, ValueError):
+        raise ErreurApi("Curseur invalide.")
+
+
+def url_suivante(request, valeurs):
+    parametres = request.GET.copy()
+    parametres['curseur'] = encoder_curseur(valeurs)
+    return request.build_absolute_uri(f"{request.path}?{parametres.urlencode()}")
+
+
+def calculer_etag(request, versions):
+    """ETag fort : version de l'API, paramètres et versions des tournois servis"""
+    empreinte = hashlib.sha256(json.dumps([
+        VERSION_API,
+        request.path,
+        sorted(request.GET.lists()),
+        sorted(versions.items()),
+    ]).encode()).hexdigest()[:32]
+    return f'"{empreinte}"'
+
+
+def _entetes_cache(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=DUREE_CACHE_HTTP)
+    return response
+
+
+def non_modifie(request, etag):
+    """Réponse 304 si le client a déjà cette version (If-None-Match), sinon None"""
+    response = get_conditional_response(request, etag=etag)
+    return response and _entetes_cache(response, etag)
+
+
+def reponse_json(donnees, etag):
+    return _entetes_cache(JsonResponse(donnees, json_dumps_params={'ensure_ascii': False}), etag)
+
+
+def _projeter(lignes, colonnes, champs):
+    """Lignes de .values() → dicts de l'API (champs demandés, dans l'ordre demandé)"""
+    return [
+        {champ: ligne[colonnes[champ]] for champ in champs if champ in colonnes}
+        for ligne in lignes
+    ]
+
+
+def _tournoi_publie(tournoi_id):
+    if not Tournoi.objects.filter(pk=tournoi_id, est_publie=True).exists():
+        raise ErreurApi("Tournoi introuvable.", status=404)
+
+
+# ═══════════════════════════════════════════════════
+# 🏆 TOURNOIS
+# ═══════════════════════════════════════════════════
+
+def _tournois(ids, champs):
+    """Tournois projetés (une requête, plus les poules en cache si demandées), dans l'ordre de ids"""
+    colonnes = {'id': 'pk', **COLONNES_TOURNOI, **{nom: nom for nom in ANNOTATIONS_TOURNOI}}
+    chemins = {'pk'}
+    for champ in champs:
+        if champ in colonnes:
+            chemins.add(colonnes[champ])
+        chemins.update(CALCULES_TOURNOI.get(champ, ()))
+
+    annotations = {nom: agregat() for nom, agregat in ANNOTATIONS_TOURNOI.items() if nom in champs}
+    lignes = {
+        ligne['pk']: ligne
+        for ligne in Tournoi.objects.filter(pk__in=ids).annotate(**annotations).values(*chemins).order_by()
+    }
+    repartitions = get_repartitions_poules(ids) if 'poules' in champs else {}
+
+    resultats = []
+    for tournoi_id in ids:
+        ligne = lignes[tournoi_id]
+        resultat = _projeter([ligne], colonnes, champs)[0]
+        if 'places_restantes' in champs:
+            resultat['places_restantes'] = (
+                None if ligne['capacite_max'] is None
+                else max(ligne['capacite_max'] - ligne['nb_equipes_inscrites'], 0)
+            )
+        if 'poules' in champs:
+            resultat['poules'] = repartitions[tournoi_id]['comptes']
+        resultats.append({champ: resultat[champ] for champ in champs})
+    return resultats
+
+
+@vue_api
+def tournois_view(request):
+    """Tournois publiés à venir (par date croissante) ou passés (du plus récent au plus ancien)"""
+    periode = request.GET.get('periode', 'a_venir')
+    if periode not in ('a_venir', 'passes'):
+        raise ErreurApi("« periode » vaut a_venir ou passes.")
+    champs = get_champs(request, CHAMPS_TOURNOI)
+    limite = get_limite(request)
+
+    aujourdhui = timezone.localdate()
+    tournois = Tournoi.objects.filter(est_publie=True)
+    if periode == 'a_venir':
+        tournois = tournois.filter(date__gte=aujourdhui).order_by('date', 'pk')
+    else:
+        tournois = tournois.filter(date__lt=aujourdhui).order_by('-date', '-pk')
+
+    curseur = decoder_curseur(request)
+    if curseur is not None:
+        try:
+            date_curseur, id_curseur = date.fromisoformat(curseur[0]), int(curseur[1])
+        except (TypeError, ValueError, IndexError, KeyError):
+            raise ErreurApi("Curseur invalide.")
+        if periode == 'a_venir':
+            tournois = tournois.filter(Q(date__gt=date_curseur) | Q(date=date_curseur, pk__gt=id_curseur))
+        else:
+            tournois = tournois.filter(Q(date__lt=date_curseur) | Q(date=date_curseur, pk__lt=id_curseur))
+
+    # Identifiants de la page d'abord : de quoi calculer l'ETag sans construire la réponse
+    page = list(tournois.values_list('date', 'pk')[:limite + 1])
+    suivant = url_suivante(request, page[limite - 1]) if len(page) > limite else None
+    ids = [tournoi_id for _, tournoi_id in page[:limite]]
+
+    etag = calculer_etag(request, get_versions_tournois(ids))
+    return non_modifie(request, etag) or reponse_json(
+        {'resultats': _tournois(ids, champs), 'suivant': suivant}, etag,
+    )
+
+
+@vue_api
+def tournoi_view(request, tournoi_id):
+    champs = get_champs(request, CHAMPS_TOURNOI)
+    _tournoi_publie(tournoi_id)
+
+    etag = calculer_etag(request, get_versions_tournois([tournoi_id]))
+    return non_modifie(request, etag) or reponse_json(_tournois([tournoi_id], champs)[0], etag)
+
+
+# ═══════════════════════════════════════════════════
+# 📋 DÉCLARATIONS ET CANDIDATURES D'UN TOURNOI
+# ═══════════════════════════════════════════════════
+
+def _page_par_id(request, lignes, limite):
+    """Pagination par id croissant : (page, URL suivante ou None)"""
+    curseur = decoder_curseur(request)
+    if curseur is not None:
+        if not isinstance(curseur, int):
+            raise ErreurApi("Curseur invalide.")
+        lignes = lignes.filter(pk__gt=curseur)
+
+    page = list(lignes.order_by('pk')[:limite + 1])
+    if len(page) > limite:
+        return page[:limite], url_suivante(request, page[limite - 1]['pk'])
+    return page, None
+
+
+@vue_api
+def declarations_view(request, tournoi_id):
+    """Effectifs déclarés (inscrits et liste d'attente), dans l'ordre d'arrivée"""
+    champs = get_champs(request, CHAMPS_DECLARATION)
+    limite = get_limite(request)
+    _tournoi_publie(tournoi_id)
+
+    # La version du tournoi change à chaque déclaration / équipe : pas de requête de plus
+    etag = calculer_etag(request, get_versions_tournois([tournoi_id]))
+    reponse = non_modifie(request, etag)
+    if reponse:
+        return reponse
+
+    colonnes = {'id': 'pk', **COLONNES_DECLARATION}
+    page, suivant = _page_par_id(
+        request,
+        Declaration.objects.filter(tournoi_id=tournoi_id).exclude(statut=StatutDeclaration.RETIREE).values(
+            'pk', *{colonnes[champ] for champ in champs if champ in colonnes}
+        ),
+        limite,
+    )
+    resultats = _projeter(page, colonnes, champs)
+
+    if 'equipes' in champs:
+        equipes = {}
+        for declaration_id, nom, poule in Equipe.objects.filter(
+            declaration_id__in=[ligne['pk'] for ligne in page]
+        ).values_list('declaration_id', 'nom', 'poule').order_by('declaration_id', 'ordre'):
+            equipes.setdefault(declaration_id, []).append({'nom': nom, 'poule': poule or None})
+        for resultat, ligne in zip(resultats, page):
+            resultat['equipes'] = equipes.get(ligne['pk'], [])
+
+    return reponse_json({'resultats': resultats, 'suivant': suivant}, etag)
+
+
+@vue_api
+def candidatures_view(request, tournoi_id):
+    """Candidatures à l'organisation et leur statut (sans coordonnées ni motif)"""
+    champs = get_champs(request, CHAMPS_CANDIDATURE)
+    limite = get_limite(request)
+    _tournoi_publie(tournoi_id)
+
+    etag = calculer_etag(request, get_versions_tournois([tournoi_id]))
+    reponse = non_modifie(request, etag)
+    if reponse:
+        return reponse
+
+    colonnes = {'id': 'pk', **COLONNES_CANDIDATURE}
+    page, suivant = _page_par_id(
+        request,
+        Candidature.objects.filter(tournoi_id=tournoi_id).exclude(statut=StatutCandidature.RETIREE).values(
+            'pk', *{colonnes[champ] for champ in champs if champ in colonnes}
+        ),
+        limite,
+    )
+    return reponse_json({'resultats': _projeter(page, colonnes, champs), 'suivant': suivant}, etag)
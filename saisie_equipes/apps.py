@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class SaisieEquipesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'saisie_equipes'
+
+    def ready(self):
+        # Invalidation des synthèses de tournois en cache
+        from . import signals  # noqa: F401
+
+        # Enregistrement des tâches périodiques (planificateur)
+        from . import maintenance  # noqa: F401
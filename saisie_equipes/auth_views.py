@@ -11,6 +11,8 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 
+from . import tentatives_connexion
+
 
 def login_view(request):
     """
@@ -33,7 +35,15 @@ def login_view(request):
             messages.error(request, "❌ Veuillez renseigner identifiant et mot de passe.")
             return render(request, 'authentication/login.html', {'next': next_url})
         
-        # Authentification
+        # 🚫 Trop d'échecs récents : refus avant authenticate() (pas de hachage)
+        restant = tentatives_connexion.verifier(request, username)
+        if restant:
+            messages.error(request, tentatives_connexion.message_blocage(restant))
+            response = render(request, 'authentication/login.html', {'next': next_url}, status=429)
+            response['Retry-After'] = str(restant)
+            return response
+
+        # Authentification (échecs et réussites comptés par signals.py)
         user = authenticate(request, username=username, password=password)
         
         if user is not None:
@@ -0,0 +1,189 @@
+"""
+═══════════════════════════════════════════════════
+🔤 AUTOCOMPLÉTION DES CLUBS (INDEX TRIGRAMMES EN MÉMOIRE)
+═══════════════════════════════════════════════════
+
+Index construit une fois par processus depuis Club.nom, interrogé sans
+requête SQL :
+- préfixes : chaque mot de la requête commence un mot du nom
+  (« sai pie » → « AS Saint-Pierre »)
+- fautes de frappe : part des trigrammes de la requête présents dans
+  le nom (« tampn geko » → « Tampon Gecko Volley »)
+
+Partage entre workers : un numéro de version en cache, incrémenté à
+chaque enregistrement / suppression de club (signals.py). Un worker
+dont l'index est plus ancien que la version le reconstruit à la
+requête suivante (une lecture de cache par recherche, sinon rien).
+"""
+
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Club
+from .recherche import plier
+
+CLE_VERSION = 'clubs_index_version'
+
+# Résultats au plus par requête
+LIMITE_RESULTATS = 10
+
+# Part minimale des trigrammes de la requête présents dans le nom
+SEUIL_SIMILARITE = 0.5
+
+
+def normaliser(nom):
+    """Sans accents, minuscules, mots alphanumériques : « Étang-Salé VB » → ['etang', 'sale', 'vb']"""
+    return re.findall(r'[a-z0-9]+', plier(nom))
+
+
+def trigrammes(mots):
+    """Trigrammes des mots, bordés d'espaces (« vb » → ' vb', 'vb ')"""
+    resultat = set()
+    for mot in mots:
+        borde = f"  {mot} "
+        resultat.update(borde[i:i + 3] for i in range(len(borde) - 2))
+    return resultat
+
+
+class IndexClubs:
+    """
+    Index en lecture seule : reconstruit entièrement, jamais modifié
+
+    Les boucles coûteuses sont confiées au C (bisect, tranches de listes,
+    Counter.update, heapq) : quelques centaines de µs pour 3000 clubs.
+    """
+
+    def __init__(self, clubs):
+        """clubs : itérable de (id, nom)"""
+        self.noms = {}
+        self.cles_tri = {}
+        self.par_trigramme = defaultdict(list)
+        mots_clubs = []
+
+        for club_id, nom in clubs:
+            mots = normaliser(nom)
+            self.noms[club_id] = nom
+            # À pertinence égale : les noms courts d'abord, puis l'ordre alphabétique
+            self.cles_tri[club_id] = (len(nom), plier(nom))
+            for trigramme in trigrammes(mots):
+                self.par_trigramme[trigramme].append(club_id)
+            mots_clubs.extend((mot, club_id) for mot in set(mots))
+
+        # Mots triés : les mots commençant par un préfixe sont contigus
+        mots_clubs.sort()
+        self.mots = [mot for mot, _ in mots_clubs]
+        self.mots_ids = [club_id for _, club_id in mots_clubs]
+
+    def __len__(self):
+        return len(self.noms)
+
+    def _commencant_par(self, prefixe):
+        """Clubs dont un mot commence par `prefixe` (deux recherches dichotomiques)"""
+        debut = bisect_left(self.mots, prefixe)
+        fin = bisect_left(self.mots, prefixe + '\uffff', debut)
+        return set(self.mots_ids[debut:fin])
+
+    def _meilleurs(self, ids, limite, score=None):
+        if score is None:
+            cle = self.cles_tri.__getitem__
+        else:
+            def cle(club_id):
+                return (-score[club_id], self.cles_tri[club_id])
+        return heapq.nsmallest(limite, ids, key=cle)
+
+    def rechercher(self, requete, limite=LIMITE_RESULTATS):
+        """
+        Clubs correspondant à la requête, les meilleurs d'abord
+
+        1. Préfixes : chaque mot de la requête commence un mot du nom
+        2. Si c'est insuffisant, trigrammes : part des trigrammes de la
+           requête présents dans le nom (tolère une faute par mot)
+
+        Returns:
+            list[(id, nom)]
+        """
+        mots = normaliser(requete)
+        if not mots:
+            return []
+
+        prefixes = self._commencant_par(mots[0])
+        for mot in mots[1:]:
+            if not prefixes:
+                break
+            prefixes &= self._commencant_par(mot)
+
+        resultats = self._meilleurs(prefixes, limite)
+        if len(resultats) < limite:
+            tri_requete = trigrammes(mots)
+            communs = Counter()
+            for trigramme in tri_requete:
+                communs.update(self.par_trigramme.get(trigramme, ()))
+
+            minimum = SEUIL_SIMILARITE * len(tri_requete)
+            proches = {
+                club_id: nb for club_id, nb in communs.items()
+                if nb >= minimum and club_id not in prefixes
+            }
+            resultats += self._meilleurs(proches, limite - len(resultats), proches)
+
+        return [(club_id, self.noms[club_id]) for club_id in resultats]
+
+
+# ═══════════════════════════════════════════════════
+# 🔢 INDEX DU PROCESSUS ET VERSION PARTAGÉE
+# ═══════════════════════════════════════════════════
+
+_index = None
+_version_index = None
+_verrou = threading.Lock()
+
+
+def get_version():
+    """Version actuelle de la liste des clubs (créée si le cache a été vidé)"""
+    version = cache.get(CLE_VERSION)
+    if version is None:
+        # Horloge : après un vidage du cache, jamais une version déjà vue
+        cache.add(CLE_VERSION, time.time_ns() // 1000, None)
+        version = cache.get(CLE_VERSION)
+    return version
+
+
+def invalider_index():
+    """La liste des clubs a changé : tous les workers reconstruiront leur index"""
+    try:
+        cache.incr(CLE_VERSION)
+    except ValueError:
+        # Clé absente : la prochaine lecture en créera une nouvelle
+        pass
+
+
+def invalider_index_apres_commit():
+    """Invalide après le commit : un worker ne reconstruit pas un index sans le club"""
+    transaction.on_commit(invalider_index)
+
+
+def get_index():
+    """Index du processus, reconstruit si la version partagée a changé"""
+    global _index, _version_index
+
+    version = get_version()
+    if _index is not None and _version_index == version:
+        return _index
+
+    with _verrou:
+        if _index is None or _version_index != version:
+            _index = IndexClubs(Club.objects.values_list('id', 'nom').iterator())
+            _version_index = version
+    return _index
+
+
+def rechercher_clubs(requete, limite=LIMITE_RESULTATS):
+    """list[(id, nom)] des clubs correspondant à la requête (préfixes puis fautes de frappe)"""
+    return get_index().rechercher(requete, limite)
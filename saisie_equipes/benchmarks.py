@@ -0,0 +1,322 @@
+"""
+═══════════════════════════════════════════════════
+⏱️ MICRO-BENCHMARKS DES CHEMINS CHAUDS
+═══════════════════════════════════════════════════
+
+Chaque benchmark est déclaré avec @benchmark('nom') : la fonction reçoit
+le jeu de données préparé par preparer_donnees() et retourne l'appel
+(sans argument) à chronométrer.
+
+Les résultats sont comparés à une référence JSON versionnée dans le dépôt
+(benchmarks/baseline.json) via la commande :
+
+    python manage.py benchmark --enregistrer   # met à jour la référence
+    python manage.py benchmark --comparer      # signale les régressions
+"""
+
+import platform
+import statistics
+import timeit
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.test import RequestFactory
+from django.utils import timezone
+
+from . import antispam
+from .autocompletion import IndexClubs
+from .doublons import groupes_doublons
+from .forms import AntiSpamFormMixin, DeclarationForm
+from .models import (
+    Club, Tournoi, Declaration, Equipe, CategorieAge, Sexe, Zone, Poule
+)
+from .templatetags import tournoi_tags
+
+
+FICHIER_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+# Durée minimale d'une répétition (s) : assez pour lisser le bruit
+DUREE_MIN_REPETITION = 0.2
+
+BENCHMARKS = {}
+
+
+def benchmark(nom):
+    """Enregistre un benchmark dans le registre"""
+    def decorateur(fonction):
+        BENCHMARKS[nom] = fonction
+        return fonction
+    return decorateur
+
+
+# ═══════════════════════════════════════════════════
+# 🧱 JEU DE DONNÉES
+# ═══════════════════════════════════════════════════
+
+def preparer_donnees():
+    """
+    Crée un tournoi réaliste (8 clubs, 10 équipes max par club)
+
+    À appeler dans un transaction.atomic() annulé ensuite :
+    rien ne doit rester en base après les mesures.
+    """
+    organisateur = Club.objects.create(nom="Benchmark Organisateur")
+    tournoi = Tournoi.objects.create(
+        titre="Benchmark",
+        date=timezone.now().date() + timedelta(days=400),
+        categorie_age=CategorieAge.M15,
+        sexe=Sexe.MIXTE,
+        zone=Zone.NORD,
+        club_organisateur=organisateur,
+        lieu="Gymnase du benchmark",
+        poules_disponibles=['HAUTE', 'BASSE'],
+    )
+
+    poules = [Poule.HAUTE, Poule.BASSE]
+    for i in range(1, 9):
+        club = Club.objects.create(nom=f"Benchmark Club {i}")
+        nombre = min(i + 2, 10)
+        declaration = Declaration.objects.create(
+            tournoi=tournoi,
+            club=club,
+            nombre_equipes=nombre,
+            declarant="Jean Dupont",
+            email_club=f"club{i}@benchmark.re",
+        )
+        Equipe.objects.bulk_create([
+            Equipe(
+                declaration=declaration,
+                tournoi=tournoi,
+                nom=f"{club.nom} {chr(65 + n)}",
+                poule=poules[n % 2],
+                ordre=n,
+            )
+            for n in range(nombre)
+        ])
+
+    tournoi_prefetche = Tournoi.objects.select_related('club_organisateur').prefetch_related(
+        Prefetch('declarations', queryset=Declaration.objects.select_related('club')),
+        'declarations__equipes',
+    ).get(pk=tournoi.pk)
+
+    declaration = max(tournoi_prefetche.declarations.all(), key=lambda d: d.nombre_equipes)
+
+    # Formulaire de 10 équipes, données POST réalistes
+    donnees_post = {
+        'tournoi': tournoi.pk,
+        'club': organisateur.pk,
+        'nombre_equipes': 10,
+        'declarant': "Jean Dupont",
+        'email_club': "contact@monclub.re",
+        'remarques': "Nous viendrons avec deux arbitres.",
+    }
+    for n in range(1, 11):
+        donnees_post[f'nom_equipe_{n}'] = f"Club Bench {chr(64 + n)}"
+        donnees_post[f'poule_equipe_{n}'] = poules[n % 2]
+
+    return {
+        'tournoi': tournoi_prefetche,
+        'declaration': declaration,
+        'donnees_post': donnees_post,
+    }
+
+
+# ═══════════════════════════════════════════════════
+# 🛡️ ANTI-SPAM
+# ═══════════════════════════════════════════════════
+
+@benchmark('antispam.validate_declarant')
+def bench_validate_declarant(donnees):
+    mixin = AntiSpamFormMixin()
+    return lambda: mixin.validate_declarant("jean-pierre de la fontaine")
+
+
+@benchmark('antispam.validate_email')
+def bench_validate_email(donnees):
+    mixin = AntiSpamFormMixin()
+    return lambda: mixin.validate_email("  Secretariat.Volley@club-saint-denis.re ")
+
+
+@benchmark('antispam.pipeline_envoi_legitime')
+def bench_antispam_pipeline(donnees):
+    """Toutes les règles passées (aucune touchée), sans requête SQL"""
+    request = RequestFactory().post('/declaration/', donnees['donnees_post'])
+    request.session = {}
+    return lambda: antispam.evaluer(request, 'declaration')
+
+
+@benchmark('antispam.validate_remarques')
+def bench_validate_remarques(donnees):
+    mixin = AntiSpamFormMixin()
+    remarques = "Nous serons présents avec nos deux équipes et un arbitre. " * 6
+    return lambda: mixin.validate_remarques(remarques, max_length=500)
+
+
+# ═══════════════════════════════════════════════════
+# 🔤 AUTOCOMPLÉTION DES CLUBS (objectif : bien moins d'1 ms)
+# ═══════════════════════════════════════════════════
+
+def _clubs_synthetiques(nb=3000):
+    villes = ["Saint-Denis", "Saint-Pierre", "Le Tampon", "Saint-Paul", "Étang-Salé", "Cilaos"]
+    types = ["Volley", "Volley-Ball Club", "AS", "Racing Club", "Gecko Volley"]
+    return [(i, f"{types[i % len(types)]} {villes[i % len(villes)]} {i}") for i in range(nb)]
+
+
+def _index_clubs_synthetique(nb=3000):
+    return IndexClubs(_clubs_synthetiques(nb))
+
+
+@benchmark('autocompletion.prefixe')
+def bench_autocompletion_prefixe(donnees):
+    index = _index_clubs_synthetique()
+    return lambda: index.rechercher("sai pier")
+
+
+@benchmark('autocompletion.faute_de_frappe')
+def bench_autocompletion_faute(donnees):
+    index = _index_clubs_synthetique()
+    return lambda: index.rechercher("tampn geko")
+
+
+@benchmark('doublons.detection_3000_clubs')
+def bench_doublons(donnees):
+    """Blocs + similarité, sans requête SQL (un club sur 10 saisi en majuscules)"""
+    clubs = _clubs_synthetiques()
+    clubs += [(10000 + i, f"{nom.upper()} ") for i, nom in clubs[::10]]
+    return lambda: groupes_doublons(clubs)
+
+
+# ═══════════════════════════════════════════════════
+# 📝 FORMULAIRE DE DÉCLARATION
+# ═══════════════════════════════════════════════════
+
+@benchmark('declaration_form.clean_10_equipes')
+def bench_declaration_clean(donnees):
+    """clean() seul (noms + poules de 10 équipes), sans requête SQL"""
+    form = DeclarationForm(data=donnees['donnees_post'])
+    valeurs = {
+        'nombre_equipes': 10,
+        'declarant': "Jean Dupont",
+        'email_club': "contact@monclub.re",
+    }
+
+    def appel():
+        form.cleaned_data = dict(valeurs)
+        form.clean()
+
+    return appel
+
+
+# ═══════════════════════════════════════════════════
+# 🏐 MODÈLES
+# ═══════════════════════════════════════════════════
+
+@benchmark('declaration.get_equipes_avec_poules')
+def bench_equipes_avec_poules(donnees):
+    return donnees['declaration'].get_equipes_avec_poules
+
+
+@benchmark('declaration.get_equipes_par_poule')
+def bench_equipes_par_poule(donnees):
+    return donnees['declaration'].get_equipes_par_poule
+
+
+@benchmark('tournoi.__str__')
+def bench_tournoi_str(donnees):
+    tournoi = donnees['tournoi']
+    return lambda: str(tournoi)
+
+
+# ═══════════════════════════════════════════════════
+# 🏷️ FILTRES DE TEMPLATE (tournoi prefetché comme en consultation)
+# ═══════════════════════════════════════════════════
+
+@benchmark('tournoi_tags.get_tableau_synthese')
+def bench_tableau_synthese(donnees):
+    return lambda: tournoi_tags.get_tableau_synthese(donnees['tournoi'])
+
+
+@benchmark('tournoi_tags.get_categories_detaillees')
+def bench_categories_detaillees(donnees):
+    return lambda: tournoi_tags.get_categories_detaillees(donnees['tournoi'])
+
+
+@benchmark('tournoi_tags.get_total_general')
+def bench_total_general(donnees):
+    return lambda: tournoi_tags.get_total_general(donnees['tournoi'])
+
+
+@benchmark('tournoi_tags.get_nb_clubs_total')
+def bench_nb_clubs_total(donnees):
+    return lambda: tournoi_tags.get_nb_clubs_total(donnees['tournoi'])
+
+
+@benchmark('tournoi_tags.get_nb_categories')
+def bench_nb_categories(donnees):
+    return lambda: tournoi_tags.get_nb_categories(donnees['tournoi'])
+
+
+# ═══════════════════════════════════════════════════
+# 📐 MESURE & COMPARAISON
+# ═══════════════════════════════════════════════════
+
+def mesurer(appel, repetitions=5, duree_min=DUREE_MIN_REPETITION):
+    """
+    Chronomètre un appel à la manière de timeit
+
+    Le nombre d'itérations par répétition est calibré pour durer au moins
+    duree_min secondes ; on garde le minimum et la médiane (µs par appel).
+    """
+    timer = timeit.Timer(appel)
+    iterations = 1
+    while True:
+        if timer.timeit(iterations) >= duree_min:
+            break
+        iterations *= 2
+
+    durees = [t / iterations * 1e6 for t in timer.repeat(repeat=repetitions, number=iterations)]
+    return {
+        'min_us': round(min(durees), 3),
+        'median_us': round(statistics.median(durees), 3),
+        'iterations': iterations,
+    }
+
+
+def executer_benchmarks(filtre='', repetitions=5, duree_min=DUREE_MIN_REPETITION):
+    """Exécute les benchmarks (dont le nom contient filtre) et retourne {nom: stats}"""
+    donnees = preparer_donnees()
+    resultats = {}
+    for nom, fabrique in sorted(BENCHMARKS.items()):
+        if filtre and filtre not in nom:
+            continue
+        resultats[nom] = mesurer(fabrique(donnees), repetitions=repetitions, duree_min=duree_min)
+    return resultats
+
+
+def comparer(resultats, reference, seuil_pct):
+    """
+    Compare des résultats à la référence (sur le minimum, plus stable)
+
+    Returns:
+        list: (nom, reference_us, actuel_us, ecart_pct, est_regression)
+    """
+    lignes = []
+    for nom, stats in sorted(resultats.items()):
+        if nom not in reference:
+            lignes.append((nom, None, stats['min_us'], None, False))
+            continue
+        avant = reference[nom]['min_us']
+        ecart = (stats['min_us'] - avant) / avant * 100 if avant else 0.0
+        lignes.append((nom, avant, stats['min_us'], round(ecart, 1), ecart > seuil_pct))
+    return lignes
+
+
+def meta_environnement():
+    """Contexte de mesure enregistré avec la référence"""
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'date': timezone.now().isoformat(timespec='seconds'),
+    }
@@ -0,0 +1,255 @@
+"""
+═══════════════════════════════════════════════════
+🔌 CONNEXIONS PERSISTANTES À LA BASE - MESURES
+═══════════════════════════════════════════════════
+
+En production, une connexion MySQL est gardée ouverte entre deux
+requêtes (CONN_MAX_AGE) et vérifiée avant réutilisation
+(CONN_HEALTH_CHECKS) : on ne paie plus la poignée de main TLS et
+l'authentification à chaque page.
+
+Ce module mesure, par worker (processus) :
+- la durée d'ouverture des connexions (histogramme)
+- les requêtes HTTP servies par une connexion déjà ouverte ou neuve
+- les reconnexions (connexion ouverte en début de requête mais
+  remplacée : health check raté, serveur qui a coupé)
+
+Les moteurs saisie_equipes.db.mysql / saisie_equipes.db.sqlite3
+chronomètrent l'ouverture ; MesureConnexionsMiddleware classe chaque
+requête. Chaque worker publie ses compteurs dans le cache, la page
+staff « Métriques » les additionne.
+"""
+
+import os
+import socket
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .mesures import Histogramme
+
+# Cases de l'histogramme des ouvertures de connexion (ms)
+BORNES_CONNEXION_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Publication des compteurs d'un worker dans le cache (secondes)
+INTERVALLE_PUBLICATION = 30
+
+# Un worker qui n'a rien publié depuis ce délai disparaît de la page
+DUREE_PUBLICATION = 3600
+
+CLE_WORKERS = 'metriques_connexions:workers'
+
+
+def get_worker():
+    """Identifiant du worker courant : hôte:pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def cle_worker(worker):
+    return f"metriques_connexions:{worker}"
+
+
+# ═══════════════════════════════════════════════════
+# 📊 COMPTEURS DU WORKER
+# ═══════════════════════════════════════════════════
+
+class StatistiquesConnexions:
+    """
+    Compteurs de connexions du processus courant (partagés par ses threads)
+
+    Après un fork (workers uWSGI), le processus enfant repart de zéro :
+    il ne doit pas republier les compteurs hérités du parent.
+    """
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self.pid = os.getpid()
+        self.depuis = time.time()
+        self.derniere_publication = 0.0
+        self.ouvertures = 0
+        self.reutilisees = 0
+        self.nouvelles = 0
+        self.reconnexions = 0
+        self.latences = Histogramme(BORNES_CONNEXION_MS)
+
+    def _verifier_processus(self):
+        if self.pid != os.getpid():
+            self.reinitialiser()
+
+    def connexion_ouverte(self, duree_ms):
+        """Une connexion vient d'être établie en `duree_ms`"""
+        with self.verrou:
+            self._verifier_processus()
+            self.ouvertures += 1
+            self.latences.ajouter(duree_ms)
+
+    def requete_terminee(self, ouverte_avant, ouvertures):
+        """
+        Classe une requête HTTP qui a interrogé la base
+
+        Args:
+            ouverte_avant: une connexion était ouverte en début de requête
+            ouvertures: connexions ouvertes pendant la requête
+        """
+        with self.verrou:
+            self._verifier_processus()
+            if not ouvertures:
+                self.reutilisees += 1
+            elif ouverte_avant:
+                self.reconnexions += 1
+            else:
+                self.nouvelles += 1
+
+    def as_dict(self):
+        """Représentation sérialisable (cache)"""
+        with self.verrou:
+            self._verifier_processus()
+            return {
+                'worker': get_worker(),
+                'depuis': self.depuis,
+                'publie_le': time.time(),
+                'ouvertures': self.ouvertures,
+                'reutilisees': self.reutilisees,
+                'nouvelles': self.nouvelles,
+                'reconnexions': self.reconnexions,
+                'latences': self.latences.as_dict(),
+            }
+
+    def publier(self, forcer=False):
+        """Écrit les compteurs dans le cache (au plus toutes les INTERVALLE_PUBLICATION s)"""
+        maintenant = time.time()
+        if not forcer and maintenant - self.derniere_publication < INTERVALLE_PUBLICATION:
+            return
+        self.derniere_publication = maintenant
+
+        donnees = self.as_dict()
+        cache.set(cle_worker(donnees['worker']), donnees, DUREE_PUBLICATION)
+
+        # Registre des workers : écrasement concurrent sans gravité (republié 30 s plus tard)
+        workers = {
+            worker: vu_le
+            for worker, vu_le in (cache.get(CLE_WORKERS) or {}).items()
+            if maintenant - vu_le < DUREE_PUBLICATION
+        }
+        workers[donnees['worker']] = maintenant
+        cache.set(CLE_WORKERS, workers, DUREE_PUBLICATION)
+
+
+STATISTIQUES = StatistiquesConnexions()
+
+
+# ═══════════════════════════════════════════════════
+# ⏱️ MOTEURS DE BASE CHRONOMÉTRÉS
+# ═══════════════════════════════════════════════════
+
+class ConnexionMesureeMixin:
+    """
+    À placer devant le DatabaseWrapper d'un moteur Django
+
+    nb_ouvertures est propre à l'objet connexion (donc au thread) :
+    le middleware y lit les ouvertures de sa requête.
+    """
+
+    nb_ouvertures = 0
+
+    def get_new_connection(self, conn_params):
+        debut = time.perf_counter()
+        connexion = super().get_new_connection(conn_params)
+        self.nb_ouvertures += 1
+        STATISTIQUES.connexion_ouverte((time.perf_counter() - debut) * 1000)
+        return connexion
+
+
+# ═══════════════════════════════════════════════════
+# 🧭 MIDDLEWARE
+# ═══════════════════════════════════════════════════
+
+class MesureConnexionsMiddleware:
+    """
+    Classe chaque requête HTTP : connexion réutilisée, neuve ou reconnexion
+
+    Les requêtes qui n'interrogent pas la base ne sont pas comptées.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        connexion = connections[DEFAULT_DB_ALIAS]
+        ouverte_avant = connexion.connection is not None
+        ouvertures_avant = connexion.nb_ouvertures if hasattr(connexion, 'nb_ouvertures') else 0
+        requetes = []
+
+        def compter(execute, sql, params, many, context):
+            requetes.append(1)
+            return execute(sql, params, many, context)
+
+        with connexion.execute_wrapper(compter):
+            response = self.get_response(request)
+
+        if requetes:
+            STATISTIQUES.requete_terminee(
+                ouverte_avant,
+                getattr(connexion, 'nb_ouvertures', 0) - ouvertures_avant,
+            )
+        STATISTIQUES.publier()
+        return response
+
+
+# ═══════════════════════════════════════════════════
+# 📋 LECTURE (PAGE STAFF)
+# ═══════════════════════════════════════════════════
+
+def _completer(donnees):
+    """Ajoute taux de réutilisation, histogramme et latence moyenne"""
+    requetes = donnees['reutilisees'] + donnees['nouvelles'] + donnees['reconnexions']
+    histogramme = Histogramme.from_dict(donnees['latences'])
+
+    donnees['requetes'] = requetes
+    donnees['taux_reutilisation'] = round(100 * donnees['reutilisees'] / requetes, 1) if requetes else None
+    donnees['latence_moyenne'] = round(histogramme.somme / histogramme.total, 2) if histogramme.total else None
+    donnees['cases'] = list(zip(histogramme.libelles(), histogramme.comptes))
+    return donnees
+
+
+def metriques_workers():
+    """
+    Compteurs publiés par les workers, et leur total
+
+    Le worker qui sert la page publie d'abord les siens (toujours à jour).
+
+    Returns:
+        dict: {'workers': [dict par worker], 'total': dict | None}
+    """
+    STATISTIQUES.publier(forcer=True)
+
+    workers = sorted(cache.get(CLE_WORKERS) or {})
+    publies = cache.get_many([cle_worker(worker) for worker in workers])
+    lignes = [publies[cle_worker(worker)] for worker in workers if cle_worker(worker) in publies]
+
+    if not lignes:
+        return {'workers': [], 'total': None}
+
+    total = {
+        'worker': 'Total',
+        'ouvertures': 0,
+        'reutilisees': 0,
+        'nouvelles': 0,
+        'reconnexions': 0,
+    }
+    histogramme = Histogramme(BORNES_CONNEXION_MS)
+    for ligne in lignes:
+        for champ in ('ouvertures', 'reutilisees', 'nouvelles', 'reconnexions'):
+            total[champ] += ligne[champ]
+        histogramme.fusionner(Histogramme.from_dict(ligne['latences']))
+    total['latences'] = histogramme.as_dict()
+
+    return {
+        'workers': [_completer(dict(ligne)) for ligne in lignes],
+        'total': _completer(total),
+    }
@@ -0,0 +1,12 @@
+"""
+Moteur django.db.backends.sqlite3 dont l'ouverture des connexions est
+chronométrée (voir saisie_equipes/connexions.py)
+"""
+
+from django.db.backends.sqlite3 import base
+
+from saisie_equipes.connexions import ConnexionMesureeMixin
+
+
+class DatabaseWrapper(ConnexionMesureeMixin, base.DatabaseWrapper):
+    pass
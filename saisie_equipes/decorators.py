@@ -2,6 +2,8 @@ from functools import wraps
 from django.shortcuts import redirect
 from django.contrib import messages
 
+from .replicas import ecriture_recente, lectures_sur_replica
+
 def staff_or_superuser_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
@@ -15,4 +17,18 @@ def staff_or_superuser_required(view_func):
         messages.error(request, "🚫 Accès réservé au personnel.")
         return redirect('accueil')
 
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+def using_replica(view_func):
+    """
+    Lectures de la vue sur la réplique (voir replicas.py)
+
+    Sauf pour un visiteur qui vient d'écrire : il doit voir sa propre
+    déclaration, que la réplique n'a peut-être pas encore reçue.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with lectures_sur_replica(not ecriture_recente(request)):
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
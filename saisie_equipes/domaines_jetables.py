@@ -0,0 +1,108 @@
+"""
+═══════════════════════════════════════════════════
+🚫 DOMAINES EMAIL JETABLES
+═══════════════════════════════════════════════════
+
+Liste lue depuis un fichier (DOMAINES_JETABLES_FICHIER, par défaut
+saisie_equipes/donnees/domaines_jetables.txt), chargée une fois par
+processus dans un frozenset.
+
+Correspondance par domaine entier ou domaine parent :
+- « yopmail.com » bloque jean@yopmail.com et jean@mx.yopmail.com
+- « test.com » ne bloque pas jean@contest.com.re (simple sous-chaîne)
+
+Coût par email : une recherche dans l'ensemble par niveau du domaine
+(3 ou 4 au plus), quelle que soit la taille de la liste.
+
+Rechargement sans redémarrage : la date de modification du fichier est
+vérifiée au plus toutes les DELAI_VERIFICATION secondes.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Secondes entre deux vérifications de la date du fichier
+DELAI_VERIFICATION = 30
+
+
+def charger_domaines(chemin):
+    """frozenset des domaines du fichier (lignes vides et commentaires ignorés)"""
+    domaines = set()
+    with open(chemin, encoding='utf-8') as fichier:
+        for ligne in fichier:
+            domaine = ligne.split('#', 1)[0].strip().lower().rstrip('.')
+            if domaine:
+                domaines.add(domaine)
+    return frozenset(domaines)
+
+
+def est_dans(domaine, domaines):
+    """True si le domaine ou l'un de ses parents est dans l'ensemble"""
+    domaine = domaine.lower().rstrip('.')
+    while domaine:
+        if domaine in domaines:
+            return True
+        _, _, domaine = domaine.partition('.')
+    return False
+
+
+# ═══════════════════════════════════════════════════
+# 🔄 LISTE DU PROCESSUS (RECHARGÉE SI LE FICHIER CHANGE)
+# ═══════════════════════════════════════════════════
+
+_domaines = frozenset()
+_signature = None
+_prochaine_verification = 0.0
+_verrou = threading.Lock()
+
+
+def _signature_fichier(chemin):
+    try:
+        etat = os.stat(chemin)
+    except OSError:
+        return None
+    return (str(chemin), etat.st_mtime_ns, etat.st_size)
+
+
+def get_domaines():
+    """Domaines jetables, relus si le fichier a changé depuis le chargement"""
+    global _domaines, _signature, _prochaine_verification
+
+    maintenant = time.monotonic()
+    if maintenant < _prochaine_verification:
+        return _domaines
+
+    with _verrou:
+        if maintenant >= _prochaine_verification:
+            chemin = settings.DOMAINES_JETABLES_FICHIER
+            signature = _signature_fichier(chemin)
+            if signature != _signature:
+                try:
+                    _domaines = charger_domaines(chemin)
+                except OSError:
+                    # Fichier absent ou illisible : la liste précédente reste en place
+                    logger.exception("Liste des domaines jetables illisible : %s", chemin)
+                else:
+                    logger.info("%d domaines jetables chargés depuis %s", len(_domaines), chemin)
+                    _signature = signature
+            _prochaine_verification = maintenant + DELAI_VERIFICATION
+    return _domaines
+
+
+def recharger():
+    """Force la relecture du fichier à la prochaine vérification"""
+    global _signature, _prochaine_verification
+    with _verrou:
+        _signature = None
+        _prochaine_verification = 0.0
+
+
+def est_jetable(domaine):
+    """True si le domaine d'email (partie après @) est jetable ou réservé aux exemples"""
+    return est_dans(domaine, get_domaines())
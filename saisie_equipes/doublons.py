@@ -0,0 +1,267 @@
+"""
+═══════════════════════════════════════════════════
+🔀 DOUBLONS DE CLUBS : DÉTECTION ET FUSION
+═══════════════════════════════════════════════════
+
+Les clubs arrivent par l'import CSV et l'admin avec des graphies
+voisines (« Tampon Gecko Volley » / « TAMPON GECKO VOLLEY ») : les
+statistiques se dispersent et les listes de choix s'allongent.
+
+Détection sans comparer toutes les paires (O(n²)) :
+1. normalisation (accents, casse, ponctuation : voir autocompletion.py)
+2. blocs : les clubs qui partagent une clé (début d'un mot distinctif,
+   ou nom compact sans espaces) ; les mots génériques (« volley »,
+   « club »...) ne servent pas de clé
+3. similarité (trigrammes communs / trigrammes distincts) des seules
+   paires d'un même bloc, puis regroupement des paires retenues ; dans
+   un bloc trop gros (clé fréquente), chaque club n'est comparé qu'à
+   ses voisins dans l'ordre alphabétique des noms compacts
+
+Fusion : déclarations, candidatures et tournois organisés passent sur
+le club conservé (UPDATE groupés, une transaction), puis les doublons
+sont supprimés.
+
+Utilisé par la page staff « Doublons » et la commande doublons_clubs.
+"""
+
+from collections import defaultdict
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .autocompletion import invalider_index_apres_commit, normaliser, trigrammes
+from .models import Candidature, Club, Declaration, DeclarationRecue, Tournoi
+from .recherche import indexer_club
+from .syntheses import invalider_tournois_apres_commit
+
+# Similarité minimale de deux noms pour les proposer à la fusion
+SEUIL_DOUBLON = 0.6
+
+# Au-delà, un bloc n'est plus comparé paire à paire mais par voisinage
+TAILLE_MAX_BLOC = 50
+
+# Voisins comparés à chaque club d'un gros bloc
+FENETRE_VOISINS = 10
+
+# Lettres du début d'un mot qui forment sa clé (« tampon », « tampn » → « tamp »)
+LONGUEUR_CLE = 4
+
+MOTS_GENERIQUES = {
+    'as', 'asc', 'cs', 'us', 'vb', 'vc', 'club', 'volley', 'volleyball', 'ball',
+    'de', 'des', 'du', 'la', 'le', 'les', 'l', 'd', 'et', 'st', 'ste', 'saint', 'sainte',
+}
+
+
+class ErreurFusion(Exception):
+    """Fusion refusée (club absent, candidatures en conflit...)"""
+
+
+def cles_bloc(mots):
+    """Clés de blocage d'un nom normalisé"""
+    cles = {'=' + ''.join(mots)}
+    cles.update(mot[:LONGUEUR_CLE] for mot in mots if mot not in MOTS_GENERIQUES and not mot.isdigit())
+    return cles
+
+
+def paires_bloc(membres, compacts):
+    """Paires à comparer dans un bloc : toutes, ou les voisines si le bloc est gros"""
+    if len(membres) <= TAILLE_MAX_BLOC:
+        return combinations(membres, 2)
+
+    ordre = sorted(membres, key=compacts.__getitem__)
+    return (
+        (a, b)
+        for i, a in enumerate(ordre)
+        for b in ordre[i + 1:i + 1 + FENETRE_VOISINS]
+    )
+
+
+def similarite(trigrammes_a, trigrammes_b):
+    """Jaccard : trigrammes communs / trigrammes distincts"""
+    if not trigrammes_a or not trigrammes_b:
+        return 0.0
+    communs = len(trigrammes_a & trigrammes_b)
+    return communs / (len(trigrammes_a) + len(trigrammes_b) - communs)
+
+
+def groupes_doublons(clubs, seuil=SEUIL_DOUBLON):
+    """
+    Groupes de clubs probablement identiques
+
+    Args:
+        clubs: itérable de (id, nom)
+
+    Returns:
+        list[(list[id], similarité maximale du groupe)], les plus sûrs d'abord
+    """
+    compacts = {}
+    nombres = {}
+    tri = {}
+    blocs = defaultdict(list)
+    for club_id, nom in clubs:
+        mots = normaliser(nom)
+        if not mots:
+            continue
+        compacts[club_id] = ''.join(mots)
+        nombres[club_id] = {mot for mot in mots if mot.isdigit()}
+        tri[club_id] = trigrammes(mots)
+        for cle in cles_bloc(mots):
+            blocs[cle].append(club_id)
+
+    # Union-find des paires retenues
+    parent = {}
+
+    def racine(club_id):
+        while parent.get(club_id, club_id) != club_id:
+            club_id = parent[club_id]
+        return club_id
+
+    comparees = set()
+    scores = {}
+    for membres in blocs.values():
+        for a, b in paires_bloc(membres, compacts):
+            a, b = min(a, b), max(a, b)
+            if (a, b) in comparees:
+                continue
+            comparees.add((a, b))
+
+            if compacts[a] == compacts[b]:
+                score = 1.0
+            elif nombres[a] != nombres[b]:
+                # « Saint-Denis VB 1 » et « Saint-Denis VB 2 » sont deux clubs
+                continue
+            else:
+                score = similarite(tri[a], tri[b])
+            if score >= seuil:
+                racine_a, racine_b = racine(a), racine(b)
+                if racine_a != racine_b:
+                    parent[max(racine_a, racine_b)] = min(racine_a, racine_b)
+                scores[(a, b)] = score
+
+    groupes = defaultdict(list)
+    meilleurs = defaultdict(float)
+    for (a, b), score in scores.items():
+        meilleurs[racine(a)] = max(meilleurs[racine(a)], score)
+    for club_id in parent.keys() | parent.values():
+        groupes[racine(club_id)].append(club_id)
+
+    return sorted(
+        ((sorted(ids), meilleurs[cle]) for cle, ids in groupes.items()),
+        key=lambda groupe: (-groupe[1], groupe[0]),
+    )
+
+
+def trouver_doublons(seuil=SEUIL_DOUBLON):
+    """
+    Groupes de doublons avec leurs clubs, le club à conserver en premier
+
+    Le club conservé proposé est le plus utilisé (déclarations,
+    candidatures, tournois organisés), puis le plus ancien.
+
+    Returns:
+        list[dict]: {'clubs': [Club annoté], 'similarite': float}
+    """
+    groupes = groupes_doublons(Club.objects.values_list('id', 'nom').iterator(), seuil)
+    if not groupes:
+        return []
+
+    ids = [club_id for membres, _ in groupes for club_id in membres]
+    clubs = Club.objects.filter(pk__in=ids).annotate(
+        nb_declarations=Count('declaration', distinct=True),
+        nb_candidatures=Count('candidatures', distinct=True),
+        nb_tournois=Count('tournois_organises', distinct=True),
+    ).in_bulk()
+
+    def usage(club):
+        return (-(club.nb_declarations + club.nb_candidatures + club.nb_tournois), club.pk)
+
+    return [
+        {
+            'clubs': sorted((clubs[club_id] for club_id in membres if club_id in clubs), key=usage),
+            'similarite': score,
+        }
+        for membres, score in groupes
+    ]
+
+
+# ═══════════════════════════════════════════════════
+# 🔀 FUSION
+# ═══════════════════════════════════════════════════
+
+def fusionner_clubs(cible_id, doublon_ids):
+    """
+    Rattache tout ce qui concerne les doublons au club cible, puis les supprime
+
+    Refusée si deux des clubs ont candidaté au même tournoi (une seule
+    candidature par club et par tournoi) : l'une doit d'abord être traitée.
+
+    Returns:
+        dict: {'declarations': n, 'candidatures': n, 'tournois': n,
+               'declarations_recues': n, 'clubs': n}
+    """
+    doublon_ids = {int(pk) for pk in doublon_ids} - {int(cible_id)}
+    if not doublon_ids:
+        raise ErreurFusion("Aucun doublon à fusionner.")
+
+    with transaction.atomic():
+        tous = list(
+            Club.objects.select_for_update().filter(pk__in=[cible_id, *doublon_ids]).order_by('pk').values_list('pk', flat=True)
+        )
+        if len(tous) != len(doublon_ids) + 1:
+            raise ErreurFusion("Club introuvable (déjà fusionné ou supprimé ?).")
+
+        conflits = list(
+            Candidature.objects.filter(club_id__in=tous).values('tournoi_id').annotate(
+                nb=Count('id')
+            ).filter(nb__gt=1).values_list('tournoi_id', flat=True).order_by('tournoi_id')
+        )
+        if conflits:
+            raise ErreurFusion(
+                f"Plusieurs de ces clubs ont candidaté au(x) même(s) tournoi(s) "
+                f"({', '.join(str(t) for t in Tournoi.objects.filter(pk__in=conflits))}) : "
+                f"traitez ou supprimez l'une des candidatures avant de fusionner."
+            )
+
+        # Tournois dont les pages affichent le nom d'un doublon
+        tournoi_ids = set(
+            Declaration.objects.filter(club_id__in=doublon_ids).values_list('tournoi_id', flat=True).order_by()
+        )
+        tournoi_ids.update(
+            Tournoi.objects.filter(club_organisateur_id__in=doublon_ids).values_list('pk', flat=True).order_by()
+        )
+        tournoi_ids.update(
+            Candidature.objects.filter(club_id__in=doublon_ids).values_list('tournoi_id', flat=True).order_by()
+        )
+
+        resultat = {
+            'declarations': Declaration.objects.filter(club_id__in=doublon_ids).update(club_id=cible_id),
+            'candidatures': Candidature.objects.filter(club_id__in=doublon_ids).update(
+                club_id=cible_id, updated_at=timezone.now(),
+            ),
+            'tournois': Tournoi.objects.filter(club_organisateur_id__in=doublon_ids).update(
+                club_organisateur_id=cible_id, updated_at=timezone.now(),
+            ),
+            # Envois reçus pas encore enregistrés (mode DECLARATIONS_DIFFEREES)
+            'declarations_recues': DeclarationRecue.objects.filter(club_id__in=doublon_ids).update(
+                club_id=cible_id,
+            ),
+        }
+
+        # Plus rien ne devrait les référencer : si la cascade emporte autre chose
+        # (une table ajoutée sans être rattachée ci-dessus), la fusion est annulée
+        resultat['clubs'], supprimes = Club.objects.filter(pk__in=doublon_ids).delete()
+        emportes = {modele: nb for modele, nb in supprimes.items() if modele != Club._meta.label and nb}
+        if emportes:
+            raise ErreurFusion(
+                f"La suppression des doublons emporterait d'autres données ({emportes}) : fusion annulée."
+            )
+
+        # UPDATE sans signaux : documents de recherche, synthèses et
+        # index d'autocomplétion sont mis à jour ici
+        indexer_club(cible_id)
+        invalider_tournois_apres_commit(*tournoi_ids)
+        invalider_index_apres_commit()
+
+    return resultat
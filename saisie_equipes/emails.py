@@ -0,0 +1,256 @@
+"""
+═══════════════════════════════════════════════════
+📧 FILE D'ENVOI DES EMAILS (OUTBOX)
+═══════════════════════════════════════════════════
+
+1. Mise en file : une ligne EmailOutbox, écrite dans la transaction
+   de l'opération métier (aucun appel SMTP pendant la requête)
+2. Envoi : la commande envoyer_emails réserve des lots et les envoie
+   sur UNE connexion SMTP réutilisée, en respectant EMAILS_PAR_MINUTE
+
+Un échec est retenté plus tard (attente exponentielle), jusqu'à
+EMAILS_MAX_TENTATIVES, puis le message passe en ECHEC.
+
+Gabarits : templates/emails/<modele>_sujet.txt et <modele>.txt
+"""
+
+import logging
+import smtplib
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import EmailOutbox, StatutEmail
+
+logger = logging.getLogger('saisie_equipes')
+
+# Un lot réservé mais jamais terminé (worker arrêté) redevient disponible après ce délai
+DUREE_RESERVATION = timedelta(minutes=10)
+
+# Attente avant un nouvel essai : 1 min, 2 min, 4 min... plafonnée à 1 h
+DELAI_ESSAI_INITIAL = 60
+DELAI_ESSAI_MAX = 60 * 60
+
+
+def get_par_minute():
+    return getattr(settings, 'EMAILS_PAR_MINUTE', 30)
+
+
+def get_max_tentatives():
+    return getattr(settings, 'EMAILS_MAX_TENTATIVES', 5)
+
+
+def get_taille_lot():
+    return getattr(settings, 'EMAILS_TAILLE_LOT', 50)
+
+
+# ═══════════════════════════════════════════════════
+# 📥 MISE EN FILE
+# ═══════════════════════════════════════════════════
+
+def preparer_email(modele, destinataire, contexte):
+    """EmailOutbox non enregistré, rendu depuis templates/emails/"""
+    sujet = render_to_string(f'emails/{modele}_sujet.txt', contexte)
+    return EmailOutbox(
+        modele=modele,
+        destinataire=destinataire,
+        # Le sujet doit tenir sur une ligne
+        sujet=' '.join(sujet.split())[:200],
+        corps=render_to_string(f'emails/{modele}.txt', contexte),
+    )
+
+
+def mettre_en_file(envois):
+    """
+    Ajoute des emails à la file (un seul INSERT)
+
+    À appeler DANS la transaction de l'opération métier.
+
+    Args:
+        envois: liste de (modele, destinataire, contexte),
+                modele = nom du gabarit (ex: 'declaration_recue')
+    """
+    emails = [
+        preparer_email(modele, destinataire, contexte)
+        for modele, destinataire, contexte in envois
+        if destinataire
+    ]
+    return EmailOutbox.objects.bulk_create(emails)
+
+
+def notifier_declaration(declaration):
+    """Accusé de réception d'une déclaration d'équipes (inscrite ou en liste d'attente)"""
+    return mettre_en_file([
+        ('declaration_recue', declaration.email_club,
+         {'declaration': declaration, 'tournoi': declaration.tournoi}),
+    ])
+
+
+def notifier_decisions(validees=(), refusees=(), raison=''):
+    """
+    Décisions sur des candidatures (un seul INSERT)
+
+    Args:
+        validees: candidatures retenues (le club organisera le tournoi)
+        refusees: candidatures refusées, manuellement ou automatiquement
+        raison: motif commun des refus
+    """
+    return mettre_en_file(
+        [
+            ('candidature_validee', c.email_contact, {'candidature': c, 'tournoi': c.tournoi})
+            for c in validees
+        ] + [
+            ('candidature_refusee', c.email_contact,
+             {'candidature': c, 'tournoi': c.tournoi, 'raison': raison})
+            for c in refusees
+        ]
+    )
+
+
+# ═══════════════════════════════════════════════════
+# 📤 ENVOI
+# ═══════════════════════════════════════════════════
+
+def reserver_lot(taille=None):
+    """
+    Réserve les prochains emails à envoyer
+
+    Les lignes sont verrouillées (SKIP LOCKED : deux workers ne prennent pas
+    les mêmes) puis marquées EN_COURS pour DUREE_RESERVATION.
+
+    Returns:
+        list[EmailOutbox]
+    """
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        lot = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                Q(statut=StatutEmail.EN_ATTENTE) | Q(statut=StatutEmail.EN_COURS),
+                prochain_essai__lte=maintenant,
+            ).order_by('prochain_essai', 'pk')[:taille or get_taille_lot()]
+        )
+        if lot:
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in lot]).update(
+                statut=StatutEmail.EN_COURS,
+                prochain_essai=maintenant + DUREE_RESERVATION,
+            )
+
+    return lot
+
+
+def delai_nouvel_essai(tentatives):
+    """Attente (secondes) après la n-ième tentative échouée"""
+    return min(DELAI_ESSAI_INITIAL * 2 ** (tentatives - 1), DELAI_ESSAI_MAX)
+
+
+class LimiteurDebit:
+    """
+    Pas plus de `par_minute` envois sur toute fenêtre glissante de 60 s
+
+    horloge / dormir sont injectables pour les tests.
+    """
+
+    def __init__(self, par_minute, horloge=time.monotonic, dormir=time.sleep):
+        self.par_minute = par_minute
+        self.horloge = horloge
+        self.dormir = dormir
+        self.envois = deque()
+
+    def attendre(self):
+        """Bloque jusqu'à ce qu'un envoi soit autorisé, puis le comptabilise"""
+        if self.par_minute:
+            maintenant = self.horloge()
+            while self.envois and maintenant - self.envois[0] >= 60:
+                self.envois.popleft()
+
+            if len(self.envois) >= self.par_minute:
+                self.dormir(60 - (maintenant - self.envois[0]))
+                self.envois.popleft()
+
+        self.envois.append(self.horloge())
+
+
+class Expediteur:
+    """
+    Envoie des lots d'emails sur une connexion SMTP réutilisée
+
+    La connexion est ouverte au premier envoi et gardée entre les lots ;
+    elle est rouverte si le serveur la coupe.
+    """
+
+    def __init__(self, par_minute=None, limiteur=None):
+        self.limiteur = limiteur or LimiteurDebit(
+            get_par_minute() if par_minute is None else par_minute
+        )
+        self.connexion = None
+        self.envoyes = 0
+        self.echecs = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def fermer(self):
+        if self.connexion is not None:
+            try:
+                self.connexion.close()
+            except Exception:
+                pass
+            self.connexion = None
+
+    def get_connexion(self):
+        if self.connexion is None:
+            self.connexion = get_connection()
+            self.connexion.open()
+        return self.connexion
+
+    def envoyer_lot(self, lot):
+        """Envoie les emails réservés ; chaque résultat est enregistré aussitôt"""
+        for email in lot:
+            self.limiteur.attendre()
+            try:
+                EmailMessage(
+                    subject=email.sujet,
+                    body=email.corps,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[email.destinataire],
+                    connection=self.get_connexion(),
+                ).send()
+            except Exception as e:
+                self.enregistrer_echec(email, e)
+                if isinstance(e, (smtplib.SMTPServerDisconnected, OSError)):
+                    # Connexion perdue : la rouvrir pour le message suivant
+                    self.fermer()
+            else:
+                EmailOutbox.objects.filter(pk=email.pk).update(
+                    statut=StatutEmail.ENVOYE,
+                    tentatives=email.tentatives + 1,
+                    envoye_le=timezone.now(),
+                    derniere_erreur='',
+                )
+                self.envoyes += 1
+
+    def enregistrer_echec(self, email, erreur):
+        tentatives = email.tentatives + 1
+        definitif = tentatives >= get_max_tentatives()
+
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            statut=StatutEmail.ECHEC if definitif else StatutEmail.EN_ATTENTE,
+            tentatives=tentatives,
+            prochain_essai=timezone.now() + timedelta(seconds=delai_nouvel_essai(tentatives)),
+            derniere_erreur=f"{type(erreur).__name__}: {erreur}"[:1000],
+        )
+        self.echecs += 1
+
+        log = logger.error if definitif else logger.warning
+        log(f"Email {email.pk} vers {email.destinataire} : échec {tentatives} ({erreur})")
@@ -0,0 +1,154 @@
+"""
+═══════════════════════════════════════════════════
+📥 EXPORTS / IMPORTS CSV
+═══════════════════════════════════════════════════
+
+Code partagé par les vues staff / l'admin et les travaux en
+arrière-plan (jobs.py) : filtres de la liste des déclarations,
+export CSV des déclarations, import CSV des clubs.
+"""
+
+import csv
+import io
+
+from .models import Club, Declaration, TypeDocument
+from .autocompletion import invalider_index_apres_commit
+from .recherche import ids_correspondants
+
+
+# Paramètres GET de la liste staff des déclarations
+FILTRES_DECLARATIONS = ('tournoi', 'club', 'categorie', 'sexe', 'zone', 'q')
+
+ENTETES_CSV_DECLARATIONS = [
+    'Date déclaration',
+    'Club',
+    'Déclarant',
+    'Email',
+    'Tournoi',
+    'Date tournoi',
+    'Catégorie',
+    'Sexe',
+    'Zone',
+    'Nombre équipes',
+    'Statut',
+    'Remarques'
+]
+
+
+def get_filtres_declarations(donnees):
+    """Filtres non vides extraits de request.GET (sérialisables en JSON)"""
+    return {cle: donnees[cle] for cle in FILTRES_DECLARATIONS if donnees.get(cle)}
+
+
+def filtrer_declarations(filtres):
+    """
+    Déclarations de la liste staff, filtrées
+
+    Args:
+        filtres: dict tournoi / club / categorie / sexe / zone / q
+    """
+    declarations = Declaration.objects.select_related(
+        'club', 'tournoi'
+    ).order_by('-date_declaration')
+
+    if filtres.get('tournoi'):
+        declarations = declarations.filter(tournoi_id=filtres['tournoi'])
+
+    if filtres.get('club'):
+        declarations = declarations.filter(club_id=filtres['club'])
+
+    if filtres.get('categorie'):
+        declarations = declarations.filter(tournoi__categorie_age=filtres['categorie'])
+
+    if filtres.get('sexe'):
+        declarations = declarations.filter(tournoi__sexe=filtres['sexe'])
+
+    if filtres.get('zone'):
+        declarations = declarations.filter(tournoi__zone=filtres['zone'])
+
+    recherche = filtres.get('q')
+    if recherche:
+        declarations = declarations.filter(
+            pk__in=ids_correspondants(recherche, TypeDocument.DECLARATION)
+        )
+
+    return declarations
+
+
+def ecrire_csv_declarations(flux, declarations, progression=None):
+    """
+    Écrit l'export CSV (séparateur ;, BOM UTF-8 pour Excel) dans flux
+
+    Args:
+        flux: objet avec write() (texte)
+        progression: callable(pourcentage, message) optionnel
+    """
+    # BOM UTF-8 pour Excel
+    flux.write('\ufeff')
+
+    writer = csv.writer(flux, delimiter=';')
+    writer.writerow(ENTETES_CSV_DECLARATIONS)
+
+    total = declarations.count() if progression else 0
+    # Le club organisateur sert à str(tournoi)
+    declarations = declarations.select_related('tournoi__club_organisateur')
+
+    for numero, d in enumerate(declarations.iterator(chunk_size=500), start=1):
+        writer.writerow([
+            d.date_declaration.strftime('%d/%m/%Y %H:%M'),
+            d.club.nom,
+            d.declarant,
+            d.email_club,
+            str(d.tournoi),
+            d.tournoi.date.strftime('%d/%m/%Y'),
+            d.tournoi.get_categorie_age_display(),
+            d.tournoi.get_sexe_display(),
+            d.tournoi.get_zone_display() if d.tournoi.zone else 'Toutes zones',
+            d.nombre_equipes,
+            d.get_statut_display(),
+            d.remarques if d.remarques else ''
+        ])
+        if progression and numero % 500 == 0:
+            progression(100 * numero // total, f"{numero} / {total} déclarations")
+
+
+class ErreurImport(Exception):
+    """Fichier d'import illisible (colonnes manquantes...)"""
+
+
+def importer_clubs(texte, progression=None):
+    """
+    Crée les clubs listés dans un CSV (colonne nom_club)
+
+    Les clubs déjà connus sont ignorés ; une requête pour lire les
+    clubs existants, un INSERT groupé pour les nouveaux.
+
+    Returns:
+        dict: {'nouveaux': n, 'existants': n, 'erreurs': [...]}
+    Raises:
+        ErreurImport: colonne nom_club absente
+    """
+    reader = csv.DictReader(io.StringIO(texte.lstrip('\ufeff')))
+    if 'nom_club' not in (reader.fieldnames or []):
+        raise ErreurImport("La colonne 'nom_club' est manquante dans le CSV.")
+
+    noms = {}
+    erreurs = []
+    for numero_ligne, row in enumerate(reader, start=2):  # start=2 car ligne 1 = headers
+        nom_club = (row.get('nom_club') or '').strip()
+        if not nom_club:
+            erreurs.append(f"Ligne {numero_ligne}: Nom de club vide")
+            continue
+        noms.setdefault(nom_club, numero_ligne)
+
+    if progression:
+        progression(50, f"{len(noms)} club(s) lu(s)")
+
+    existants = set(Club.objects.filter(nom__in=noms).values_list('nom', flat=True))
+    nouveaux = [Club(nom=nom) for nom in noms if nom not in existants]
+    Club.objects.bulk_create(nouveaux)
+
+    # bulk_create ne déclenche pas les signaux
+    invalider_index_apres_commit()
+
+    return {'nouveaux': len(nouveaux), 'existants': len(existants), 'erreurs': erreurs}
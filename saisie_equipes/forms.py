@@ -1,6 +1,15 @@
+import uuid
+
 from django import forms
+from django.db import transaction
+from django.urls import reverse_lazy
 from django.utils import timezone
-from .models import Declaration, Candidature, Tournoi, Club, Poule  # 🆕 Ajout de Poule
+from .models import Declaration, Candidature, Tournoi, Club, Poule, Equipe
+from .emails import notifier_declaration
+from .domaines_jetables import est_jetable
+from .antispam import (
+    EMAILS_PAR_DEFAUT, MOTIF_LIEN, MOTIF_LIEN_OU_SCRIPT, MOTIF_REPETITION, MOTIF_URL, VALEURS_PAR_DEFAUT,
+)
 
 
 # ═══════════════════════════════════════════════════
@@ -36,12 +45,7 @@ class AntiSpamFormMixin:
     def validate_declarant(self, declarant):
         """Validation générique du nom du déclarant - anti-spam"""
         # 🚫 BLOQUER LES VALEURS PAR DÉFAUT
-        valeurs_interdites = [
-            'inconnu', 'unknown', 'test', 'exemple', 'example',
-            'admin', 'administrateur', 'user', 'utilisateur'
-        ]
-
-        if declarant.lower().strip() in valeurs_interdites:
+        if declarant.lower().strip() in VALEURS_PAR_DEFAUT:
             raise forms.ValidationError("Veuillez saisir votre vrai nom")
 
         # Minimum 2 mots (prénom + nom)
@@ -57,8 +61,8 @@ class AntiSpamFormMixin:
         if len(declarant.strip()) < 5:
             raise forms.ValidationError("Le nom semble trop court")
 
-        # Pas de caractères suspects répétés
-        if any(char * 5 in declarant for char in 'abcdefghijklmnopqrstuvwxyz'):
+        # Pas de caractères suspects répétés (« aaaaa »)
+        if MOTIF_REPETITION.search(declarant):
             raise forms.ValidationError("Format de nom invalide")
 
         return declarant.strip().title()
@@ -66,45 +70,30 @@ class AntiSpamFormMixin:
     def validate_email(self, email):
         """Validation générique email anti-spam"""
         # 🚫 BLOQUER LES EMAILS PAR DÉFAUT
-        emails_interdits = [
-            'inconnu@exemple.com', 'unknown@example.com', 'test@test.com',
-            'admin@admin.com', 'user@user.com', 'example@example.com',
-            'test@example.com', 'noreply@example.com'
-        ]
-
-        if email.lower().strip() in emails_interdits:
+        if email.lower().strip() in EMAILS_PAR_DEFAUT:
             raise forms.ValidationError("Veuillez saisir une adresse email réelle")
 
-        # Domaines email temporaires/suspects à bloquer
-        spam_domains = [
-            'tempmail.org', '10minutemail.com', 'guerrillamail.com',
-            'mailinator.com', 'throwaway.email', 'temp-mail.org',
-            'maildrop.cc', 'sharklasers.com', 'yopmail.com',
-            'example.com', 'exemple.com', 'test.com'
-        ]
-
         email_lower = email.lower().strip()
 
-        for domain in spam_domains:
-            if domain in email_lower:
-                raise forms.ValidationError("Les adresses email temporaires ne sont pas autorisées")
-
         # Vérification format basique supplémentaire
         if email_lower.count('@') != 1:
             raise forms.ValidationError("Format d'email invalide")
 
         # Vérifier que le domaine a au moins un point
-        partie_domaine = email_lower.split('@')[1] if '@' in email_lower else ''
+        partie_domaine = email_lower.split('@')[1]
         if '.' not in partie_domaine:
             raise forms.ValidationError("Le domaine de l'email semble invalide")
 
+        # Domaines email temporaires/suspects à bloquer (domaine ou domaine parent)
+        if est_jetable(partie_domaine):
+            raise forms.ValidationError("Les adresses email temporaires ne sont pas autorisées")
+
         return email_lower
 
     def validate_remarques(self, remarques, max_length=500):
         """Validation générique des remarques - anti-spam"""
         # Détecter les URLs (spam fréquent)
-        mots_suspects = ['http://', 'https://', 'www.', '.com', '.org', '.net']
-        if any(mot in remarques.lower() for mot in mots_suspects):
+        if MOTIF_LIEN.search(remarques):
             raise forms.ValidationError("Les liens ne sont pas autorisés dans les remarques")
 
         # Limiter la longueur
@@ -114,6 +103,48 @@ class AntiSpamFormMixin:
         return remarques.strip()
 
 
+# ═══════════════════════════════════════════════════
+# 🔑 MIXIN CLÉ DE SOUMISSION (IDEMPOTENCE)
+# ═══════════════════════════════════════════════════
+
+class CleSoumissionFormMixin:
+    """
+    Mixin pour rendre une soumission idempotente
+
+    Chaque formulaire affiché porte une clé unique (UUID, champ caché).
+    La clé est enregistrée avec l'objet, sous contrainte d'unicité :
+    un double clic ou un POST rejoué par le navigateur retrouve l'objet
+    déjà créé au lieu d'en insérer un second.
+    """
+
+    def add_cle_soumission(self):
+        """Ajoute le champ caché (nouvelle clé à chaque affichage du formulaire)"""
+        self.fields['cle_soumission'] = forms.UUIDField(
+            required=False,
+            label='',
+            widget=forms.HiddenInput(),
+        )
+        if not self.is_bound:
+            self.initial['cle_soumission'] = uuid.uuid4()
+
+    def get_cle_soumission(self):
+        """Clé envoyée avec le POST (None si absente ou invalide)"""
+        try:
+            return uuid.UUID(str(self.data.get('cle_soumission', '')))
+        except ValueError:
+            return None
+
+    def get_soumission_existante(self):
+        """Objet déjà enregistré avec la clé de ce POST, ou None"""
+        cle = self.get_cle_soumission()
+        if cle is None:
+            return None
+        return self._meta.model.objects.filter(cle_soumission=cle).first()
+
+    def appliquer_cle_soumission(self, instance):
+        instance.cle_soumission = self.get_cle_soumission()
+
+
 # ═══════════════════════════════════════════════════
 # 📝 FORMULAIRE DE DÉCLARATION D'ÉQUIPES - VERSION SIMPLIFIÉE
 # ═══════════════════════════════════════════════════
@@ -124,12 +155,13 @@ class AntiSpamFormMixin:
 #
 # ═══════════════════════════════════════════════════
 
-class DeclarationForm(AntiSpamFormMixin, forms.ModelForm):
+class DeclarationForm(CleSoumissionFormMixin, AntiSpamFormMixin, forms.ModelForm):
     """Formulaire de déclaration d'équipes pour un tournoi"""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.add_honeypot()
+        self.add_cle_soumission()
 
         # 🆕 Filtrer les tournois : uniquement à venir + publiés
         today = timezone.now().date()
@@ -166,14 +198,16 @@ class DeclarationForm(AntiSpamFormMixin, forms.ModelForm):
         # 🆕 SIMPLIFIÉ : on masque les champs redondants avec le tournoi
         exclude = [
             'date_declaration',
-            'noms_equipes',
-            'poules_equipes',
             # date_tournoi, categorie_age, sexe, zone supprimés en Sprint 3b
+            # noms_equipes, poules_equipes remplacés par le modèle Equipe
+            'statut',  # décidé à l'enregistrement (capacité du tournoi)
         ]
 
         widgets = {
             "club": forms.Select(attrs={
                 "class": "form-control",
+                # Champ de recherche ajouté par autocompletion_club.js (le select reste sans JS)
+                "data-autocompletion": reverse_lazy('clubs_autocompletion'),
             }),
             "declarant": forms.TextInput(attrs={
                 "placeholder": "Exemple: Jean Dupont",
@@ -282,8 +316,7 @@ class DeclarationForm(AntiSpamFormMixin, forms.ModelForm):
                     )
 
                 # ✅ VALIDATION : Pas de caractères suspects
-                mots_suspects = ['http://', 'https://', 'www.', '<script', 'javascript:']
-                if any(mot in nom.lower() for mot in mots_suspects):
+                if MOTIF_LIEN_OU_SCRIPT.search(nom):
                     raise forms.ValidationError(
                         f"Le nom de l'équipe {i} contient des caractères interdits."
                     )
@@ -336,33 +369,66 @@ class DeclarationForm(AntiSpamFormMixin, forms.ModelForm):
         return cleaned_data
 
     def save(self, commit=True):
-        """Sauvegarder la déclaration avec noms et poules d'équipes"""
+        """Sauvegarder la déclaration et ses équipes (une ligne Equipe par équipe)"""
         instance = super().save(commit=False)
-
-        # ✅ Récupérer les noms validés depuis cleaned_data
-        if 'noms_equipes' in self.cleaned_data:
-            instance.noms_equipes = self.cleaned_data['noms_equipes']
-
-        # ✅ Récupérer les poules validées depuis cleaned_data
-        if 'poules_equipes' in self.cleaned_data:
-            instance.poules_equipes = self.cleaned_data['poules_equipes']
+        self.appliquer_cle_soumission(instance)
 
         if commit:
-            instance.save()
+            # IntegrityError sur cle_soumission (double envoi) : tout est annulé,
+            # y compris la réservation de places et l'accusé de réception
+            with transaction.atomic():
+                instance.save()
+                self._save_equipes(instance)
+                notifier_declaration(instance)
+        else:
+            # Comme pour les ManyToMany : les équipes seront créées par save_m2m()
+            save_m2m = self.save_m2m
+
+            def save_m2m_et_equipes():
+                save_m2m()
+                self._save_equipes(instance)
+
+            self.save_m2m = save_m2m_et_equipes
 
         return instance
 
+    def _save_equipes(self, declaration):
+        """Crée les équipes validées dans clean() en une seule requête"""
+        noms = self.cleaned_data.get('noms_equipes', [])
+        poules = self.cleaned_data.get('poules_equipes', [])
+
+        Equipe.objects.bulk_create([
+            Equipe(
+                declaration=declaration,
+                tournoi_id=declaration.tournoi_id,
+                nom=nom,
+                poule=poules[ordre] if ordre < len(poules) else '',
+                ordre=ordre,
+            )
+            for ordre, nom in enumerate(noms)
+        ])
+
 
 # ═══════════════════════════════════════════════════
 # 📋 FORMULAIRE DE CANDIDATURE À L'ORGANISATION
 # ═══════════════════════════════════════════════════
 
-class CandidatureForm(AntiSpamFormMixin, forms.ModelForm):
+class CandidatureForm(CleSoumissionFormMixin, AntiSpamFormMixin, forms.ModelForm):
     """Formulaire pour qu'un club candidate à l'organisation d'un tournoi"""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.add_honeypot()
+        self.add_cle_soumission()
+
+    def save(self, commit=True):
+        instance = super().save(commit=False)
+        self.appliquer_cle_soumission(instance)
+        if commit:
+            # Savepoint : une IntegrityError (double envoi) laisse la transaction utilisable
+            with transaction.atomic():
+                instance.save()
+        return instance
 
     class Meta:
         model = Candidature
@@ -373,7 +439,8 @@ class CandidatureForm(AntiSpamFormMixin, forms.ModelForm):
             'tournoi': forms.HiddenInput(),
             'club': forms.Select(attrs={
                 'class': 'form-control',
-                'required': True
+                'required': True,
+                'data-autocompletion': reverse_lazy('clubs_autocompletion'),
             }),
             'declarant': forms.TextInput(attrs={
                 'placeholder': 'Votre nom et prénom',
@@ -438,8 +505,7 @@ class CandidatureForm(AntiSpamFormMixin, forms.ModelForm):
             raise forms.ValidationError("Le nom du lieu ne peut pas dépasser 200 caractères")
 
         # Détecter URLs (spam)
-        mots_suspects = ['http://', 'https://', 'www.']
-        if any(mot in lieu.lower() for mot in mots_suspects):
+        if MOTIF_URL.search(lieu):
             raise forms.ValidationError("Les liens ne sont pas autorisés")
 
         return lieu.strip()
@@ -521,7 +587,7 @@ class TournoiForm(AntiSpamFormMixin, forms.ModelForm):
         model = Tournoi
         fields = [
             'date', 'titre', 'categorie_age', 'sexe', 'zone',
-            'statut', 'club_organisateur', 'lieu',
+            'statut', 'capacite_max', 'club_organisateur', 'lieu',
             'est_publie', 'remarques'
             # Note : poules_disponibles est géré via le champ personnalisé ci-dessus
         ]
@@ -548,6 +614,11 @@ class TournoiForm(AntiSpamFormMixin, forms.ModelForm):
                 'class': 'form-control',
                 'required': True
             }),
+            'capacite_max': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'min': '1',
+                'placeholder': 'Pas de limite',
+            }),
             'club_organisateur': forms.Select(attrs={
                 'class': 'form-control'
             }),
@@ -571,6 +642,7 @@ class TournoiForm(AntiSpamFormMixin, forms.ModelForm):
             'sexe': 'Sexe',
             'zone': 'Zone géographique',
             'statut': 'Statut',
+            'capacite_max': 'Capacité maximale (équipes)',
             'club_organisateur': 'Club organisateur',
             'lieu': 'Lieu / Gymnase (optionnel)',
             'est_publie': 'Publié (visible publiquement)',
@@ -579,6 +651,7 @@ class TournoiForm(AntiSpamFormMixin, forms.ModelForm):
         help_texts = {
             'date': 'Date à laquelle le tournoi aura lieu',
             'zone': 'Laisser vide si pas de zone spécifique',
+            'capacite_max': 'Vide = pas de limite. Au-delà, les déclarations passent en liste d\'attente',
             'club_organisateur': 'Sera défini lors de la validation d\'une candidature',
             'lieu': 'Sera défini lors de la validation d\'une candidature',
             'est_publie': 'Si décoché, seul le staff verra ce tournoi',
@@ -610,8 +683,7 @@ class TournoiForm(AntiSpamFormMixin, forms.ModelForm):
             raise forms.ValidationError("Le nom du lieu ne peut pas dépasser 200 caractères")
 
         # Détecter URLs (spam)
-        mots_suspects = ['http://', 'https://', 'www.']
-        if any(mot in lieu.lower() for mot in mots_suspects):
+        if MOTIF_URL.search(lieu):
             raise forms.ValidationError("Les liens ne sont pas autorisés")
 
         return lieu.strip()
@@ -0,0 +1,237 @@
+"""
+═══════════════════════════════════════════════════
+⚙️ TRAVAUX EN ARRIÈRE-PLAN (JOBS)
+═══════════════════════════════════════════════════
+
+Les opérations lourdes du staff (exports, imports) ne tournent plus
+dans la requête web : la vue crée un Job et répond aussitôt, la
+commande run_jobs (tâche permanente PythonAnywhere) l'exécute.
+
+- Un type de job = une fonction décorée par @type_job, qui reçoit le job
+  et un callable progression(pourcentage, message), et retourne
+  (nom_fichier, contenu) ou None
+- cpu=True : exécuté dans un pool de processus si run_jobs --processus N
+- Le fichier produit est rangé dans le stockage privé (stockage.py,
+  hors MEDIA_ROOT) et téléchargé par la page staff du job
+"""
+
+import io
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+import django
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job, StatutJob
+from .stockage import stockage_jobs
+
+logger = logging.getLogger('saisie_equipes')
+
+# Sans nouvelle progression pendant ce délai, le job est considéré abandonné
+DUREE_RESERVATION = timedelta(minutes=10)
+
+# Au plus une écriture de progression par intervalle (secondes)
+INTERVALLE_PROGRESSION = 1.0
+
+
+# ═══════════════════════════════════════════════════
+# 📒 REGISTRE DES TYPES DE JOBS
+# ═══════════════════════════════════════════════════
+
+class TypeJob:
+    def __init__(self, nom, libelle, fonction, cpu=False):
+        self.nom = nom
+        self.libelle = libelle
+        self.fonction = fonction
+        self.cpu = cpu
+
+
+TYPES_JOBS = {}
+
+
+def type_job(nom, libelle, cpu=False):
+    """Décorateur : enregistre une fonction comme type de job"""
+    def enregistrer(fonction):
+        TYPES_JOBS[nom] = TypeJob(nom, libelle, fonction, cpu)
+        return fonction
+    return enregistrer
+
+
+def lancer_job(nom, user=None, **parametres):
+    """Met un job en file (la requête n'attend pas son exécution)"""
+    if nom not in TYPES_JOBS:
+        raise ValueError(f"Type de job inconnu : {nom}")
+    return Job.objects.create(type_job=nom, parametres=parametres, cree_par=user)
+
+
+# ═══════════════════════════════════════════════════
+# ▶️ EXÉCUTION
+# ═══════════════════════════════════════════════════
+
+def reserver_job():
+    """
+    Réserve le plus ancien job à exécuter (ou None)
+
+    SKIP LOCKED : deux workers ne prennent pas le même job. Un job EN_COURS
+    dont la réservation a expiré (worker arrêté) est repris.
+    """
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        job = Job.objects.select_for_update(skip_locked=True).filter(
+            Q(statut=StatutJob.EN_ATTENTE) |
+            Q(statut=StatutJob.EN_COURS, reserve_jusqua__lt=maintenant)
+        ).order_by('created_at', 'pk').first()
+
+        if job is None:
+            return None
+
+        Job.objects.filter(pk=job.pk).update(
+            statut=StatutJob.EN_COURS,
+            debut=maintenant,
+            reserve_jusqua=maintenant + DUREE_RESERVATION,
+            progression=0,
+            message='',
+        )
+
+    job.refresh_from_db()
+    return job
+
+
+class Progression:
+    """
+    Callable passé aux jobs : enregistre la progression et prolonge la réservation
+
+    Les appels trop rapprochés sont ignorés (sauf 100 %).
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.derniere_ecriture = 0.0
+
+    def __call__(self, pourcentage, message=''):
+        maintenant = time.monotonic()
+        if pourcentage < 100 and maintenant - self.derniere_ecriture < INTERVALLE_PROGRESSION:
+            return
+        self.derniere_ecriture = maintenant
+
+        Job.objects.filter(pk=self.job_id).update(
+            progression=max(0, min(int(pourcentage), 100)),
+            message=message[:255],
+            reserve_jusqua=timezone.now() + DUREE_RESERVATION,
+        )
+
+
+def executer_job(job_id):
+    """
+    Exécute un job réservé et enregistre son résultat
+
+    Fonction de module (sérialisable) : appelée telle quelle par le pool
+    de processus de run_jobs.
+
+    Returns:
+        str: statut final
+    """
+    job = Job.objects.get(pk=job_id)
+    type_job = TYPES_JOBS.get(job.type_job)
+
+    try:
+        if type_job is None:
+            raise ValueError(f"Type de job inconnu : {job.type_job}")
+
+        resultat = type_job.fonction(job, Progression(job.pk))
+
+        if resultat is not None:
+            nom_fichier, contenu = resultat
+            job.resultat.save(nom_fichier, ContentFile(contenu), save=False)
+
+        Job.objects.filter(pk=job.pk).update(
+            statut=StatutJob.TERMINE,
+            progression=100,
+            resultat=job.resultat.name or '',
+            fin=timezone.now(),
+            reserve_jusqua=None,
+        )
+        return StatutJob.TERMINE
+
+    except Exception as e:
+        logger.error(f"Job {job.pk} ({job.type_job}) en échec : {e}", exc_info=True)
+        Job.objects.filter(pk=job.pk).update(
+            statut=StatutJob.ECHEC,
+            message=f"{type(e).__name__}: {e}"[:255],
+            erreur=traceback.format_exc(),
+            fin=timezone.now(),
+            reserve_jusqua=None,
+        )
+        return StatutJob.ECHEC
+
+
+def initialiser_processus():
+    """
+    Initialisation d'un processus du pool
+
+    Après un fork, les connexions à la base héritées du parent ne doivent
+    être ni utilisées ni fermées (le parent s'en sert encore) : on les abandonne,
+    le processus ouvrira les siennes.
+    """
+    django.setup()
+    for connexion in connections.all(initialized_only=True):
+        connexion.connection = None
+
+
+def fin_message(job, message):
+    """Message final affiché dans la page du job"""
+    Job.objects.filter(pk=job.pk).update(message=message[:255])
+
+
+# ═══════════════════════════════════════════════════
+# 📦 TYPES DE JOBS
+# ═══════════════════════════════════════════════════
+
+@type_job('export_declarations', "📥 Export CSV des déclarations", cpu=True)
+def job_export_declarations(job, progression):
+    """parametres : filtres de la liste staff (tournoi, club, categorie...)"""
+    from .exports import filtrer_declarations, ecrire_csv_declarations
+
+    declarations = filtrer_declarations(job.parametres)
+    flux = io.StringIO()
+    ecrire_csv_declarations(flux, declarations, progression)
+
+    fin_message(job, f"{declarations.count()} déclaration(s) exportée(s)")
+    return (
+        f"declarations_volleychamp_{timezone.localtime():%Y%m%d_%H%M}.csv",
+        flux.getvalue().encode('utf-8'),
+    )
+
+
+@type_job('import_clubs', "🏐 Import CSV des clubs")
+def job_import_clubs(job, progression):
+    """
+    parametres : {'fichier': chemin dans le stockage privé des jobs}
+
+    Le fichier déposé est supprimé après l'import, réussi ou non.
+    Résultat : la liste des erreurs, s'il y en a.
+    """
+    from .exports import importer_clubs
+
+    chemin = job.parametres['fichier']
+    try:
+        with stockage_jobs.open(chemin, 'rb') as f:
+            texte = f.read().decode('utf-8')
+        resultat = importer_clubs(texte, progression)
+    finally:
+        stockage_jobs.delete(chemin)
+
+    fin_message(
+        job,
+        f"{resultat['nouveaux']} nouveau(x) club(s), {resultat['existants']} déjà existant(s), "
+        f"{len(resultat['erreurs'])} erreur(s)"
+    )
+    if resultat['erreurs']:
+        return ('erreurs_import_clubs.txt', '\n'.join(resultat['erreurs']).encode('utf-8'))
+    return None
@@ -0,0 +1,104 @@
+"""
+═══════════════════════════════════════════════════
+🧹 TÂCHES DE MAINTENANCE PÉRIODIQUES
+═══════════════════════════════════════════════════
+
+Enregistrées dans le planificateur (voir planificateur.py) et exécutées
+par : python manage.py planificateur --boucle
+
+- terminer_tournois_passes : un seul UPDATE PLANIFIE/CONFIRME → TERMINE
+- purger_sessions : suppression des sessions expirées par lots (sessions.py)
+- prechauffer_caches : synthèses des tournois à venir recalculées avant
+  l'affluence (les visiteurs ne paient pas le calcul)
+- traiter_declarations_recues : filet de sécurité de la commande
+  traiter_declarations (mode DECLARATIONS_DIFFEREES, voir reception.py)
+- purger_resultats_jobs : fichiers des jobs supprimés après
+  JOBS_DUREE_CONSERVATION_JOURS (les exports contiennent des emails)
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job, Tournoi, StatutTournoi
+from .planificateur import tache_periodique
+from .reception import traiter_file
+from .sessions import TAILLE_LOT_PURGE, purger_sessions_expirees, sessions_en_base
+from .syntheses import get_repartitions_poules, invalider_tournois
+
+# Tournois dont les synthèses sont préchauffées : les N prochains jours
+JOURS_PRECHAUFFAGE = 10
+
+
+@tache_periodique('terminer_tournois_passes', intervalle=timedelta(hours=1))
+def terminer_tournois_passes():
+    """Passe les tournois dont la date est dépassée au statut TERMINE"""
+    aujourdhui = timezone.localdate()
+    passes = Tournoi.objects.filter(
+        date__lt=aujourdhui,
+        statut__in=[StatutTournoi.PLANIFIE, StatutTournoi.CONFIRME],
+    )
+
+    tournoi_ids = list(passes.values_list('pk', flat=True))
+    if not tournoi_ids:
+        return "0 tournoi terminé"
+
+    nb = passes.filter(pk__in=tournoi_ids).update(
+        statut=StatutTournoi.TERMINE,
+        updated_at=timezone.now(),
+    )
+
+    # update() ne déclenche pas les signaux
+    invalider_tournois(*tournoi_ids)
+    return f"{nb} tournoi(s) terminé(s)"
+
+
+@tache_periodique('purger_sessions', intervalle=timedelta(hours=6))
+def purger_sessions(taille_lot=TAILLE_LOT_PURGE):
+    """Supprime les sessions expirées par lots (pas de grand DELETE qui bloque la table)"""
+    if not sessions_en_base():
+        return "sessions hors base : rien à purger"
+
+    resultat = purger_sessions_expirees(taille_lot)
+    return f"{resultat['supprimees']} session(s) supprimée(s) en {resultat['lots']} lot(s)"
+
+
+@tache_periodique('prechauffer_caches', intervalle=timedelta(hours=1))
+def prechauffer_caches(jours=JOURS_PRECHAUFFAGE):
+    """Calcule et met en cache les synthèses des tournois des prochains jours"""
+    aujourdhui = timezone.localdate()
+    tournoi_ids = list(
+        Tournoi.objects.filter(
+            date__gte=aujourdhui,
+            date__lte=aujourdhui + timedelta(days=jours),
+        ).exclude(
+            statut=StatutTournoi.ANNULE
+        ).values_list('pk', flat=True)
+    )
+
+    # Déjà en cache pour la version courante : lecture seule, sinon calcul
+    get_repartitions_poules(tournoi_ids)
+    return f"{len(tournoi_ids)} tournoi(s) préchauffé(s)"
+
+
+@tache_periodique('traiter_declarations_recues', intervalle=timedelta(minutes=1))
+def traiter_declarations_recues():
+    """Enregistre les déclarations reçues en mode différé (si aucune commande ne tourne)"""
+    resultat = traiter_file()
+    return (
+        f"{resultat['inscrites']} inscrite(s), {resultat['liste_attente']} en liste d'attente, "
+        f"{resultat['echecs']} échec(s)"
+    )
+
+
+@tache_periodique('purger_resultats_jobs', intervalle=timedelta(days=1))
+def purger_resultats_jobs():
+    """Supprime les fichiers des jobs terminés depuis plus de JOBS_DUREE_CONSERVATION_JOURS"""
+    limite = timezone.now() - timedelta(days=settings.JOBS_DUREE_CONSERVATION_JOURS)
+    jobs = list(Job.objects.filter(fin__lt=limite).exclude(resultat='').only('pk', 'resultat'))
+
+    for job in jobs:
+        job.resultat.delete(save=False)
+    Job.objects.filter(pk__in=[job.pk for job in jobs]).update(resultat='')
+    return f"{len(jobs)} fichier(s) de job supprimé(s)"
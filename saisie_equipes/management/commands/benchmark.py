@@ -0,0 +1,134 @@
+# saisie_equipes/management/commands/benchmark.py
+"""
+⏱️ Micro-benchmarks des chemins chauds avec référence JSON
+
+    python manage.py benchmark                 # mesure et affiche
+    python manage.py benchmark --enregistrer   # écrit benchmarks/baseline.json
+    python manage.py benchmark --comparer      # échoue si régression > --seuil %
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from saisie_equipes.benchmarks import (
+    FICHIER_BASELINE, executer_benchmarks, comparer, meta_environnement
+)
+
+
+class AnnulerTransaction(Exception):
+    """Sert uniquement à annuler les données de benchmark"""
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmarks des chemins chauds (anti-spam, formulaires, modèles, filtres)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enregistrer',
+            action='store_true',
+            help='Enregistre les résultats comme nouvelle référence',
+        )
+        parser.add_argument(
+            '--comparer',
+            action='store_true',
+            help='Compare à la référence et échoue en cas de régression',
+        )
+        parser.add_argument(
+            '--seuil',
+            type=float,
+            default=25.0,
+            help='Ralentissement toléré en %% avant de signaler une régression (défaut : 25)',
+        )
+        parser.add_argument(
+            '--filtre',
+            default='',
+            help='N\'exécute que les benchmarks dont le nom contient ce texte',
+        )
+        parser.add_argument(
+            '--repetitions',
+            type=int,
+            default=5,
+            help='Nombre de répétitions par benchmark (défaut : 5)',
+        )
+        parser.add_argument(
+            '--fichier',
+            default=str(FICHIER_BASELINE),
+            help=f'Fichier de référence (défaut : {FICHIER_BASELINE})',
+        )
+
+    def handle(self, *args, **options):
+        resultats = {}
+        try:
+            # Les données de test sont créées puis annulées
+            with transaction.atomic():
+                resultats = executer_benchmarks(
+                    filtre=options['filtre'],
+                    repetitions=options['repetitions'],
+                )
+                raise AnnulerTransaction
+        except AnnulerTransaction:
+            pass
+
+        if not resultats:
+            raise CommandError("Aucun benchmark ne correspond au filtre.")
+
+        if options['comparer']:
+            self.comparer(resultats, options)
+        else:
+            for nom, stats in resultats.items():
+                self.stdout.write(
+                    f"  {nom:<42} min={stats['min_us']:>10.3f} µs  "
+                    f"médiane={stats['median_us']:>10.3f} µs"
+                )
+
+        if options['enregistrer']:
+            self.enregistrer(resultats, options['fichier'])
+
+    def lire_reference(self, fichier):
+        try:
+            with open(fichier, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'resultats': {}}
+
+    def enregistrer(self, resultats, fichier):
+        reference = self.lire_reference(fichier)
+        # Un --filtre ne met à jour que les benchmarks exécutés
+        reference['resultats'].update(resultats)
+        reference['meta'] = meta_environnement()
+
+        with open(fichier, 'w', encoding='utf-8') as f:
+            json.dump(reference, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+
+        self.stdout.write(self.style.SUCCESS(f"💾 Référence enregistrée : {fichier}"))
+
+    def comparer(self, resultats, options):
+        reference = self.lire_reference(options['fichier'])['resultats']
+        if not reference:
+            raise CommandError(f"Pas de référence dans {options['fichier']} : lancez --enregistrer.")
+
+        regressions = []
+        for nom, avant, actuel, ecart, est_regression in comparer(resultats, reference, options['seuil']):
+            if avant is None:
+                self.stdout.write(f"  🆕 {nom:<42} {actuel:>10.3f} µs (absent de la référence)")
+                continue
+
+            ligne = f"{nom:<42} {avant:>10.3f} → {actuel:>10.3f} µs ({ecart:+.1f} %)"
+            if est_regression:
+                regressions.append(nom)
+                self.stdout.write(self.style.ERROR(f"  🐢 {ligne}"))
+            elif ecart < -options['seuil']:
+                self.stdout.write(self.style.SUCCESS(f"  🚀 {ligne}"))
+            else:
+                self.stdout.write(f"  ✓  {ligne}")
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} régression(s) au-delà de {options['seuil']} % : "
+                f"{', '.join(regressions)}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Aucune régression"))
@@ -0,0 +1,442 @@
+# saisie_equipes/management/commands/charge_declarations.py
+"""
+═══════════════════════════════════════════════════
+🏋️ HARNAIS DE CHARGE - OUVERTURE DES DÉCLARATIONS
+═══════════════════════════════════════════════════
+
+Simule la ruée des clubs à l'ouverture d'un tournoi :
+- N clients "déclarants" suivent le vrai parcours
+  GET /declaration/ → attente anti-robot (> 3 s) → POST du formulaire
+  (avec les champs nom_equipe_i / poule_equipe_i)
+- M clients "lecteurs" consultent /consultation/ en boucle pendant ce temps
+
+Les requêtes traversent toute la pile Django (middlewares, sessions,
+vues, templates) via le handler du client de test, contre la base
+configurée (SQLite locale ou MySQL de test).
+
+⚠️ À lancer uniquement sur une base locale / de recette, JAMAIS en production.
+
+Exemples :
+    python manage.py charge_declarations --preparer --clients 40 --lecteurs 10
+    python manage.py charge_declarations --tournoi 12 --clients 20 --json rapport.json
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, OperationalError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from saisie_equipes.mesures import resume_latences
+from saisie_equipes.models import (
+    Club, Tournoi, Declaration, CategorieAge, Sexe, StatutTournoi
+)
+
+
+TITRE_TOURNOI_CHARGE = "Test de charge"
+PREFIXE_CLUB_CHARGE = "Club Charge"
+
+
+class Collecteur:
+    """Accumule les mesures des différents threads (accès protégé par verrou)"""
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.latences = defaultdict(list)      # étape → [ms]
+        self.statuts = defaultdict(lambda: defaultdict(int))  # étape → {statut: nb}
+        self.issues = defaultdict(int)         # issue du POST → nb
+        self.ecritures_sql = []                # latences des INSERT/UPDATE/DELETE (ms)
+        self.erreurs_verrou = 0                # "database is locked" & co
+
+    def requete(self, etape, duree_ms, statut):
+        with self.verrou:
+            self.latences[etape].append(duree_ms)
+            self.statuts[etape][statut] += 1
+
+    def issue(self, nom):
+        with self.verrou:
+            self.issues[nom] += 1
+
+    def ecriture(self, duree_ms):
+        with self.verrou:
+            self.ecritures_sql.append(duree_ms)
+
+    def verrou_en_erreur(self):
+        with self.verrou:
+            self.erreurs_verrou += 1
+
+
+class Command(BaseCommand):
+    help = 'Harnais de charge : simule des déclarations concurrentes à l\'ouverture d\'un tournoi'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tournoi',
+            type=int,
+            help='ID du tournoi ciblé (doit accepter les déclarations)',
+        )
+        parser.add_argument(
+            '--preparer',
+            action='store_true',
+            help='Crée (ou réutilise) un tournoi et des clubs dédiés au test de charge',
+        )
+        parser.add_argument(
+            '--nettoyer',
+            action='store_true',
+            help='Supprime les déclarations créées par le test à la fin',
+        )
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=20,
+            help='Nombre de clients déclarants simultanés (défaut : 20)',
+        )
+        parser.add_argument(
+            '--lecteurs',
+            type=int,
+            default=5,
+            help='Nombre de clients qui consultent /consultation/ en boucle (défaut : 5)',
+        )
+        parser.add_argument(
+            '--delai',
+            type=float,
+            default=3.2,
+            help='Attente entre le GET et le POST, en secondes (anti-robot : > 3 s, défaut : 3.2)',
+        )
+        parser.add_argument(
+            '--etalement',
+            type=float,
+            default=1.0,
+            help='Fenêtre (s) sur laquelle les arrivées des déclarants sont réparties (défaut : 1)',
+        )
+        parser.add_argument(
+            '--equipes-max',
+            type=int,
+            default=4,
+            help='Nombre maximum d\'équipes par déclaration (tiré au hasard, défaut : 4)',
+        )
+        parser.add_argument(
+            '--hote',
+            default='localhost',
+            help='En-tête Host des requêtes (doit figurer dans ALLOWED_HOSTS, défaut : localhost)',
+        )
+        parser.add_argument(
+            '--json',
+            dest='fichier_json',
+            help='Écrit aussi le rapport complet dans ce fichier JSON',
+        )
+        parser.add_argument(
+            '--graine',
+            type=int,
+            default=None,
+            help='Graine aléatoire pour rejouer exactement le même scénario',
+        )
+
+    # ═══════════════════════════════════════════════════
+    # 🎬 ORCHESTRATION
+    # ═══════════════════════════════════════════════════
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1:
+            raise CommandError("Il faut au moins un client déclarant.")
+
+        random.seed(options['graine'])
+
+        tournoi = self.get_tournoi(options)
+        clubs = self.get_clubs(options['clients'], options['preparer'])
+        poules = tournoi.poules_disponibles or []
+
+        self.stdout.write(self.style.HTTP_INFO(
+            f"🏋️ Charge sur « {tournoi} » : {options['clients']} déclarant(s), "
+            f"{options['lecteurs']} lecteur(s), base {connection.vendor}"
+        ))
+
+        ids_avant = set(
+            Declaration.objects.filter(tournoi=tournoi).values_list('pk', flat=True)
+        )
+        mysql_avant = self.statut_verrous_mysql()
+
+        collecteur = Collecteur()
+        fin_ecritures = threading.Event()
+
+        lecteurs = [
+            threading.Thread(
+                target=self.executer_lecteur,
+                args=(i, options, collecteur, fin_ecritures),
+                daemon=True,
+            )
+            for i in range(options['lecteurs'])
+        ]
+        declarants = [
+            threading.Thread(
+                target=self.executer_declarant,
+                args=(i, options, collecteur, tournoi, clubs[i % len(clubs)], poules),
+            )
+            for i in range(options['clients'])
+        ]
+
+        debut = time.perf_counter()
+        for thread in lecteurs + declarants:
+            thread.start()
+        for thread in declarants:
+            thread.join()
+        fin_ecritures.set()
+        for thread in lecteurs:
+            thread.join()
+        duree_totale = time.perf_counter() - debut
+
+        mysql_apres = self.statut_verrous_mysql()
+        nb_crees = Declaration.objects.filter(tournoi=tournoi).exclude(pk__in=ids_avant).count()
+
+        rapport = self.construire_rapport(
+            collecteur, duree_totale, nb_crees, mysql_avant, mysql_apres, options
+        )
+        self.afficher_rapport(rapport)
+
+        if options['fichier_json']:
+            with open(options['fichier_json'], 'w', encoding='utf-8') as fichier:
+                json.dump(rapport, fichier, ensure_ascii=False, indent=2)
+            self.stdout.write(f"💾 Rapport écrit dans {options['fichier_json']}")
+
+        if options['nettoyer']:
+            nb, _ = Declaration.objects.filter(tournoi=tournoi).exclude(pk__in=ids_avant).delete()
+            self.stdout.write(self.style.WARNING(f"🧹 {nb} objet(s) de test supprimé(s)"))
+
+    def get_tournoi(self, options):
+        """Tournoi ciblé : soit fourni, soit créé pour l'occasion"""
+        if options['tournoi']:
+            try:
+                tournoi = Tournoi.objects.get(pk=options['tournoi'])
+            except Tournoi.DoesNotExist:
+                raise CommandError(f"Tournoi {options['tournoi']} introuvable.")
+        elif options['preparer']:
+            tournoi, created = Tournoi.objects.get_or_create(
+                titre=TITRE_TOURNOI_CHARGE,
+                defaults={
+                    'date': timezone.now().date() + timedelta(days=365),
+                    'categorie_age': CategorieAge.M18,
+                    'sexe': Sexe.MIXTE,
+                    'statut': StatutTournoi.PLANIFIE,
+                    'est_publie': True,
+                    'poules_disponibles': ['HAUTE', 'BASSE'],
+                },
+            )
+            if created:
+                self.stdout.write(self.style.SUCCESS(f"✅ Tournoi de charge créé : {tournoi}"))
+        else:
+            raise CommandError("Précisez --tournoi ID ou --preparer.")
+
+        if not tournoi.peut_recevoir_declarations():
+            raise CommandError(f"Le tournoi « {tournoi} » n'accepte pas de déclarations.")
+
+        return tournoi
+
+    def get_clubs(self, nb_clients, preparer):
+        """Un club par client (réutilisés en boucle s'il en manque)"""
+        if preparer:
+            return [
+                Club.objects.get_or_create(nom=f"{PREFIXE_CLUB_CHARGE} {i:03d}")[0]
+                for i in range(1, nb_clients + 1)
+            ]
+
+        clubs = list(Club.objects.order_by('pk')[:nb_clients])
+        if not clubs:
+            raise CommandError("Aucun club en base : utilisez --preparer.")
+        return clubs
+
+    # ═══════════════════════════════════════════════════
+    # 👥 CLIENTS SIMULÉS
+    # ═══════════════════════════════════════════════════
+
+    def nouveau_client(self, numero, options):
+        """Client HTTP isolé (cookies/session propres, IP distincte)"""
+        return Client(
+            raise_request_exception=False,
+            HTTP_HOST=options['hote'],
+            REMOTE_ADDR=f"10.{numero // 65536 % 256}.{numero // 256 % 256}.{numero % 256}",
+        )
+
+    def chronometrer(self, collecteur, etape, requete):
+        """Exécute une requête et enregistre sa latence et son statut"""
+        debut = time.perf_counter()
+        try:
+            reponse = requete()
+        except OperationalError:
+            collecteur.verrou_en_erreur()
+            collecteur.requete(etape, (time.perf_counter() - debut) * 1000, 'exception')
+            return None
+        collecteur.requete(etape, (time.perf_counter() - debut) * 1000, reponse.status_code)
+        return reponse
+
+    def surveiller_ecritures(self, collecteur):
+        """execute_wrapper : mesure chaque écriture SQL (attente de verrou incluse)"""
+        def wrapper(execute, sql, params, many, context):
+            if sql.lstrip()[:6].upper() not in ('INSERT', 'UPDATE', 'DELETE'):
+                return execute(sql, params, many, context)
+            debut = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            except OperationalError as e:
+                if 'lock' in str(e).lower():
+                    collecteur.verrou_en_erreur()
+                raise
+            finally:
+                collecteur.ecriture((time.perf_counter() - debut) * 1000)
+        return wrapper
+
+    def executer_declarant(self, numero, options, collecteur, tournoi, club, poules):
+        """Parcours complet d'un club : formulaire → attente → envoi"""
+        try:
+            with connection.execute_wrapper(self.surveiller_ecritures(collecteur)):
+                time.sleep(random.uniform(0, options['etalement']))
+                client = self.nouveau_client(numero, options)
+                url = reverse('declaration')
+
+                if self.chronometrer(collecteur, 'GET formulaire', lambda: client.get(url)) is None:
+                    collecteur.issue('erreur')
+                    return
+
+                time.sleep(options['delai'])
+
+                nb_equipes = random.randint(1, max(1, options['equipes_max']))
+                donnees = {
+                    'tournoi': tournoi.pk,
+                    'club': club.pk,
+                    'nombre_equipes': nb_equipes,
+                    'declarant': 'Jean Dupont',
+                    'email_club': f"contact{numero}@club-charge.re",
+                    'remarques': '',
+                    'website': '',
+                    # Comme un navigateur : la clé du formulaire affiché
+                    'cle_soumission': str(uuid.uuid4()),
+                }
+                for i in range(1, nb_equipes + 1):
+                    donnees[f'nom_equipe_{i}'] = f"{club.nom} {chr(64 + i)}"
+                    donnees[f'poule_equipe_{i}'] = random.choice(poules) if poules else ''
+
+                reponse = self.chronometrer(
+                    collecteur, 'POST déclaration', lambda: client.post(url, donnees)
+                )
+                collecteur.issue(self.qualifier_envoi(reponse))
+        finally:
+            connection.close()
+
+    def qualifier_envoi(self, reponse):
+        """Classe le résultat d'un POST de déclaration"""
+        if reponse is None or reponse.status_code >= 500:
+            return 'erreur'
+        if reponse.status_code == 302:
+            if reponse['Location'] == reverse('confirmation'):
+                return 'acceptée'
+            return 'rejetée (anti-spam / session)'
+        return 'formulaire invalide'
+
+    def executer_lecteur(self, numero, options, collecteur, fin_ecritures):
+        """Lecteur : consulte les déclarations jusqu'à la fin des écritures"""
+        try:
+            client = self.nouveau_client(10000 + numero, options)
+            url = reverse('consultation')
+            while not fin_ecritures.is_set():
+                self.chronometrer(collecteur, 'GET consultation', lambda: client.get(url))
+        finally:
+            connection.close()
+
+    # ═══════════════════════════════════════════════════
+    # 📊 RAPPORT
+    # ═══════════════════════════════════════════════════
+
+    def statut_verrous_mysql(self):
+        """Compteurs InnoDB d'attente de verrous (MySQL uniquement)"""
+        if connection.vendor != 'mysql':
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Innodb_row_lock%%'")
+            return {nom: int(valeur) for nom, valeur in cursor.fetchall()}
+
+    def construire_rapport(self, collecteur, duree_totale, nb_crees, mysql_avant, mysql_apres, options):
+        nb_requetes = sum(len(v) for v in collecteur.latences.values())
+        etapes = {}
+        for etape, latences in collecteur.latences.items():
+            statuts = collecteur.statuts[etape]
+            nb_erreurs = sum(
+                nb for statut, nb in statuts.items()
+                if statut == 'exception' or statut >= 500
+            )
+            etapes[etape] = {
+                'latences_ms': resume_latences(latences),
+                'statuts': {str(k): v for k, v in statuts.items()},
+                'taux_erreur': round(nb_erreurs / len(latences), 4) if latences else 0,
+                'debit_req_s': round(len(latences) / duree_totale, 2) if duree_totale else 0,
+            }
+
+        return {
+            'base': connection.vendor,
+            'clients': options['clients'],
+            'lecteurs': options['lecteurs'],
+            'delai_s': options['delai'],
+            'duree_s': round(duree_totale, 2),
+            'requetes': nb_requetes,
+            'debit_req_s': round(nb_requetes / duree_totale, 2) if duree_totale else 0,
+            'etapes': etapes,
+            'envois': dict(collecteur.issues),
+            'declarations_creees': nb_crees,
+            'ecritures_sql_ms': resume_latences(collecteur.ecritures_sql),
+            'erreurs_verrou': collecteur.erreurs_verrou,
+            'mysql_verrous': {
+                nom: mysql_apres[nom] - mysql_avant.get(nom, 0) for nom in mysql_apres
+            },
+        }
+
+    def afficher_rapport(self, rapport):
+        self.stdout.write('')
+        self.stdout.write(self.style.HTTP_INFO('📊 Résultats'))
+        self.stdout.write(
+            f"  Durée : {rapport['duree_s']} s — {rapport['requetes']} requêtes "
+            f"— {rapport['debit_req_s']} req/s"
+        )
+
+        for etape, stats in rapport['etapes'].items():
+            lat = stats['latences_ms']
+            self.stdout.write(
+                f"  {etape:<18} n={lat['nb']:<5} p50={lat['p50']:>8} ms  "
+                f"p95={lat['p95']:>8} ms  p99={lat['p99']:>8} ms  max={lat['max']:>8} ms  "
+                f"erreurs={stats['taux_erreur']:.1%}  ({stats['debit_req_s']} req/s)"
+            )
+
+        self.stdout.write('')
+        self.stdout.write(self.style.HTTP_INFO('📝 Issues des envois'))
+        for issue, nb in sorted(rapport['envois'].items()):
+            self.stdout.write(f"  {issue:<32} {nb}")
+        self.stdout.write(f"  Déclarations réellement créées : {rapport['declarations_creees']}")
+
+        ecritures = rapport['ecritures_sql_ms']
+        self.stdout.write('')
+        self.stdout.write(self.style.HTTP_INFO('🔒 Écritures SQL / verrous'))
+        self.stdout.write(
+            f"  {ecritures['nb']} écriture(s) — p50={ecritures['p50']} ms "
+            f"p99={ecritures['p99']} ms max={ecritures['max']} ms"
+        )
+        self.stdout.write(f"  Erreurs de verrou : {rapport['erreurs_verrou']}")
+        for nom, delta in rapport['mysql_verrous'].items():
+            self.stdout.write(f"  {nom} : +{delta}")
+
+        if rapport['erreurs_verrou'] or any(
+            stats['taux_erreur'] for stats in rapport['etapes'].values()
+        ):
+            self.stdout.write(self.style.WARNING('⚠️  Des erreurs ont été observées pendant la charge'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Aucune erreur serveur'))
+
+        if not settings.DEBUG and connection.vendor == 'mysql':
+            self.stdout.write(self.style.WARNING(
+                '⚠️  DEBUG=False sur MySQL : vérifiez que ce n\'est PAS la base de production'
+            ))
@@ -0,0 +1,66 @@
+# saisie_equipes/management/commands/doublons_clubs.py
+"""
+═══════════════════════════════════════════════════
+🔀 DOUBLONS DE CLUBS
+═══════════════════════════════════════════════════
+
+Liste les clubs probablement en double (voir saisie_equipes/doublons.py),
+ou fusionne des clubs dans un club conservé.
+
+Exemples :
+    python manage.py doublons_clubs
+    python manage.py doublons_clubs --seuil 0.5
+    python manage.py doublons_clubs --fusionner 12 47 83   # 47 et 83 → 12
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from saisie_equipes.doublons import SEUIL_DOUBLON, ErreurFusion, fusionner_clubs, trouver_doublons
+
+
+class Command(BaseCommand):
+    help = 'Liste les clubs probablement en double, ou les fusionne'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seuil',
+            type=float,
+            default=SEUIL_DOUBLON,
+            help=f'Similarité minimale des noms, entre 0 et 1 (défaut : {SEUIL_DOUBLON})',
+        )
+        parser.add_argument(
+            '--fusionner',
+            type=int,
+            nargs='+',
+            metavar='ID',
+            help='Club conservé puis doublons à fusionner dedans',
+        )
+
+    def handle(self, *args, **options):
+        if options['fusionner']:
+            cible, *doublons = options['fusionner']
+            try:
+                resultat = fusionner_clubs(cible, doublons)
+            except ErreurFusion as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {resultat['clubs']} club(s) fusionné(s) dans #{cible} : "
+                f"{resultat['declarations']} déclaration(s), {resultat['candidatures']} candidature(s), "
+                f"{resultat['tournois']} tournoi(s)"
+            ))
+            return
+
+        groupes = trouver_doublons(options['seuil'])
+        for groupe in groupes:
+            self.stdout.write(f"\n🔀 Similarité {groupe['similarite']:.2f}")
+            for club in groupe['clubs']:
+                self.stdout.write(
+                    f"   #{club.pk:<6} {club.nom}  "
+                    f"({club.nb_declarations} décl., {club.nb_candidatures} cand., {club.nb_tournois} tournois)"
+                )
+
+        if groupes:
+            self.stdout.write(
+                "\nFusion : python manage.py doublons_clubs --fusionner <conservé> <doublon> [...]"
+            )
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(groupes)} groupe(s) de doublons probables"))
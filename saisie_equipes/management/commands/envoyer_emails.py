@@ -0,0 +1,78 @@
+# saisie_equipes/management/commands/envoyer_emails.py
+"""
+═══════════════════════════════════════════════════
+📧 ENVOI DE LA FILE D'EMAILS
+═══════════════════════════════════════════════════
+
+Vide la file EmailOutbox par lots, sur une seule connexion SMTP
+réutilisée, sans dépasser EMAILS_PAR_MINUTE.
+
+Exemples :
+    python manage.py envoyer_emails                 # vide la file puis s'arrête
+    python manage.py envoyer_emails --boucle        # tâche permanente (PythonAnywhere)
+    python manage.py envoyer_emails --par-minute 10 --lot 20
+
+En local, EMAIL_BACKEND console affiche les emails ; pour un vrai
+échange SMTP : python -m aiosmtpd -n -l localhost:1025 et
+EMAIL_BACKEND smtp avec EMAIL_HOST=localhost, EMAIL_PORT=1025.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from saisie_equipes.emails import Expediteur, reserver_lot, get_taille_lot
+
+
+class Command(BaseCommand):
+    help = 'Envoie les emails en attente dans la file (EmailOutbox)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lot',
+            type=int,
+            default=None,
+            help='Nombre d\'emails réservés à la fois (défaut : EMAILS_TAILLE_LOT)',
+        )
+        parser.add_argument(
+            '--par-minute',
+            type=int,
+            default=None,
+            help='Débit maximum (défaut : EMAILS_PAR_MINUTE, 0 = illimité)',
+        )
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help='Ne s\'arrête pas quand la file est vide : attend de nouveaux emails',
+        )
+        parser.add_argument(
+            '--intervalle',
+            type=float,
+            default=10,
+            help='Attente (secondes) entre deux consultations de la file vide (défaut : 10)',
+        )
+
+    def handle(self, *args, **options):
+        taille = options['lot'] or get_taille_lot()
+
+        with Expediteur(par_minute=options['par_minute']) as expediteur:
+            while True:
+                lot = reserver_lot(taille)
+                if lot:
+                    expediteur.envoyer_lot(lot)
+                    continue
+
+                if not options['boucle']:
+                    break
+
+                # File vide : ne pas garder une connexion SMTP inactive
+                expediteur.fermer()
+                # Hors requête HTTP, CONN_MAX_AGE n'est appliqué que par cet appel
+                close_old_connections()
+                time.sleep(options['intervalle'])
+
+        style = self.style.SUCCESS if not expediteur.echecs else self.style.WARNING
+        self.stdout.write(style(
+            f"📧 {expediteur.envoyes} email(s) envoyé(s), {expediteur.echecs} échec(s)"
+        ))
@@ -0,0 +1,90 @@
+# saisie_equipes/management/commands/planificateur.py
+"""
+═══════════════════════════════════════════════════
+⏰ PLANIFICATEUR DE TÂCHES PÉRIODIQUES
+═══════════════════════════════════════════════════
+
+Exécute les tâches de maintenance dues (voir maintenance.py).
+Plusieurs planificateurs peuvent tourner : chaque tâche n'est
+exécutée que par celui qui obtient son bail.
+
+Exemples :
+    python manage.py planificateur               # tâches dues, puis s'arrête (tâche planifiée)
+    python manage.py planificateur --boucle      # tâche permanente (PythonAnywhere)
+    python manage.py planificateur --liste
+    python manage.py planificateur --forcer purger_sessions
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from saisie_equipes.models import VerrouTache
+from saisie_equipes.planificateur import TACHES_PERIODIQUES, creer_verrous, executer_taches_dues, get_proprietaire
+
+
+class Command(BaseCommand):
+    help = 'Exécute les tâches périodiques dues (terminer les tournois, purger les sessions...)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help='Tourne en permanence en vérifiant les tâches dues',
+        )
+        parser.add_argument(
+            '--intervalle',
+            type=float,
+            default=60,
+            help='Attente (secondes) entre deux vérifications en mode boucle (défaut : 60)',
+        )
+        parser.add_argument(
+            '--liste',
+            action='store_true',
+            help='Affiche les tâches et leur dernière exécution, sans rien exécuter',
+        )
+        parser.add_argument(
+            '--forcer',
+            nargs='+',
+            metavar='TACHE',
+            help='Exécute ces tâches maintenant, même si elles ne sont pas dues',
+        )
+
+    def handle(self, *args, **options):
+        if options['liste']:
+            self.afficher_liste()
+            return
+
+        noms = options['forcer']
+        if noms:
+            inconnues = set(noms) - set(TACHES_PERIODIQUES)
+            if inconnues:
+                raise CommandError(f"Tâche(s) inconnue(s) : {', '.join(sorted(inconnues))}")
+
+        proprietaire = get_proprietaire()
+        while True:
+            for nom, resume in executer_taches_dues(proprietaire, noms=noms, forcer=bool(noms)):
+                self.stdout.write(f"⏰ {nom} : {resume}")
+
+            if not options['boucle']:
+                break
+            # Hors requête HTTP, CONN_MAX_AGE n'est appliqué que par cet appel
+            close_old_connections()
+            time.sleep(options['intervalle'])
+
+    def afficher_liste(self):
+        creer_verrous()
+        verrous = VerrouTache.objects.in_bulk(list(TACHES_PERIODIQUES))
+
+        for nom, tache in TACHES_PERIODIQUES.items():
+            verrou = verrous[nom]
+            self.stdout.write(self.style.HTTP_INFO(f"⏰ {nom} (toutes les {tache.intervalle})"))
+            self.stdout.write(f"   {tache.description}")
+            if verrou.derniere_execution:
+                self.stdout.write(
+                    f"   dernière : {timezone.localtime(verrou.derniere_execution):%d/%m/%Y %H:%M} "
+                    f"({verrou.derniere_duree} s) → {verrou.dernier_resultat}"
+                )
+            self.stdout.write(f"   prochaine : {timezone.localtime(verrou.prochaine_execution):%d/%m/%Y %H:%M}")
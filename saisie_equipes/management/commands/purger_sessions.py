@@ -0,0 +1,79 @@
+# saisie_equipes/management/commands/purger_sessions.py
+"""
+═══════════════════════════════════════════════════
+🍪 PURGE DES SESSIONS EXPIRÉES PAR LOTS
+═══════════════════════════════════════════════════
+
+Remplace clearsessions (un seul grand DELETE qui verrouille
+django_session sur MySQL) : suppression par plages de clés,
+avec une pause entre les lots. Voir saisie_equipes/sessions.py.
+
+Exemples :
+    python manage.py purger_sessions
+    python manage.py purger_sessions --lot 500 --pause 0.2
+    python manage.py purger_sessions --stats       # n'efface rien
+"""
+
+from django.core.management.base import BaseCommand
+
+from saisie_equipes.sessions import (
+    PAUSE_PURGE, TAILLE_LOT_PURGE, purger_sessions_expirees, sessions_en_base, statistiques_sessions,
+)
+
+
+class Command(BaseCommand):
+    help = 'Supprime les sessions expirées par lots, sans verrouiller la table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lot',
+            type=int,
+            default=TAILLE_LOT_PURGE,
+            help=f'Sessions supprimées par requête (défaut : {TAILLE_LOT_PURGE})',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=PAUSE_PURGE,
+            help=f'Attente entre deux lots, en secondes (défaut : {PAUSE_PURGE})',
+        )
+        parser.add_argument(
+            '--max-lots',
+            type=int,
+            default=None,
+            help='Arrêt après ce nombre de lots (défaut : jusqu\'au bout)',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Affiche seulement l\'état de la table',
+        )
+
+    def handle(self, *args, **options):
+        if not sessions_en_base():
+            self.stdout.write("ℹ️  Le moteur de session n'utilise pas la base : rien à purger.")
+            return
+
+        self.afficher_stats("avant" if not options['stats'] else "état")
+        if options['stats']:
+            return
+
+        resultat = purger_sessions_expirees(
+            taille_lot=options['lot'],
+            pause=options['pause'],
+            max_lots=options['max_lots'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"🧹 {resultat['supprimees']} session(s) supprimée(s) en {resultat['lots']} lot(s)"
+        ))
+        self.afficher_stats("après")
+
+    def afficher_stats(self, moment):
+        stats = statistiques_sessions()
+        taille = (
+            f"{stats['taille_octets'] / 1024 / 1024:.1f} Mo"
+            if stats['taille_octets'] is not None else "taille inconnue"
+        )
+        self.stdout.write(
+            f"📊 Sessions ({moment}) : {stats['total']} dont {stats['expirees']} expirée(s) — {taille}"
+        )
@@ -0,0 +1,29 @@
+# saisie_equipes/management/commands/reindexer_recherche.py
+"""
+═══════════════════════════════════════════════════
+🔎 RECONSTRUCTION DE L'INDEX DE RECHERCHE
+═══════════════════════════════════════════════════
+
+Recalcule les documents de recherche de tous les tournois, candidatures
+et déclarations (voir recherche.py). La migration 0031 les remplit au
+déploiement ; à lancer après des écritures en masse (bulk_create, update).
+
+Exemple :
+    python manage.py reindexer_recherche
+"""
+
+from django.core.management.base import BaseCommand
+
+from saisie_equipes.models import TypeDocument
+from saisie_equipes.recherche import reindexer_tout
+
+
+class Command(BaseCommand):
+    help = "Reconstruit les documents de la recherche plein texte (staff)"
+
+    def handle(self, *args, **options):
+        def progression(type_objet, nb):
+            self.stdout.write(f"🔎 {TypeDocument(type_objet).label} : {nb} document(s)")
+
+        reindexer_tout(progression)
+        self.stdout.write(self.style.SUCCESS("✅ Index de recherche reconstruit"))
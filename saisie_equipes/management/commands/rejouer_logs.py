@@ -0,0 +1,290 @@
+# saisie_equipes/management/commands/rejouer_logs.py
+"""
+═══════════════════════════════════════════════════
+🔁 REJEU D'UN LOG D'ACCÈS PYTHONANYWHERE
+═══════════════════════════════════════════════════
+
+Rejoue le trafic GET d'un log d'accès (format "combined" de PythonAnywhere)
+contre l'application locale, à travers toute la pile Django, pour évaluer
+l'effet d'un changement (cache, requêtes SQL...) sur un vrai mélange de
+trafic : accueil, consultation, archives, staff...
+
+Produit par route :
+- histogramme et percentiles de latence
+- codes de réponse
+- taux de succès du cache (lectures get/get_many sur le cache par défaut)
+
+Exemples :
+    python manage.py rejouer_logs gkoprod.pythonanywhere.com.access.log
+    python manage.py rejouer_logs samedi.log --acceleration 20 --utilisateur staff
+"""
+
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import resolve, Resolver404
+
+from saisie_equipes.mesures import Histogramme, CompteurCache, resume_latences
+
+
+# 1.2.3.4 - - [19/Oct/2026:08:15:02 +0000] "GET /consultation/ HTTP/1.1" 200 5123 "ref" "UA" ...
+LIGNE_LOG = re.compile(
+    r'^(?P<ip>\S+) \S+ \S+ \[(?P<date>[^\]]+)\] '
+    r'"(?P<methode>[A-Z]+) (?P<chemin>\S+) [^"]*" (?P<statut>\d{3}) '
+)
+FORMAT_DATE_LOG = '%d/%b/%Y:%H:%M:%S %z'
+
+PREFIXES_STATIQUES = ('/static/', '/media/', '/favicon.ico', '/robots.txt')
+
+# Seules ces routes sont rejouées connecté (--utilisateur) ; le trafic public reste anonyme
+PREFIXES_STAFF = ('/staff/', '/admin/')
+
+# Au-delà, les clients les plus anciens sont oubliés (un client = une IP)
+MAX_CLIENTS = 500
+
+
+class Command(BaseCommand):
+    help = 'Rejoue le trafic GET d\'un log d\'accès PythonAnywhere contre l\'application locale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fichier',
+            help='Fichier de log d\'accès (format combined)',
+        )
+        parser.add_argument(
+            '--acceleration',
+            type=float,
+            default=0,
+            help='Compression du temps : 1 = temps réel, 10 = 10x plus vite, '
+                 '0 = enchaîner sans attendre (défaut : 0)',
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=0,
+            help='Nombre maximum de requêtes rejouées (0 = toutes)',
+        )
+        parser.add_argument(
+            '--utilisateur',
+            help='Nom d\'un compte staff utilisé pour rejouer /staff/ et /admin/ '
+                 '(sinon ces requêtes sont ignorées)',
+        )
+        parser.add_argument(
+            '--avec-statiques',
+            action='store_true',
+            help='Rejoue aussi /static/ et /media/ (ignorés par défaut)',
+        )
+        parser.add_argument(
+            '--hote',
+            default='localhost',
+            help='En-tête Host des requêtes (doit figurer dans ALLOWED_HOSTS, défaut : localhost)',
+        )
+        parser.add_argument(
+            '--json',
+            dest='fichier_json',
+            help='Écrit aussi le rapport complet dans ce fichier JSON',
+        )
+
+    # ═══════════════════════════════════════════════════
+    # 📖 LECTURE DU LOG
+    # ═══════════════════════════════════════════════════
+
+    def lire_requetes(self, fichier, options):
+        """Retourne [(datetime, ip, chemin)] des GET à rejouer, triés par date"""
+        requetes = []
+        ignorees = defaultdict(int)
+
+        try:
+            with open(fichier, encoding='utf-8', errors='replace') as f:
+                for ligne in f:
+                    correspondance = LIGNE_LOG.match(ligne)
+                    if not correspondance:
+                        ignorees['illisibles'] += 1
+                        continue
+
+                    if correspondance['methode'] != 'GET':
+                        ignorees['non GET'] += 1
+                        continue
+
+                    chemin = correspondance['chemin']
+                    if not options['avec_statiques'] and chemin.startswith(PREFIXES_STATIQUES):
+                        ignorees['statiques'] += 1
+                        continue
+
+                    if not options['utilisateur'] and chemin.startswith(PREFIXES_STAFF):
+                        ignorees['staff (sans --utilisateur)'] += 1
+                        continue
+
+                    try:
+                        date = datetime.strptime(correspondance['date'], FORMAT_DATE_LOG)
+                    except ValueError:
+                        ignorees['illisibles'] += 1
+                        continue
+
+                    requetes.append((date, correspondance['ip'], chemin))
+        except OSError as e:
+            raise CommandError(f"Impossible de lire {fichier} : {e}")
+
+        requetes.sort(key=lambda r: r[0])
+        if options['limite']:
+            requetes = requetes[:options['limite']]
+
+        return requetes, dict(ignorees)
+
+    def nom_route(self, chemin):
+        """Regroupe les URL par route Django (ex: staff:tournoi_edit)"""
+        try:
+            match = resolve(chemin.split('?', 1)[0])
+        except Resolver404:
+            return '(non résolue)'
+        return match.view_name or match.route
+
+    # ═══════════════════════════════════════════════════
+    # ▶️ REJEU
+    # ═══════════════════════════════════════════════════
+
+    def handle(self, *args, **options):
+        requetes, ignorees = self.lire_requetes(options['fichier'], options)
+        if not requetes:
+            raise CommandError("Aucune requête GET à rejouer dans ce fichier.")
+
+        utilisateur = None
+        if options['utilisateur']:
+            try:
+                utilisateur = get_user_model().objects.get(username=options['utilisateur'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Utilisateur « {options['utilisateur']} » introuvable.")
+
+        debut_log = requetes[0][0]
+        duree_log = (requetes[-1][0] - debut_log).total_seconds()
+        self.stdout.write(self.style.HTTP_INFO(
+            f"🔁 {len(requetes)} requêtes sur {duree_log / 60:.1f} min de log "
+            f"(accélération : {options['acceleration'] or 'aucune attente'})"
+        ))
+
+        clients = {}
+        routes = defaultdict(lambda: {
+            'latences': [],
+            'histogramme': Histogramme(),
+            'statuts': defaultdict(int),
+            'cache_succes': 0,
+            'cache_echecs': 0,
+        })
+        retard_max = 0.0
+
+        debut = time.perf_counter()
+        with CompteurCache() as compteur:
+            for date, ip, chemin in requetes:
+                if options['acceleration']:
+                    cible = (date - debut_log).total_seconds() / options['acceleration']
+                    attente = cible - (time.perf_counter() - debut)
+                    if attente > 0:
+                        time.sleep(attente)
+                    else:
+                        retard_max = max(retard_max, -attente)
+
+                staff = chemin.startswith(PREFIXES_STAFF)
+                client = self.get_client(clients, ip, utilisateur if staff else None, options['hote'])
+                compteur.reinitialiser()
+
+                t0 = time.perf_counter()
+                reponse = client.get(chemin)
+                duree_ms = (time.perf_counter() - t0) * 1000
+
+                stats = routes[self.nom_route(chemin)]
+                stats['latences'].append(duree_ms)
+                stats['histogramme'].ajouter(duree_ms)
+                stats['statuts'][reponse.status_code] += 1
+                stats['cache_succes'] += compteur.succes
+                stats['cache_echecs'] += compteur.echecs
+        duree_totale = time.perf_counter() - debut
+
+        rapport = self.construire_rapport(routes, requetes, ignorees, duree_log, duree_totale, retard_max)
+        self.afficher_rapport(rapport, routes)
+
+        if options['fichier_json']:
+            with open(options['fichier_json'], 'w', encoding='utf-8') as f:
+                json.dump(rapport, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"💾 Rapport écrit dans {options['fichier_json']}")
+
+    def get_client(self, clients, ip, utilisateur, hote):
+        """
+        Un client (donc une session) par IP du log, comme un vrai visiteur
+
+        Les pages staff d'une IP passent par un second client, seul connecté :
+        le trafic public reste rejoué en anonyme (mêmes chemins de code,
+        mêmes requêtes de session qu'en production).
+        """
+        cle = (ip, utilisateur is not None)
+        client = clients.pop(cle, None)
+        if client is None:
+            client = Client(raise_request_exception=False, HTTP_HOST=hote, REMOTE_ADDR=ip)
+            if utilisateur:
+                client.force_login(utilisateur)
+            if len(clients) >= MAX_CLIENTS:
+                clients.pop(next(iter(clients)))
+        # Réinsertion en fin de dict = ordre LRU
+        clients[cle] = client
+        return client
+
+    # ═══════════════════════════════════════════════════
+    # 📊 RAPPORT
+    # ═══════════════════════════════════════════════════
+
+    def construire_rapport(self, routes, requetes, ignorees, duree_log, duree_totale, retard_max):
+        rapport_routes = {}
+        for nom, stats in sorted(routes.items(), key=lambda r: -len(r[1]['latences'])):
+            lectures = stats['cache_succes'] + stats['cache_echecs']
+            rapport_routes[nom] = {
+                'latences_ms': resume_latences(stats['latences']),
+                'histogramme': stats['histogramme'].as_dict(),
+                'statuts': {str(k): v for k, v in stats['statuts'].items()},
+                'cache_lectures': lectures,
+                'cache_taux_succes': round(stats['cache_succes'] / lectures, 4) if lectures else None,
+            }
+
+        return {
+            'requetes': len(requetes),
+            'ignorees': ignorees,
+            'duree_log_s': round(duree_log, 1),
+            'duree_rejeu_s': round(duree_totale, 2),
+            'debit_req_s': round(len(requetes) / duree_totale, 2) if duree_totale else 0,
+            'retard_max_s': round(retard_max, 3),
+            'routes': rapport_routes,
+        }
+
+    def afficher_rapport(self, rapport, routes):
+        self.stdout.write('')
+        for nom, stats in rapport['routes'].items():
+            lat = stats['latences_ms']
+            taux = stats['cache_taux_succes']
+            cache = f"{taux:.0%} ({stats['cache_lectures']} lectures)" if taux is not None else "—"
+            statuts = ', '.join(f"{k}×{v}" for k, v in sorted(stats['statuts'].items()))
+
+            self.stdout.write(self.style.HTTP_INFO(f"📍 {nom}"))
+            self.stdout.write(
+                f"   n={lat['nb']}  p50={lat['p50']} ms  p95={lat['p95']} ms  "
+                f"p99={lat['p99']} ms  max={lat['max']} ms"
+            )
+            self.stdout.write(f"   statuts : {statuts}  —  cache : {cache}")
+            for ligne in routes[nom]['histogramme'].lignes(largeur=30):
+                self.stdout.write(f"   {ligne}")
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"⏱️  {rapport['requetes']} requêtes rejouées en {rapport['duree_rejeu_s']} s "
+            f"({rapport['debit_req_s']} req/s) pour {rapport['duree_log_s']} s de log"
+        )
+        if rapport['retard_max_s']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️  Retard max sur le planning : {rapport['retard_max_s']} s "
+                f"(l'application ne suit pas l'accélération demandée)"
+            ))
+        for raison, nb in rapport['ignorees'].items():
+            self.stdout.write(f"   ignorées ({raison}) : {nb}")
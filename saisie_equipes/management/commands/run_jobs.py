@@ -0,0 +1,114 @@
+# saisie_equipes/management/commands/run_jobs.py
+"""
+═══════════════════════════════════════════════════
+⚙️ EXÉCUTION DES TRAVAUX EN ARRIÈRE-PLAN
+═══════════════════════════════════════════════════
+
+Exécute les jobs demandés par le staff (exports, imports...).
+
+Exemples :
+    python manage.py run_jobs                   # vide la file puis s'arrête
+    python manage.py run_jobs --boucle          # tâche permanente (PythonAnywhere)
+    python manage.py run_jobs --boucle --processus 2
+
+--processus N : les types de jobs marqués cpu=True tournent dans un pool
+de N processus (plusieurs cœurs), les autres dans le processus principal.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from saisie_equipes.jobs import TYPES_JOBS, executer_job, initialiser_processus, reserver_job
+from saisie_equipes.models import StatutJob
+
+
+class Command(BaseCommand):
+    help = 'Exécute les travaux en arrière-plan en attente (Job)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help='Ne s\'arrête pas quand la file est vide : attend de nouveaux jobs',
+        )
+        parser.add_argument(
+            '--intervalle',
+            type=float,
+            default=5,
+            help='Attente (secondes) entre deux consultations de la file vide (défaut : 5)',
+        )
+        parser.add_argument(
+            '--processus',
+            type=int,
+            default=0,
+            help='Taille du pool de processus pour les jobs cpu=True (défaut : 0 = pas de pool)',
+        )
+
+    def handle(self, *args, **options):
+        self.termines = 0
+        self.echecs = 0
+
+        pool = None
+        if options['processus'] > 0:
+            pool = ProcessPoolExecutor(
+                max_workers=options['processus'],
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=initialiser_processus,
+            )
+        en_cours = set()
+
+        try:
+            while True:
+                self.recuperer(en_cours)
+
+                # Pool plein : attendre qu'un processus se libère
+                if pool and len(en_cours) >= options['processus']:
+                    time.sleep(0.2)
+                    continue
+
+                job = reserver_job()
+                if job is None:
+                    if not options['boucle'] and not en_cours:
+                        break
+                    if not en_cours:
+                        # Hors requête HTTP, CONN_MAX_AGE n'est appliqué que par cet appel
+                        close_old_connections()
+                    time.sleep(options['intervalle'] if not en_cours else 0.2)
+                    continue
+
+                type_job = TYPES_JOBS.get(job.type_job)
+                if pool and type_job and type_job.cpu:
+                    self.stdout.write(f"⚙️  Job {job.pk} ({job.type_job}) → pool")
+                    en_cours.add(pool.submit(executer_job, job.pk))
+                else:
+                    self.stdout.write(f"⚙️  Job {job.pk} ({job.type_job})")
+                    self.compter(executer_job(job.pk))
+        finally:
+            if pool:
+                pool.shutdown(wait=True)
+                self.recuperer(en_cours)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {self.termines} job(s) terminé(s), {self.echecs} échec(s)"
+        ))
+
+    def recuperer(self, en_cours):
+        """Comptabilise les jobs du pool qui sont terminés"""
+        for futur in [f for f in en_cours if f.done()]:
+            en_cours.discard(futur)
+            try:
+                self.compter(futur.result())
+            except Exception as e:
+                # Processus tué : le job sera repris à l'expiration de sa réservation
+                self.stderr.write(f"❌ Processus du pool en erreur : {e}")
+                self.echecs += 1
+
+    def compter(self, statut):
+        if statut == StatutJob.TERMINE:
+            self.termines += 1
+        else:
+            self.echecs += 1
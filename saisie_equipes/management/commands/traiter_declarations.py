@@ -0,0 +1,69 @@
+# saisie_equipes/management/commands/traiter_declarations.py
+"""
+═══════════════════════════════════════════════════
+📥 ENREGISTREMENT DES DÉCLARATIONS REÇUES
+═══════════════════════════════════════════════════
+
+Vide la file DeclarationRecue (mode DECLARATIONS_DIFFEREES) par lots :
+une transaction, un bulk_create et une invalidation des synthèses par
+tournoi pour chaque lot (voir reception.py).
+
+Exemples :
+    python manage.py traiter_declarations              # vide la file puis s'arrête
+    python manage.py traiter_declarations --boucle     # tâche permanente pendant le pic
+    python manage.py traiter_declarations --lot 50
+"""
+
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from saisie_equipes.reception import get_taille_lot, reserver_lot, traiter_lot
+
+
+class Command(BaseCommand):
+    help = 'Enregistre les déclarations reçues en mode différé (DeclarationRecue)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lot',
+            type=int,
+            default=None,
+            help='Déclarations enregistrées par transaction (défaut : DECLARATIONS_TAILLE_LOT)',
+        )
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help='Ne s\'arrête pas quand la file est vide : attend de nouvelles déclarations',
+        )
+        parser.add_argument(
+            '--intervalle',
+            type=float,
+            default=2,
+            help='Attente (secondes) entre deux consultations de la file vide (défaut : 2)',
+        )
+
+    def handle(self, *args, **options):
+        taille = options['lot'] or get_taille_lot()
+        total = Counter()
+
+        while True:
+            lot = reserver_lot(taille)
+            if lot:
+                total.update(traiter_lot(lot))
+                continue
+
+            if not options['boucle']:
+                break
+
+            # Hors requête HTTP, CONN_MAX_AGE n'est appliqué que par cet appel
+            close_old_connections()
+            time.sleep(options['intervalle'])
+
+        style = self.style.SUCCESS if not total['echecs'] else self.style.WARNING
+        self.stdout.write(style(
+            f"📥 {total['inscrites']} déclaration(s) inscrite(s), "
+            f"{total['liste_attente']} en liste d'attente, {total['echecs']} échec(s)"
+        ))
@@ -0,0 +1,238 @@
+"""
+═══════════════════════════════════════════════════
+📏 MESURES DE LATENCE - OUTILS STATISTIQUES
+═══════════════════════════════════════════════════
+
+Fonctions partagées par les outils de mesure de performance
+(harnais de charge, benchmarks, rejeu de logs...).
+
+Toutes les durées manipulées ici sont en millisecondes.
+
+incrementer() : compteurs partagés en cache des modules anti-abus
+(anti-spam, connexions, salle d'attente, mode dégradé).
+"""
+
+import math
+from bisect import bisect_left
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import BaseCache
+
+
+# Bornes par défaut des histogrammes (en ms) — la dernière case est "> 5000"
+BORNES_HISTOGRAMME_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def percentile(valeurs_triees, p):
+    """
+    Percentile avec interpolation linéaire
+
+    Args:
+        valeurs_triees: liste de valeurs DÉJÀ triées
+        p: percentile souhaité (0 à 100)
+    """
+    if not valeurs_triees:
+        return 0.0
+
+    rang = (len(valeurs_triees) - 1) * (p / 100)
+    bas = math.floor(rang)
+    haut = math.ceil(rang)
+
+    if bas == haut:
+        return float(valeurs_triees[int(rang)])
+
+    return (
+        valeurs_triees[bas] * (haut - rang) +
+        valeurs_triees[haut] * (rang - bas)
+    )
+
+
+def resume_latences(latences):
+    """
+    Résumé statistique d'une série de latences
+
+    Returns:
+        dict: nb, min, moyenne, p50, p90, p95, p99, max (ms, arrondis à 0.01)
+    """
+    valeurs = sorted(latences)
+    if not valeurs:
+        return {'nb': 0, 'min': 0, 'moyenne': 0, 'p50': 0,
+                'p90': 0, 'p95': 0, 'p99': 0, 'max': 0}
+
+    return {
+        'nb': len(valeurs),
+        'min': round(valeurs[0], 2),
+        'moyenne': round(sum(valeurs) / len(valeurs), 2),
+        'p50': round(percentile(valeurs, 50), 2),
+        'p90': round(percentile(valeurs, 90), 2),
+        'p95': round(percentile(valeurs, 95), 2),
+        'p99': round(percentile(valeurs, 99), 2),
+        'max': round(valeurs[-1], 2),
+    }
+
+
+class Histogramme:
+    """
+    Histogramme à cases fixes (borne supérieure incluse)
+
+    Exemple avec bornes (1, 5) : cases "≤ 1", "≤ 5", "> 5"
+    """
+
+    def __init__(self, bornes=BORNES_HISTOGRAMME_MS):
+        self.bornes = tuple(bornes)
+        self.comptes = [0] * (len(self.bornes) + 1)
+        self.total = 0
+        self.somme = 0.0
+
+    def ajouter(self, valeur):
+        """Range une valeur dans sa case"""
+        self.comptes[bisect_left(self.bornes, valeur)] += 1
+        self.total += 1
+        self.somme += valeur
+
+    def fusionner(self, autre):
+        """Additionne un autre histogramme de mêmes bornes"""
+        if autre.bornes != self.bornes:
+            raise ValueError("Impossible de fusionner des histogrammes de bornes différentes")
+        self.comptes = [a + b for a, b in zip(self.comptes, autre.comptes)]
+        self.total += autre.total
+        self.somme += autre.somme
+
+    def libelles(self):
+        """Libellés lisibles des cases"""
+        libelles = [f"≤ {borne} ms" for borne in self.bornes]
+        libelles.append(f"> {self.bornes[-1]} ms")
+        return libelles
+
+    def as_dict(self):
+        """Représentation sérialisable (JSON / cache)"""
+        return {
+            'bornes': list(self.bornes),
+            'comptes': list(self.comptes),
+            'total': self.total,
+            'somme': round(self.somme, 3),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruit un histogramme depuis as_dict()"""
+        histogramme = cls(data['bornes'])
+        histogramme.comptes = list(data['comptes'])
+        histogramme.total = data['total']
+        histogramme.somme = data['somme']
+        return histogramme
+
+    def lignes(self, largeur=40):
+        """Rendu texte (une ligne par case non vide) pour la console"""
+        maximum = max(self.comptes) if self.total else 0
+        lignes = []
+        for libelle, compte in zip(self.libelles(), self.comptes):
+            if not compte:
+                continue
+            barre = '█' * max(1, round(compte / maximum * largeur))
+            lignes.append(f"{libelle:>12} | {barre} {compte}")
+        return lignes
+
+
+# ═══════════════════════════════════════════════════
+# 🗃️ COMPTAGE DES ACCÈS AU CACHE
+# ═══════════════════════════════════════════════════
+
+_ABSENT = object()
+
+
+class CompteurCache:
+    """
+    Compte les succès / échecs de lecture sur un cache Django
+
+    Remplace temporairement get() et get_many() de l'instance de cache
+    (celle du thread courant) pour observer le taux de succès :
+
+        with CompteurCache() as compteur:
+            client.get('/consultation/')
+        compteur.succes, compteur.echecs
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self.succes = 0
+        self.echecs = 0
+        self._cache = None
+
+    def __enter__(self):
+        self._cache = caches[self.alias]
+        get_original = self._cache.get
+        get_many_original = self._cache.get_many
+
+        # BaseCache.get_many() appelle self.get() : on ne compte qu'une fois
+        dans_get_many = []
+
+        def get(key, default=None, version=None):
+            valeur = get_original(key, _ABSENT, version=version)
+            if dans_get_many:
+                return default if valeur is _ABSENT else valeur
+            if valeur is _ABSENT:
+                self.echecs += 1
+                return default
+            self.succes += 1
+            return valeur
+
+        def get_many(keys, version=None):
+            keys = list(keys)
+            dans_get_many.append(True)
+            try:
+                resultat = get_many_original(keys, version=version)
+            finally:
+                dans_get_many.pop()
+            self.succes += len(resultat)
+            self.echecs += len(keys) - len(resultat)
+            return resultat
+
+        self._cache.get = get
+        self._cache.get_many = get_many
+        return self
+
+    def __exit__(self, *exc_info):
+        # Supprimer les attributs d'instance rétablit les méthodes de classe
+        del self._cache.get
+        del self._cache.get_many
+        self._cache = None
+
+    def reinitialiser(self):
+        """Remet les compteurs à zéro (le cache reste instrumenté)"""
+        self.succes = 0
+        self.echecs = 0
+
+
+# ═══════════════════════════════════════════════════
+# 🔢 COMPTEURS PARTAGÉS (CACHE)
+# ═══════════════════════════════════════════════════
+
+def incrementer(cle, delta=1, timeout=None):
+    """
+    Incrémente un compteur partagé par les workers, avec un délai d'expiration explicite
+
+    BaseCache.incr (caches fichier et base, dont celui de la production)
+    n'est qu'un get + set qui remet le délai par défaut (300 s) : un
+    compteur créé sans expiration disparaissait après 5 minutes sans
+    écriture. Pour ces caches, get + set avec `timeout` ; les caches qui
+    ont leur propre incr (mémoire locale, memcached, redis) l'utilisent :
+    atomique, et le délai posé à la création est conservé.
+
+    Args:
+        timeout: durée de vie en secondes (None : sans expiration)
+
+    Returns:
+        int: nouvelle valeur
+    """
+    if type(caches['default']).incr is BaseCache.incr:
+        valeur = cache.get(cle, 0) + delta
+        cache.set(cle, valeur, timeout)
+        return valeur
+
+    try:
+        return cache.incr(cle, delta)
+    except ValueError:
+        if cache.add(cle, delta, timeout):
+            return delta
+        return cache.incr(cle, delta)
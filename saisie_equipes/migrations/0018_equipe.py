@@ -0,0 +1,35 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0017_alter_tournoi_sexe'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Equipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100, verbose_name="Nom de l'équipe")),
+                ('poule', models.CharField(blank=True, choices=[('HAUTE', 'Poule Haute'), ('BASSE', 'Poule Basse'), ('UNIQUE', 'Poule Unique')], help_text="Vide si le tournoi n'a pas de poules", max_length=10, verbose_name='Poule')),
+                ('ordre', models.PositiveSmallIntegerField(default=0, help_text="Position de l'équipe dans la déclaration (A, B, C...)", verbose_name='Ordre')),
+                ('declaration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equipes', to='saisie_equipes.declaration', verbose_name='Déclaration')),
+                ('tournoi', models.ForeignKey(help_text='Copie de declaration.tournoi (évite une jointure pour les requêtes par poule)', on_delete=django.db.models.deletion.CASCADE, related_name='equipes', to='saisie_equipes.tournoi', verbose_name='Tournoi')),
+            ],
+            options={
+                'verbose_name': 'Équipe',
+                'verbose_name_plural': 'Équipes',
+                'ordering': ['declaration', 'ordre'],
+                'indexes': [models.Index(fields=['tournoi', 'poule'], name='saisie_equi_tournoi_eae3f6_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='equipe',
+            constraint=models.UniqueConstraint(fields=('declaration', 'ordre'), name='equipe_ordre_unique'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+"""
+Migration de données : noms_equipes / poules_equipes (JSON) → table Equipe
+
+Une ligne Equipe par nom d'équipe, dans l'ordre de la liste JSON.
+La migration inverse reconstruit les listes JSON depuis les lignes Equipe.
+"""
+
+from django.db import migrations
+
+TAILLE_LOT = 500
+
+
+def json_vers_equipes(apps, schema_editor):
+    Declaration = apps.get_model('saisie_equipes', 'Declaration')
+    Equipe = apps.get_model('saisie_equipes', 'Equipe')
+
+    lot = []
+    declarations = Declaration.objects.only(
+        'id', 'tournoi_id', 'noms_equipes', 'poules_equipes'
+    ).iterator(chunk_size=TAILLE_LOT)
+
+    for declaration in declarations:
+        poules = declaration.poules_equipes or []
+        for ordre, nom in enumerate(declaration.noms_equipes or []):
+            lot.append(Equipe(
+                declaration_id=declaration.id,
+                tournoi_id=declaration.tournoi_id,
+                nom=nom[:100],
+                poule=(poules[ordre] if ordre < len(poules) else '') or '',
+                ordre=ordre,
+            ))
+
+        if len(lot) >= TAILLE_LOT:
+            Equipe.objects.bulk_create(lot)
+            lot = []
+
+    if lot:
+        Equipe.objects.bulk_create(lot)
+
+
+def equipes_vers_json(apps, schema_editor):
+    Declaration = apps.get_model('saisie_equipes', 'Declaration')
+    Equipe = apps.get_model('saisie_equipes', 'Equipe')
+
+    listes = {}
+    for declaration_id, nom, poule in Equipe.objects.order_by(
+        'declaration_id', 'ordre'
+    ).values_list('declaration_id', 'nom', 'poule').iterator(chunk_size=TAILLE_LOT):
+        noms, poules = listes.setdefault(declaration_id, ([], []))
+        noms.append(nom)
+        poules.append(poule)
+
+    for declaration_id, (noms, poules) in listes.items():
+        Declaration.objects.filter(pk=declaration_id).update(
+            noms_equipes=noms, poules_equipes=poules
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0018_equipe'),
+    ]
+
+    operations = [
+        migrations.RunPython(json_vers_equipes, equipes_vers_json),
+    ]
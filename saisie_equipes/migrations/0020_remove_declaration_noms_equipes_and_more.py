@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0019_equipes_depuis_json'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='declaration',
+            name='noms_equipes',
+        ),
+        migrations.RemoveField(
+            model_name='declaration',
+            name='poules_equipes',
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def initialiser_compteurs(apps, schema_editor):
+    """Toutes les déclarations existantes sont inscrites : compteur = somme des équipes"""
+    Tournoi = apps.get_model('saisie_equipes', 'Tournoi')
+    Declaration = apps.get_model('saisie_equipes', 'Declaration')
+
+    total = Declaration.objects.filter(
+        tournoi_id=OuterRef('pk')
+    ).order_by().values('tournoi_id').annotate(total=Sum('nombre_equipes')).values('total')
+
+    Tournoi.objects.update(nb_equipes_inscrites=Coalesce(Subquery(total), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0020_remove_declaration_noms_equipes_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='declaration',
+            name='statut',
+            field=models.CharField(choices=[('INSCRITE', 'Inscrite'), ('LISTE_ATTENTE', "Liste d'attente"), ('RETIREE', 'Retirée')], default='INSCRITE', help_text="Liste d'attente si le tournoi était complet au moment de la déclaration", max_length=20, verbose_name='Statut'),
+        ),
+        migrations.AddField(
+            model_name='tournoi',
+            name='capacite_max',
+            field=models.PositiveSmallIntegerField(blank=True, help_text="Nombre maximum d'équipes (vide = pas de limite). Au-delà, les déclarations vont en liste d'attente.", null=True, verbose_name='Capacité maximale'),
+        ),
+        migrations.AddField(
+            model_name='tournoi',
+            name='nb_equipes_inscrites',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Compteur tenu à jour à chaque inscription / retrait (hors liste d'attente)", verbose_name='Équipes inscrites'),
+        ),
+        migrations.AddIndex(
+            model_name='declaration',
+            index=models.Index(fields=['tournoi', 'statut', 'date_declaration'], name='saisie_equi_tournoi_1fb2eb_idx'),
+        ),
+        migrations.RunPython(initialiser_compteurs, migrations.RunPython.noop),
+    ]
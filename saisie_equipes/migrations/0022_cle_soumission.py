@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0021_capacite_liste_attente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidature',
+            name='cle_soumission',
+            field=models.UUIDField(blank=True, editable=False, help_text="Générée à l'affichage du formulaire : un double envoi ne crée pas de doublon", null=True, unique=True, verbose_name='Clé de soumission'),
+        ),
+        migrations.AddField(
+            model_name='declaration',
+            name='cle_soumission',
+            field=models.UUIDField(blank=True, editable=False, help_text="Générée à l'affichage du formulaire : un double envoi ne crée pas de doublon", null=True, unique=True, verbose_name='Clé de soumission'),
+        ),
+    ]
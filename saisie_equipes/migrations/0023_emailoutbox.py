@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0022_cle_soumission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modele', models.CharField(help_text='Nom du gabarit dans templates/emails/', max_length=50, verbose_name='Modèle')),
+                ('destinataire', models.EmailField(max_length=254, verbose_name='Destinataire')),
+                ('sujet', models.CharField(max_length=200, verbose_name='Sujet')),
+                ('corps', models.TextField(verbose_name='Corps')),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', "En cours d'envoi"), ('ENVOYE', 'Envoyé'), ('ECHEC', 'Échec définitif')], default='EN_ATTENTE', max_length=20, verbose_name='Statut')),
+                ('tentatives', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('prochain_essai', models.DateTimeField(default=django.utils.timezone.now, help_text="Pas d'envoi avant cette date (attente exponentielle après un échec)", verbose_name='Prochain essai')),
+                ('derniere_erreur', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+                ('envoye_le', models.DateTimeField(blank=True, null=True, verbose_name='Envoyé le')),
+            ],
+            options={
+                'verbose_name': "Email (file d'envoi)",
+                'verbose_name_plural': "Emails (file d'envoi)",
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['statut', 'prochain_essai'], name='saisie_equi_statut_b8bd74_idx')],
+            },
+        ),
+    ]
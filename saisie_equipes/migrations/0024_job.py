@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0023_emailoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type_job', models.CharField(help_text='Nom du travail enregistré dans jobs.py', max_length=50, verbose_name='Type')),
+                ('parametres', models.JSONField(blank=True, default=dict, verbose_name='Paramètres')),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TERMINE', 'Terminé'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=20, verbose_name='Statut')),
+                ('progression', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100)], verbose_name='Progression (%)')),
+                ('message', models.CharField(blank=True, max_length=255, verbose_name='Message')),
+                ('resultat', models.FileField(blank=True, upload_to='jobs/', verbose_name='Résultat')),
+                ('erreur', models.TextField(blank=True, verbose_name='Erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Demandé le')),
+                ('debut', models.DateTimeField(blank=True, null=True, verbose_name='Début')),
+                ('fin', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('reserve_jusqua', models.DateTimeField(blank=True, help_text='Prolongé à chaque progression ; passé ce délai, un autre worker reprend le travail', null=True, verbose_name="Réservé jusqu'à")),
+                ('cree_par', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL, verbose_name='Demandé par')),
+            ],
+            options={
+                'verbose_name': 'Travail en arrière-plan',
+                'verbose_name_plural': 'Travaux en arrière-plan',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['statut', 'created_at'], name='saisie_equi_statut_ab8903_idx')],
+            },
+        ),
+    ]
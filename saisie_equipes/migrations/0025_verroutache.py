@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-19 07:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0024_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerrouTache',
+            fields=[
+                ('nom', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Tâche')),
+                ('proprietaire', models.CharField(blank=True, help_text='hôte:pid du worker qui détient (ou détenait) le bail', max_length=100, verbose_name='Worker')),
+                ('bail_jusqua', models.DateTimeField(blank=True, help_text="Vide = libre ; expiré = le worker s'est arrêté en cours de tâche", null=True, verbose_name="Bail jusqu'à")),
+                ('prochaine_execution', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Prochaine exécution')),
+                ('derniere_execution', models.DateTimeField(blank=True, null=True, verbose_name='Dernière exécution')),
+                ('derniere_duree', models.FloatField(blank=True, null=True, verbose_name='Durée (s)')),
+                ('dernier_resultat', models.CharField(blank=True, max_length=255, verbose_name='Dernier résultat')),
+                ('derniere_erreur', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('nb_executions', models.PositiveIntegerField(default=0, verbose_name='Exécutions')),
+            ],
+            options={
+                'verbose_name': 'Tâche périodique',
+                'verbose_name_plural': 'Tâches périodiques',
+                'ordering': ['nom'],
+            },
+        ),
+    ]
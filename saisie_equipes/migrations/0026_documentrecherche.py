@@ -0,0 +1,84 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = 'saisie_equipes_documentrecherche'
+
+
+def creer_index_plein_texte(apps, schema_editor):
+    """
+    Index plein texte selon la base (voir recherche.py)
+
+    SQLite : table FTS5 à contenu externe, tenue à jour par des triggers.
+    MySQL : index FULLTEXT. Autres bases : pas d'index (recherche par LIKE).
+    """
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'mysql':
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX document_recherche_texte ON {TABLE} (texte)"
+        )
+
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {TABLE}_fts USING fts5("
+            f"texte, content='{TABLE}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+            f"INSERT INTO {TABLE}_fts(rowid, texte) VALUES (new.id, new.texte); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+            f"INSERT INTO {TABLE}_fts({TABLE}_fts, rowid, texte) VALUES ('delete', old.id, old.texte); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+            f"INSERT INTO {TABLE}_fts({TABLE}_fts, rowid, texte) VALUES ('delete', old.id, old.texte); "
+            f"INSERT INTO {TABLE}_fts(rowid, texte) VALUES (new.id, new.texte); END"
+        )
+
+
+def supprimer_index_plein_texte(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'mysql':
+        schema_editor.execute(f"DROP INDEX document_recherche_texte ON {TABLE}")
+
+    elif vendor == 'sqlite':
+        for suffixe in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABLE}_{suffixe}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0025_verroutache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentRecherche',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type_objet', models.CharField(choices=[('TOURNOI', 'Tournoi'), ('CANDIDATURE', 'Candidature'), ('DECLARATION', 'Déclaration')], max_length=20, verbose_name='Type')),
+                ('objet_id', models.PositiveBigIntegerField(verbose_name='Identifiant')),
+                ('titre', models.CharField(max_length=300, verbose_name='Titre')),
+                ('texte', models.TextField(verbose_name='Texte indexé')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Mis à jour le')),
+                ('tournoi', models.ForeignKey(help_text="Tournoi de l'objet (lui-même pour un tournoi) : liens des résultats", on_delete=django.db.models.deletion.CASCADE, related_name='documents_recherche', to='saisie_equipes.tournoi')),
+            ],
+            options={
+                'verbose_name': 'Document de recherche',
+                'verbose_name_plural': 'Documents de recherche',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documentrecherche',
+            constraint=models.UniqueConstraint(fields=('type_objet', 'objet_id'), name='document_recherche_unique'),
+        ),
+        migrations.RunPython(creer_index_plein_texte, supprimer_index_plein_texte),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0026_documentrecherche'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeclarationRecue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre_equipes', models.PositiveSmallIntegerField(verbose_name="Nombre d'équipes")),
+                ('equipes', models.JSONField(default=list, help_text="[[nom, poule], ...] dans l'ordre du formulaire", verbose_name='Équipes')),
+                ('declarant', models.CharField(max_length=200, verbose_name='Déclarant')),
+                ('email_club', models.EmailField(max_length=254, verbose_name='Email du club')),
+                ('remarques', models.TextField(blank=True)),
+                ('cle_soumission', models.UUIDField(editable=False, help_text='Reprise par la déclaration créée : un double envoi ne crée pas de doublon', unique=True, verbose_name='Clé de soumission')),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TRAITEE', 'Enregistrée'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=20, verbose_name='Statut')),
+                ('tentatives', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('prochain_essai', models.DateTimeField(default=django.utils.timezone.now, help_text="Réservée par un worker jusqu'à cette date", verbose_name='Prochain essai')),
+                ('derniere_erreur', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Reçue le')),
+                ('traitee_le', models.DateTimeField(blank=True, null=True, verbose_name='Enregistrée le')),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='saisie_equipes.club', verbose_name='Club affilié')),
+                ('declaration', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reception', to='saisie_equipes.declaration', verbose_name='Déclaration créée')),
+                ('tournoi', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='declarations_recues', to='saisie_equipes.tournoi', verbose_name='Tournoi')),
+            ],
+            options={
+                'verbose_name': "Déclaration reçue (en attente d'enregistrement)",
+                'verbose_name_plural': "Déclarations reçues (en attente d'enregistrement)",
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['statut', 'prochain_essai'], name='saisie_equi_statut_fbd6c5_idx')],
+            },
+        ),
+    ]
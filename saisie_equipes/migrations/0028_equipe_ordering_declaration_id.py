@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0027_declarationrecue'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='equipe',
+            options={'ordering': ['declaration_id', 'ordre'], 'verbose_name': 'Équipe', 'verbose_name_plural': 'Équipes'},
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:46
+
+import saisie_equipes.stockage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0028_equipe_ordering_declaration_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='resultat',
+            field=models.FileField(blank=True, storage=saisie_equipes.stockage.StockagePrive(), upload_to=saisie_equipes.stockage.chemin_resultat_job, verbose_name='Résultat'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.7 on 2026-10-19 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0029_job_resultat_stockage_prive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileAttente',
+            fields=[
+                ('nom', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='File')),
+                ('dernier_ticket', models.PositiveIntegerField(default=0, verbose_name='Dernier ticket distribué')),
+                ('dernier_appel', models.PositiveIntegerField(default=0, verbose_name='Dernier ticket appelé')),
+            ],
+            options={
+                'verbose_name': "File d'attente",
+                'verbose_name_plural': "Files d'attente",
+            },
+        ),
+    ]
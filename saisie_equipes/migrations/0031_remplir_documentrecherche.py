@@ -0,0 +1,101 @@
+"""
+Migration de données : un DocumentRecherche par tournoi, candidature et déclaration
+
+0026 crée la table (et son index) vide : sans ce remplissage, les filtres
+« q » du staff ne trouvaient aucun objet existant avant un
+reindexer_recherche manuel.
+
+Mêmes textes que recherche.py (document_tournoi, document_candidature,
+document_declaration), reconstruits ici avec les modèles historiques.
+Les documents déjà écrits par les signaux depuis 0026 sont conservés.
+"""
+
+import unicodedata
+
+from django.db import migrations
+
+TAILLE_LOT = 500
+
+
+def plier(texte):
+    decompose = unicodedata.normalize('NFKD', texte or '')
+    return ''.join(c for c in decompose if not unicodedata.combining(c)).lower()
+
+
+def libelle_tournoi(tournoi):
+    zone = f" {tournoi.get_zone_display()}" if tournoi.zone else ""
+    return (
+        f"{tournoi.date:%d/%m/%Y} - {tournoi.get_categorie_age_display()} "
+        f"{tournoi.get_sexe_display()}{zone}"
+    )
+
+
+def documents_tournois(Tournoi):
+    for tournoi in Tournoi.objects.select_related('club_organisateur').order_by('pk').iterator(chunk_size=TAILLE_LOT):
+        organisateur = tournoi.club_organisateur.nom if tournoi.club_organisateur else ''
+        titre = libelle_tournoi(tournoi) + (f" - Org: {organisateur}" if organisateur else "")
+        yield 'TOURNOI', tournoi, tournoi.pk, titre, [
+            tournoi.titre,
+            tournoi.lieu,
+            tournoi.categorie_age,
+            tournoi.get_categorie_age_display(),
+            tournoi.get_sexe_display(),
+            tournoi.get_zone_display() if tournoi.zone else '',
+            organisateur,
+            tournoi.remarques,
+        ]
+
+
+def documents_candidatures(Candidature):
+    for candidature in Candidature.objects.select_related('club', 'tournoi').order_by('pk').iterator(chunk_size=TAILLE_LOT):
+        yield (
+            'CANDIDATURE', candidature, candidature.tournoi_id,
+            f"{candidature.club.nom} → {libelle_tournoi(candidature.tournoi)}",
+            [candidature.club.nom, candidature.declarant, candidature.lieu, candidature.remarques],
+        )
+
+
+def documents_declarations(Declaration):
+    for declaration in Declaration.objects.select_related('club', 'tournoi').order_by('pk').iterator(chunk_size=TAILLE_LOT):
+        yield (
+            'DECLARATION', declaration, declaration.tournoi_id,
+            f"{declaration.club.nom} ({declaration.declarant}) → {libelle_tournoi(declaration.tournoi)}",
+            [declaration.club.nom, declaration.declarant, declaration.remarques],
+        )
+
+
+def remplir_documents(apps, schema_editor):
+    DocumentRecherche = apps.get_model('saisie_equipes', 'DocumentRecherche')
+    sources = [
+        documents_tournois(apps.get_model('saisie_equipes', 'Tournoi')),
+        documents_candidatures(apps.get_model('saisie_equipes', 'Candidature')),
+        documents_declarations(apps.get_model('saisie_equipes', 'Declaration')),
+    ]
+
+    lot = []
+    for source in sources:
+        for type_objet, objet, tournoi_id, titre, morceaux in source:
+            lot.append(DocumentRecherche(
+                type_objet=type_objet,
+                objet_id=objet.pk,
+                tournoi_id=tournoi_id,
+                titre=titre[:300],
+                texte=plier(' '.join(m for m in morceaux if m)),
+            ))
+            if len(lot) >= TAILLE_LOT:
+                DocumentRecherche.objects.bulk_create(lot, ignore_conflicts=True)
+                lot = []
+
+    if lot:
+        DocumentRecherche.objects.bulk_create(lot, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('saisie_equipes', '0030_fileattente'),
+    ]
+
+    operations = [
+        migrations.RunPython(remplir_documents, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MaxValueValidator, EmailValidator
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from .stockage import chemin_resultat_job, stockage_jobs
+
 # Create your models here.
 class Sexe(models.TextChoices):
     MASCULIN = "M", "Masculin"
@@ -34,6 +36,12 @@ class StatutTournoi(models.TextChoices):
     ANNULE = "ANNULE", "Annulé"
     TERMINE = "TERMINE", "Terminé"
 
+class StatutDeclaration(models.TextChoices):
+    """Statut d'une déclaration d'équipes"""
+    INSCRITE = "INSCRITE", "Inscrite"
+    LISTE_ATTENTE = "LISTE_ATTENTE", "Liste d'attente"
+    RETIREE = "RETIREE", "Retirée"
+
 class StatutCandidature(models.TextChoices):
     """Statut d'une candidature à l'organisation"""
     EN_ATTENTE = "EN_ATTENTE", "En attente"
@@ -120,6 +128,20 @@ class Tournoi(models.Model):
         help_text="État actuel du tournoi"
     )
 
+    capacite_max = models.PositiveSmallIntegerField(
+        "Capacité maximale",
+        null=True,
+        blank=True,
+        help_text="Nombre maximum d'équipes (vide = pas de limite). Au-delà, les déclarations vont en liste d'attente."
+    )
+
+    nb_equipes_inscrites = models.PositiveIntegerField(
+        "Équipes inscrites",
+        default=0,
+        editable=False,
+        help_text="Compteur tenu à jour à chaque inscription / retrait (hors liste d'attente)"
+    )
+
     est_publie = models.BooleanField(
         "Publié",
         default=True,
@@ -166,17 +188,121 @@ class Tournoi(models.Model):
         )
 
     def get_nb_declarations(self):
-        """Nombre de clubs qui ont déclaré des équipes"""
-        return self.declarations.count()
+        """Nombre de clubs inscrits (hors liste d'attente et déclarations retirées)"""
+        return self.declarations.filter(statut=StatutDeclaration.INSCRITE).count()
 
     def get_nb_equipes_total(self):
-        """Nombre total d'équipes inscrites"""
+        """Nombre total d'équipes inscrites (hors liste d'attente)"""
         from django.db.models import Sum
-        total = self.declarations.aggregate(
+        total = self.declarations.filter(
+            statut=StatutDeclaration.INSCRITE
+        ).aggregate(
             total=Sum('nombre_equipes')
         )['total']
         return total or 0
 
+    def get_places_restantes(self):
+        """Places encore libres (None si pas de limite)"""
+        if self.capacite_max is None:
+            return None
+        return max(self.capacite_max - self.nb_equipes_inscrites, 0)
+
+    # ═══════════════════════════════════════════════════
+    # 🎟️ CAPACITÉ ET LISTE D'ATTENTE
+    # ═══════════════════════════════════════════════════
+
+    def reserver_places(self, nb, depuis_liste_attente=False):
+        """
+        Réserve nb places si la capacité le permet
+
+        Un seul UPDATE conditionnel (pas de SELECT SUM préalable) : la base
+        sérialise les soumissions simultanées sur la ligne du tournoi,
+        la capacité ne peut donc jamais être dépassée.
+
+        Une nouvelle déclaration ne double pas la liste d'attente : tant
+        qu'elle n'est pas vide, seule la promotion peut réserver.
+
+        Returns:
+            bool: True si les places sont réservées
+        """
+        from django.db.models import F, Q, Exists, OuterRef
+
+        tournoi = Tournoi.objects.filter(pk=self.pk).alias(
+            apres=F('nb_equipes_inscrites') + nb
+        ).filter(
+            Q(capacite_max__isnull=True) | Q(apres__lte=F('capacite_max'))
+        )
+        if not depuis_liste_attente:
+            tournoi = tournoi.filter(~Exists(Declaration.objects.filter(
+                tournoi_id=OuterRef('pk'), statut=StatutDeclaration.LISTE_ATTENTE
+            )))
+
+        reserve = tournoi.update(nb_equipes_inscrites=F('nb_equipes_inscrites') + nb)
+        return bool(reserve)
+
+    def liberer_places(self, nb):
+        """Rend nb places (retrait ou suppression d'une déclaration inscrite)"""
+        from django.db.models import F
+
+        Tournoi.objects.filter(pk=self.pk, nb_equipes_inscrites__gte=nb).update(
+            nb_equipes_inscrites=F('nb_equipes_inscrites') - nb
+        )
+
+    def promouvoir_liste_attente(self):
+        """
+        Inscrit les déclarations en liste d'attente, dans l'ordre d'arrivée
+
+        FIFO strict : on s'arrête à la première déclaration qui ne tient pas
+        (une petite déclaration arrivée plus tard ne passe pas devant).
+
+        Returns:
+            list: identifiants des déclarations promues
+        """
+        from .syntheses import invalider_tournois_apres_commit
+
+        promues = []
+        with transaction.atomic():
+            # Sérialise avec les retraits / autres promotions du tournoi
+            list(Tournoi.objects.select_for_update().filter(pk=self.pk).values_list('pk'))
+
+            en_attente = self.declarations.filter(
+                statut=StatutDeclaration.LISTE_ATTENTE
+            ).order_by('date_declaration', 'pk').values_list('pk', 'nombre_equipes')
+
+            for pk, nb in en_attente:
+                if not self.reserver_places(nb, depuis_liste_attente=True):
+                    break
+                Declaration.objects.filter(pk=pk).update(statut=StatutDeclaration.INSCRITE)
+                promues.append(pk)
+
+            if promues:
+                # update() ne déclenche pas les signaux
+                invalider_tournois_apres_commit(self.pk)
+
+        return promues
+
+    def recalculer_nb_equipes(self):
+        """
+        Recalcule le compteur depuis les déclarations inscrites
+
+        Utilisé quand une déclaration est modifiée à la main (admin),
+        et par la migration qui a introduit le compteur.
+        """
+        self.nb_equipes_inscrites = self.get_nb_equipes_total()
+        Tournoi.objects.filter(pk=self.pk).update(nb_equipes_inscrites=self.nb_equipes_inscrites)
+
+    def get_nb_equipes_par_poule(self):
+        """
+        Nombre d'équipes inscrites par poule ({'HAUTE': 6, 'BASSE': 4, 'AUCUNE': 0...})
+
+        Une seule requête agrégée, servie par l'index (tournoi, poule) d'Equipe
+        """
+        from django.db.models import Count
+        comptes = self.equipes.filter(
+            declaration__statut=StatutDeclaration.INSCRITE
+        ).values_list('poule').annotate(nb=Count('id')).order_by()
+        return {poule or "AUCUNE": nb for poule, nb in comptes}
+
     def get_nb_candidatures(self):
         """Nombre de clubs qui ont candidaté pour organiser"""
         return self.candidatures.count()
@@ -220,6 +346,28 @@ class Tournoi(models.Model):
             models.Index(fields=['date', 'statut']),
         ]
 
+RAISON_REFUS_AUTO = "Une autre candidature a été retenue pour ce tournoi."
+
+
+class ResultatTransition:
+    """
+    Résultat d'un changement de statut de candidature
+
+    Vrai si la transition a eu lieu, sinon message explique le conflit
+    (candidature déjà traitée par quelqu'un d'autre, tournoi déjà attribué...).
+    """
+
+    def __init__(self, ok, message=""):
+        self.ok = ok
+        self.message = message
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return f"ResultatTransition(ok={self.ok!r}, message={self.message!r})"
+
+
 class Candidature(models.Model):
     """
     Candidature d'un club pour ORGANISER un tournoi
@@ -311,6 +459,15 @@ class Candidature(models.Model):
         auto_now=True
     )
 
+    cle_soumission = models.UUIDField(
+        "Clé de soumission",
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        help_text="Générée à l'affichage du formulaire : un double envoi ne crée pas de doublon"
+    )
+
     def __str__(self):
         return (
             f"Candidature {self.club.nom} - "
@@ -333,39 +490,98 @@ class Candidature(models.Model):
         """
         Valide la candidature et met à jour le tournoi
 
-        Actions :
-        1. Change statut → VALIDEE
-        2. Met à jour tournoi.club_organisateur
-        3. Met à jour tournoi.lieu
+        Actions (une transaction, tournoi verrouillé) :
+        1. Change statut → VALIDEE, seulement si encore EN_ATTENTE
+        2. Refuse les autres candidatures en attente du tournoi
+        3. Met à jour tournoi.club_organisateur, tournoi.lieu
         4. Change tournoi.statut → CONFIRME
+        5. Met en file les emails aux clubs concernés
+
+        Deux validations simultanées (même candidature ou deux candidatures
+        du même tournoi) : la seconde attend le verrou puis échoue proprement.
+        Comme valider_candidatures, un organisateur déjà désigné (admin,
+        candidature validée) n'est jamais remplacé.
 
         Args:
             user: Utilisateur staff qui valide
-        """
-        self.statut = StatutCandidature.VALIDEE
-        self.traite_par = user
-        self.date_traitement = timezone.now()
-        self.save()
 
-        # Mettre à jour le tournoi
-        self.tournoi.club_organisateur = self.club
-        self.tournoi.lieu = self.lieu
-        self.tournoi.statut = StatutTournoi.CONFIRME
-        self.tournoi.save()
+        Returns:
+            ResultatTransition: ok=False avec un message en cas de conflit
+        """
+        from .emails import notifier_decisions
+
+        with transaction.atomic():
+            club_organisateur_id = self._verrouiller_tournoi()
+
+            if club_organisateur_id is not None or Candidature.objects.filter(
+                tournoi_id=self.tournoi_id, statut=StatutCandidature.VALIDEE
+            ).exclude(pk=self.pk).exists():
+                return ResultatTransition(False, "Ce tournoi a déjà un organisateur.")
+
+            maintenant = timezone.now()
+            if not self._changer_statut(
+                [StatutCandidature.EN_ATTENTE],
+                statut=StatutCandidature.VALIDEE,
+                traite_par=user,
+                date_traitement=maintenant,
+                updated_at=maintenant,
+            ):
+                return self._conflit()
+
+            # Lues sous le verrou du tournoi : ce sont exactement celles refusées
+            concurrentes = list(
+                Candidature.objects.filter(
+                    tournoi_id=self.tournoi_id, statut=StatutCandidature.EN_ATTENTE
+                ).select_related('club', 'tournoi')
+            )
+            Candidature.objects.filter(pk__in=[c.pk for c in concurrentes]).update(
+                statut=StatutCandidature.REFUSEE,
+                raison_refus=RAISON_REFUS_AUTO,
+                traite_par=user,
+                date_traitement=maintenant,
+                updated_at=maintenant,
+            )
+
+            self._maj_tournoi(
+                club_organisateur=self.club,
+                lieu=self.lieu,
+                statut=StatutTournoi.CONFIRME,
+                updated_at=maintenant,
+            )
+
+            notifier_decisions([self], concurrentes, RAISON_REFUS_AUTO)
+
+        return ResultatTransition(True)
 
     def refuser(self, user, raison):
         """
-        Refuse la candidature
+        Refuse la candidature (seulement si encore EN_ATTENTE)
+        et met en file l'email au club
 
         Args:
             user: Utilisateur staff qui refuse
             raison: Motif du refus
+
+        Returns:
+            ResultatTransition
         """
-        self.statut = StatutCandidature.REFUSEE
-        self.raison_refus = raison
-        self.traite_par = user
-        self.date_traitement = timezone.now()
-        self.save()
+        from .emails import notifier_decisions
+
+        maintenant = timezone.now()
+        with transaction.atomic():
+            if not self._changer_statut(
+                [StatutCandidature.EN_ATTENTE],
+                statut=StatutCandidature.REFUSEE,
+                raison_refus=raison,
+                traite_par=user,
+                date_traitement=maintenant,
+                updated_at=maintenant,
+            ):
+                return self._conflit()
+
+            notifier_decisions(refusees=[self], raison=raison)
+
+        return ResultatTransition(True)
 
     def retirer(self):
         """
@@ -373,18 +589,92 @@ class Candidature(models.Model):
 
         Si la candidature était validée, il faut aussi
         retirer l'organisateur du tournoi
+
+        Returns:
+            ResultatTransition
+        """
+        with transaction.atomic():
+            # Même ordre de verrouillage que valider() : tournoi puis candidature
+            self._verrouiller_tournoi()
+            ancien_statut = Candidature.objects.select_for_update().filter(
+                pk=self.pk
+            ).values_list('statut', flat=True).first()
+
+            if ancien_statut not in (StatutCandidature.EN_ATTENTE, StatutCandidature.VALIDEE):
+                return self._conflit()
+
+            maintenant = timezone.now()
+            self._changer_statut(
+                [ancien_statut],
+                statut=StatutCandidature.RETIREE,
+                updated_at=maintenant,
+            )
+
+            # Si c'était la candidature validée, vider le tournoi
+            if ancien_statut == StatutCandidature.VALIDEE:
+                self._maj_tournoi(
+                    club_organisateur=None,
+                    lieu="",
+                    statut=StatutTournoi.PLANIFIE,
+                    updated_at=maintenant,
+                )
+
+        return ResultatTransition(True)
+
+    def _verrouiller_tournoi(self):
         """
-        ancien_statut = self.statut
+        SELECT ... FOR UPDATE sur le tournoi (sérialise les décisions d'un même tournoi)
 
-        self.statut = StatutCandidature.RETIREE
-        self.save()
+        Returns:
+            club_organisateur_id du tournoi, lu sous le verrou
+        """
+        return Tournoi.objects.select_for_update().filter(
+            pk=self.tournoi_id
+        ).values_list('club_organisateur_id', flat=True).first()
+
+    def _changer_statut(self, statuts_attendus, **valeurs):
+        """
+        Compare-and-set : UPDATE ... WHERE statut IN (statuts_attendus)
 
-        # Si c'était la candidature validée, vider le tournoi
-        if ancien_statut == StatutCandidature.VALIDEE:
-            self.tournoi.club_organisateur = None
-            self.tournoi.lieu = ""
-            self.tournoi.statut = StatutTournoi.PLANIFIE
-            self.tournoi.save()
+        Met aussi l'instance à jour si la transition a eu lieu.
+        Returns:
+            bool: False si la candidature n'était plus dans un statut attendu
+        """
+        from .syntheses import invalider_tournois_apres_commit
+
+        if not Candidature.objects.filter(
+            pk=self.pk, statut__in=statuts_attendus
+        ).update(**valeurs):
+            return False
+
+        for champ, valeur in valeurs.items():
+            setattr(self, champ, valeur)
+
+        # update() ne déclenche pas les signaux (statut publié par l'API)
+        invalider_tournois_apres_commit(self.tournoi_id)
+        return True
+
+    def _maj_tournoi(self, **valeurs):
+        """Met à jour le tournoi en base (UPDATE) et l'instance déjà chargée"""
+        from .recherche import indexer
+        from .syntheses import invalider_tournois_apres_commit
+
+        Tournoi.objects.filter(pk=self.tournoi_id).update(**valeurs)
+        if Candidature.tournoi.is_cached(self):
+            for champ, valeur in valeurs.items():
+                setattr(self.tournoi, champ, valeur)
+
+        # update() ne déclenche pas les signaux (organisateur et lieu sont indexés)
+        invalider_tournois_apres_commit(self.tournoi_id)
+        indexer(TypeDocument.TOURNOI, [self.tournoi_id])
+
+    def _conflit(self):
+        """Recharge le statut et décrit pourquoi la transition est impossible"""
+        self.refresh_from_db(fields=['statut', 'traite_par', 'date_traitement'])
+        return ResultatTransition(
+            False,
+            f"Cette candidature a déjà été traitée : {self.get_statut_display()}",
+        )
 
     class Meta:
         verbose_name = "Candidature"
@@ -409,20 +699,6 @@ class Declaration(models.Model):
         validators=[MaxValueValidator(10)]
     )
 
-    noms_equipes = models.JSONField(
-        "Noms des équipes",
-        default=list,
-        blank=True,
-        help_text="Liste des noms d'équipes (ex: ['TGV A', 'TGV B'])"
-    )
-
-    poules_equipes = models.JSONField(
-        "Poules des équipes",
-        default=list,
-        blank=True,
-        help_text="Liste des poules assignées à chaque équipe"
-    )
-
     tournoi = models.ForeignKey(
         'Tournoi',
         on_delete=models.CASCADE,
@@ -444,52 +720,581 @@ class Declaration(models.Model):
 
     date_declaration = models.DateTimeField("Date de déclaration", auto_now_add=True)
 
+    statut = models.CharField(
+        "Statut",
+        max_length=20,
+        choices=StatutDeclaration.choices,
+        default=StatutDeclaration.INSCRITE,
+        help_text="Liste d'attente si le tournoi était complet au moment de la déclaration"
+    )
+
+    cle_soumission = models.UUIDField(
+        "Clé de soumission",
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        help_text="Générée à l'affichage du formulaire : un double envoi ne crée pas de doublon"
+    )
+
     def __str__(self):
-        equipes_str = ", ".join(self.noms_equipes) if self.noms_equipes else f"{self.nombre_equipes} équipe(s)"
+        # Pas de requête sur les équipes (listes de l'admin) : noms seulement s'ils sont préchargés
+        equipes = getattr(self, '_prefetched_objects_cache', {}).get('equipes')
+        equipes_str = ", ".join(e.nom for e in equipes) if equipes else f"{self.nombre_equipes} équipe(s)"
         return f"{self.declarant} ({self.club}) - {equipes_str} - {self.tournoi}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeurs d'origine : compteur du tournoi et invalidation de cache
+        # si le tournoi / nombre d'équipes / statut changent
+        instance._tournoi_id_initial = instance.__dict__.get('tournoi_id')
+        instance._compteur_initial = (
+            instance.__dict__.get('tournoi_id'),
+            instance.__dict__.get('nombre_equipes'),
+            instance.__dict__.get('statut'),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        creation = self._state.adding
+
+        with transaction.atomic():
+            # Nouvelle déclaration : réserver les places ou passer en liste d'attente
+            if creation and self.statut == StatutDeclaration.INSCRITE:
+                if not self.tournoi.reserver_places(self.nombre_equipes):
+                    self.statut = StatutDeclaration.LISTE_ATTENTE
+
+            super().save(*args, **kwargs)
+
+            if not creation:
+                # Equipe.tournoi est une copie de declaration.tournoi : la garder alignée
+                # si le tournoi de la déclaration change (modification dans l'admin)
+                self.equipes.exclude(tournoi_id=self.tournoi_id).update(tournoi_id=self.tournoi_id)
+
+                # Modification manuelle : recompter les tournois concernés
+                initial = getattr(self, '_compteur_initial', None)
+                if initial and initial != (self.tournoi_id, self.nombre_equipes, self.statut):
+                    for tournoi in Tournoi.objects.filter(pk__in={initial[0], self.tournoi_id}):
+                        tournoi.recalculer_nb_equipes()
+                        tournoi.promouvoir_liste_attente()
+
+        self._tournoi_id_initial = self.tournoi_id
+        self._compteur_initial = (self.tournoi_id, self.nombre_equipes, self.statut)
+
+    def retirer(self):
+        """
+        Retire la déclaration et libère ses places
+
+        Les déclarations en liste d'attente sont alors promues (FIFO).
+
+        Returns:
+            ResultatTransition
+        """
+        from .syntheses import invalider_tournois_apres_commit
+
+        with transaction.atomic():
+            # Même verrou que promouvoir_liste_attente()
+            list(Tournoi.objects.select_for_update().filter(pk=self.tournoi_id).values_list('pk'))
+
+            ancien_statut = Declaration.objects.filter(pk=self.pk).values_list('statut', flat=True).first()
+            if ancien_statut in (None, StatutDeclaration.RETIREE):
+                return ResultatTransition(False, "Cette déclaration a déjà été retirée.")
+
+            Declaration.objects.filter(pk=self.pk, statut=ancien_statut).update(
+                statut=StatutDeclaration.RETIREE
+            )
+            self.statut = StatutDeclaration.RETIREE
+            self._compteur_initial = (self.tournoi_id, self.nombre_equipes, self.statut)
+
+            if ancien_statut == StatutDeclaration.INSCRITE:
+                self.tournoi.liberer_places(self.nombre_equipes)
+                self.tournoi.promouvoir_liste_attente()
+
+            # update() ne déclenche pas les signaux
+            invalider_tournois_apres_commit(self.tournoi_id)
+
+        return ResultatTransition(True)
+
+    def est_en_liste_attente(self):
+        return self.statut == StatutDeclaration.LISTE_ATTENTE
+
     def get_noms_equipes_formatte(self):
         """Retourne les noms d'équipes formatés pour affichage"""
-        if self.noms_equipes:
-            return ", ".join(self.noms_equipes)
+        noms = [equipe.nom for equipe in self.equipes.all()]
+        if noms:
+            return ", ".join(noms)
         return f"{self.nombre_equipes} équipe(s)"
 
     def get_equipes_avec_poules(self):
-        """Retourne les équipes avec leurs poules formatées pour affichage"""
-        if not self.noms_equipes:
-            return []
-
-        equipes = []
-        for i, nom in enumerate(self.noms_equipes):
-            poule = ""
-            if self.poules_equipes and i < len(self.poules_equipes):
-                poule = self.poules_equipes[i] or ""
-
-            equipes.append({
-                'nom': nom,
-                'poule': poule,
-                'poule_display': dict(Poule.choices).get(poule, "Aucune") if poule else "Aucune"
-            })
+        """
+        Retourne les équipes avec leurs poules formatées pour affichage
 
-        return equipes
+        Profite d'un prefetch_related('equipes') s'il a été fait.
+        """
+        return [
+            {
+                'nom': equipe.nom,
+                'poule': equipe.poule,
+                'poule_display': equipe.get_poule_display() if equipe.poule else "Aucune",
+            }
+            for equipe in self.equipes.all()
+        ]
 
     def get_equipes_par_poule(self):
         """Retourne les équipes groupées par poule"""
-        if not self.noms_equipes:
-            return {}
-
         equipes_par_poule = {}
-        for i, nom in enumerate(self.noms_equipes):
-            poule = self.poules_equipes[i] if i < len(self.poules_equipes) and self.poules_equipes[i] else "AUCUNE"
-
-            if poule not in equipes_par_poule:
-                equipes_par_poule[poule] = []
-
-            equipes_par_poule[poule].append(nom)
+        for equipe in self.equipes.all():
+            equipes_par_poule.setdefault(equipe.poule or "AUCUNE", []).append(equipe.nom)
 
         return equipes_par_poule
 
     class Meta:
         verbose_name = "Déclaration"
         verbose_name_plural = "Déclarations"
-        ordering = ['-date_declaration']
\ No newline at end of file
+        ordering = ['-date_declaration']
+        indexes = [
+            # Liste d'attente d'un tournoi, dans l'ordre d'arrivée
+            models.Index(fields=['tournoi', 'statut', 'date_declaration']),
+        ]
+
+
+class Equipe(models.Model):
+    """
+    Équipe engagée par une déclaration
+
+    Une ligne par équipe (remplace les anciennes listes JSON parallèles
+    noms_equipes / poules_equipes) : les effectifs et comptages par poule
+    deviennent de simples requêtes indexées sur (tournoi, poule).
+    """
+
+    declaration = models.ForeignKey(
+        'Declaration',
+        on_delete=models.CASCADE,
+        related_name='equipes',
+        verbose_name="Déclaration"
+    )
+
+    tournoi = models.ForeignKey(
+        'Tournoi',
+        on_delete=models.CASCADE,
+        related_name='equipes',
+        verbose_name="Tournoi",
+        help_text="Copie de declaration.tournoi (évite une jointure pour les requêtes par poule)"
+    )
+
+    nom = models.CharField(
+        "Nom de l'équipe",
+        max_length=100
+    )
+
+    poule = models.CharField(
+        "Poule",
+        max_length=10,
+        choices=Poule.choices,
+        blank=True,
+        help_text="Vide si le tournoi n'a pas de poules"
+    )
+
+    ordre = models.PositiveSmallIntegerField(
+        "Ordre",
+        default=0,
+        help_text="Position de l'équipe dans la déclaration (A, B, C...)"
+    )
+
+    def __str__(self):
+        poule_str = f" ({self.get_poule_display()})" if self.poule else ""
+        return f"{self.nom}{poule_str}"
+
+    class Meta:
+        verbose_name = "Équipe"
+        verbose_name_plural = "Équipes"
+        # declaration_id et non declaration : pas de jointure vers l'ordre de Declaration
+        ordering = ['declaration_id', 'ordre']
+        indexes = [
+            models.Index(fields=['tournoi', 'poule']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['declaration', 'ordre'], name='equipe_ordre_unique'),
+        ]
+
+
+# ═══════════════════════════════════════════════════
+# 📥 RÉCEPTION DIFFÉRÉE DES DÉCLARATIONS
+# ═══════════════════════════════════════════════════
+
+class StatutReception(models.TextChoices):
+    """Statut d'une déclaration reçue en attente d'enregistrement"""
+    EN_ATTENTE = "EN_ATTENTE", "En attente"
+    EN_COURS = "EN_COURS", "En cours"
+    TRAITEE = "TRAITEE", "Enregistrée"
+    ECHEC = "ECHEC", "Échec"
+
+
+class DeclarationRecue(models.Model):
+    """
+    Déclaration validée, pas encore enregistrée (mode DECLARATIONS_DIFFEREES)
+
+    Pendant les pics, la vue n'écrit que cette ligne (un INSERT) et répond
+    aussitôt ; la commande traiter_declarations crée les Declaration par
+    lots (voir reception.py).
+    """
+
+    tournoi = models.ForeignKey(
+        'Tournoi',
+        on_delete=models.CASCADE,
+        related_name='declarations_recues',
+        verbose_name="Tournoi"
+    )
+
+    club = models.ForeignKey(
+        Club,
+        on_delete=models.CASCADE,
+        verbose_name="Club affilié"
+    )
+
+    nombre_equipes = models.PositiveSmallIntegerField("Nombre d'équipes")
+
+    equipes = models.JSONField(
+        "Équipes",
+        default=list,
+        help_text="[[nom, poule], ...] dans l'ordre du formulaire"
+    )
+
+    declarant = models.CharField("Déclarant", max_length=200)
+
+    email_club = models.EmailField("Email du club")
+
+    remarques = models.TextField(blank=True)
+
+    cle_soumission = models.UUIDField(
+        "Clé de soumission",
+        unique=True,
+        editable=False,
+        help_text="Reprise par la déclaration créée : un double envoi ne crée pas de doublon"
+    )
+
+    statut = models.CharField(
+        "Statut",
+        max_length=20,
+        choices=StatutReception.choices,
+        default=StatutReception.EN_ATTENTE
+    )
+
+    tentatives = models.PositiveSmallIntegerField("Tentatives", default=0)
+
+    prochain_essai = models.DateTimeField(
+        "Prochain essai",
+        default=timezone.now,
+        help_text="Réservée par un worker jusqu'à cette date"
+    )
+
+    declaration = models.OneToOneField(
+        'Declaration',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reception',
+        verbose_name="Déclaration créée"
+    )
+
+    derniere_erreur = models.TextField("Dernière erreur", blank=True)
+
+    created_at = models.DateTimeField("Reçue le", auto_now_add=True)
+
+    traitee_le = models.DateTimeField("Enregistrée le", null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_statut_display()} - {self.declarant} ({self.club}) - {self.tournoi}"
+
+    class Meta:
+        verbose_name = "Déclaration reçue (en attente d'enregistrement)"
+        verbose_name_plural = "Déclarations reçues (en attente d'enregistrement)"
+        ordering = ['-created_at']
+        indexes = [
+            # Déclarations à traiter, dans l'ordre d'arrivée
+            models.Index(fields=['statut', 'prochain_essai']),
+        ]
+
+
+# ═══════════════════════════════════════════════════
+# 📧 FILE D'ENVOI DES EMAILS
+# ═══════════════════════════════════════════════════
+
+class StatutEmail(models.TextChoices):
+    """Statut d'un email dans la file d'envoi"""
+    EN_ATTENTE = "EN_ATTENTE", "En attente"
+    EN_COURS = "EN_COURS", "En cours d'envoi"
+    ENVOYE = "ENVOYE", "Envoyé"
+    ECHEC = "ECHEC", "Échec définitif"
+
+
+class EmailOutbox(models.Model):
+    """
+    Email à envoyer (outbox)
+
+    Écrit dans la même transaction que le changement métier (déclaration,
+    décision sur une candidature) : pas d'email pour une opération annulée,
+    pas d'opération perdue faute d'email. L'envoi SMTP est fait hors requête
+    par la commande envoyer_emails (voir emails.py).
+    """
+
+    modele = models.CharField(
+        "Modèle",
+        max_length=50,
+        help_text="Nom du gabarit dans templates/emails/"
+    )
+
+    destinataire = models.EmailField("Destinataire")
+
+    sujet = models.CharField("Sujet", max_length=200)
+
+    corps = models.TextField("Corps")
+
+    statut = models.CharField(
+        "Statut",
+        max_length=20,
+        choices=StatutEmail.choices,
+        default=StatutEmail.EN_ATTENTE
+    )
+
+    tentatives = models.PositiveSmallIntegerField("Tentatives", default=0)
+
+    prochain_essai = models.DateTimeField(
+        "Prochain essai",
+        default=timezone.now,
+        help_text="Pas d'envoi avant cette date (attente exponentielle après un échec)"
+    )
+
+    derniere_erreur = models.TextField("Dernière erreur", blank=True)
+
+    created_at = models.DateTimeField("Créé le", auto_now_add=True)
+
+    envoye_le = models.DateTimeField("Envoyé le", null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_statut_display()} - {self.destinataire} - {self.sujet}"
+
+    class Meta:
+        verbose_name = "Email (file d'envoi)"
+        verbose_name_plural = "Emails (file d'envoi)"
+        ordering = ['-created_at']
+        indexes = [
+            # Messages à envoyer, par date d'échéance
+            models.Index(fields=['statut', 'prochain_essai']),
+        ]
+
+
+# ═══════════════════════════════════════════════════
+# ⚙️ TRAVAUX EN ARRIÈRE-PLAN
+# ═══════════════════════════════════════════════════
+
+class StatutJob(models.TextChoices):
+    """Statut d'un travail en arrière-plan"""
+    EN_ATTENTE = "EN_ATTENTE", "En attente"
+    EN_COURS = "EN_COURS", "En cours"
+    TERMINE = "TERMINE", "Terminé"
+    ECHEC = "ECHEC", "Échec"
+
+
+class Job(models.Model):
+    """
+    Travail lourd demandé par le staff (export, import...)
+
+    Créé par une vue (la requête répond aussitôt), exécuté par la commande
+    run_jobs (voir jobs.py). Le fichier produit est rangé dans le stockage
+    privé des jobs (stockage.py), jamais sous MEDIA_ROOT.
+    """
+
+    type_job = models.CharField(
+        "Type",
+        max_length=50,
+        help_text="Nom du travail enregistré dans jobs.py"
+    )
+
+    parametres = models.JSONField("Paramètres", default=dict, blank=True)
+
+    statut = models.CharField(
+        "Statut",
+        max_length=20,
+        choices=StatutJob.choices,
+        default=StatutJob.EN_ATTENTE
+    )
+
+    progression = models.PositiveSmallIntegerField(
+        "Progression (%)",
+        default=0,
+        validators=[MaxValueValidator(100)]
+    )
+
+    message = models.CharField("Message", max_length=255, blank=True)
+
+    resultat = models.FileField("Résultat", upload_to=chemin_resultat_job, storage=stockage_jobs, blank=True)
+
+    erreur = models.TextField("Erreur", blank=True)
+
+    cree_par = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        verbose_name="Demandé par"
+    )
+
+    created_at = models.DateTimeField("Demandé le", auto_now_add=True)
+
+    debut = models.DateTimeField("Début", null=True, blank=True)
+
+    fin = models.DateTimeField("Fin", null=True, blank=True)
+
+    reserve_jusqua = models.DateTimeField(
+        "Réservé jusqu'à",
+        null=True,
+        blank=True,
+        help_text="Prolongé à chaque progression ; passé ce délai, un autre worker reprend le travail"
+    )
+
+    def __str__(self):
+        return f"{self.get_type_display()} #{self.pk} - {self.get_statut_display()}"
+
+    def get_type_display(self):
+        """Libellé du type (registre de jobs.py)"""
+        from .jobs import TYPES_JOBS
+        type_job = TYPES_JOBS.get(self.type_job)
+        return type_job.libelle if type_job else self.type_job
+
+    def est_fini(self):
+        return self.statut in (StatutJob.TERMINE, StatutJob.ECHEC)
+
+    class Meta:
+        verbose_name = "Travail en arrière-plan"
+        verbose_name_plural = "Travaux en arrière-plan"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['statut', 'created_at']),
+        ]
+
+
+# ═══════════════════════════════════════════════════
+# ⏰ TÂCHES PÉRIODIQUES
+# ═══════════════════════════════════════════════════
+
+class VerrouTache(models.Model):
+    """
+    État et bail d'une tâche périodique (voir planificateur.py)
+
+    Une ligne par tâche. Un worker ne lance la tâche qu'après avoir pris
+    le bail par un UPDATE conditionnel : si plusieurs planificateurs
+    tournent, un seul exécute chaque tâche.
+    """
+
+    nom = models.CharField("Tâche", max_length=100, primary_key=True)
+
+    proprietaire = models.CharField(
+        "Worker",
+        max_length=100,
+        blank=True,
+        help_text="hôte:pid du worker qui détient (ou détenait) le bail"
+    )
+
+    bail_jusqua = models.DateTimeField(
+        "Bail jusqu'à",
+        null=True,
+        blank=True,
+        help_text="Vide = libre ; expiré = le worker s'est arrêté en cours de tâche"
+    )
+
+    prochaine_execution = models.DateTimeField("Prochaine exécution", default=timezone.now)
+
+    derniere_execution = models.DateTimeField("Dernière exécution", null=True, blank=True)
+
+    derniere_duree = models.FloatField("Durée (s)", null=True, blank=True)
+
+    dernier_resultat = models.CharField("Dernier résultat", max_length=255, blank=True)
+
+    derniere_erreur = models.TextField("Dernière erreur", blank=True)
+
+    nb_executions = models.PositiveIntegerField("Exécutions", default=0)
+
+    def __str__(self):
+        return self.nom
+
+    class Meta:
+        verbose_name = "Tâche périodique"
+        verbose_name_plural = "Tâches périodiques"
+        ordering = ['nom']
+
+
+# ═══════════════════════════════════════════════════
+# 🚦 SALLE D'ATTENTE
+# ═══════════════════════════════════════════════════
+
+class FileAttente(models.Model):
+    """
+    Compteurs de la salle d'attente (voir salle_attente.py)
+
+    Une ligne par file. Tickets et appels avancent par UPDATE avec F() :
+    atomique entre workers, contrairement à incr du cache fichier (un
+    get + set qui distribuerait deux fois le même ticket pendant un pic).
+    """
+
+    nom = models.CharField("File", max_length=50, primary_key=True)
+
+    dernier_ticket = models.PositiveIntegerField("Dernier ticket distribué", default=0)
+
+    dernier_appel = models.PositiveIntegerField("Dernier ticket appelé", default=0)
+
+    def __str__(self):
+        return self.nom
+
+    class Meta:
+        verbose_name = "File d'attente"
+        verbose_name_plural = "Files d'attente"
+
+
+# ═══════════════════════════════════════════════════
+# 🔎 RECHERCHE PLEIN TEXTE
+# ═══════════════════════════════════════════════════
+
+class TypeDocument(models.TextChoices):
+    TOURNOI = 'TOURNOI', 'Tournoi'
+    CANDIDATURE = 'CANDIDATURE', 'Candidature'
+    DECLARATION = 'DECLARATION', 'Déclaration'
+
+
+class DocumentRecherche(models.Model):
+    """
+    Texte indexé d'un tournoi, d'une candidature ou d'une déclaration (voir recherche.py)
+
+    Dénormalisé (nom du club compris) et sans accents, tenu à jour par
+    les signaux. Index plein texte : FULLTEXT sur MySQL, table FTS5 sur
+    SQLite (créés par la migration).
+    """
+
+    type_objet = models.CharField("Type", max_length=20, choices=TypeDocument.choices)
+
+    objet_id = models.PositiveBigIntegerField("Identifiant")
+
+    tournoi = models.ForeignKey(
+        Tournoi,
+        on_delete=models.CASCADE,
+        related_name='documents_recherche',
+        help_text="Tournoi de l'objet (lui-même pour un tournoi) : liens des résultats"
+    )
+
+    titre = models.CharField("Titre", max_length=300)
+
+    texte = models.TextField("Texte indexé")
+
+    updated_at = models.DateTimeField("Mis à jour le", auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_type_objet_display()} #{self.objet_id} - {self.titre}"
+
+    class Meta:
+        verbose_name = "Document de recherche"
+        verbose_name_plural = "Documents de recherche"
+        constraints = [
+            models.UniqueConstraint(fields=['type_objet', 'objet_id'], name='document_recherche_unique'),
+        ]
@@ -0,0 +1,159 @@
+"""
+═══════════════════════════════════════════════════
+⏰ PLANIFICATEUR DE TÂCHES PÉRIODIQUES
+═══════════════════════════════════════════════════
+
+Registre déclaratif : une tâche = une fonction décorée par
+@tache_periodique(nom, intervalle), qui retourne un court résumé.
+Les tâches de l'application sont dans maintenance.py.
+
+La commande planificateur exécute les tâches dues. Avant d'en lancer
+une, le worker prend son bail (ligne VerrouTache) par un UPDATE
+conditionnel : plusieurs planificateurs peuvent tourner, chaque tâche
+n'est exécutée que par un seul.
+"""
+
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import VerrouTache
+
+logger = logging.getLogger('saisie_equipes')
+
+
+class TachePeriodique:
+    def __init__(self, nom, fonction, intervalle, bail, description):
+        self.nom = nom
+        self.fonction = fonction
+        self.intervalle = intervalle
+        self.bail = bail
+        self.description = description
+
+
+TACHES_PERIODIQUES = {}
+
+
+def tache_periodique(nom, intervalle, bail=timedelta(minutes=15)):
+    """
+    Décorateur : enregistre une tâche périodique
+
+    Args:
+        intervalle: timedelta entre deux exécutions
+        bail: durée maximale d'une exécution ; passé ce délai, un autre
+              worker peut reprendre la tâche
+    """
+    def enregistrer(fonction):
+        TACHES_PERIODIQUES[nom] = TachePeriodique(
+            nom, fonction, intervalle, bail, (fonction.__doc__ or '').strip().split('\n')[0]
+        )
+        return fonction
+    return enregistrer
+
+
+def get_proprietaire():
+    """Identifiant du worker : hôte:pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+# ═══════════════════════════════════════════════════
+# 🔒 BAIL
+# ═══════════════════════════════════════════════════
+
+def creer_verrous():
+    """Une ligne VerrouTache par tâche enregistrée (sans écraser les existantes)"""
+    VerrouTache.objects.bulk_create(
+        [VerrouTache(nom=nom) for nom in TACHES_PERIODIQUES],
+        ignore_conflicts=True,
+    )
+
+
+def prendre_bail(tache, proprietaire, forcer=False):
+    """
+    Prend le bail de la tâche si elle est due et libre (un seul UPDATE)
+
+    Args:
+        forcer: ignorer la date de prochaine exécution (le bail reste exigé)
+
+    Returns:
+        bool: True si ce worker doit exécuter la tâche
+    """
+    maintenant = timezone.now()
+    verrous = VerrouTache.objects.filter(nom=tache.nom).filter(
+        Q(bail_jusqua__isnull=True) | Q(bail_jusqua__lt=maintenant)
+    )
+    if not forcer:
+        verrous = verrous.filter(prochaine_execution__lte=maintenant)
+
+    return verrous.update(
+        proprietaire=proprietaire,
+        bail_jusqua=maintenant + tache.bail,
+    ) == 1
+
+
+def rendre_bail(tache, proprietaire, duree, resultat='', erreur=''):
+    """Libère le bail et programme la prochaine exécution"""
+    maintenant = timezone.now()
+    VerrouTache.objects.filter(nom=tache.nom, proprietaire=proprietaire).update(
+        bail_jusqua=None,
+        derniere_execution=maintenant,
+        prochaine_execution=maintenant + tache.intervalle,
+        derniere_duree=round(duree, 3),
+        dernier_resultat=str(resultat)[:255],
+        derniere_erreur=erreur,
+        nb_executions=F('nb_executions') + 1,
+    )
+
+
+# ═══════════════════════════════════════════════════
+# ▶️ EXÉCUTION
+# ═══════════════════════════════════════════════════
+
+def executer_tache(tache, proprietaire=None, forcer=False):
+    """
+    Exécute une tâche si ce worker obtient son bail
+
+    Returns:
+        (bool, str): (exécutée, résumé ou erreur)
+    """
+    proprietaire = proprietaire or get_proprietaire()
+    if not prendre_bail(tache, proprietaire, forcer):
+        return False, ''
+
+    debut = time.perf_counter()
+    try:
+        resultat = tache.fonction()
+    except Exception as e:
+        logger.error(f"Tâche {tache.nom} en échec : {e}", exc_info=True)
+        rendre_bail(tache, proprietaire, time.perf_counter() - debut,
+                    f"❌ {type(e).__name__}: {e}", traceback.format_exc())
+        return True, f"❌ {type(e).__name__}: {e}"
+
+    rendre_bail(tache, proprietaire, time.perf_counter() - debut, resultat or '')
+    return True, resultat or ''
+
+
+def executer_taches_dues(proprietaire=None, noms=None, forcer=False):
+    """
+    Exécute les tâches dues (ou celles nommées)
+
+    Returns:
+        list[(nom, résumé)] des tâches exécutées par ce worker
+    """
+    creer_verrous()
+    proprietaire = proprietaire or get_proprietaire()
+
+    executees = []
+    for nom, tache in TACHES_PERIODIQUES.items():
+        if noms and nom not in noms:
+            continue
+        fait, resume = executer_tache(tache, proprietaire, forcer)
+        if fait:
+            executees.append((nom, resume))
+    return executees
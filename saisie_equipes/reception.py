@@ -0,0 +1,297 @@
+"""
+═══════════════════════════════════════════════════
+📥 RÉCEPTION DIFFÉRÉE DES DÉCLARATIONS
+═══════════════════════════════════════════════════
+
+À l'ouverture des déclarations, chaque envoi coûte une transaction
+complète pendant la requête : réservation des places (UPDATE du
+tournoi), déclaration et équipes, accusé de réception, document de
+recherche, invalidation des synthèses du tournoi.
+
+Mode DECLARATIONS_DIFFEREES (settings) :
+1. Réception : le formulaire entièrement validé est écrit dans une
+   ligne DeclarationRecue (un INSERT) ; le visiteur suit son envoi sur
+   une page « en cours d'enregistrement »
+2. Traitement : la commande traiter_declarations (ou la tâche du
+   planificateur) réserve des lots comme la file d'emails (SKIP LOCKED)
+   et les enregistre en une transaction par lot : places comptées par
+   tournoi sous verrou, bulk_create des déclarations et des équipes,
+   un INSERT d'emails, un INSERT de documents, une invalidation des
+   synthèses par tournoi et par lot (et non par déclaration)
+
+Mêmes règles que Declaration.save() : inscrite tant que la capacité le
+permet et que la liste d'attente est vide, sinon en liste d'attente,
+dans l'ordre d'arrivée.
+
+Un lot en échec est repris déclaration par déclaration : une ligne en
+erreur ne bloque pas les autres ; elle est retentée, puis passe en ECHEC.
+"""
+
+import logging
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, prefetch_related_objects
+from django.utils import timezone
+
+from .emails import mettre_en_file
+from .models import (
+    Declaration, DeclarationRecue, Equipe, StatutDeclaration, StatutReception, Tournoi,
+)
+from .recherche import document_declaration, enregistrer_documents
+from .syntheses import invalider_tournois_apres_commit
+
+logger = logging.getLogger('saisie_equipes')
+
+# Un lot réservé mais jamais terminé (worker arrêté) redevient disponible après ce délai
+DUREE_RESERVATION = timedelta(minutes=5)
+
+# Au-delà, une déclaration en erreur passe en ECHEC (à remettre en file depuis l'admin)
+MAX_TENTATIVES = 3
+DELAI_ESSAI = timedelta(minutes=1)
+
+
+def est_active():
+    return getattr(settings, 'DECLARATIONS_DIFFEREES', False)
+
+
+def get_taille_lot():
+    return getattr(settings, 'DECLARATIONS_TAILLE_LOT', 20)
+
+
+# ═══════════════════════════════════════════════════
+# 📥 RÉCEPTION (PENDANT LA REQUÊTE)
+# ═══════════════════════════════════════════════════
+
+def recevoir(form):
+    """
+    Met en file une déclaration validée (un seul INSERT)
+
+    Args:
+        form: DeclarationForm dont is_valid() a réussi
+
+    Returns:
+        DeclarationRecue (celle déjà reçue en cas de double envoi)
+    """
+    donnees = form.cleaned_data
+    poules = donnees.get('poules_equipes', [])
+    cle = form.get_cle_soumission() or uuid.uuid4()
+
+    try:
+        # Savepoint : un double envoi laisse la transaction utilisable
+        with transaction.atomic():
+            return DeclarationRecue.objects.create(
+                tournoi=donnees['tournoi'],
+                club=donnees['club'],
+                nombre_equipes=donnees['nombre_equipes'],
+                equipes=[
+                    [nom, poules[ordre] if ordre < len(poules) else '']
+                    for ordre, nom in enumerate(donnees.get('noms_equipes', []))
+                ],
+                declarant=donnees['declarant'],
+                email_club=donnees['email_club'],
+                remarques=donnees.get('remarques', ''),
+                cle_soumission=cle,
+            )
+    except IntegrityError:
+        existante = DeclarationRecue.objects.filter(cle_soumission=cle).first()
+        if existante is None:
+            raise
+        return existante
+
+
+# ═══════════════════════════════════════════════════
+# ⚙️ TRAITEMENT (HORS REQUÊTE)
+# ═══════════════════════════════════════════════════
+
+def reserver_lot(taille=None):
+    """
+    Réserve les prochaines déclarations reçues, dans l'ordre d'arrivée
+
+    Returns:
+        list[DeclarationRecue]
+    """
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        lot = list(
+            DeclarationRecue.objects.select_for_update(skip_locked=True).filter(
+                statut__in=[StatutReception.EN_ATTENTE, StatutReception.EN_COURS],
+                prochain_essai__lte=maintenant,
+            ).order_by('pk')[:taille or get_taille_lot()]
+        )
+        if lot:
+            DeclarationRecue.objects.filter(pk__in=[r.pk for r in lot]).update(
+                statut=StatutReception.EN_COURS,
+                prochain_essai=maintenant + DUREE_RESERVATION,
+                tentatives=F('tentatives') + 1,
+            )
+            for recue in lot:
+                recue.tentatives += 1
+
+    return lot
+
+
+def _enregistrer(lot):
+    """Crée les déclarations d'un lot en une transaction (voir l'en-tête du module)"""
+    resultat = Counter()
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        # Encore à nous : une réservation expirée a pu être reprise par un autre worker
+        a_traiter = set(
+            DeclarationRecue.objects.select_for_update().filter(
+                pk__in=[r.pk for r in lot], statut=StatutReception.EN_COURS,
+            ).values_list('pk', flat=True)
+        )
+        lot = [r for r in lot if r.pk in a_traiter]
+        if not lot:
+            return resultat
+
+        # Déjà enregistrée par la voie directe (même clé de soumission) : simplement rattachée
+        existantes = dict(
+            Declaration.objects.filter(
+                cle_soumission__in=[r.cle_soumission for r in lot]
+            ).values_list('cle_soumission', 'pk')
+        )
+
+        # Même verrou que Declaration.retirer() / promouvoir_liste_attente()
+        tournoi_ids = sorted({r.tournoi_id for r in lot})
+        tournois = {
+            t.pk: t for t in Tournoi.objects.select_for_update().filter(pk__in=tournoi_ids).order_by('pk')
+        }
+        avec_liste_attente = set(
+            Declaration.objects.filter(
+                tournoi_id__in=tournoi_ids, statut=StatutDeclaration.LISTE_ATTENTE,
+            ).values_list('tournoi_id', flat=True).distinct()
+        )
+        places = {
+            t.pk: None if t.capacite_max is None else t.capacite_max - t.nb_equipes_inscrites
+            for t in tournois.values()
+        }
+
+        reservees = Counter()
+        nouvelles = []
+        for recue in lot:
+            if recue.cle_soumission in existantes:
+                continue
+
+            tournoi_id = recue.tournoi_id
+            libres = places[tournoi_id]
+            if tournoi_id not in avec_liste_attente and (libres is None or recue.nombre_equipes <= libres):
+                statut = StatutDeclaration.INSCRITE
+                reservees[tournoi_id] += recue.nombre_equipes
+                if libres is not None:
+                    places[tournoi_id] -= recue.nombre_equipes
+            else:
+                # FIFO : les suivantes ne passent pas devant
+                statut = StatutDeclaration.LISTE_ATTENTE
+                avec_liste_attente.add(tournoi_id)
+
+            nouvelles.append((recue, Declaration(
+                tournoi=tournois[tournoi_id],
+                club_id=recue.club_id,
+                nombre_equipes=recue.nombre_equipes,
+                declarant=recue.declarant,
+                email_club=recue.email_club,
+                remarques=recue.remarques,
+                statut=statut,
+                cle_soumission=recue.cle_soumission,
+            )))
+            resultat['inscrites' if statut == StatutDeclaration.INSCRITE else 'liste_attente'] += 1
+
+        for tournoi_id, nb in reservees.items():
+            Tournoi.objects.filter(pk=tournoi_id).update(nb_equipes_inscrites=F('nb_equipes_inscrites') + nb)
+
+        declarations = Declaration.objects.bulk_create([declaration for _, declaration in nouvelles])
+        if any(d.pk is None for d in declarations):
+            # MySQL ne renvoie pas les clés des lignes insérées
+            cles = dict(
+                Declaration.objects.filter(
+                    cle_soumission__in=[d.cle_soumission for d in declarations]
+                ).values_list('cle_soumission', 'pk')
+            )
+            for declaration in declarations:
+                declaration.pk = cles[declaration.cle_soumission]
+
+        Equipe.objects.bulk_create([
+            Equipe(declaration=declaration, tournoi_id=declaration.tournoi_id, nom=nom, poule=poule, ordre=ordre)
+            for recue, declaration in nouvelles
+            for ordre, (nom, poule) in enumerate(recue.equipes)
+        ])
+
+        # Accusés de réception et documents de recherche : un INSERT chacun
+        prefetch_related_objects(declarations, 'club', 'equipes')
+        mettre_en_file([
+            ('declaration_recue', d.email_club, {'declaration': d, 'tournoi': d.tournoi})
+            for d in declarations
+        ])
+        enregistrer_documents([document_declaration(d) for d in declarations])
+
+        for recue, declaration in nouvelles:
+            recue.declaration_id = declaration.pk
+        for recue in lot:
+            if recue.cle_soumission in existantes:
+                recue.declaration_id = existantes[recue.cle_soumission]
+                resultat['deja_enregistrees'] += 1
+            recue.statut = StatutReception.TRAITEE
+            recue.traitee_le = maintenant
+            recue.derniere_erreur = ''
+        DeclarationRecue.objects.bulk_update(lot, ['statut', 'declaration', 'traitee_le', 'derniere_erreur'])
+
+        # bulk_create ne déclenche pas les signaux : une invalidation par tournoi
+        invalider_tournois_apres_commit(*tournoi_ids)
+
+    return resultat
+
+
+def _echec(recue, erreur):
+    """Déclaration en erreur : retentée plus tard, puis ECHEC"""
+    definitif = recue.tentatives >= MAX_TENTATIVES
+    DeclarationRecue.objects.filter(pk=recue.pk).update(
+        statut=StatutReception.ECHEC if definitif else StatutReception.EN_ATTENTE,
+        prochain_essai=timezone.now() + DELAI_ESSAI * recue.tentatives,
+        derniere_erreur=f"{type(erreur).__name__}: {erreur}",
+    )
+    logger.error(
+        f"Déclaration reçue {recue.pk} non enregistrée (essai {recue.tentatives}) : {erreur}",
+        exc_info=definitif,
+    )
+
+
+def traiter_lot(lot):
+    """
+    Enregistre un lot réservé par reserver_lot()
+
+    Returns:
+        Counter: inscrites, liste_attente, deja_enregistrees, echecs
+    """
+    try:
+        return _enregistrer(lot)
+    except Exception as e:
+        if len(lot) == 1:
+            _echec(lot[0], e)
+            return Counter(echecs=1)
+        logger.warning(f"Lot de {len(lot)} déclarations reçues en échec ({e}) : reprise une par une")
+
+    resultat = Counter()
+    for recue in lot:
+        resultat.update(traiter_lot([recue]))
+    return resultat
+
+
+def traiter_file(taille=None):
+    """
+    Vide la file des déclarations reçues, lot par lot
+
+    Returns:
+        Counter: inscrites, liste_attente, deja_enregistrees, echecs, lots
+    """
+    resultat = Counter()
+    while lot := reserver_lot(taille):
+        resultat.update(traiter_lot(lot))
+        resultat['lots'] += 1
+    return resultat
@@ -0,0 +1,288 @@
+"""
+═══════════════════════════════════════════════════
+🔎 RECHERCHE PLEIN TEXTE (STAFF)
+═══════════════════════════════════════════════════
+
+Un document par tournoi, candidature et déclaration (DocumentRecherche) :
+le texte recherchable, nom du club compris, sans accents et en
+minuscules. Les filtres « q » des listes staff et la recherche globale
+interrogent cette seule table, indexée :
+- MySQL : index FULLTEXT, MATCH ... AGAINST en mode booléen
+- SQLite : table FTS5 (triggers), classement bm25
+- autres bases : LIKE sur le texte plié (pas d'index)
+
+« reunion » trouve « Réunion » : requête et documents sont pliés de la
+même façon. Chaque mot de la requête est un préfixe obligatoire.
+
+Les documents sont remplis par la migration 0031, puis tenus à jour par
+les signaux (signals.py). Si des données ont été écrites en masse :
+    python manage.py reindexer_recherche
+"""
+
+import re
+import unicodedata
+
+from django.db import connection
+
+from .models import Candidature, Declaration, DocumentRecherche, Tournoi, TypeDocument
+
+TABLE_DOCUMENTS = DocumentRecherche._meta.db_table
+
+# Résultats au plus par recherche globale, et par filtre « q » d'une liste
+LIMITE_RESULTATS = 200
+LIMITE_FILTRE = 5000
+
+# Mots de la requête au plus (les suivants sont ignorés)
+MAX_TERMES = 8
+
+# Longueur minimale d'un mot indexé par MySQL (innodb_ft_min_token_size)
+LONGUEUR_MIN_MYSQL = 3
+
+TAILLE_LOT_INDEXATION = 500
+
+
+def plier(texte):
+    """Minuscules sans accents : « Saint-Denis Réunion » → « saint-denis reunion »"""
+    decompose = unicodedata.normalize('NFKD', texte or '')
+    return ''.join(c for c in decompose if not unicodedata.combining(c)).lower()
+
+
+def get_termes(requete):
+    """Mots de la requête, pliés"""
+    return re.findall(r'\w+', plier(requete))[:MAX_TERMES]
+
+
+# ═══════════════════════════════════════════════════
+# 📝 DOCUMENTS
+# ═══════════════════════════════════════════════════
+
+def _document(type_objet, objet, tournoi_id, titre, morceaux):
+    return DocumentRecherche(
+        type_objet=type_objet,
+        objet_id=objet.pk,
+        tournoi_id=tournoi_id,
+        titre=titre[:300],
+        texte=plier(' '.join(m for m in morceaux if m)),
+    )
+
+
+def libelle_tournoi(tournoi):
+    """Tournoi dans le titre d'une candidature / déclaration (sans l'organisateur, qui change)"""
+    zone = f" {tournoi.get_zone_display()}" if tournoi.zone else ""
+    return (
+        f"{tournoi.date:%d/%m/%Y} - {tournoi.get_categorie_age_display()} "
+        f"{tournoi.get_sexe_display()}{zone}"
+    )
+
+
+def document_tournoi(tournoi):
+    return _document(
+        TypeDocument.TOURNOI, tournoi, tournoi.pk, str(tournoi),
+        [
+            tournoi.titre,
+            tournoi.lieu,
+            tournoi.categorie_age,
+            tournoi.get_categorie_age_display(),
+            tournoi.get_sexe_display(),
+            tournoi.get_zone_display() if tournoi.zone else '',
+            tournoi.club_organisateur.nom if tournoi.club_organisateur else '',
+            tournoi.remarques,
+        ],
+    )
+
+
+def document_candidature(candidature):
+    return _document(
+        TypeDocument.CANDIDATURE, candidature, candidature.tournoi_id,
+        f"{candidature.club.nom} → {libelle_tournoi(candidature.tournoi)}",
+        [candidature.club.nom, candidature.declarant, candidature.lieu, candidature.remarques],
+    )
+
+
+def document_declaration(declaration):
+    return _document(
+        TypeDocument.DECLARATION, declaration, declaration.tournoi_id,
+        f"{declaration.club.nom} ({declaration.declarant}) → {libelle_tournoi(declaration.tournoi)}",
+        [declaration.club.nom, declaration.declarant, declaration.remarques],
+    )
+
+
+# Par type : (requête avec les jointures du document, constructeur)
+SOURCES = {
+    TypeDocument.TOURNOI: (
+        lambda: Tournoi.objects.select_related('club_organisateur'),
+        document_tournoi,
+    ),
+    TypeDocument.CANDIDATURE: (
+        lambda: Candidature.objects.select_related('club', 'tournoi'),
+        document_candidature,
+    ),
+    TypeDocument.DECLARATION: (
+        lambda: Declaration.objects.select_related('club', 'tournoi'),
+        document_declaration,
+    ),
+}
+
+
+def enregistrer_documents(documents):
+    """Insère ou met à jour les documents (un seul INSERT ... ON CONFLICT / ON DUPLICATE KEY)"""
+    if documents:
+        DocumentRecherche.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['type_objet', 'objet_id'],
+            update_fields=['tournoi', 'titre', 'texte', 'updated_at'],
+        )
+
+
+def indexer(type_objet, ids):
+    """(Ré)indexe des objets d'un type, par identifiants"""
+    requete, construire = SOURCES[type_objet]
+    enregistrer_documents([construire(objet) for objet in requete().filter(pk__in=list(ids))])
+
+
+def desindexer(type_objet, ids):
+    DocumentRecherche.objects.filter(type_objet=type_objet, objet_id__in=list(ids)).delete()
+
+
+def indexer_tournoi(tournoi_id):
+    """Le tournoi figure dans le titre des documents de ses candidatures et déclarations"""
+    indexer(TypeDocument.TOURNOI, [tournoi_id])
+    indexer(TypeDocument.CANDIDATURE, Candidature.objects.filter(tournoi_id=tournoi_id).values_list('pk', flat=True))
+    indexer(TypeDocument.DECLARATION, Declaration.objects.filter(tournoi_id=tournoi_id).values_list('pk', flat=True))
+
+
+def indexer_club(club_id):
+    """Le nom du club figure dans les documents de ses tournois, candidatures et déclarations"""
+    indexer(TypeDocument.TOURNOI, Tournoi.objects.filter(club_organisateur_id=club_id).values_list('pk', flat=True))
+    indexer(TypeDocument.CANDIDATURE, Candidature.objects.filter(club_id=club_id).values_list('pk', flat=True))
+    indexer(TypeDocument.DECLARATION, Declaration.objects.filter(club_id=club_id).values_list('pk', flat=True))
+
+
+def reindexer_tout(progression=None):
+    """
+    Reconstruit tous les documents (par lots), et supprime les orphelins
+
+    Returns:
+        dict: {type_objet: nombre de documents}
+    """
+    comptes = {}
+    for type_objet, (requete, construire) in SOURCES.items():
+        ids = set()
+        lot = []
+        for objet in requete().order_by('pk').iterator(chunk_size=TAILLE_LOT_INDEXATION):
+            lot.append(construire(objet))
+            ids.add(objet.pk)
+            if len(lot) >= TAILLE_LOT_INDEXATION:
+                enregistrer_documents(lot)
+                lot = []
+        enregistrer_documents(lot)
+
+        DocumentRecherche.objects.filter(type_objet=type_objet).exclude(objet_id__in=ids).delete()
+        comptes[type_objet] = len(ids)
+        if progression:
+            progression(type_objet, len(ids))
+    return comptes
+
+
+# ═══════════════════════════════════════════════════
+# 🔎 RECHERCHE
+# ═══════════════════════════════════════════════════
+
+def _rechercher_sqlite(termes, types, limite):
+    expression = ' '.join(f'"{terme}"*' for terme in termes)
+    filtre_types = f"AND d.type_objet IN ({', '.join(['%s'] * len(types))})" if types else ''
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT d.type_objet, d.objet_id, -bm25({TABLE_DOCUMENTS}_fts) AS score "
+            f"FROM {TABLE_DOCUMENTS}_fts JOIN {TABLE_DOCUMENTS} d ON d.id = {TABLE_DOCUMENTS}_fts.rowid "
+            f"WHERE {TABLE_DOCUMENTS}_fts MATCH %s {filtre_types} "
+            f"ORDER BY score DESC LIMIT %s",
+            [expression, *types, limite],
+        )
+        return cursor.fetchall()
+
+
+def _rechercher_mysql(termes, types, limite):
+    indexables = [terme for terme in termes if len(terme) >= LONGUEUR_MIN_MYSQL]
+    if not indexables:
+        return None
+
+    expression = ' '.join(f'+{terme}*' for terme in indexables)
+    filtre_types = f"AND type_objet IN ({', '.join(['%s'] * len(types))})" if types else ''
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT type_objet, objet_id, MATCH(texte) AGAINST (%s IN BOOLEAN MODE) AS score "
+            f"FROM {TABLE_DOCUMENTS} "
+            f"WHERE MATCH(texte) AGAINST (%s IN BOOLEAN MODE) {filtre_types} "
+            f"ORDER BY score DESC LIMIT %s",
+            [expression, expression, *types, limite],
+        )
+        lignes = cursor.fetchall()
+
+    # Mots trop courts pour l'index : vérifiés sur le texte des résultats
+    courts = [terme for terme in termes if len(terme) < LONGUEUR_MIN_MYSQL]
+    if courts and lignes:
+        return _filtrer_mots_courts(lignes, courts)
+    return lignes
+
+
+def _filtrer_mots_courts(lignes, courts):
+    textes = dict(
+        ((type_objet, objet_id), texte)
+        for type_objet, objet_id, texte in DocumentRecherche.objects.filter(
+            objet_id__in=[objet_id for _, objet_id, _ in lignes]
+        ).values_list('type_objet', 'objet_id', 'texte')
+    )
+    return [
+        ligne for ligne in lignes
+        if all(
+            re.search(rf'\b{re.escape(terme)}', textes.get((ligne[0], ligne[1]), ''))
+            for terme in courts
+        )
+    ]
+
+
+def _rechercher_like(termes, types, limite):
+    documents = DocumentRecherche.objects.all()
+    if types:
+        documents = documents.filter(type_objet__in=types)
+    for terme in termes:
+        documents = documents.filter(texte__contains=terme)
+    return [
+        (type_objet, objet_id, 0.0)
+        for type_objet, objet_id in documents.order_by('-updated_at').values_list(
+            'type_objet', 'objet_id'
+        )[:limite]
+    ]
+
+
+def rechercher(requete, types=None, limite=LIMITE_RESULTATS):
+    """
+    Recherche plein texte, résultats classés par pertinence
+
+    Args:
+        types: types de documents (TypeDocument), tous si None
+
+    Returns:
+        list[(type_objet, objet_id, score)], les plus pertinents d'abord
+    """
+    termes = get_termes(requete)
+    if not termes:
+        return []
+    types = list(types or [])
+
+    lignes = None
+    if connection.vendor == 'sqlite':
+        lignes = _rechercher_sqlite(termes, types, limite)
+    elif connection.vendor == 'mysql':
+        lignes = _rechercher_mysql(termes, types, limite)
+
+    if lignes is None:
+        lignes = _rechercher_like(termes, types, limite)
+    return [(type_objet, objet_id, float(score or 0)) for type_objet, objet_id, score in lignes]
+
+
+def ids_correspondants(requete, type_objet, limite=LIMITE_FILTRE):
+    """Identifiants des objets d'un type qui correspondent (filtre « q » d'une liste)"""
+    return [objet_id for _, objet_id, _ in rechercher(requete, [type_objet], limite)]
@@ -0,0 +1,117 @@
+"""
+═══════════════════════════════════════════════════
+📖 LECTURES SUR LA RÉPLIQUE
+═══════════════════════════════════════════════════
+
+Les pages publiques en lecture seule (décorateur @using_replica, voir
+decorators.py) lisent sur l'alias 'replica' ; tout le reste (écritures,
+staff, sessions, authentification) reste sur 'default'.
+
+- Activé par REPLICA_LECTURE = True (et un alias 'replica' dans DATABASES)
+- Seuls les modèles de saisie_equipes sont lus sur la réplique : une
+  session ou un utilisateur en retard de réplication ferait plus de mal
+  que de bien
+- Lire ses propres écritures : après un POST, un cookie court
+  (REPLICA_DELAI_COHERENCE secondes) renvoie les lectures du visiteur
+  sur 'default', le temps que la réplique rattrape
+
+En local, deux bases SQLite :
+    cp db.sqlite3 db_replica.sqlite3
+    REPLICA=1 python manage.py runserver
+(la copie ne suit pas : une déclaration saisie n'apparaît dans la
+consultation qu'à la copie suivante, passé le délai du cookie)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+ALIAS_REPLICA = 'replica'
+
+COOKIE_ECRITURE = 'ecriture_recente'
+
+# Vrai pendant l'exécution d'une vue @using_replica
+_lecture_replica = ContextVar('lecture_replica', default=False)
+
+
+@contextmanager
+def lectures_sur_replica(actif=True):
+    """Les lectures du bloc vont sur la réplique (actif=False : sur 'default')"""
+    jeton = _lecture_replica.set(actif)
+    try:
+        yield
+    finally:
+        _lecture_replica.reset(jeton)
+
+
+def sur_base_principale():
+    """Les lectures du bloc vont sur 'default', même dans une vue @using_replica"""
+    return lectures_sur_replica(False)
+
+
+def ecriture_recente(request):
+    """True si le visiteur a écrit il y a moins de REPLICA_DELAI_COHERENCE secondes"""
+    try:
+        horodatage = float(request.COOKIES.get(COOKIE_ECRITURE, ''))
+    except ValueError:
+        return False
+    return time.time() - horodatage < settings.REPLICA_DELAI_COHERENCE
+
+
+# ═══════════════════════════════════════════════════
+# 🧭 ROUTEUR
+# ═══════════════════════════════════════════════════
+
+class RouteurReplica:
+    """DATABASE_ROUTERS : lectures des modèles de l'application vers la réplique"""
+
+    def db_for_read(self, model, **hints):
+        if (
+            settings.REPLICA_LECTURE
+            and _lecture_replica.get()
+            and model._meta.app_label == 'saisie_equipes'
+        ):
+            return ALIAS_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplique est une copie de 'default' : mêmes lignes, mêmes clés
+        if {obj1._state.db, obj2._state.db} <= {'default', ALIAS_REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Le schéma de la réplique vient de la réplication (ou de la copie)
+        if db == ALIAS_REPLICA:
+            return False
+        return None
+
+
+# ═══════════════════════════════════════════════════
+# 🍪 LIRE SES PROPRES ÉCRITURES
+# ═══════════════════════════════════════════════════
+
+class CoherenceReplicaMiddleware:
+    """Après un POST (PUT, DELETE...), pose le cookie qui écarte la réplique"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if settings.REPLICA_LECTURE and request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                COOKIE_ECRITURE,
+                str(round(time.time(), 3)),
+                max_age=settings.REPLICA_DELAI_COHERENCE,
+                httponly=True,
+                samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
@@ -0,0 +1,240 @@
+"""
+═══════════════════════════════════════════════════
+🧯 MODE DÉGRADÉ : DERNIÈRES PAGES CONNUES
+═══════════════════════════════════════════════════
+
+Quand MySQL sature ou redémarre, les pages publiques répondaient 500.
+
+@avec_instantane sur les pages publiques en lecture seule :
+- un rendu réussi (visiteur anonyme, code 200, sans message affiché)
+  est gardé en cache, au plus une fois par minute : le HTML et son
+  heure (instantané)
+- si la vue lève une erreur de base (OperationalError,
+  InterfaceError), l'instantané est servi avec un bandeau « données
+  du <heure> » ; sans instantané, une page 503 légère
+- un disjoncteur partagé (cache) compte les erreurs et les pages trop
+  lentes (SEUIL_LENTEUR) : après SEUIL_ECHECS sur FENETRE_ECHECS, il
+  s'ouvre et les pages sont servies depuis les instantanés SANS
+  interroger la base pendant DUREE_OUVERTURE ; ensuite, une seule
+  requête à la fois vérifie si la base répond (demi-ouvert)
+
+Ni l'instantané ni la page 503 ne touchent la base (pas de contexte
+utilisateur, et la session du visiteur n'est pas réenregistrée malgré
+SESSION_SAVE_EVERY_REQUEST : voir servir_instantane).
+"""
+
+import logging
+import time
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .mesures import incrementer
+
+logger = logging.getLogger('saisie_equipes')
+
+# Erreurs d'une base indisponible ou saturée
+ERREURS_BASE = (OperationalError, InterfaceError)
+
+# Au-delà (secondes), un rendu réussi compte comme un échec pour le disjoncteur
+SEUIL_LENTEUR = 5.0
+
+# Échecs sur la fenêtre qui ouvrent le disjoncteur
+SEUIL_ECHECS = 3
+FENETRE_ECHECS = 60
+
+# Secondes sans requête à la base une fois le disjoncteur ouvert
+DUREE_OUVERTURE = 30
+
+# Durée réservée à la requête qui teste la base (demi-ouvert)
+DUREE_ESSAI = 10
+
+# Un instantané est renouvelé au plus une fois par intervalle (secondes)
+INTERVALLE_INSTANTANE = 60
+
+COMPTEURS = ('echecs', 'ouvertures', 'instantanes_servis', 'indisponibles')
+
+
+def _compter(nom):
+    incrementer(f'resilience:compteur:{nom}')
+
+
+# ═══════════════════════════════════════════════════
+# ⚡ DISJONCTEUR
+# ═══════════════════════════════════════════════════
+
+class Disjoncteur:
+    """
+    Disjoncteur partagé par tous les workers (état en cache)
+
+    Fermé : les requêtes passent. Ouvert : aucune pendant DUREE_OUVERTURE.
+    Demi-ouvert : une requête à la fois essaie ; sa réussite referme,
+    son échec rouvre.
+    """
+
+    def __init__(self, nom):
+        self.cle_echecs = f'disjoncteur:{nom}:echecs'
+        self.cle_ouvert = f'disjoncteur:{nom}:ouvert'    # fin de l'ouverture (timestamp)
+        self.cle_essai = f'disjoncteur:{nom}:essai'
+
+    def etat(self):
+        """'ferme', 'ouvert' ou 'demi_ouvert'"""
+        fin = cache.get(self.cle_ouvert)
+        if fin is None:
+            return 'ferme'
+        return 'ouvert' if time.time() < fin else 'demi_ouvert'
+
+    def autoriser(self):
+        """
+        La requête peut-elle interroger la base ?
+
+        Returns:
+            (bool, str): (autorisée, état au moment de la décision)
+        """
+        etat = self.etat()
+        if etat == 'ferme':
+            return True, etat
+        if etat == 'demi_ouvert' and cache.add(self.cle_essai, 1, DUREE_ESSAI):
+            return True, etat
+        return False, etat
+
+    def succes(self, etat):
+        if etat == 'demi_ouvert':
+            cache.delete_many([self.cle_ouvert, self.cle_essai, self.cle_echecs])
+            logger.warning("Disjoncteur refermé : la base répond de nouveau")
+
+    def echec(self, etat):
+        _compter('echecs')
+        if etat == 'demi_ouvert':
+            self.ouvrir()
+            return
+
+        # get + set plutôt qu'incr : incr de certains caches remet le délai d'expiration par défaut
+        echecs = cache.get(self.cle_echecs, 0) + 1
+        cache.set(self.cle_echecs, echecs, FENETRE_ECHECS)
+        if echecs >= SEUIL_ECHECS:
+            self.ouvrir()
+
+    def ouvrir(self):
+        cache.set(self.cle_ouvert, time.time() + DUREE_OUVERTURE, None)
+        cache.delete_many([self.cle_echecs, self.cle_essai])
+        _compter('ouvertures')
+        logger.error(f"Disjoncteur ouvert : pages publiques servies sans la base pendant {DUREE_OUVERTURE} s")
+
+
+disjoncteur_base = Disjoncteur('base')
+
+
+# ═══════════════════════════════════════════════════
+# 📸 INSTANTANÉS
+# ═══════════════════════════════════════════════════
+
+BANDEAU = (
+    '<div class="messages-container"><div class="alert alert-warning">'
+    '⚠️ Service ralenti : données du {heure}, sans doute déjà un peu anciennes.'
+    '</div></div>'
+)
+
+# Le bandeau est inséré juste après cette balise de base.html
+ANCRE_BANDEAU = '<main role="main">'
+
+
+def _cle_instantane(request):
+    return f'resilience:instantane:{request.path}'
+
+
+def enregistrer_instantane(request, response):
+    # Pas une écriture de cache par page vue : une par INTERVALLE_INSTANTANE
+    if not cache.add(f'{_cle_instantane(request)}:recent', 1, INTERVALLE_INSTANTANE):
+        return
+    cache.set(_cle_instantane(request), {
+        'contenu': response.content,
+        'type': response.get('Content-Type'),
+        'date': timezone.now(),
+    }, None)
+
+
+def servir_instantane(request):
+    """Dernier rendu réussi avec le bandeau « données du... », ou une page 503"""
+    # Sessions en base et SESSION_SAVE_EVERY_REQUEST : SessionMiddleware
+    # enregistrerait la session du visiteur sur ce 200 (OperationalError,
+    # donc une 500). Sans request.session, il laisse la réponse telle quelle
+    # (cookie inchangé : la session reste valable).
+    if hasattr(request, 'session'):
+        del request.session
+
+    instantane = cache.get(_cle_instantane(request))
+    if instantane is None:
+        _compter('indisponibles')
+        response = HttpResponse(render_to_string('saisie_equipes/indisponible.html'), status=503)
+        response['Retry-After'] = str(DUREE_OUVERTURE)
+        return response
+
+    _compter('instantanes_servis')
+    heure = timezone.localtime(instantane['date']).strftime('%d/%m/%Y à %H:%M')
+    ancre = ANCRE_BANDEAU.encode()
+    contenu = instantane['contenu'].replace(ancre, ancre + BANDEAU.format(heure=heure).encode(), 1)
+
+    response = HttpResponse(contenu, content_type=instantane['type'])
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def _reutilisable(request, response):
+    """Rendu identique pour tout visiteur : anonyme, 200, aucun message affiché"""
+    return (
+        response.status_code == 200
+        and not request.user.is_authenticated
+        and not getattr(get_messages(request), 'used', False)
+    )
+
+
+def avec_instantane(view_func):
+    """
+    Page publique en lecture seule servie depuis son dernier rendu
+    quand la base ne répond pas (à placer au-dessus de @using_replica)
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        autorisee, etat = disjoncteur_base.autoriser()
+        if not autorisee:
+            return servir_instantane(request)
+
+        debut = time.perf_counter()
+        try:
+            response = view_func(request, *args, **kwargs)
+        except ERREURS_BASE as e:
+            logger.error(f"Base indisponible pour {request.path} : {e}")
+            disjoncteur_base.echec(etat)
+            return servir_instantane(request)
+
+        if time.perf_counter() - debut > SEUIL_LENTEUR:
+            # Page servie, mais la base peine : le disjoncteur en tient compte
+            disjoncteur_base.echec(etat)
+        else:
+            disjoncteur_base.succes(etat)
+
+        if _reutilisable(request, response):
+            enregistrer_instantane(request, response)
+        return response
+
+    return wrapper
+
+
+def statistiques():
+    """Compteurs et état du disjoncteur, pour la page staff « Métriques »"""
+    valeurs = cache.get_many([f'resilience:compteur:{nom}' for nom in COMPTEURS])
+    resultat = {nom: valeurs.get(f'resilience:compteur:{nom}', 0) for nom in COMPTEURS}
+    resultat.update(
+        etat=disjoncteur_base.etat(),
+        seuil_echecs=SEUIL_ECHECS,
+        fenetre_echecs=FENETRE_ECHECS,
+        duree_ouverture=DUREE_OUVERTURE,
+        seuil_lenteur=SEUIL_LENTEUR,
+    )
+    return resultat
@@ -0,0 +1,253 @@
+"""
+═══════════════════════════════════════════════════
+🚦 SALLE D'ATTENTE (PICS DE TRAFIC)
+═══════════════════════════════════════════════════
+
+À la publication du calendrier, tous les clubs ouvrent /declaration/ en
+même temps : chaque page construit les querysets du formulaire et la
+carte des poules, et les connexions MySQL s'épuisent.
+
+Contrôle d'admission sur quelques routes (SALLE_ATTENTE_ROUTES) :
+- au plus N pages en cours de calcul : N jetons en cache (cache.add,
+  expirés après DUREE_JETON si un worker meurt avant de le rendre)
+- au-delà, un ticket numéroté (cookie signé) et une page d'attente
+  légère (503 + Retry-After) qui se recharge toute seule
+- tickets et appels : ligne FileAttente avancée par UPDATE avec F()
+  (un ticket n'est jamais distribué deux fois, même avec le cache
+  fichier), recopiée en cache : une fois le ticket distribué, la page
+  d'attente ne fait plus de requête SQL
+- file FIFO : chaque jeton rendu appelle le ticket suivant, et seul un
+  ticket appelé peut prendre un jeton ; un appelé qui ne se présente
+  pas dans DELAI_APPEL laisse sa place aux suivants
+- un nouveau venu ne double pas la file : s'il y a des tickets en
+  attente (ou appelés depuis peu), il en prend un lui aussi
+- les POST ne sont jamais refoulés (la saisie du visiteur serait perdue)
+- le staff passe toujours
+
+Réglages (activation, N) modifiables par le staff (page « Métriques »),
+gardés en cache ; à défaut, ceux de settings.
+"""
+
+import random
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Least
+from django.shortcuts import render
+from django.urls import Resolver404, resolve
+
+from .mesures import incrementer
+from .models import FileAttente
+
+FILE = 'declaration'                       # ligne FileAttente
+CLE_REGLAGES = 'salle_attente:reglages'
+CLE_TICKETS = 'salle_attente:tickets'      # dernier ticket distribué (copie de FileAttente)
+CLE_APPEL = 'salle_attente:appel'          # dernier ticket appelé (copie de FileAttente)
+CLE_APPELE_LE = 'salle_attente:appele_le'  # heure du dernier appel
+COOKIE_TICKET = 'salle_attente_ticket'
+
+# Durée de vie d'un jeton : au-delà, une page est considérée terminée
+DUREE_JETON = 30
+
+# Secondes entre deux essais de la page d'attente
+DELAI_ESSAI = 5
+
+# Un ticket appelé a ce délai pour se présenter (deux essais de sa page d'attente)
+DELAI_APPEL = 2 * DELAI_ESSAI
+
+# Copie en cache de la file, cookie du ticket : oubliés après une heure sans pic
+DUREE_FILE = 3600
+
+COMPTEURS = ('admises', 'attentes')
+
+
+def get_reglages():
+    """{'active': bool, 'max_simultanes': int}"""
+    reglages = cache.get(CLE_REGLAGES)
+    if reglages is None:
+        reglages = {
+            'active': settings.SALLE_ATTENTE_ACTIVE,
+            'max_simultanes': settings.SALLE_ATTENTE_MAX_SIMULTANES,
+        }
+    return reglages
+
+
+def enregistrer_reglages(active, max_simultanes):
+    cache.set(CLE_REGLAGES, {'active': bool(active), 'max_simultanes': max(1, int(max_simultanes))}, None)
+
+
+def _cles_jetons(nb):
+    return [f'salle_attente:jeton:{i}' for i in range(nb)]
+
+
+def prendre_jeton(max_simultanes):
+    """Clé du jeton obtenu, ou None si tous sont pris (une lecture groupée, puis add)"""
+    cles = _cles_jetons(max_simultanes)
+    pris = cache.get_many(cles)
+    libres = [cle for cle in cles if cle not in pris]
+    random.shuffle(libres)
+    for cle in libres:
+        if cache.add(cle, time.time(), DUREE_JETON):
+            return cle
+    return None
+
+
+def rendre_jeton(cle):
+    cache.delete(cle)
+    # Une place libérée : le ticket suivant peut entrer
+    appeler(1)
+
+
+def _avancer_file(**champs):
+    """
+    Met à jour la ligne FileAttente (un UPDATE atomique) et sa copie en cache
+
+    Returns:
+        FileAttente: valeurs après la mise à jour
+    """
+    with transaction.atomic():
+        if not FileAttente.objects.filter(pk=FILE).update(**champs):
+            FileAttente.objects.bulk_create([FileAttente(nom=FILE)], ignore_conflicts=True)
+            FileAttente.objects.filter(pk=FILE).update(**champs)
+        # Ligne verrouillée par l'UPDATE : on relit nos propres valeurs
+        file = FileAttente.objects.get(pk=FILE)
+
+    cache.set_many({CLE_TICKETS: file.dernier_ticket, CLE_APPEL: file.dernier_appel}, DUREE_FILE)
+    return file
+
+
+def distribuer_ticket():
+    """Numéro du nouveau ticket (unique, même entre workers)"""
+    return _avancer_file(dernier_ticket=F('dernier_ticket') + 1).dernier_ticket
+
+
+def appeler(nb):
+    """Appelle les nb tickets suivants, si la copie en cache montre des tickets en attente"""
+    if nb > 0 and cache.get(CLE_TICKETS, 0) > cache.get(CLE_APPEL, 0):
+        _appeler(nb)
+
+
+def _appeler(nb):
+    """Appelle les nb tickets suivants (sans dépasser le dernier distribué)"""
+    _avancer_file(dernier_appel=Least(F('dernier_appel') + nb, F('dernier_ticket')))
+    cache.set(CLE_APPELE_LE, time.time(), DUREE_FILE)
+
+
+def _appel_recent():
+    """Des tickets appelés ont encore le temps de se présenter"""
+    return time.time() - cache.get(CLE_APPELE_LE, 0) < DELAI_APPEL
+
+
+def _compter(nom):
+    incrementer(f'salle_attente:compteur:{nom}')
+
+
+def etat():
+    """Occupation et file d'attente, pour la page staff « Métriques »"""
+    reglages = get_reglages()
+    tickets = cache.get(CLE_TICKETS, 0)
+    appel = cache.get(CLE_APPEL, 0)
+    compteurs = cache.get_many([f'salle_attente:compteur:{nom}' for nom in COMPTEURS])
+
+    return {
+        **reglages,
+        'en_cours': len(cache.get_many(_cles_jetons(reglages['max_simultanes']))),
+        'en_attente': max(tickets - appel, 0),
+        **{nom: compteurs.get(f'salle_attente:compteur:{nom}', 0) for nom in COMPTEURS},
+    }
+
+
+# ═══════════════════════════════════════════════════
+# 🚪 MIDDLEWARE
+# ═══════════════════════════════════════════════════
+
+class SalleAttenteMiddleware:
+    """Placé après AuthenticationMiddleware (le staff n'attend pas)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _protegee(self, request):
+        try:
+            return resolve(request.path_info).url_name in settings.SALLE_ATTENTE_ROUTES
+        except Resolver404:
+            return False
+
+    def __call__(self, request):
+        if not self._protegee(request):
+            return self.get_response(request)
+
+        reglages = get_reglages()
+        if not reglages['active'] or request.user.is_staff:
+            return self.get_response(request)
+
+        ticket = self._lire_ticket(request)
+        appel = cache.get(CLE_APPEL, 0)
+        if ticket is not None and ticket > appel:
+            appel = self._relancer_appel(reglages['max_simultanes'])
+
+        if request.method == 'POST':
+            peut_entrer = True
+        elif ticket is not None:
+            # Dans l'ordre des tickets : seuls les appelés prennent un jeton
+            peut_entrer = ticket <= appel
+        else:
+            peut_entrer = appel >= cache.get(CLE_TICKETS, 0) and not _appel_recent()
+
+        jeton = prendre_jeton(reglages['max_simultanes']) if peut_entrer else None
+
+        if jeton is None and request.method != 'POST':
+            return self._attendre(request, ticket)
+
+        _compter('admises')
+        try:
+            response = self.get_response(request)
+        finally:
+            if jeton:
+                rendre_jeton(jeton)
+
+        if ticket is not None:
+            response.delete_cookie(COOKIE_TICKET)
+        return response
+
+    def _relancer_appel(self, max_simultanes):
+        """
+        Jetons libres mais personne n'entre (les appelés sont partis) :
+        les tickets suivants sont appelés, au plus un appel par DELAI_APPEL
+
+        Passe par la base même si la copie en cache ne montre personne en
+        attente : elle peut être en retard (ou expirée) sur FileAttente.
+        """
+        if not _appel_recent():
+            libres = max_simultanes - len(cache.get_many(_cles_jetons(max_simultanes)))
+            if libres > 0:
+                _appeler(libres)
+        return cache.get(CLE_APPEL, 0)
+
+    def _lire_ticket(self, request):
+        """Numéro du ticket, None sans cookie ou si le cookie a été modifié"""
+        try:
+            return int(request.get_signed_cookie(COOKIE_TICKET, salt=COOKIE_TICKET, max_age=DUREE_FILE))
+        except (KeyError, ValueError, signing.BadSignature):
+            return None
+
+    def _attendre(self, request, ticket):
+        if ticket is None:
+            ticket = distribuer_ticket()
+        _compter('attentes')
+
+        response = render(request, 'saisie_equipes/salle_attente.html', {
+            'position': max(ticket - cache.get(CLE_APPEL, 0), 1),
+            'delai': DELAI_ESSAI,
+        }, status=503)
+        response['Retry-After'] = str(DELAI_ESSAI)
+        response['Cache-Control'] = 'no-store'
+        response.set_signed_cookie(
+            COOKIE_TICKET, str(ticket), salt=COOKIE_TICKET, max_age=DUREE_FILE,
+            httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+        )
+        return response
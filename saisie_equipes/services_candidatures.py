@@ -0,0 +1,185 @@
+"""
+═══════════════════════════════════════════════════
+📋 DÉCISIONS GROUPÉES SUR LES CANDIDATURES
+═══════════════════════════════════════════════════
+
+Validation / refus de plusieurs candidatures en une transaction,
+avec un nombre fixe de requêtes quel que soit le nombre de candidatures.
+
+Utilisé par l'action de l'admin Django et par la liste staff des
+candidatures (cases à cocher).
+
+Règle : un tournoi n'a qu'un organisateur. Valider une candidature
+refuse automatiquement les autres candidatures en attente du même tournoi.
+"""
+
+from django.db import transaction
+from django.db.models import Case, When, Value
+from django.utils import timezone
+
+from .emails import notifier_decisions
+from .models import Candidature, Tournoi, StatutCandidature, StatutTournoi, TypeDocument, RAISON_REFUS_AUTO
+from .recherche import indexer
+from .syntheses import invalider_tournois_apres_commit
+
+
+RAISON_REFUS_GROUPE = "Refusé par action groupée"
+
+
+def valider_candidatures(candidature_ids, user, raison_auto=RAISON_REFUS_AUTO):
+    """
+    Valide des candidatures en attente et confirme leurs tournois
+
+    Sous verrou des tournois concernés (select_for_update) :
+    1. UPDATE des candidatures retenues → VALIDEE
+    2. UPDATE des autres candidatures en attente de ces tournois → REFUSEE
+    3. UPDATE des tournois : organisateur, lieu, statut CONFIRME
+    4. INSERT groupé des emails aux clubs (file d'envoi)
+
+    Si plusieurs candidatures d'un même tournoi sont sélectionnées,
+    la plus ancienne est retenue. Les tournois qui ont déjà une
+    candidature validée ou un club organisateur sont ignorés.
+
+    Args:
+        candidature_ids: identifiants des candidatures à valider
+        user: membre du staff qui décide
+        raison_auto: motif des refus automatiques
+
+    Returns:
+        dict: {'validees': n, 'refusees_auto': n, 'ignorees': n}
+        (ignorees : sélectionnées ni validées ni refusées automatiquement)
+    """
+    candidature_ids = {int(pk) for pk in candidature_ids}
+
+    with transaction.atomic():
+        tournoi_ids = set(
+            Candidature.objects.filter(pk__in=candidature_ids).values_list('tournoi_id', flat=True).order_by()
+        )
+
+        # Verrou dans l'ordre des clés : deux décisions simultanées
+        # ne peuvent pas s'interbloquer. Un organisateur déjà désigné
+        # (admin, candidature validée) compte comme une confirmation.
+        deja_confirmes = {
+            pk for pk, club_organisateur_id in Tournoi.objects.select_for_update().filter(
+                pk__in=tournoi_ids
+            ).order_by('pk').values_list('pk', 'club_organisateur_id')
+            if club_organisateur_id is not None
+        }
+
+        # Relecture sous verrou : l'état a pu changer depuis l'affichage
+        en_attente = Candidature.objects.filter(
+            pk__in=candidature_ids,
+            statut=StatutCandidature.EN_ATTENTE,
+        ).values_list('pk', 'tournoi_id', 'club_id', 'lieu').order_by('created_at', 'pk')
+
+        deja_confirmes |= set(
+            Candidature.objects.filter(
+                tournoi_id__in=tournoi_ids,
+                statut=StatutCandidature.VALIDEE,
+            ).values_list('tournoi_id', flat=True).order_by()
+        )
+
+        retenues = {}
+        for pk, tournoi_id, club_id, lieu in en_attente:
+            if tournoi_id not in deja_confirmes and tournoi_id not in retenues:
+                retenues[tournoi_id] = (pk, club_id, lieu)
+
+        if not retenues:
+            return {'validees': 0, 'refusees_auto': 0, 'ignorees': len(candidature_ids)}
+
+        maintenant = timezone.now()
+        pks_retenues = [pk for pk, _, _ in retenues.values()]
+
+        # Destinataires des emails, lus avant les UPDATE (une requête)
+        concernees = list(
+            Candidature.objects.filter(
+                tournoi_id__in=retenues,
+                statut=StatutCandidature.EN_ATTENTE,
+            ).select_related('club', 'tournoi').order_by()
+        )
+
+        validees = Candidature.objects.filter(pk__in=pks_retenues).update(
+            statut=StatutCandidature.VALIDEE,
+            traite_par=user,
+            date_traitement=maintenant,
+            updated_at=maintenant,
+        )
+
+        refusees_auto = Candidature.objects.filter(
+            tournoi_id__in=retenues,
+            statut=StatutCandidature.EN_ATTENTE,
+        ).exclude(pk__in=pks_retenues).update(
+            statut=StatutCandidature.REFUSEE,
+            raison_refus=raison_auto,
+            traite_par=user,
+            date_traitement=maintenant,
+            updated_at=maintenant,
+        )
+
+        Tournoi.objects.filter(pk__in=retenues).update(
+            club_organisateur_id=Case(
+                *[When(pk=tid, then=Value(club_id)) for tid, (_, club_id, _) in retenues.items()]
+            ),
+            lieu=Case(
+                *[When(pk=tid, then=Value(lieu)) for tid, (_, _, lieu) in retenues.items()]
+            ),
+            statut=StatutTournoi.CONFIRME,
+            updated_at=maintenant,
+        )
+
+        pks_retenues = set(pks_retenues)
+        refusees_selectionnees = sum(
+            1 for c in concernees if c.pk in candidature_ids and c.pk not in pks_retenues
+        )
+        notifier_decisions(
+            validees=[c for c in concernees if c.pk in pks_retenues],
+            refusees=[c for c in concernees if c.pk not in pks_retenues],
+            raison=raison_auto,
+        )
+
+        # update() ne déclenche pas les signaux (organisateur et lieu sont indexés)
+        invalider_tournois_apres_commit(*retenues)
+        indexer(TypeDocument.TOURNOI, retenues)
+
+    return {
+        'validees': validees,
+        'refusees_auto': refusees_auto,
+        'ignorees': len(candidature_ids) - validees - refusees_selectionnees,
+    }
+
+
+def refuser_candidatures(candidature_ids, user, raison=RAISON_REFUS_GROUPE):
+    """
+    Refuse des candidatures en attente (un UPDATE + un INSERT des emails)
+
+    Returns:
+        dict: {'refusees': n, 'ignorees': n}
+    """
+    candidature_ids = list(candidature_ids)
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        a_refuser = list(
+            Candidature.objects.select_for_update().filter(
+                pk__in=candidature_ids,
+                statut=StatutCandidature.EN_ATTENTE,
+            ).select_related('club', 'tournoi').order_by('pk')
+        )
+
+        refusees = Candidature.objects.filter(
+            pk__in=[c.pk for c in a_refuser],
+            statut=StatutCandidature.EN_ATTENTE,
+        ).update(
+            statut=StatutCandidature.REFUSEE,
+            raison_refus=raison,
+            traite_par=user,
+            date_traitement=maintenant,
+            updated_at=maintenant,
+        )
+
+        notifier_decisions(refusees=a_refuser, raison=raison)
+
+        # update() ne déclenche pas les signaux (statut publié par l'API)
+        invalider_tournois_apres_commit(*{c.tournoi_id for c in a_refuser})
+
+    return {'refusees': refusees, 'ignorees': len(candidature_ids) - refusees}
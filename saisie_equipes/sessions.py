@@ -0,0 +1,220 @@
+"""
+═══════════════════════════════════════════════════
+🍪 SESSIONS : PURGE PAR LOTS ET STOCKAGE HYBRIDE
+═══════════════════════════════════════════════════
+
+1. Purge des sessions expirées par plages de clés primaires, avec une
+   pause entre deux lots : jamais de grand DELETE qui verrouille
+   django_session sur MySQL (contrairement à clearsessions)
+2. Statistiques de la table (lignes, expirées, taille sur disque)
+3. Moteur de session hybride (optionnel) :
+       SESSION_ENGINE = 'saisie_equipes.sessions'
+   - visiteur anonyme : données dans un cookie signé, aucune ligne en base
+   - utilisateur connecté (staff) : cached_db, comme avant
+   Le cookie est signé (non modifiable) mais lisible par le visiteur :
+   n'y mettre rien de secret. Un visiteur peut aussi renvoyer un ancien
+   cookie ; comme il pouvait déjà supprimer le sien, les compteurs
+   anti-spam en session ne perdent rien.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.models import Session
+from django.core import signing
+from django.db import connection
+from django.utils import timezone
+
+# Sessions supprimées au plus par requête DELETE
+TAILLE_LOT_PURGE = 1000
+
+# Pause (secondes) entre deux lots : laisse passer les requêtes du site
+PAUSE_PURGE = 0.05
+
+MOTEURS_SESSIONS_BASE = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'saisie_equipes.sessions',
+)
+
+
+# ═══════════════════════════════════════════════════
+# 🧹 PURGE PAR LOTS
+# ═══════════════════════════════════════════════════
+
+def sessions_en_base():
+    """True si le moteur de session configuré écrit dans django_session"""
+    return settings.SESSION_ENGINE in MOTEURS_SESSIONS_BASE
+
+
+def purger_sessions_expirees(taille_lot=TAILLE_LOT_PURGE, pause=PAUSE_PURGE, max_lots=None):
+    """
+    Supprime les sessions expirées, lot par lot
+
+    Chaque lot : lecture des `taille_lot` clés expirées suivantes (dans
+    l'ordre de la clé primaire), puis DELETE de la plage [première, dernière]
+    restreinte aux sessions expirées. Les plages sont parcourues une seule
+    fois : une session active au milieu d'une plage n'est jamais relue.
+
+    Args:
+        pause: attente entre deux lots (secondes)
+        max_lots: arrêt après ce nombre de lots (None = jusqu'au bout)
+
+    Returns:
+        dict: {'supprimees': n, 'lots': n}
+    """
+    maintenant = timezone.now()
+    derniere_cle = ''
+    supprimees = 0
+    lots = 0
+
+    while max_lots is None or lots < max_lots:
+        cles = list(
+            Session.objects.filter(
+                session_key__gt=derniere_cle,
+                expire_date__lt=maintenant,
+            ).order_by('session_key').values_list('session_key', flat=True)[:taille_lot]
+        )
+        if not cles:
+            break
+
+        supprimees += Session.objects.filter(
+            session_key__gte=cles[0],
+            session_key__lte=cles[-1],
+            expire_date__lt=maintenant,
+        ).delete()[0]
+        lots += 1
+        derniere_cle = cles[-1]
+
+        if len(cles) < taille_lot:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return {'supprimees': supprimees, 'lots': lots}
+
+
+# ═══════════════════════════════════════════════════
+# 📊 STATISTIQUES
+# ═══════════════════════════════════════════════════
+
+def taille_table_sessions():
+    """Taille de django_session sur disque (octets, données + index), None si inconnue"""
+    table = Session._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT data_length + index_length FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+        else:
+            return None
+        ligne = cursor.fetchone()
+
+    return int(ligne[0]) if ligne and ligne[0] is not None else None
+
+
+def statistiques_sessions():
+    """
+    État de la table des sessions
+
+    Returns:
+        dict: {'total', 'expirees', 'actives', 'taille_octets'}
+    """
+    total = Session.objects.count()
+    expirees = Session.objects.filter(expire_date__lt=timezone.now()).count()
+    return {
+        'total': total,
+        'expirees': expirees,
+        'actives': total - expirees,
+        'taille_octets': taille_table_sessions(),
+    }
+
+
+# ═══════════════════════════════════════════════════
+# 🍪 MOTEUR HYBRIDE : COOKIE SIGNÉ / CACHED_DB
+# ═══════════════════════════════════════════════════
+
+SEL_COOKIE = 'saisie_equipes.sessions.cookie'
+
+# Au-delà, les données vont en base (limite des navigateurs : ~4 Ko par cookie)
+TAILLE_MAX_COOKIE = 3000
+
+
+def est_cle_cookie(cle):
+    """Les clés en base sont [a-z0-9]{32} ; un cookie signé contient des ':'"""
+    return bool(cle) and ':' in cle
+
+
+class SessionStore(CachedDBStore):
+    """
+    Session d'un visiteur anonyme dans un cookie signé, en base dès la connexion
+
+    La clé de session (valeur du cookie) est soit une clé cached_db,
+    soit les données signées elles-mêmes.
+    """
+
+    def load(self):
+        if not est_cle_cookie(self.session_key):
+            return super().load()
+
+        try:
+            return signing.loads(
+                self.session_key,
+                salt=SEL_COOKIE,
+                serializer=self.serializer,
+                max_age=self.get_session_cookie_age(),
+            )
+        except Exception:
+            # Signature invalide ou cookie trop ancien : nouvelle session
+            self._session_key = None
+            self.modified = True
+            return {}
+
+    def _doit_etre_en_base(self, data):
+        return SESSION_KEY in data
+
+    def save(self, must_create=False):
+        data = self._get_session(no_load=must_create)
+
+        if not self._doit_etre_en_base(data):
+            cle = signing.dumps(data, salt=SEL_COOKIE, serializer=self.serializer, compress=True)
+            if len(cle) <= TAILLE_MAX_COOKIE:
+                ancienne = self.session_key
+                self._session_key = cle
+                if ancienne and not est_cle_cookie(ancienne):
+                    # Session en base devenue anonyme : la ligne ne sert plus
+                    super().delete(ancienne)
+                return
+
+        if self.session_key is None or est_cle_cookie(self.session_key):
+            # Passage du cookie à la base : nouvelle clé (create() rappelle save)
+            self._session_key = None
+            return self.create()
+
+        return super().save(must_create=must_create)
+
+    def exists(self, session_key):
+        if est_cle_cookie(session_key):
+            return False
+        return super().exists(session_key)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+
+        if est_cle_cookie(session_key):
+            # Rien en base : il suffit d'oublier les données
+            if session_key == self.session_key:
+                self._session_key = None
+                self._session_cache = {}
+                self.modified = True
+            return
+
+        super().delete(session_key)
@@ -0,0 +1,139 @@
+"""
+═══════════════════════════════════════════════════
+📡 SIGNAUX - INVALIDATION DES SYNTHÈSES DE TOURNOIS
+═══════════════════════════════════════════════════
+
+Toute modification d'un tournoi, de ses déclarations, de ses équipes ou
+de ses candidatures incrémente la version du tournoi (voir syntheses.py),
+après commit. Elle sert aussi d'ETag à l'API JSON (api.py).
+
+La suppression d'une déclaration inscrite libère aussi ses places
+(compteur du tournoi) et promeut la liste d'attente.
+
+Les mêmes écritures tiennent à jour les documents de la recherche
+plein texte (recherche.py).
+
+Les connexions réussies ou échouées alimentent la limitation des
+tentatives de connexion (tentatives_connexion.py).
+
+⚠️ Les écritures en masse (bulk_create, update) ne déclenchent pas de
+signaux : le code qui les utilise doit invalider lui-même.
+"""
+
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Club, Tournoi, Candidature, Declaration, Equipe, StatutDeclaration, TypeDocument
+from .autocompletion import invalider_index_apres_commit
+from .recherche import (
+    desindexer, document_candidature, document_declaration, enregistrer_documents,
+    indexer_club, indexer_tournoi,
+)
+from .syntheses import invalider_tournois_apres_commit, tournois_du_club
+from . import tentatives_connexion
+
+
+@receiver(post_save, sender=Tournoi)
+@receiver(post_delete, sender=Tournoi)
+def tournoi_modifie(sender, instance, **kwargs):
+    invalider_tournois_apres_commit(instance.pk)
+
+
+@receiver(post_save, sender=Declaration)
+@receiver(post_delete, sender=Declaration)
+def declaration_modifiee(sender, instance, **kwargs):
+    # Si la déclaration a changé de tournoi, l'ancien est aussi concerné
+    invalider_tournois_apres_commit(
+        instance.tournoi_id,
+        getattr(instance, '_tournoi_id_initial', None),
+    )
+
+
+@receiver(post_delete, sender=Declaration)
+def declaration_supprimee(sender, instance, **kwargs):
+    # Une déclaration inscrite supprimée libère ses places
+    if instance.statut != StatutDeclaration.INSCRITE:
+        return
+
+    tournoi = Tournoi.objects.filter(pk=instance.tournoi_id).first()
+    if tournoi is not None:
+        tournoi.liberer_places(instance.nombre_equipes)
+        tournoi.promouvoir_liste_attente()
+
+
+@receiver(post_save, sender=Equipe)
+@receiver(post_delete, sender=Equipe)
+def equipe_modifiee(sender, instance, **kwargs):
+    invalider_tournois_apres_commit(instance.tournoi_id)
+
+
+@receiver(post_save, sender=Candidature)
+@receiver(post_delete, sender=Candidature)
+def candidature_modifiee(sender, instance, **kwargs):
+    invalider_tournois_apres_commit(instance.tournoi_id)
+
+
+# ═══════════════════════════════════════════════════
+# 🔎 DOCUMENTS DE RECHERCHE
+# ═══════════════════════════════════════════════════
+
+@receiver(post_save, sender=Tournoi)
+def tournoi_indexe(sender, instance, raw=False, **kwargs):
+    if not raw:
+        indexer_tournoi(instance.pk)
+
+
+@receiver(post_save, sender=Candidature)
+def candidature_indexee(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enregistrer_documents([document_candidature(instance)])
+
+
+@receiver(post_save, sender=Declaration)
+def declaration_indexee(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enregistrer_documents([document_declaration(instance)])
+
+
+@receiver(post_delete, sender=Candidature)
+def candidature_desindexee(sender, instance, **kwargs):
+    desindexer(TypeDocument.CANDIDATURE, [instance.pk])
+
+
+@receiver(post_delete, sender=Declaration)
+def declaration_desindexee(sender, instance, **kwargs):
+    desindexer(TypeDocument.DECLARATION, [instance.pk])
+
+
+@receiver(post_save, sender=Club)
+def club_renomme(sender, instance, created=False, raw=False, **kwargs):
+    # Un club créé n'apparaît encore dans aucun document
+    if not created and not raw:
+        indexer_club(instance.pk)
+        # Le nom du club figure dans les réponses de l'API des tournois concernés
+        invalider_tournois_apres_commit(*tournois_du_club(instance.pk))
+
+
+# ═══════════════════════════════════════════════════
+# 🔤 INDEX D'AUTOCOMPLÉTION DES CLUBS
+# ═══════════════════════════════════════════════════
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def liste_clubs_modifiee(sender, instance, **kwargs):
+    invalider_index_apres_commit()
+
+
+# ═══════════════════════════════════════════════════
+# 🔐 TENTATIVES DE CONNEXION (toutes pages de connexion)
+# ═══════════════════════════════════════════════════
+
+@receiver(user_login_failed)
+def connexion_echouee(sender, credentials, request=None, **kwargs):
+    tentatives_connexion.enregistrer_echec(request, credentials.get('username', ''))
+
+
+@receiver(user_logged_in)
+def connexion_reussie(sender, request, user, **kwargs):
+    tentatives_connexion.enregistrer_succes(request, user.get_username())
@@ -0,0 +1,46 @@
+"""
+═══════════════════════════════════════════════════
+🔒 STOCKAGE PRIVÉ DES FICHIERS DES JOBS
+═══════════════════════════════════════════════════
+
+Les exports contiennent les emails de tous les clubs : ils ne doivent
+pas être rangés sous MEDIA_ROOT, servi tel quel par /media/.
+
+Fichiers des jobs (résultats, CSV déposés pour un import) rangés sous
+settings.JOBS_STOCKAGE, hors de tout répertoire servi par le serveur
+web : seule la vue staff job_telecharger les renvoie.
+
+- chaque résultat est rangé dans un répertoire aléatoire : le nom
+  horodaté du fichier ne suffit pas à le retrouver
+- les résultats sont supprimés après JOBS_DUREE_CONSERVATION
+  (tâche purger_resultats_jobs, voir maintenance.py)
+"""
+
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+class StockagePrive(FileSystemStorage):
+    """FileSystemStorage sous settings.JOBS_STOCKAGE (relu à chaque accès, sans URL publique)"""
+
+    @property
+    def base_location(self):
+        return settings.JOBS_STOCKAGE
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def url(self, name):
+        raise ValueError("Les fichiers des jobs n'ont pas d'URL publique : passer par job_telecharger.")
+
+
+stockage_jobs = StockagePrive()
+
+
+def chemin_resultat_job(job, nom_fichier):
+    """resultats/<aléatoire>/<nom_fichier> : le nom reste lisible au téléchargement"""
+    return f"resultats/{uuid.uuid4().hex}/{nom_fichier}"
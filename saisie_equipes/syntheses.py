@@ -0,0 +1,188 @@
+"""
+═══════════════════════════════════════════════════
+📦 SYNTHÈSES DE TOURNOIS MISES EN CACHE
+═══════════════════════════════════════════════════
+
+Chaque tournoi a un numéro de version en cache, incrémenté à chaque
+changement de ses déclarations / équipes / candidatures (voir signals.py).
+Les synthèses sont stockées sous une clé qui contient cette version :
+une invalidation ne supprime rien, elle rend simplement les anciennes
+clés inaccessibles (elles expirent d'elles-mêmes).
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .mesures import incrementer
+from .models import Candidature, Declaration, Equipe, Poule, StatutDeclaration, Tournoi
+from .replicas import sur_base_principale
+
+
+PREFIXE_VERSION = 'tournoi_version'
+PREFIXE_POULES = 'tournoi_poules'
+
+# Les synthèses versionnées n'ont pas besoin d'expirer vite : 1 jour
+DUREE_CACHE_SYNTHESE = 60 * 60 * 24
+
+LIBELLES_POULES = dict(Poule.choices)
+LIBELLES_POULES['AUCUNE'] = "Sans poule"
+ORDRE_POULES = ['HAUTE', 'BASSE', 'UNIQUE', 'AUCUNE']
+
+
+# ═══════════════════════════════════════════════════
+# 🔢 VERSIONS
+# ═══════════════════════════════════════════════════
+
+def _cle_version(tournoi_id):
+    return f"{PREFIXE_VERSION}:{tournoi_id}"
+
+
+def _version_initiale():
+    """
+    Version de départ basée sur l'horloge
+
+    Si le cache est vidé, on ne repart pas de 1 : une ancienne clé
+    (ou un ancien ETag) ne peut donc pas être confondue avec la nouvelle.
+    """
+    return time.time_ns() // 1000
+
+
+def get_versions_tournois(tournoi_ids):
+    """Versions actuelles {tournoi_id: version} (une lecture groupée du cache)"""
+    tournoi_ids = list(tournoi_ids)
+    cles = {_cle_version(tid): tid for tid in tournoi_ids}
+    trouvees = cache.get_many(list(cles))
+
+    versions = {cles[cle]: version for cle, version in trouvees.items()}
+    for tid in tournoi_ids:
+        if tid not in versions:
+            cache.add(_cle_version(tid), _version_initiale(), None)
+            versions[tid] = cache.get(_cle_version(tid))
+    return versions
+
+
+def get_version_tournoi(tournoi_id):
+    """Version actuelle d'un tournoi"""
+    return get_versions_tournois([tournoi_id])[tournoi_id]
+
+
+def invalider_tournois(*tournoi_ids):
+    """Incrémente la version des tournois : leurs synthèses en cache sont périmées"""
+    for tid in set(filter(None, tournoi_ids)):
+        # Clé absente (jamais lue ou cache vidé) : nouvelle version d'horloge
+        if not cache.add(_cle_version(tid), _version_initiale(), None):
+            # timeout=None : la version ne doit jamais expirer (synthèses, ETags)
+            incrementer(_cle_version(tid), timeout=None)
+
+
+def invalider_tournois_apres_commit(*tournoi_ids):
+    """
+    Invalide une fois la transaction validée
+
+    Évite qu'un lecteur remette en cache l'état d'avant le commit
+    (ex : déclaration enregistrée mais équipes pas encore insérées).
+    """
+    transaction.on_commit(lambda: invalider_tournois(*tournoi_ids))
+
+
+def tournois_du_club(club_id):
+    """Tournois où le club a déclaré, candidaté ou qu'il organise"""
+    tournoi_ids = set(Declaration.objects.filter(club_id=club_id).values_list('tournoi_id', flat=True).order_by())
+    tournoi_ids.update(Candidature.objects.filter(club_id=club_id).values_list('tournoi_id', flat=True).order_by())
+    tournoi_ids.update(Tournoi.objects.filter(club_organisateur_id=club_id).values_list('pk', flat=True).order_by())
+    return tournoi_ids
+
+
+# ═══════════════════════════════════════════════════
+# 🏆 RÉPARTITION DES ÉQUIPES PAR POULE
+# ═══════════════════════════════════════════════════
+
+def _calculer_repartitions(tournoi_ids):
+    """
+    Effectifs et comptages par poule pour plusieurs tournois
+
+    Seules les équipes inscrites comptent (ni liste d'attente, ni retraits).
+    2 requêtes au total quel que soit le nombre de tournois :
+    - comptages : GROUP BY (tournoi, poule) sur l'index d'Equipe
+    - effectifs : liste des équipes avec le nom du club
+    """
+    repartitions = {tid: {'total': 0, 'comptes': {}, 'poules': {}} for tid in tournoi_ids}
+
+    comptes = Equipe.objects.filter(
+        tournoi_id__in=tournoi_ids,
+        declaration__statut=StatutDeclaration.INSCRITE,
+    ).values_list('tournoi_id', 'poule').annotate(nb=Count('id')).order_by()
+
+    for tid, poule, nb in comptes:
+        poule = poule or 'AUCUNE'
+        repartitions[tid]['comptes'][poule] = nb
+        repartitions[tid]['total'] += nb
+
+    equipes = Equipe.objects.filter(
+        tournoi_id__in=tournoi_ids,
+        declaration__statut=StatutDeclaration.INSCRITE,
+    ).values_list(
+        'tournoi_id', 'poule', 'nom', 'declaration__club__nom'
+    ).order_by('tournoi_id', 'declaration__club__nom', 'ordre')
+
+    for tid, poule, nom, club in equipes:
+        repartitions[tid]['poules'].setdefault(poule or 'AUCUNE', []).append(
+            {'nom': nom, 'club': club}
+        )
+
+    return repartitions
+
+
+def get_repartitions_poules(tournoi_ids):
+    """
+    Répartition par poule de chaque tournoi, servie depuis le cache
+
+    Returns:
+        dict: {tournoi_id: {'total': 10, 'comptes': {'HAUTE': 6, ...},
+                            'poules': [{'poule', 'libelle', 'nb', 'equipes': [...]}]}}
+    """
+    tournoi_ids = list(tournoi_ids)
+    if not tournoi_ids:
+        return {}
+
+    versions = get_versions_tournois(tournoi_ids)
+    cles = {f"{PREFIXE_POULES}:{tid}:{versions[tid]}": tid for tid in tournoi_ids}
+
+    en_cache = cache.get_many(list(cles))
+    resultats = {cles[cle]: valeur for cle, valeur in en_cache.items()}
+
+    manquants = [tid for tid in tournoi_ids if tid not in resultats]
+    if manquants:
+        # Mise en cache sous la version courante : jamais calculée sur une
+        # réplique en retard (elle resterait périmée jusqu'à la prochaine écriture)
+        with sur_base_principale():
+            bruts = _calculer_repartitions(manquants)
+        calcules = {tid: _mettre_en_forme(brut) for tid, brut in bruts.items()}
+        cache.set_many(
+            {f"{PREFIXE_POULES}:{tid}:{versions[tid]}": valeur for tid, valeur in calcules.items()},
+            DUREE_CACHE_SYNTHESE,
+        )
+        resultats.update(calcules)
+
+    return resultats
+
+
+def _mettre_en_forme(brut):
+    """Liste de poules ordonnée (Haute, Basse, Unique, sans poule)"""
+    return {
+        'total': brut['total'],
+        'comptes': brut['comptes'],
+        'poules': [
+            {
+                'poule': poule,
+                'libelle': LIBELLES_POULES[poule],
+                'nb': brut['comptes'][poule],
+                'equipes': brut['poules'].get(poule, []),
+            }
+            for poule in ORDRE_POULES
+            if poule in brut['comptes']
+        ],
+    }
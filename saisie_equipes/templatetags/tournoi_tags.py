@@ -1,119 +1,128 @@
 """
 Custom template tags pour les statistiques de tournois
+
+Les filtres travaillent sur tournoi.declarations.all() : quand la vue a fait
+un prefetch_related('declarations__club') (consultation), aucun ne déclenche
+de requête supplémentaire.
+
+Seules les déclarations inscrites comptent dans les totaux ; la liste
+d'attente est affichée à part (get_liste_attente).
 """
 from django import template
-from collections import defaultdict
+
+from saisie_equipes.models import StatutDeclaration
 
 register = template.Library()
 
+# Valeurs brutes (str) : comparaison plus rapide que via l'énumération
+INSCRITE = StatutDeclaration.INSCRITE.value
+LISTE_ATTENTE = StatutDeclaration.LISTE_ATTENTE.value
+
+
+def _toutes_declarations(tournoi):
+    """Déclarations du tournoi, tous statuts (profite du prefetch s'il existe)"""
+    return list(tournoi.declarations.all())
+
+
+def _declarations(tournoi):
+    """Déclarations inscrites du tournoi"""
+    return [d for d in tournoi.declarations.all() if d.statut == INSCRITE]
+
+
+def _est_prefetche(tournoi):
+    """True si les déclarations du tournoi ont déjà été chargées par prefetch_related"""
+    return 'declarations' in getattr(tournoi, '_prefetched_objects_cache', {})
+
+
+def _cle_categorie(tournoi):
+    """
+    Clé catégorie + sexe + zone
+
+    Depuis le Sprint 3b, ces informations sont portées par le tournoi
+    (et non plus par chaque déclaration) : un tournoi = une catégorie.
+    """
+    return f"{tournoi.categorie_age}_{tournoi.sexe}_{tournoi.zone or ''}"
+
+
+def _entete_categorie(tournoi, declarations):
+    """Champs communs au tableau de synthèse et aux détails"""
+    return {
+        'categorie': tournoi.get_categorie_age_display(),
+        'sexe': tournoi.get_sexe_display(),
+        'zone': tournoi.get_zone_display() if tournoi.zone else "Toutes zones",
+        'nb_clubs': len(declarations),
+        'total_equipes': sum(d.nombre_equipes for d in declarations),
+        'cle': _cle_categorie(tournoi),
+    }
+
 
 @register.filter
 def get_tableau_synthese(tournoi):
     """
     Génère le tableau de synthèse pour un tournoi
-    
+
     Returns:
         list: Liste de dictionnaires avec les stats par catégorie
     """
-    declarations = tournoi.declarations.all()
-    
+    declarations = _declarations(tournoi)
+
     if not declarations:
         return []
-    
-    # Grouper par catégorie + sexe + zone
-    categories = defaultdict(list)
-    for decl in declarations:
-        cle = f"{decl.categorie_age}_{decl.sexe}_{decl.zone or ''}"
-        categories[cle].append(decl)
-    
-    # Créer le tableau de synthèse
-    tableau = []
-    for cle in sorted(categories.keys()):
-        declarations_cat = categories[cle]
-        premiere_decl = declarations_cat[0]
-        
-        total_equipes = sum(d.nombre_equipes for d in declarations_cat)
-        nb_clubs = len(declarations_cat)
-        
-        tableau.append({
-            'categorie': premiere_decl.get_categorie_age_display(),
-            'sexe': premiere_decl.get_sexe_display(),
-            'zone': premiere_decl.get_zone_display() if premiere_decl.zone else "Toutes zones",
-            'nb_clubs': nb_clubs,
-            'total_equipes': total_equipes,
-            'cle': cle
-        })
-    
-    return tableau
+
+    return [_entete_categorie(tournoi, declarations)]
 
 
 @register.filter
 def get_categories_detaillees(tournoi):
     """
     Génère les détails par catégorie pour un tournoi
-    
+
     Returns:
         list: Liste de dictionnaires avec les déclarations groupées
     """
-    declarations = tournoi.declarations.all()
-    
+    declarations = _declarations(tournoi)
+
     if not declarations:
         return []
-    
-    # Grouper par catégorie + sexe + zone
-    categories = defaultdict(list)
-    for decl in declarations:
-        cle = f"{decl.categorie_age}_{decl.sexe}_{decl.zone or ''}"
-        categories[cle].append(decl)
-    
-    # Créer les détails
-    details = []
-    for cle in sorted(categories.keys()):
-        declarations_cat = categories[cle]
-        premiere_decl = declarations_cat[0]
-        
-        total_equipes = sum(d.nombre_equipes for d in declarations_cat)
-        nb_clubs = len(declarations_cat)
-        
-        details.append({
-            'categorie': premiere_decl.get_categorie_age_display(),
-            'sexe': premiere_decl.get_sexe_display(),
-            'zone': premiere_decl.get_zone_display() if premiere_decl.zone else "Toutes zones",
-            'declarations': sorted(declarations_cat, key=lambda x: x.club.nom),
-            'total_equipes': total_equipes,
-            'nb_clubs': nb_clubs,
-            'cle': cle
-        })
-    
-    return details
+
+    details = _entete_categorie(tournoi, declarations)
+    details['declarations'] = sorted(declarations, key=lambda x: x.club.nom)
+    return [details]
 
 
 @register.filter
 def get_total_general(tournoi):
     """Calcule le nombre total d'équipes pour un tournoi"""
-    from django.db.models import Sum
-    total = tournoi.declarations.aggregate(total=Sum('nombre_equipes'))['total']
-    return total or 0
+    if _est_prefetche(tournoi):
+        return sum(d.nombre_equipes for d in _declarations(tournoi))
+
+    return tournoi.get_nb_equipes_total()
 
 
 @register.filter
 def get_nb_clubs_total(tournoi):
     """Calcule le nombre de clubs ayant déclaré des équipes"""
-    return tournoi.declarations.values('club').distinct().count()
+    if _est_prefetche(tournoi):
+        return len({d.club_id for d in _declarations(tournoi)})
+
+    return tournoi.declarations.filter(
+        statut=StatutDeclaration.INSCRITE
+    ).values('club').distinct().count()
 
 
 @register.filter
 def get_nb_categories(tournoi):
     """Calcule le nombre de catégories différentes"""
-    declarations = tournoi.declarations.all()
-    
-    if not declarations:
-        return 0
-    
-    # Compter les combinaisons uniques de catégorie + sexe + zone
-    categories = set()
-    for decl in declarations:
-        cle = f"{decl.categorie_age}_{decl.sexe}_{decl.zone or ''}"
-        categories.add(cle)
-    
-    return len(categories)
+    if _est_prefetche(tournoi):
+        return 1 if _declarations(tournoi) else 0
+
+    return 1 if tournoi.declarations.filter(statut=StatutDeclaration.INSCRITE).exists() else 0
+
+
+@register.filter
+def get_liste_attente(tournoi):
+    """Déclarations en liste d'attente, dans l'ordre d'arrivée"""
+    return sorted(
+        (d for d in _toutes_declarations(tournoi) if d.statut == LISTE_ATTENTE),
+        key=lambda d: (d.date_declaration, d.pk),
+    )
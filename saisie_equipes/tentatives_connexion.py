@@ -0,0 +1,120 @@
+"""
+═══════════════════════════════════════════════════
+🔐 LIMITATION DES TENTATIVES DE CONNEXION
+═══════════════════════════════════════════════════
+
+Chaque appel à authenticate() coûte un hachage PBKDF2 complet : une
+rafale de tentatives sur /login/ ou /admin/login/ affamerait le worker.
+
+Échecs comptés en cache, par identifiant et par adresse IP, sur une
+fenêtre glissante (FENETRE_ECHECS). Au-delà du seuil, blocage de durée
+exponentielle : 30 s, 1 min, 2 min... jusqu'à DUREE_MAX_BLOCAGE.
+
+verifier() est appelé AVANT authenticate() par login_view et par le
+formulaire de connexion de l'admin (admin.py) : une tentative bloquée
+ne hache aucun mot de passe. Échecs et réussites sont enregistrés par
+les signaux user_login_failed / user_logged_in (signals.py), quelle que
+soit la page de connexion.
+"""
+
+import hashlib
+import logging
+import math
+import time
+
+from django.core.cache import cache
+
+from .mesures import incrementer
+
+logger = logging.getLogger('saisie_equipes')
+
+# Échecs tolérés avant blocage
+SEUIL_IDENTIFIANT = 5
+SEUIL_IP = 20
+
+# Un échec est oublié après cette durée sans nouvel échec (secondes)
+FENETRE_ECHECS = 3600
+
+# Premier blocage, doublé à chaque échec suivant (secondes)
+DUREE_BLOCAGE = 30
+DUREE_MAX_BLOCAGE = 3600
+
+COMPTEURS = ('reussies', 'echecs', 'refusees')
+
+
+def get_ip(request):
+    if request is None:
+        return 'inconnue'
+    return request.META.get('REMOTE_ADDR', 'inconnue')
+
+
+def _cles(request, username):
+    """(type, identifiant, seuil) des compteurs concernés par une tentative"""
+    # Identifiant haché : clé de cache sûre, et pas d'identifiant en clair dans le cache
+    empreinte = hashlib.sha256((username or '').strip().lower().encode()).hexdigest()[:32]
+    return [
+        ('identifiant', empreinte, SEUIL_IDENTIFIANT),
+        ('ip', get_ip(request), SEUIL_IP),
+    ]
+
+
+def _compter(nom):
+    incrementer(f'connexion:compteur:{nom}')
+
+
+def verifier(request, username):
+    """
+    Secondes de blocage restantes pour cette tentative (0 : autorisée)
+
+    À appeler avant authenticate() ; une tentative refusée est comptée.
+    """
+    cles = [f'connexion:blocage:{type_}:{identifiant}' for type_, identifiant, _ in _cles(request, username)]
+    fins = [fin for fin in cache.get_many(cles).values() if fin]
+
+    restant = max(fins, default=0) - time.time()
+    if restant <= 0:
+        return 0
+
+    _compter('refusees')
+    return math.ceil(restant)
+
+
+def enregistrer_echec(request, username):
+    """Un échec de plus ; bloque l'identifiant ou l'IP au-delà de son seuil"""
+    _compter('echecs')
+
+    for type_, identifiant, seuil in _cles(request, username):
+        cle = f'connexion:echecs:{type_}:{identifiant}'
+        # get + set plutôt qu'incr : incr de certains caches remet le délai d'expiration par défaut
+        echecs = cache.get(cle, 0) + 1
+        cache.set(cle, echecs, FENETRE_ECHECS)
+
+        if echecs >= seuil:
+            duree = min(DUREE_BLOCAGE * 2 ** (echecs - seuil), DUREE_MAX_BLOCAGE)
+            cache.set(f'connexion:blocage:{type_}:{identifiant}', time.time() + duree, duree)
+            logger.warning(f"Connexion : {type_} bloqué {duree} s après {echecs} échecs ({get_ip(request)})")
+
+
+def enregistrer_succes(request, username):
+    """Connexion réussie : les échecs de l'identifiant sont oubliés (pas ceux de l'IP)"""
+    _compter('reussies')
+
+    type_, identifiant, _ = _cles(request, username)[0]
+    cache.delete_many([
+        f'connexion:echecs:{type_}:{identifiant}',
+        f'connexion:blocage:{type_}:{identifiant}',
+    ])
+
+
+def message_blocage(secondes):
+    minutes = math.ceil(secondes / 60)
+    duree = f"{minutes} minute(s)" if secondes >= 60 else f"{secondes} seconde(s)"
+    return f"🚫 Trop de tentatives de connexion. Réessayez dans {duree}."
+
+
+def statistiques():
+    """Compteurs partagés (cache), pour la page staff « Métriques »"""
+    valeurs = cache.get_many([f'connexion:compteur:{nom}' for nom in COMPTEURS])
+    resultat = {nom: valeurs.get(f'connexion:compteur:{nom}', 0) for nom in COMPTEURS}
+    resultat.update(seuil_identifiant=SEUIL_IDENTIFIANT, seuil_ip=SEUIL_IP)
+    return resultat
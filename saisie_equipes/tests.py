@@ -11,18 +11,81 @@ Groupes :
   2. CandidatureModelTests  — règles métier du modèle Candidature
   3. VuesPubliquesTests     — pages accessibles à tous
   4. VuesStaffTests         — sécurité accès staff
+  5. MesuresTests           — outils de mesure de performance
+  6. EquipeTests            — équipes normalisées (table Equipe)
+  7. RepartitionPoulesTests — effectifs par poule en cache (staff)
+  8. DecisionsGroupeesTests — validation / refus groupés des candidatures
+  9. CapaciteTests          — capacité des tournois et liste d'attente
+ 10. SoumissionUniqueTests  — clés de soumission (double envoi)
+ 11. EmailOutboxTests       — file d'envoi des emails (backend locmem)
+ 12. JobsTests              — travaux en arrière-plan (exports, imports)
+ 13. PlanificateurTests     — tâches périodiques et bail (VerrouTache)
+ 14. SessionsTests          — purge par lots et sessions hybrides cookie / base
+ 15. ConnexionsTests        — connexions persistantes : mesures par worker
+ 16. ReplicaTests           — lectures publiques sur la réplique (routeur, cookie)
+ 17. RechercheTests         — recherche plein texte (accents, index à jour, vues staff)
+ 18. AutocompletionTests    — autocomplétion des clubs (préfixes, fautes de frappe)
+ 19. DoublonsTests          — détection des clubs en double et fusion
+ 20. DomainesJetablesTests  — domaines email jetables (domaines parents, rechargement)
+ 21. AntispamTests          — pipeline de règles anti-spam (ordre, seuil, compteurs)
+ 22. TentativesConnexionTests — blocage des connexions après trop d'échecs
+ 23. SalleAttenteTests      — salle d'attente des pages coûteuses (jetons, tickets)
+ 24. ReceptionTests         — réception différée des déclarations (file, lots)
+ 25. ResilienceTests        — mode dégradé : instantanés des pages publiques, disjoncteur
+ 26. ApiTests               — API JSON v1 (projection, curseurs, ETags)
 """
 
+import importlib
+import pickle
+import shutil
+import tempfile
+import time
+import uuid
 from datetime import date, timedelta
-from django.test import TestCase, Client
-from django.contrib.auth.models import User
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, router
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.contrib.auth.models import AnonymousUser, User
 from django.urls import reverse
 from django.utils import timezone
 
+from .forms import DeclarationForm
 from .models import (
-    Club, Tournoi, Declaration, Candidature,
-    Sexe, CategorieAge, StatutTournoi, StatutCandidature
+    Club, Tournoi, Declaration, Candidature, Equipe,
+    Sexe, CategorieAge, StatutTournoi, StatutCandidature, StatutDeclaration,
+    EmailOutbox, StatutEmail, Job, StatutJob, VerrouTache,
+    DocumentRecherche, TypeDocument, DeclarationRecue, StatutReception, FileAttente,
 )
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache, caches
+
+from .mesures import percentile, resume_latences, Histogramme, CompteurCache
+from .benchmarks import executer_benchmarks, comparer, BENCHMARKS
+from .management.commands.rejouer_logs import Command as RejouerLogs
+from .templatetags import tournoi_tags
+from .syntheses import get_repartitions_poules, get_version_tournoi, invalider_tournois
+from .services_candidatures import valider_candidatures, refuser_candidatures
+from .emails import Expediteur, LimiteurDebit, reserver_lot
+from .jobs import lancer_job, reserver_job, DUREE_RESERVATION as DUREE_RESERVATION_JOB
+from .stockage import stockage_jobs
+from .planificateur import TACHES_PERIODIQUES, executer_taches_dues
+from .maintenance import purger_resultats_jobs, purger_sessions
+from .sessions import purger_sessions_expirees, statistiques_sessions, est_cle_cookie
+from .connexions import STATISTIQUES as STATISTIQUES_CONNEXIONS
+from .decorators import using_replica
+from .replicas import COOKIE_ECRITURE, lectures_sur_replica, sur_base_principale
+from .recherche import rechercher
+from .autocompletion import IndexClubs, get_index, rechercher_clubs
+from . import antispam, api, domaines_jetables, reception, resilience, salle_attente, tentatives_connexion
+from .doublons import ErreurFusion, fusionner_clubs, groupes_doublons, trouver_doublons
 
 
 # ═══════════════════════════════════════════════════
@@ -48,6 +111,23 @@ def creer_club(nom="Club Test"):
     return Club.objects.create(nom=nom)
 
 
+def donnees_declaration(tournoi, club, equipes=(("Club A", "HAUTE"),), **kwargs):
+    """Données POST valides pour DeclarationForm (noms et poules d'équipes inclus)."""
+    donnees = {
+        'tournoi': tournoi.pk,
+        'club': club.pk,
+        'nombre_equipes': len(equipes),
+        'declarant': "Jean Dupont",
+        'email_club': "jean@monclub.re",
+        'remarques': "",
+    }
+    for i, (nom, poule) in enumerate(equipes, start=1):
+        donnees[f'nom_equipe_{i}'] = nom
+        donnees[f'poule_equipe_{i}'] = poule
+    donnees.update(kwargs)
+    return donnees
+
+
 # ═══════════════════════════════════════════════════
 # GROUPE 1 — Modèle Tournoi
 # ═══════════════════════════════════════════════════
@@ -185,6 +265,69 @@ class CandidatureModelTests(TestCase):
         self.candidature.refuser(self.staff_user, raison)
         self.assertEqual(self.candidature.raison_refus, raison)
 
+    def autre_candidature(self, nom_club="SCB"):
+        return Candidature.objects.create(
+            tournoi=self.tournoi,
+            club=creer_club(nom_club),
+            declarant="Paul Martin",
+            email_contact="paul@scb.re",
+            lieu="Gymnase de Saint-Pierre",
+        )
+
+    def test_valider_refuse_les_candidatures_concurrentes(self):
+        """Valider une candidature refuse les autres candidatures en attente du tournoi."""
+        autre = self.autre_candidature()
+        self.assertTrue(self.candidature.valider(self.staff_user))
+        autre.refresh_from_db()
+        self.assertEqual(autre.statut, StatutCandidature.REFUSEE)
+
+    def test_double_validation_signale_un_conflit(self):
+        """Une instance périmée ne peut pas revalider : le conflit est signalé."""
+        copie = Candidature.objects.get(pk=self.candidature.pk)
+        self.assertTrue(self.candidature.refuser(self.staff_user, "Complet"))
+
+        resultat = copie.valider(self.staff_user)
+        self.assertFalse(resultat)
+        self.assertIn("Refusée", resultat.message)
+        self.assertEqual(copie.statut, StatutCandidature.REFUSEE)
+        self.tournoi.refresh_from_db()
+        self.assertIsNone(self.tournoi.club_organisateur)
+
+    def test_un_seul_organisateur(self):
+        """Une candidature repassée en attente ne peut pas remplacer l'organisateur validé."""
+        autre = self.autre_candidature()
+        self.candidature.valider(self.staff_user)
+        Candidature.objects.filter(pk=autre.pk).update(statut=StatutCandidature.EN_ATTENTE)
+
+        resultat = autre.valider(self.staff_user)
+        self.assertFalse(resultat)
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.tournoi.club_organisateur, self.club)
+
+    def test_organisateur_designe_par_l_admin_conserve(self):
+        """Un organisateur posé dans l'admin n'est pas remplacé par une validation."""
+        organisateur = creer_club("Organisateur admin")
+        Tournoi.objects.filter(pk=self.tournoi.pk).update(club_organisateur=organisateur)
+
+        resultat = self.candidature.valider(self.staff_user)
+        self.assertFalse(resultat)
+        self.assertEqual(resultat.message, "Ce tournoi a déjà un organisateur.")
+        self.candidature.refresh_from_db()
+        self.assertEqual(self.candidature.statut, StatutCandidature.EN_ATTENTE)
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.tournoi.club_organisateur, organisateur)
+
+    def test_retirer_candidature_validee_libere_le_tournoi(self):
+        """Retirer la candidature validée remet le tournoi en PLANIFIE sans organisateur."""
+        self.candidature.valider(self.staff_user)
+        self.assertTrue(self.candidature.retirer())
+        self.assertFalse(self.candidature.retirer())
+
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.tournoi.statut, StatutTournoi.PLANIFIE)
+        self.assertIsNone(self.tournoi.club_organisateur)
+        self.assertEqual(self.tournoi.lieu, "")
+
 
 # ═══════════════════════════════════════════════════
 # GROUPE 3 — Vues publiques
@@ -267,3 +410,1808 @@ class VuesStaffTests(TestCase):
         self.client.login(username='staff', password='pass')
         response = self.client.get(reverse('staff:tournois_liste'))
         self.assertEqual(response.status_code, 200)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 5 — Outils de mesure (harnais de charge, benchmarks)
+# ═══════════════════════════════════════════════════
+
+class MesuresTests(TestCase):
+
+    def test_percentile_interpole(self):
+        """Le percentile interpole entre deux valeurs."""
+        self.assertEqual(percentile([10, 20, 30, 40], 50), 25)
+        self.assertEqual(percentile([10, 20, 30, 40], 100), 40)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_resume_latences(self):
+        """Le résumé donne min, max et médiane corrects."""
+        resume = resume_latences([5, 1, 3])
+        self.assertEqual(resume['nb'], 3)
+        self.assertEqual(resume['min'], 1)
+        self.assertEqual(resume['p50'], 3)
+        self.assertEqual(resume['max'], 5)
+
+    def test_histogramme_range_les_valeurs(self):
+        """Chaque valeur tombe dans la bonne case, y compris la dernière."""
+        histogramme = Histogramme((1, 10))
+        for valeur in (0.5, 1, 7, 50):
+            histogramme.ajouter(valeur)
+        self.assertEqual(histogramme.comptes, [2, 1, 1])
+        self.assertEqual(Histogramme.from_dict(histogramme.as_dict()).comptes, [2, 1, 1])
+
+    def test_benchmarks_executent_tous_les_chemins(self):
+        """Chaque benchmark du registre s'exécute et produit une mesure."""
+        resultats = executer_benchmarks(repetitions=1, duree_min=0.0001)
+        self.assertEqual(set(resultats), set(BENCHMARKS))
+        self.assertTrue(all(r['min_us'] > 0 for r in resultats.values()))
+
+    def test_comparer_signale_les_regressions(self):
+        """Seul un ralentissement au-delà du seuil est une régression."""
+        reference = {'a': {'min_us': 10.0}, 'b': {'min_us': 10.0}}
+        resultats = {'a': {'min_us': 11.0}, 'b': {'min_us': 20.0}, 'c': {'min_us': 1.0}}
+        lignes = {nom: regression for nom, _, _, _, regression in comparer(resultats, reference, 25)}
+        self.assertEqual(lignes, {'a': False, 'b': True, 'c': False})
+
+    def test_filtres_consultation_avec_declarations(self):
+        """Les filtres de synthèse fonctionnent sur un tournoi avec déclarations."""
+        tournoi = creer_tournoi()
+        Declaration.objects.create(
+            tournoi=tournoi, club=creer_club(), nombre_equipes=2,
+            declarant="Jean Dupont", email_club="jean@club.re"
+        )
+        self.assertEqual(tournoi_tags.get_total_general(tournoi), 2)
+        self.assertEqual(tournoi_tags.get_nb_categories(tournoi), 1)
+        self.assertEqual(tournoi_tags.get_tableau_synthese(tournoi)[0]['total_equipes'], 2)
+        response = self.client.get(reverse('consultation'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_compteur_cache_compte_succes_et_echecs(self):
+        """Le compteur distingue lectures réussies et manquées, sans double compte."""
+        cache.set('mesures_test_present', 1)
+        with CompteurCache() as compteur:
+            cache.get('mesures_test_present')
+            cache.get('mesures_test_absent')
+            cache.get_many(['mesures_test_present', 'mesures_test_absent'])
+        self.assertEqual((compteur.succes, compteur.echecs), (2, 2))
+        # En sortie, le cache n'est plus instrumenté
+        cache.get('mesures_test_present')
+        self.assertEqual(compteur.succes, 2)
+
+    def test_rejeu_connecte_seulement_les_pages_staff(self):
+        """--utilisateur : la même IP reste anonyme sur les pages publiques."""
+        staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        commande, clients = RejouerLogs(), {}
+
+        client_public = commande.get_client(clients, '1.2.3.4', None, 'localhost')
+        client_staff = commande.get_client(clients, '1.2.3.4', staff, 'localhost')
+        self.assertIsNot(client_public, client_staff)
+        self.assertNotIn('_auth_user_id', client_public.session)
+        self.assertEqual(client_staff.session['_auth_user_id'], str(staff.pk))
+        self.assertIs(commande.get_client(clients, '1.2.3.4', None, 'localhost'), client_public)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 6 — Équipes normalisées
+# ═══════════════════════════════════════════════════
+
+class EquipeTests(TestCase):
+
+    def setUp(self):
+        self.tournoi = creer_tournoi(poules_disponibles=['HAUTE', 'BASSE'])
+        self.club = creer_club("TGV Volley")
+
+    def declarer(self, equipes):
+        form = DeclarationForm(donnees_declaration(self.tournoi, self.club, equipes))
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def test_save_cree_une_ligne_par_equipe(self):
+        """Le formulaire crée les équipes dans l'ordre, avec tournoi et poule."""
+        declaration = self.declarer([("TGV A", "HAUTE"), ("TGV B", "BASSE"), ("TGV C", "")])
+        equipes = list(declaration.equipes.values_list('nom', 'poule', 'ordre', 'tournoi_id'))
+        self.assertEqual(equipes, [
+            ("TGV A", "HAUTE", 0, self.tournoi.pk),
+            ("TGV B", "BASSE", 1, self.tournoi.pk),
+            ("TGV C", "", 2, self.tournoi.pk),
+        ])
+
+    def test_equipes_par_poule(self):
+        """get_equipes_par_poule() groupe les noms, 'AUCUNE' pour les équipes sans poule."""
+        declaration = self.declarer([("TGV A", "HAUTE"), ("TGV B", ""), ("TGV C", "HAUTE")])
+        self.assertEqual(declaration.get_equipes_par_poule(), {
+            "HAUTE": ["TGV A", "TGV C"],
+            "AUCUNE": ["TGV B"],
+        })
+        self.assertEqual(declaration.get_equipes_avec_poules()[1]['poule_display'], "Aucune")
+
+    def test_comptage_par_poule_du_tournoi(self):
+        """Le tournoi compte ses équipes par poule en une requête."""
+        self.declarer([("TGV A", "HAUTE"), ("TGV B", "BASSE")])
+        self.club = creer_club("SCB")
+        self.declarer([("SCB 1", "HAUTE")])
+        with self.assertNumQueries(1):
+            comptes = self.tournoi.get_nb_equipes_par_poule()
+        self.assertEqual(comptes, {"HAUTE": 2, "BASSE": 1})
+
+    def test_equipes_sans_jointure_ni_requete_dans_str(self):
+        """Ordre par défaut sans jointure ; __str__ n'interroge pas les équipes."""
+        declaration = self.declarer([("TGV A", "HAUTE"), ("TGV B", "BASSE")])
+        self.assertNotIn('JOIN', str(declaration.equipes.all().query))
+
+        declaration = Declaration.objects.select_related('club', 'tournoi').get(pk=declaration.pk)
+        with self.assertNumQueries(0):
+            self.assertIn("2 équipe(s)", str(declaration))
+
+        declaration = Declaration.objects.prefetch_related('equipes').get(pk=declaration.pk)
+        self.assertIn("TGV A, TGV B", str(declaration))
+
+    def test_changement_de_tournoi_realigne_les_equipes(self):
+        """Déplacer une déclaration met à jour la copie Equipe.tournoi."""
+        declaration = self.declarer([("TGV A", "HAUTE")])
+        autre = creer_tournoi(date_tournoi=self.tournoi.date + timedelta(days=7))
+        declaration.tournoi = autre
+        declaration.save()
+        self.assertEqual(Equipe.objects.get().tournoi, autre)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 7 — Répartition par poule (cache versionné)
+# ═══════════════════════════════════════════════════
+
+class RepartitionPoulesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tournoi = creer_tournoi(poules_disponibles=['HAUTE', 'BASSE'])
+        self.club = creer_club("TGV Volley")
+
+    def declarer(self, equipes, club=None):
+        form = DeclarationForm(donnees_declaration(self.tournoi, club or self.club, equipes))
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            return form.save()
+
+    def test_comptes_et_effectifs(self):
+        """Comptes par poule et liste des équipes avec leur club."""
+        self.declarer([("TGV A", "HAUTE"), ("TGV B", "BASSE"), ("TGV C", "")])
+        self.declarer([("SCB 1", "HAUTE")], club=creer_club("SCB"))
+
+        repartition = get_repartitions_poules([self.tournoi.pk])[self.tournoi.pk]
+        self.assertEqual(repartition['total'], 4)
+        self.assertEqual(repartition['comptes'], {"HAUTE": 2, "BASSE": 1, "AUCUNE": 1})
+        self.assertEqual([p['poule'] for p in repartition['poules']], ["HAUTE", "BASSE", "AUCUNE"])
+        self.assertEqual(repartition['poules'][0]['equipes'], [
+            {'nom': "SCB 1", 'club': "SCB"},
+            {'nom': "TGV A", 'club': "TGV Volley"},
+        ])
+
+    def test_deuxieme_lecture_servie_par_le_cache(self):
+        """Une fois calculée, la répartition ne coûte plus de requête SQL."""
+        self.declarer([("TGV A", "HAUTE")])
+        get_repartitions_poules([self.tournoi.pk])
+        with self.assertNumQueries(0):
+            get_repartitions_poules([self.tournoi.pk])
+
+    def test_nouvelle_declaration_invalide_le_cache(self):
+        """Une déclaration incrémente la version du tournoi après commit."""
+        self.declarer([("TGV A", "HAUTE")])
+        version = get_version_tournoi(self.tournoi.pk)
+        get_repartitions_poules([self.tournoi.pk])
+
+        self.declarer([("SCB 1", "BASSE")], club=creer_club("SCB"))
+
+        self.assertNotEqual(get_version_tournoi(self.tournoi.pk), version)
+        repartition = get_repartitions_poules([self.tournoi.pk])[self.tournoi.pk]
+        self.assertEqual(repartition['comptes'], {"HAUTE": 1, "BASSE": 1})
+
+    def test_version_sans_expiration_en_cache_fichier(self):
+        """Cache fichier (production) : une invalidation ne pose pas le délai par défaut de 300 s."""
+        repertoire = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repertoire)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': repertoire,
+        }}):
+            version = get_version_tournoi(self.tournoi.pk)
+            invalider_tournois(self.tournoi.pk)
+            self.assertEqual(get_version_tournoi(self.tournoi.pk), version + 1)
+
+            with open(caches['default']._key_to_file(f"tournoi_version:{self.tournoi.pk}"), 'rb') as f:
+                self.assertIsNone(pickle.load(f))   # expiration : aucune
+
+    def test_changement_de_tournoi_invalide_les_deux(self):
+        """Déplacer une déclaration invalide l'ancien et le nouveau tournoi."""
+        declaration = self.declarer([("TGV A", "HAUTE")])
+        autre = creer_tournoi(date_tournoi=self.tournoi.date + timedelta(days=7))
+        get_repartitions_poules([self.tournoi.pk, autre.pk])
+
+        declaration = Declaration.objects.get(pk=declaration.pk)
+        declaration.tournoi = autre
+        with self.captureOnCommitCallbacks(execute=True):
+            declaration.save()
+
+        repartitions = get_repartitions_poules([self.tournoi.pk, autre.pk])
+        self.assertEqual(repartitions[self.tournoi.pk]['total'], 0)
+        self.assertEqual(repartitions[autre.pk]['total'], 1)
+
+    def test_pages_staff(self):
+        """Page HTML et JSON réservées au staff, tous tournois ou un seul."""
+        self.declarer([("TGV A", "HAUTE")])
+        url = reverse('staff:poules_detail_json', args=[self.tournoi.pk])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_login(staff)
+
+        data = self.client.get(url).json()
+        self.assertEqual(data['tournois'][0]['comptes'], {"HAUTE": 1})
+        self.assertEqual(data['tournois'][0]['poules'][0]['equipes'][0]['nom'], "TGV A")
+
+        response = self.client.get(reverse('staff:poules'))
+        self.assertContains(response, "TGV A")
+        self.assertEqual(self.client.get(reverse('staff:poules_detail', args=[9999])).status_code, 404)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 8 — Décisions groupées sur les candidatures
+# ═══════════════════════════════════════════════════
+
+class DecisionsGroupeesTests(TestCase):
+
+    def setUp(self):
+        self.staff_user = User.objects.create_user(
+            username="staff", password="pass", is_staff=True
+        )
+        self.tournoi = creer_tournoi()
+        self.autre_tournoi = creer_tournoi(date_tournoi=self.tournoi.date + timedelta(days=7))
+        self.c1 = self.candidater(self.tournoi, "TGV Volley", "Gymnase A")
+        self.c2 = self.candidater(self.tournoi, "SCB", "Gymnase B")
+        self.c3 = self.candidater(self.autre_tournoi, "ASC", "Gymnase C")
+
+    def candidater(self, tournoi, nom_club, lieu):
+        return Candidature.objects.create(
+            tournoi=tournoi,
+            club=creer_club(nom_club),
+            declarant="Jean Dupont",
+            email_contact="jean@club.re",
+            lieu=lieu,
+        )
+
+    def statuts(self):
+        return dict(Candidature.objects.values_list('pk', 'statut'))
+
+    def test_valider_refuse_les_concurrentes(self):
+        """Valider c1 et c3 refuse c2 (même tournoi que c1) et confirme les deux tournois."""
+        resultat = valider_candidatures([self.c1.pk, self.c3.pk], self.staff_user)
+
+        self.assertEqual(resultat, {'validees': 2, 'refusees_auto': 1, 'ignorees': 0})
+        self.assertEqual(self.statuts(), {
+            self.c1.pk: StatutCandidature.VALIDEE,
+            self.c2.pk: StatutCandidature.REFUSEE,
+            self.c3.pk: StatutCandidature.VALIDEE,
+        })
+        self.tournoi.refresh_from_db()
+        self.autre_tournoi.refresh_from_db()
+        self.assertEqual((self.tournoi.club_organisateur, self.tournoi.lieu), (self.c1.club, "Gymnase A"))
+        self.assertEqual((self.autre_tournoi.club_organisateur, self.autre_tournoi.lieu), (self.c3.club, "Gymnase C"))
+        self.assertEqual(self.tournoi.statut, StatutTournoi.CONFIRME)
+
+    def test_un_seul_organisateur_par_tournoi(self):
+        """Deux candidatures du même tournoi cochées : seule la plus ancienne est validée."""
+        # Identifiants tels que postés par la liste staff
+        resultat = valider_candidatures([str(self.c2.pk), str(self.c1.pk)], self.staff_user)
+        # c2 est refusée automatiquement : comptée une seule fois
+        self.assertEqual(resultat, {'validees': 1, 'refusees_auto': 1, 'ignorees': 0})
+        self.assertEqual(self.statuts()[self.c1.pk], StatutCandidature.VALIDEE)
+
+        # Le tournoi a maintenant un organisateur : plus rien à valider
+        self.assertEqual(valider_candidatures([self.c2.pk], self.staff_user)['validees'], 0)
+
+    def test_organisateur_deja_designe(self):
+        """Un tournoi dont l'organisateur est déjà désigné (admin) n'est pas revalidé."""
+        Tournoi.objects.filter(pk=self.tournoi.pk).update(club_organisateur=self.c2.club)
+        resultat = valider_candidatures([self.c1.pk], self.staff_user)
+        self.assertEqual(resultat, {'validees': 0, 'refusees_auto': 0, 'ignorees': 1})
+        self.assertEqual(self.statuts()[self.c1.pk], StatutCandidature.EN_ATTENTE)
+
+    def test_nombre_de_requetes_constant(self):
+        """Le nombre de requêtes ne dépend pas du nombre de candidatures."""
+        # SAVEPOINT + tournois concernés + verrou + déjà validées + relecture
+        # + destinataires + 3 UPDATE + INSERT des emails
+        # + relecture des tournois et upsert de leurs documents de recherche + RELEASE
+        with self.assertNumQueries(13):
+            valider_candidatures([self.c1.pk, self.c3.pk], self.staff_user)
+
+    def test_refuser(self):
+        """Le refus groupé ne touche que les candidatures en attente."""
+        valider_candidatures([self.c3.pk], self.staff_user)
+        resultat = refuser_candidatures([self.c1.pk, self.c3.pk], self.staff_user, "Complet")
+        self.assertEqual(resultat, {'refusees': 1, 'ignorees': 1})
+        self.assertEqual(Candidature.objects.get(pk=self.c1.pk).raison_refus, "Complet")
+
+    def test_liste_staff_post(self):
+        """Les cases cochées de la liste staff passent par le service."""
+        self.client.force_login(self.staff_user)
+        response = self.client.post(
+            reverse('staff:candidatures_liste') + '?statut=EN_ATTENTE',
+            {'candidatures': [self.c2.pk], 'action': 'valider'},
+        )
+        self.assertRedirects(response, reverse('staff:candidatures_liste') + '?statut=EN_ATTENTE')
+        self.assertEqual(self.statuts()[self.c1.pk], StatutCandidature.REFUSEE)
+
+        # Refus sans raison : rien ne change
+        self.client.post(reverse('staff:candidatures_liste'), {'candidatures': [self.c3.pk], 'action': 'refuser'})
+        self.assertEqual(self.statuts()[self.c3.pk], StatutCandidature.EN_ATTENTE)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 9 — Capacité et liste d'attente
+# ═══════════════════════════════════════════════════
+
+class CapaciteTests(TestCase):
+
+    def setUp(self):
+        self.tournoi = creer_tournoi(capacite_max=4)
+
+    def declarer(self, nom_club, nb):
+        form = DeclarationForm(donnees_declaration(
+            self.tournoi, creer_club(nom_club),
+            equipes=[(f"{nom_club} {i}", "") for i in range(1, nb + 1)],
+        ))
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def compteur(self):
+        self.tournoi.refresh_from_db()
+        return self.tournoi.nb_equipes_inscrites
+
+    def statut(self, declaration):
+        return Declaration.objects.values_list('statut', flat=True).get(pk=declaration.pk)
+
+    def test_depassement_va_en_liste_attente(self):
+        """Au-delà de la capacité, la déclaration est en liste d'attente et ne compte pas."""
+        a = self.declarer("A", 3)
+        b = self.declarer("B", 2)
+        self.assertEqual(a.statut, StatutDeclaration.INSCRITE)
+        self.assertEqual(b.statut, StatutDeclaration.LISTE_ATTENTE)
+        self.assertEqual(self.compteur(), 3)
+        self.assertEqual(self.tournoi.get_nb_equipes_total(), 3)
+        self.assertEqual(self.tournoi.get_nb_equipes_par_poule(), {"AUCUNE": 3})
+        # Les clubs comptés (tournoi, accueil) sont les seuls inscrits
+        self.assertEqual(self.tournoi.get_nb_declarations(), 1)
+        self.assertEqual(self.client.get(reverse('accueil')).context['total_declarations'], 1)
+
+    def test_pas_de_resquille_devant_la_liste_attente(self):
+        """Une petite déclaration qui tiendrait ne passe pas devant la liste d'attente."""
+        self.declarer("A", 3)
+        self.declarer("B", 2)
+        c = self.declarer("C", 1)
+        self.assertEqual(c.statut, StatutDeclaration.LISTE_ATTENTE)
+
+    def test_retrait_promeut_en_fifo(self):
+        """Un retrait libère les places et inscrit la liste d'attente dans l'ordre."""
+        a = self.declarer("A", 3)
+        b = self.declarer("B", 2)
+        c = self.declarer("C", 2)
+
+        self.assertTrue(a.retirer())
+        self.assertFalse(a.retirer())
+
+        self.assertEqual(self.statut(b), StatutDeclaration.INSCRITE)
+        self.assertEqual(self.statut(c), StatutDeclaration.INSCRITE)
+        self.assertEqual(self.compteur(), 4)
+        self.assertEqual(self.tournoi.get_nb_declarations(), 2)
+
+    def test_fifo_strict(self):
+        """La tête de file bloque les suivantes si elle ne tient pas encore."""
+        a = self.declarer("A", 3)
+        self.declarer("B", 1)   # inscrite : 4/4
+        c = self.declarer("C", 4)
+        d = self.declarer("D", 1)
+
+        a.retirer()  # 1/4 : C (4) ne tient pas, D attend derrière
+        self.assertEqual(self.statut(c), StatutDeclaration.LISTE_ATTENTE)
+        self.assertEqual(self.statut(d), StatutDeclaration.LISTE_ATTENTE)
+        self.assertEqual(self.compteur(), 1)
+
+    def test_suppression_libere_les_places(self):
+        """Supprimer une déclaration inscrite libère ses places et promeut la file."""
+        a = self.declarer("A", 4)
+        b = self.declarer("B", 1)
+        a.delete()
+        self.assertEqual(self.statut(b), StatutDeclaration.INSCRITE)
+        self.assertEqual(self.compteur(), 1)
+
+    def test_modification_manuelle_recompte(self):
+        """Modifier le nombre d'équipes (admin) recalcule le compteur."""
+        a = self.declarer("A", 3)
+        a = Declaration.objects.get(pk=a.pk)
+        a.nombre_equipes = 1
+        a.save()
+        self.assertEqual(self.compteur(), 1)
+
+    def test_sans_capacite(self):
+        """Sans capacité, tout est inscrit et le compteur suit."""
+        self.tournoi.capacite_max = None
+        self.tournoi.save()
+        self.declarer("A", 10)
+        self.declarer("B", 10)
+        self.assertEqual(self.compteur(), 20)
+
+    def test_reservation_refusee_quand_complet(self):
+        """reserver_places() est un UPDATE conditionnel : refusé si le total dépasserait."""
+        self.assertTrue(self.tournoi.reserver_places(4))
+        self.assertFalse(self.tournoi.reserver_places(1))
+        self.assertEqual(self.compteur(), 4)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 10 — Soumissions idempotentes
+# ═══════════════════════════════════════════════════
+
+class SoumissionUniqueTests(TestCase):
+
+    def setUp(self):
+        self.tournoi = creer_tournoi(capacite_max=10)
+        self.club = creer_club("TGV Volley")
+        self.cle = str(uuid.uuid4())
+
+    def test_chaque_affichage_a_sa_cle(self):
+        """Deux affichages du formulaire portent deux clés différentes."""
+        self.assertNotEqual(
+            DeclarationForm().initial['cle_soumission'],
+            DeclarationForm().initial['cle_soumission'],
+        )
+
+    def test_double_post_declaration(self):
+        """Le même POST envoyé deux fois ne crée qu'une déclaration."""
+        donnees = donnees_declaration(self.tournoi, self.club, cle_soumission=self.cle)
+        premiere = self.client.post(reverse('declaration'), donnees)
+        seconde = self.client.post(reverse('declaration'), donnees)
+
+        self.assertRedirects(premiere, reverse('confirmation'))
+        self.assertRedirects(seconde, reverse('confirmation'))
+        self.assertEqual(Declaration.objects.count(), 1)
+        self.assertEqual(Declaration.objects.get().cle_soumission, uuid.UUID(self.cle))
+
+    def test_contrainte_unique_annule_la_reservation(self):
+        """Course entre deux envois : la base refuse le second, places comprises."""
+        premier = DeclarationForm(donnees_declaration(self.tournoi, self.club, cle_soumission=self.cle))
+        second = DeclarationForm(donnees_declaration(self.tournoi, self.club, cle_soumission=self.cle))
+        self.assertTrue(premier.is_valid() and second.is_valid())
+        premier.save()
+        with self.assertRaises(IntegrityError):
+            second.save()
+
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.tournoi.nb_equipes_inscrites, 1)
+        self.assertEqual(second.get_soumission_existante().pk, Declaration.objects.get().pk)
+
+    def test_double_post_candidature(self):
+        """Une candidature renvoyée avec la même clé n'est pas dupliquée ni refusée."""
+        donnees = {
+            'tournoi': self.tournoi.pk,
+            'club': self.club.pk,
+            'declarant': "Jean Dupont",
+            'email_contact': "jean@tgv.re",
+            'lieu': "Gymnase de Saint-Denis",
+            'cle_soumission': self.cle,
+        }
+        url = reverse('candidature_form', args=[self.tournoi.pk])
+        self.client.post(url, donnees)
+        response = self.client.post(url, donnees, follow=True)
+
+        self.assertEqual(Candidature.objects.count(), 1)
+        self.assertContains(response, "Candidature enregistrée")
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 11 — File d'envoi des emails
+# ═══════════════════════════════════════════════════
+
+class BackendCompteur(LocmemBackend):
+    """Backend locmem qui compte les connexions et refuse certains destinataires"""
+    connexions = 0
+    refuses = set()
+
+    def open(self):
+        BackendCompteur.connexions += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.refuses:
+                raise ConnectionRefusedError("serveur indisponible")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='saisie_equipes.tests.BackendCompteur',
+    EMAILS_PAR_MINUTE=0,
+    EMAILS_MAX_TENTATIVES=2,
+)
+class EmailOutboxTests(TestCase):
+
+    def setUp(self):
+        BackendCompteur.connexions = 0
+        BackendCompteur.refuses = set()
+        self.tournoi = creer_tournoi(capacite_max=2)
+
+    def declarer(self, nom_club, nb=1):
+        form = DeclarationForm(donnees_declaration(
+            self.tournoi, creer_club(nom_club),
+            equipes=[(f"{nom_club} {i}", "") for i in range(1, nb + 1)],
+        ))
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def envoyer(self):
+        sortie = StringIO()
+        call_command('envoyer_emails', stdout=sortie)
+        return sortie.getvalue()
+
+    def test_declaration_en_file_sans_envoi(self):
+        """La déclaration écrit l'accusé de réception dans la file, sans SMTP."""
+        self.declarer("TGV Volley", nb=2)
+        self.declarer("SCB")
+
+        self.assertEqual(len(mail.outbox), 0)
+        inscrite, attente = EmailOutbox.objects.order_by('pk')
+        self.assertIn("TGV Volley 2", inscrite.corps)
+        self.assertTrue(attente.sujet.startswith("Liste d'attente"))
+
+    def test_decision_en_file_dans_la_transaction(self):
+        """Valider écrit un email pour la retenue et un pour chaque refus automatique."""
+        staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        c1, c2 = [
+            Candidature.objects.create(
+                tournoi=self.tournoi, club=creer_club(nom), declarant="Jean Dupont",
+                email_contact=f"{nom.lower()}@club.re", lieu="Gymnase",
+            )
+            for nom in ("TGV", "SCB")
+        ]
+        self.assertTrue(c1.valider(staff))
+        self.assertFalse(c2.refuser(staff, "Trop tard"))  # déjà refusée : pas de second email
+
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('modele', 'destinataire')),
+            [('candidature_refusee', 'scb@club.re'), ('candidature_validee', 'tgv@club.re')],
+        )
+
+    def test_envoi_par_lot_une_connexion(self):
+        """La commande vide la file sur une seule connexion SMTP."""
+        for nom in ("TGV", "SCB", "ASC"):
+            self.declarer(nom)
+
+        self.assertIn("3 email(s) envoyé(s)", self.envoyer())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(BackendCompteur.connexions, 1)
+        self.assertFalse(EmailOutbox.objects.exclude(statut=StatutEmail.ENVOYE).exists())
+
+        # Rien de nouveau : rien n'est renvoyé
+        self.envoyer()
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_echec_puis_abandon(self):
+        """Un échec est reprogrammé plus tard, puis abandonné après EMAILS_MAX_TENTATIVES."""
+        declaration = self.declarer("TGV")
+        BackendCompteur.refuses = {declaration.email_club}
+
+        self.envoyer()
+        email = EmailOutbox.objects.get()
+        self.assertEqual((email.statut, email.tentatives), (StatutEmail.EN_ATTENTE, 1))
+        self.assertGreater(email.prochain_essai, timezone.now())
+        self.assertIn("serveur indisponible", email.derniere_erreur)
+        self.assertEqual(reserver_lot(), [])
+
+        EmailOutbox.objects.update(prochain_essai=timezone.now())
+        with Expediteur() as expediteur:
+            expediteur.envoyer_lot(reserver_lot())
+        email.refresh_from_db()
+        self.assertEqual((email.statut, email.tentatives), (StatutEmail.ECHEC, 2))
+
+    def test_limiteur_debit(self):
+        """Au-delà de par_minute envois, le limiteur attend la fin de la fenêtre."""
+        instant = [0.0]
+        attentes = []
+
+        def dormir(secondes):
+            attentes.append(secondes)
+            instant[0] += secondes
+
+        limiteur = LimiteurDebit(2, horloge=lambda: instant[0], dormir=dormir)
+        for _ in range(3):
+            limiteur.attendre()
+            instant[0] += 1
+
+        self.assertEqual(attentes, [58.0])
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 12 — Travaux en arrière-plan
+# ═══════════════════════════════════════════════════
+
+class JobsTests(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        reglages = override_settings(MEDIA_ROOT=f"{self.media}/media", JOBS_STOCKAGE=f"{self.media}/prive")
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+
+        self.staff_user = User.objects.create_user(
+            username="staff", password="pass", is_staff=True
+        )
+        self.client.force_login(self.staff_user)
+
+    def run_jobs(self):
+        sortie = StringIO()
+        call_command('run_jobs', stdout=sortie)
+        return sortie.getvalue()
+
+    def test_export_declarations_en_arriere_plan(self):
+        """L'export ne produit pas le CSV dans la requête : un job le fait ensuite."""
+        tournoi = creer_tournoi()
+        for nom in ("TGV Volley", "SCB"):
+            form = DeclarationForm(donnees_declaration(tournoi, creer_club(nom)))
+            self.assertTrue(form.is_valid(), form.errors)
+            form.save()
+
+        response = self.client.post(
+            reverse('staff:declarations_liste') + '?q=TGV', {'action': 'export'}
+        )
+        job = Job.objects.get()
+        self.assertRedirects(response, reverse('staff:job_detail', args=[job.id]))
+        self.assertEqual((job.statut, job.parametres), (StatutJob.EN_ATTENTE, {'q': 'TGV'}))
+
+        self.assertIn("1 job(s) terminé(s)", self.run_jobs())
+        etat = self.client.get(reverse('staff:job_json', args=[job.id])).json()
+        self.assertEqual((etat['statut'], etat['progression']), (StatutJob.TERMINE, 100))
+
+        fichier = self.client.get(etat['telechargement'])
+        contenu = b''.join(fichier.streaming_content).decode('utf-8')
+        self.assertIn("TGV Volley", contenu)
+        self.assertNotIn("SCB", contenu)
+
+        # Emails des clubs : hors MEDIA_ROOT, dans un répertoire impossible à deviner
+        job.refresh_from_db()
+        self.assertRegex(job.resultat.name, r'^resultats/[0-9a-f]{32}/declarations_volleychamp_')
+        self.assertTrue(job.resultat.path.startswith(f"{self.media}/prive/"))
+        self.assertIn(job.resultat.name.rsplit('/', 1)[-1], fichier['Content-Disposition'])
+
+        # Passé le délai de conservation, le fichier est supprimé
+        Job.objects.update(fin=timezone.now() - timedelta(days=settings.JOBS_DUREE_CONSERVATION_JOURS + 1))
+        self.assertEqual(purger_resultats_jobs(), "1 fichier(s) de job supprimé(s)")
+        self.assertFalse(stockage_jobs.exists(job.resultat.name))
+        self.assertEqual(self.client.get(etat['telechargement']).status_code, 404)
+
+    def test_ancien_lien_export_get(self):
+        """?export=csv (favoris) : retour à la liste filtrée avec un message, sans job."""
+        url = reverse('staff:declarations_liste')
+        response = self.client.get(url, {'q': 'TGV', 'export': 'csv'}, follow=True)
+
+        self.assertRedirects(response, url + '?q=TGV')
+        self.assertContains(response, "se lance désormais")
+        self.assertFalse(Job.objects.exists())
+
+    def test_import_clubs_en_arriere_plan(self):
+        """L'import CSV de l'admin dépose le fichier et crée un job."""
+        creer_club("SCB")
+        self.staff_user.is_superuser = True
+        self.staff_user.save()
+
+        csv_clubs = SimpleUploadedFile("clubs.csv", "nom_club\nTGV Volley\nSCB\n\n".encode('utf-8'))
+        response = self.client.post(
+            reverse('admin:saisie_equipes_club_import_csv'), {'csv_file': csv_clubs}
+        )
+        job = Job.objects.get()
+        self.assertRedirects(response, reverse('staff:job_detail', args=[job.id]))
+        self.assertFalse(Club.objects.filter(nom="TGV Volley").exists())
+
+        self.run_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.statut, StatutJob.TERMINE)
+        self.assertEqual(job.message, "1 nouveau(x) club(s), 1 déjà existant(s), 0 erreur(s)")
+        self.assertTrue(Club.objects.filter(nom="TGV Volley").exists())
+
+    def test_import_en_echec_supprime_le_fichier(self):
+        """Le CSV déposé est supprimé même si l'import échoue."""
+        chemin = stockage_jobs.save("entrees/clubs.csv", ContentFile(b"\xff\xfe pas de l'UTF-8"))
+        job = lancer_job('import_clubs', self.staff_user, fichier=chemin)
+        self.assertIn("1 échec(s)", self.run_jobs())
+
+        self.assertEqual(Job.objects.get(pk=job.pk).statut, StatutJob.ECHEC)
+        self.assertFalse(stockage_jobs.exists(chemin))
+
+    def test_echec_enregistre(self):
+        """Une exception dans le job le passe en ECHEC avec la trace."""
+        job = lancer_job('import_clubs', self.staff_user, fichier='entrees/absent.csv')
+        self.assertIn("1 échec(s)", self.run_jobs())
+
+        job.refresh_from_db()
+        self.assertEqual(job.statut, StatutJob.ECHEC)
+        self.assertIn("Traceback", job.erreur)
+        self.assertEqual(self.client.get(reverse('staff:job_telecharger', args=[job.id])).status_code, 404)
+
+    def test_reprise_apres_expiration(self):
+        """Un job EN_COURS n'est repris qu'une fois sa réservation expirée."""
+        job = lancer_job('export_declarations')
+        self.assertEqual(reserver_job().pk, job.pk)
+        self.assertIsNone(reserver_job())
+
+        Job.objects.update(reserve_jusqua=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(reserver_job().pk, job.pk)
+        self.assertGreater(
+            Job.objects.get().reserve_jusqua,
+            timezone.now() + DUREE_RESERVATION_JOB - timedelta(minutes=1),
+        )
+
+    def test_pages_staff(self):
+        """Liste et suivi des jobs réservés au staff."""
+        job = lancer_job('export_declarations', self.staff_user)
+        self.assertContains(self.client.get(reverse('staff:jobs_liste')), "Export CSV des déclarations")
+        self.assertContains(self.client.get(reverse('staff:job_detail', args=[job.id])), "job-data")
+
+        self.client.logout()
+        response = self.client.get(reverse('staff:job_json', args=[job.id]))
+        self.assertEqual(response.status_code, 302)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 13 — Tâches périodiques
+# ═══════════════════════════════════════════════════
+
+class PlanificateurTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_un_seul_worker_par_tache(self):
+        """Un second worker ne relance pas une tâche déjà faite ou en cours."""
+        premier = executer_taches_dues('hote:1')
+        self.assertEqual({nom for nom, _ in premier}, set(TACHES_PERIODIQUES))
+        self.assertEqual(executer_taches_dues('hote:2'), [])
+
+        # Bail détenu par un worker en cours : même forcée, la tâche n'est pas relancée
+        VerrouTache.objects.filter(nom='purger_sessions').update(
+            bail_jusqua=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertEqual(executer_taches_dues('hote:2', noms=['purger_sessions'], forcer=True), [])
+
+        # Bail expiré (worker arrêté) : la tâche est reprise
+        VerrouTache.objects.filter(nom='purger_sessions').update(
+            bail_jusqua=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(len(executer_taches_dues('hote:2', noms=['purger_sessions'], forcer=True)), 1)
+        self.assertEqual(VerrouTache.objects.get(nom='purger_sessions').nb_executions, 2)
+
+    def test_terminer_tournois_passes(self):
+        """Les tournois passés PLANIFIE/CONFIRME deviennent TERMINE, pas les annulés."""
+        hier = timezone.localdate() - timedelta(days=1)
+        passe = creer_tournoi(date_tournoi=hier)
+        annule = creer_tournoi(date_tournoi=hier - timedelta(days=1), statut=StatutTournoi.ANNULE)
+        futur = creer_tournoi()
+
+        with self.assertNumQueries(2):  # SELECT des ids + UPDATE
+            TACHES_PERIODIQUES['terminer_tournois_passes'].fonction()
+
+        statuts = dict(Tournoi.objects.values_list('pk', 'statut'))
+        self.assertEqual(statuts[passe.pk], StatutTournoi.TERMINE)
+        self.assertEqual(statuts[annule.pk], StatutTournoi.ANNULE)
+        self.assertEqual(statuts[futur.pk], StatutTournoi.PLANIFIE)
+
+    def test_purger_sessions_par_lots(self):
+        """Les sessions expirées sont supprimées par lots, les autres gardées."""
+        from django.contrib.sessions.backends.db import SessionStore
+        from django.contrib.sessions.models import Session
+
+        for i in range(5):
+            session = SessionStore()
+            session['i'] = i
+            session.set_expiry(-10 if i < 4 else 3600)
+            session.save()
+
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            self.assertEqual(purger_sessions(taille_lot=3), "4 session(s) supprimée(s) en 2 lot(s)")
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_prechauffer_caches(self):
+        """Après préchauffage, la page poules du staff est servie depuis le cache."""
+        tournoi = creer_tournoi(date_tournoi=timezone.localdate() + timedelta(days=2))
+        TACHES_PERIODIQUES['prechauffer_caches'].fonction()
+
+        with self.assertNumQueries(0):
+            get_repartitions_poules([tournoi.pk])
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 14 — Sessions
+# ═══════════════════════════════════════════════════
+
+class SessionsTests(TestCase):
+
+    def creer_sessions(self, nb_expirees, nb_actives):
+        from django.contrib.sessions.backends.db import SessionStore
+        for i in range(nb_expirees + nb_actives):
+            session = SessionStore()
+            session['i'] = i
+            session.set_expiry(-10 if i < nb_expirees else 3600)
+            session.save()
+
+    def test_purge_par_plages(self):
+        """Lots successifs sur des plages de clés ; les sessions actives restent."""
+        self.creer_sessions(7, 3)
+
+        resultat = purger_sessions_expirees(taille_lot=3, pause=0)
+        self.assertEqual(resultat, {'supprimees': 7, 'lots': 3})
+
+        stats = statistiques_sessions()
+        self.assertEqual((stats['total'], stats['expirees'], stats['actives']), (3, 0, 3))
+
+    def test_purge_limitee(self):
+        """max_lots arrête la purge (elle reprendra au prochain passage)."""
+        self.creer_sessions(5, 0)
+        self.assertEqual(purger_sessions_expirees(taille_lot=2, pause=0, max_lots=1)['supprimees'], 2)
+
+    @override_settings(SESSION_ENGINE='saisie_equipes.sessions')
+    def test_anonyme_en_cookie_staff_en_base(self):
+        """Un visiteur anonyme n'écrit rien en base ; le staff connecté, si."""
+        from django.contrib.sessions.models import Session
+
+        self.client.get(reverse('declaration'))  # form_start_time en session
+        cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.assertTrue(est_cle_cookie(cookie))
+        self.assertEqual(Session.objects.count(), 0)
+
+        # Les données de la session sont dans le cookie lui-même
+        from saisie_equipes.sessions import SessionStore
+        self.assertIn('form_start_time', SessionStore(cookie))
+
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.post(reverse('login'), {'username': 'staff', 'password': 'pass'})
+        self.assertEqual(self.client.get(reverse('staff:dashboard')).status_code, 200)
+        self.assertEqual(Session.objects.count(), 1)
+        self.assertFalse(est_cle_cookie(self.client.cookies[settings.SESSION_COOKIE_NAME].value))
+
+    @override_settings(SESSION_ENGINE='saisie_equipes.sessions')
+    def test_cookie_falsifie(self):
+        """Un cookie modifié est ignoré (nouvelle session vide)."""
+        from saisie_equipes.sessions import SessionStore
+
+        session = SessionStore()
+        session['compteur'] = 1
+        session.save()
+        falsifie = SessionStore(session.session_key.replace(':', 'x:', 1))
+        self.assertEqual(dict(falsifie.items()), {})
+        self.assertEqual(SessionStore(session.session_key)['compteur'], 1)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 15 — Connexions à la base
+# ═══════════════════════════════════════════════════
+
+class ConnexionsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        STATISTIQUES_CONNEXIONS.reinitialiser()
+
+    def test_classement_des_requetes(self):
+        """Réutilisée, neuve ou reconnexion selon l'état avant / les ouvertures pendant."""
+        STATISTIQUES_CONNEXIONS.requete_terminee(ouverte_avant=True, ouvertures=0)
+        STATISTIQUES_CONNEXIONS.requete_terminee(ouverte_avant=False, ouvertures=1)
+        STATISTIQUES_CONNEXIONS.requete_terminee(ouverte_avant=True, ouvertures=1)
+        donnees = STATISTIQUES_CONNEXIONS.as_dict()
+        self.assertEqual(
+            (donnees['reutilisees'], donnees['nouvelles'], donnees['reconnexions']), (1, 1, 1)
+        )
+
+    def test_ouverture_chronometree(self):
+        """Le moteur de base compte et chronomètre chaque ouverture de connexion."""
+        from django.db import connections
+
+        connexion = connections.create_connection('default')
+        try:
+            connexion.ensure_connection()
+        finally:
+            connexion.close()
+
+        self.assertEqual(connexion.nb_ouvertures, 1)
+        self.assertEqual(STATISTIQUES_CONNEXIONS.as_dict()['latences']['total'], 1)
+
+    def test_middleware_et_page_metriques(self):
+        """Les requêtes du test réutilisent la connexion ; la page additionne les workers."""
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+        self.client.get(reverse('staff:dashboard'))
+        self.assertEqual(STATISTIQUES_CONNEXIONS.as_dict()['reutilisees'], 1)
+
+        # Un autre worker a publié ses compteurs
+        autre = dict(STATISTIQUES_CONNEXIONS.as_dict(), worker='autre:1', ouvertures=4, reutilisees=9)
+        cache.set('metriques_connexions:autre:1', autre)
+        cache.set('metriques_connexions:workers', {'autre:1': autre['publie_le']})
+
+        response = self.client.get(reverse('staff:metriques'))
+        self.assertEqual(response.status_code, 200)
+        metriques = response.context['connexions']
+        self.assertEqual(len(metriques['workers']), 2)
+        self.assertEqual(metriques['total']['reutilisees'], 10)
+        self.assertEqual(metriques['total']['ouvertures'], 4)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 16 — Réplique en lecture
+# ═══════════════════════════════════════════════════
+
+@using_replica
+def vue_base_lue(request):
+    """Vue de test : alias sur lequel seraient lus tournois et utilisateurs"""
+    return HttpResponse(f"{Tournoi.objects.all().db},{User.objects.all().db}")
+
+
+@override_settings(REPLICA_LECTURE=True)
+class ReplicaTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def get(self, **cookies):
+        request = RequestFactory().get('/')
+        request.COOKIES.update(cookies)
+        return vue_base_lue(request).content.decode()
+
+    def test_routage(self):
+        """Modèles de l'application sur la réplique ; auth, écritures et hors vue sur default."""
+        self.assertEqual(self.get(), 'replica,default')
+        self.assertEqual(Tournoi.objects.all().db, 'default')
+
+        with lectures_sur_replica():
+            self.assertEqual(Tournoi.objects.all().db, 'replica')
+            self.assertEqual(router.db_for_write(Tournoi), 'default')
+            with sur_base_principale():
+                self.assertEqual(Tournoi.objects.all().db, 'default')
+
+        with override_settings(REPLICA_LECTURE=False):
+            self.assertEqual(self.get(), 'default,default')
+
+    def test_lire_ses_ecritures(self):
+        """Un POST pose le cookie ; tant qu'il est récent, les lectures restent sur default."""
+        response = self.client.post(reverse('declaration'), {})
+        horodatage = response.cookies[COOKIE_ECRITURE].value
+        self.assertEqual(self.get(**{COOKIE_ECRITURE: horodatage}), 'default,default')
+
+        self.assertNotIn(COOKIE_ECRITURE, self.client.get(reverse('accueil')).cookies)
+        with override_settings(REPLICA_DELAI_COHERENCE=0):
+            self.assertEqual(self.get(**{COOKIE_ECRITURE: horodatage}), 'replica,default')
+        self.assertEqual(self.get(**{COOKIE_ECRITURE: 'invalide'}), 'replica,default')
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 17 — Recherche plein texte (staff)
+# ═══════════════════════════════════════════════════
+
+class RechercheTests(TestCase):
+
+    def setUp(self):
+        self.tournoi = creer_tournoi(lieu="Gymnase de Saint-Pierre, La Réunion")
+        self.club = creer_club("Volley Étang-Salé")
+        self.candidature = Candidature.objects.create(
+            tournoi=self.tournoi,
+            club=self.club,
+            declarant="Hélène Payet",
+            email_contact="helene@club.re",
+            lieu="Salle Hoarau",
+        )
+
+    def trouves(self, requete, *types):
+        return [(type_objet, objet_id) for type_objet, objet_id, _ in rechercher(requete, types)]
+
+    def test_accents_et_prefixes(self):
+        """« reunion » trouve « Réunion » ; chaque mot est un préfixe obligatoire."""
+        self.assertEqual(self.trouves("reunion"), [(TypeDocument.TOURNOI, self.tournoi.pk)])
+        self.assertEqual(self.trouves("RÉUN saint"), [(TypeDocument.TOURNOI, self.tournoi.pk)])
+        self.assertEqual(self.trouves("etang helene"), [(TypeDocument.CANDIDATURE, self.candidature.pk)])
+        self.assertEqual(self.trouves("reunion paris"), [])
+        self.assertEqual(self.trouves("' OR 1=1 --"), [])
+
+    def test_documents_tenus_a_jour(self):
+        """Renommage du club, validation (UPDATE du tournoi), suppression."""
+        self.club.nom = "Cilaos Volley"
+        self.club.save()
+        self.assertEqual(self.trouves("etang"), [])
+        self.assertEqual(self.trouves("cilaos", TypeDocument.CANDIDATURE), [(TypeDocument.CANDIDATURE, self.candidature.pk)])
+
+        # L'organisateur est écrit par UPDATE : le document du tournoi suit
+        staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        valider_candidatures([self.candidature.pk], staff)
+        self.assertEqual(self.trouves("cilaos hoarau", TypeDocument.TOURNOI), [(TypeDocument.TOURNOI, self.tournoi.pk)])
+
+        self.candidature.delete()
+        self.assertEqual(self.trouves("cilaos", TypeDocument.CANDIDATURE), [])
+
+    def test_reindexer(self):
+        """La commande reconstruit les documents perdus."""
+        DocumentRecherche.objects.all().delete()
+        call_command('reindexer_recherche', stdout=StringIO())
+        self.assertEqual(DocumentRecherche.objects.count(), 2)
+        self.assertEqual(len(self.trouves("reunion")), 1)
+
+    def test_migration_remplit_les_documents(self):
+        """Les objets existants sont indexés au déploiement, avec les textes de recherche.py."""
+        Declaration.objects.create(tournoi=self.tournoi, club=self.club, nombre_equipes=1, declarant="Hélène Payet", email_club="h@club.re")
+        self.tournoi.club_organisateur = self.club
+        self.tournoi.save()
+        attendus = set(DocumentRecherche.objects.values_list('type_objet', 'objet_id', 'titre', 'texte'))
+
+        DocumentRecherche.objects.all().delete()
+        migration = importlib.import_module('saisie_equipes.migrations.0031_remplir_documentrecherche')
+        migration.remplir_documents(django_apps, None)
+
+        self.assertEqual(set(DocumentRecherche.objects.values_list('type_objet', 'objet_id', 'titre', 'texte')), attendus)
+        self.assertEqual(len(attendus), 3)
+        self.assertEqual(self.trouves("reunion"), [(TypeDocument.TOURNOI, self.tournoi.pk)])
+
+    def test_vues_staff(self):
+        """Filtre « q » des listes et recherche globale."""
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+
+        response = self.client.get(reverse('staff:candidatures_liste'), {'q': 'etang'})
+        self.assertEqual(list(response.context['candidatures']), [self.candidature])
+
+        response = self.client.get(reverse('staff:recherche'), {'q': 'reunion'})
+        self.assertEqual([r['type'] for r in response.context['resultats']], ["Tournoi"])
+        self.assertContains(response, reverse('staff:tournoi_edit', args=[self.tournoi.pk]))
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 18 — Autocomplétion des clubs
+# ═══════════════════════════════════════════════════
+
+class AutocompletionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.saint_pierre = creer_club("AS Saint-Pierre")
+        self.tampon = creer_club("Tampon Gecko Volley")
+        self.etang = creer_club("Volley Étang-Salé")
+
+    def noms(self, requete):
+        return [nom for _, nom in rechercher_clubs(requete)]
+
+    def test_prefixes_fautes_et_accents(self):
+        self.assertEqual(self.noms("sai pie"), ["AS Saint-Pierre"])
+        self.assertEqual(self.noms("ETANG"), ["Volley Étang-Salé"])
+        self.assertEqual(self.noms("tampn geko"), ["Tampon Gecko Volley"])
+        self.assertEqual(self.noms("xyz"), [])
+        self.assertEqual(self.noms("  "), [])
+
+    def test_prefixes_avant_ressemblances(self):
+        """Les noms commençant par la requête passent avant les simples ressemblances."""
+        index = IndexClubs([(1, "Volley Club"), (2, "Vollay Club"), (3, "Saint-Paul Volley")])
+        self.assertEqual([club_id for club_id, _ in index.rechercher("volley")], [1, 3, 2])
+        self.assertEqual(len(index.rechercher("volley", limite=1)), 1)
+
+    def test_index_reconstruit_apres_modification(self):
+        """Un club créé ou renommé est trouvé dès le commit (version en cache)."""
+        self.assertEqual(self.noms("cilaos"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            creer_club("Cilaos VB")
+        self.assertEqual(self.noms("cilaos"), ["Cilaos VB"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.etang.nom = "Étang-Salé Volley"
+            self.etang.save()
+        self.assertEqual(self.noms("etang"), ["Étang-Salé Volley"])
+
+    def test_vue_json_sans_requete_sql(self):
+        get_index()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('clubs_autocompletion'), {'q': 'saint pi'})
+        self.assertEqual(response.json(), {'resultats': [{'id': self.saint_pierre.pk, 'nom': "AS Saint-Pierre"}]})
+
+    def test_recherche_admin(self):
+        """La recherche de l'admin des clubs tolère aussi les fautes de frappe."""
+        User.objects.create_superuser(username="admin", password="pass", email="admin@club.re")
+        self.client.login(username="admin", password="pass")
+        response = self.client.get(reverse('admin:saisie_equipes_club_changelist'), {'q': 'tampn'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.tampon])
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 19 — Doublons de clubs
+# ═══════════════════════════════════════════════════
+
+class DoublonsTests(TestCase):
+
+    def setUp(self):
+        self.tampon = creer_club("Tampon Gecko Volley")
+        self.tampon_maj = creer_club("TAMPON GECKO VOLLEY ")
+        self.tampon_faute = creer_club("Tampn Gecko Voley")
+        self.cilaos = creer_club("Cilaos VB")
+
+        self.tournoi = creer_tournoi(club_organisateur=self.tampon_maj)
+        self.declaration = Declaration.objects.create(
+            tournoi=self.tournoi, club=self.tampon_faute,
+            nombre_equipes=1, declarant="Jean Dupont", email_club="jean@test.re",
+        )
+        self.candidature = Candidature.objects.create(
+            tournoi=self.tournoi, club=self.tampon_maj,
+            declarant="Hélène Payet", email_contact="helene@club.re", lieu="Salle Hoarau",
+        )
+
+    def test_detection(self):
+        """Casse, espaces et fautes de frappe ; le club le plus utilisé proposé en premier."""
+        groupes = trouver_doublons()
+        self.assertEqual(len(groupes), 1)
+        self.assertEqual(groupes[0]['clubs'][0], self.tampon_maj)
+        self.assertEqual(set(groupes[0]['clubs']), {self.tampon, self.tampon_maj, self.tampon_faute})
+
+    def test_numeros_et_mots_generiques(self):
+        """Deux numéros différents, ou un seul mot générique commun, ne font pas un doublon."""
+        clubs = [(1, "Saint-Denis VB 1"), (2, "Saint-Denis VB 2"), (3, "AS Volley Club"), (4, "AS Volley Cilaos")]
+        self.assertEqual(groupes_doublons(clubs), [])
+
+    def test_fusion(self):
+        # Un envoi reçu d'un doublon, pas encore enregistré (réception différée)
+        recue = DeclarationRecue.objects.create(
+            tournoi=self.tournoi, club=self.tampon_faute, nombre_equipes=1, equipes=[["Tampon 2", ""]],
+            declarant="Jean Dupont", email_club="jean@club.re", cle_soumission=uuid.uuid4(),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = fusionner_clubs(self.tampon.pk, [self.tampon_maj.pk, self.tampon_faute.pk])
+
+        self.assertEqual(resultat, {
+            'declarations': 1, 'candidatures': 1, 'tournois': 1, 'declarations_recues': 1, 'clubs': 2,
+        })
+        self.assertEqual(DeclarationRecue.objects.get().pk, recue.pk)
+        self.assertEqual(DeclarationRecue.objects.get().club, self.tampon)
+        self.assertEqual(set(Club.objects.all()), {self.tampon, self.cilaos})
+        self.declaration.refresh_from_db()
+        self.candidature.refresh_from_db()
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.declaration.club, self.tampon)
+        self.assertEqual(self.candidature.club, self.tampon)
+        self.assertEqual(self.tournoi.club_organisateur, self.tampon)
+
+        # UPDATE sans signaux : documents de recherche et autocomplétion suivent
+        self.assertEqual(
+            [objet_id for _, objet_id, _ in rechercher("tampon gecko", [TypeDocument.DECLARATION])],
+            [self.declaration.pk],
+        )
+        self.assertEqual([nom for _, nom in rechercher_clubs("tampon")], ["Tampon Gecko Volley"])
+
+    def test_fusion_refusee_si_candidatures_en_conflit(self):
+        Candidature.objects.create(
+            tournoi=self.tournoi, club=self.tampon,
+            declarant="Jean Dupont", email_contact="jean@club.re", lieu="Gymnase",
+        )
+        with self.assertRaises(ErreurFusion):
+            fusionner_clubs(self.tampon.pk, [self.tampon_maj.pk])
+        self.assertEqual(Club.objects.count(), 4)
+
+    def test_vue_staff_et_commande(self):
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+
+        response = self.client.get(reverse('staff:clubs_doublons'))
+        self.assertContains(response, "Tampn Gecko Voley")
+        self.assertNotContains(response, "Cilaos VB")
+
+        response = self.client.post(reverse('staff:clubs_doublons'), {
+            'cible': self.tampon_maj.pk, 'doublons': [self.tampon.pk, self.tampon_faute.pk],
+        })
+        self.assertRedirects(response, reverse('staff:clubs_doublons'))
+        self.assertEqual(Club.objects.count(), 2)
+
+        sortie = StringIO()
+        call_command('doublons_clubs', stdout=sortie)
+        self.assertIn("0 groupe(s)", sortie.getvalue())
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 20 — Domaines email jetables
+# ═══════════════════════════════════════════════════
+
+class DomainesJetablesTests(TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier, ignore_errors=True)
+        self.fichier = f"{self.dossier}/domaines.txt"
+        with open(self.fichier, 'w', encoding='utf-8') as f:
+            f.write("# commentaire\nyopmail.com\ntest.com  # exemple\n\n")
+
+        reglage = override_settings(DOMAINES_JETABLES_FICHIER=self.fichier)
+        reglage.enable()
+        self.addCleanup(reglage.disable)
+
+        # Vérifie la date du fichier à chaque appel
+        delai = domaines_jetables.DELAI_VERIFICATION
+        domaines_jetables.DELAI_VERIFICATION = 0
+        self.addCleanup(setattr, domaines_jetables, 'DELAI_VERIFICATION', delai)
+        domaines_jetables.recharger()
+        self.addCleanup(domaines_jetables.recharger)
+
+    def test_domaine_et_domaines_parents(self):
+        """yopmail.com bloque ses sous-domaines ; test.com ne bloque pas contest.com.re."""
+        self.assertTrue(domaines_jetables.est_jetable("yopmail.com"))
+        self.assertTrue(domaines_jetables.est_jetable("MX.Yopmail.com."))
+        self.assertFalse(domaines_jetables.est_jetable("contest.com.re"))
+        self.assertFalse(domaines_jetables.est_jetable("yopmail.com.re"))
+
+    def test_rechargement_quand_le_fichier_change(self):
+        self.assertFalse(domaines_jetables.est_jetable("jetable.re"))
+        with open(self.fichier, 'a', encoding='utf-8') as f:
+            f.write("jetable.re\n")
+        self.assertTrue(domaines_jetables.est_jetable("jetable.re"))
+
+        # Fichier disparu : la dernière liste lue reste en place
+        with self.assertLogs('saisie_equipes.domaines_jetables', 'ERROR'):
+            with override_settings(DOMAINES_JETABLES_FICHIER=f"{self.dossier}/absent.txt"):
+                self.assertTrue(domaines_jetables.est_jetable("jetable.re"))
+
+    def test_formulaires(self):
+        """Le fichier livré est celui des formulaires publics."""
+        tournoi, club = creer_tournoi(), creer_club()
+        with override_settings(DOMAINES_JETABLES_FICHIER=settings.BASE_DIR / 'saisie_equipes' / 'donnees' / 'domaines_jetables.txt'):
+            form = DeclarationForm(data=donnees_declaration(tournoi, club, email_club="jean@yopmail.fr"))
+            self.assertIn('email_club', form.errors)
+
+            form = DeclarationForm(data=donnees_declaration(tournoi, club, email_club="jean@contest.com.re"))
+            self.assertNotIn('email_club', form.errors)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 21 — Pipeline anti-spam
+# ═══════════════════════════════════════════════════
+
+class AntispamTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tournoi = creer_tournoi()
+        self.club = creer_club()
+
+    def verdict(self, session=None, **donnees):
+        request = RequestFactory().post('/declaration/', donnees)
+        request.session = session or {}
+        return antispam.evaluer(request, 'declaration')
+
+    def test_honeypot_rejete_sans_requete_sql(self):
+        donnees = donnees_declaration(self.tournoi, self.club, website="http://spam.example")
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('declaration'), donnees)
+        self.assertRedirects(response, reverse('declaration'), fetch_redirect_response=False)
+        self.assertEqual(Declaration.objects.count(), 0)
+
+    def test_court_circuit_et_compteurs(self):
+        """Le honeypot suffit : les règles de contenu, plus coûteuses, ne sont pas évaluées."""
+        verdict = self.verdict(website="x", remarques="www.spam.net")
+        self.assertTrue(verdict.bloque)
+        self.assertEqual([r.nom for r in verdict.touchees], ['honeypot'])
+
+        regles = {r['nom']: r['touchee'] for r in antispam.statistiques()['regles']}
+        self.assertEqual(regles['honeypot'], 1)
+        self.assertEqual(regles['liens'], 0)
+        self.assertEqual(antispam.statistiques()['formulaires'][0]['bloques'], 1)
+
+    def test_indices_faibles_cumules(self):
+        """Un lien seul est laissé au formulaire ; un lien et un email jetable sont rejetés."""
+        self.assertFalse(self.verdict(remarques="voir monclub.com").bloque)
+        self.assertTrue(self.verdict(remarques="voir monclub.com", email_club="x@yopmail.com").bloque)
+        self.assertFalse(self.verdict(remarques="Nous serons là.Comme prévu", declarant="Jean Dupont").bloque)
+
+    def test_session_delai_et_limite(self):
+        self.client.get(reverse('declaration'))
+        response = self.client.post(reverse('declaration'), donnees_declaration(self.tournoi, self.club), follow=True)
+        self.assertContains(response, "prendre le temps")
+
+        ip = 'submissions_127_0_0_1'
+        trop_lent = (timezone.now() - timedelta(hours=1)).replace(tzinfo=None).isoformat()
+        self.assertEqual(self.verdict({'form_start_time': trop_lent}).regle.nom, 'session_expiree')
+        self.assertEqual(self.verdict({'form_start_time': "pas une date"}).regle.nom, 'session_invalide')
+        self.assertEqual(self.verdict({ip: 5}).regle.nom, 'limite_envois')
+        self.assertFalse(self.verdict({ip: 4}).bloque)
+
+    def test_renvoi_apres_limite(self):
+        """Le renvoi du 5e envoi accepté reçoit la confirmation idempotente, pas limite_envois."""
+        for i in range(antispam.MAX_SOUMISSIONS):
+            donnees = donnees_declaration(self.tournoi, creer_club(f"Club {i}"), cle_soumission=str(uuid.uuid4()))
+            self.assertRedirects(self.client.post(reverse('declaration'), donnees), reverse('confirmation'))
+
+        self.assertRedirects(self.client.post(reverse('declaration'), donnees), reverse('confirmation'))
+        self.assertEqual(Declaration.objects.count(), antispam.MAX_SOUMISSIONS)
+
+        donnees['cle_soumission'] = str(uuid.uuid4())
+        response = self.client.post(reverse('declaration'), donnees, follow=True)
+        self.assertContains(response, "limite d")
+
+    def test_compteurs_gardent_leur_expiration_en_cache_fichier(self):
+        """Cache fichier (production) : le compteur est écrit sans le délai par défaut de 300 s."""
+        repertoire = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repertoire)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': repertoire,
+        }}):
+            self.verdict(website="x")
+            self.verdict(website="x")
+            self.assertEqual(antispam.statistiques()['formulaires'][0]['bloques'], 2)
+
+            with open(caches['default']._key_to_file('antispam:bloques:declaration'), 'rb') as f:
+                self.assertIsNone(pickle.load(f))   # expiration : aucune
+
+    def test_candidature(self):
+        """Les mêmes règles protègent le formulaire de candidature."""
+        url = reverse('candidature_form', args=[self.tournoi.pk])
+        response = self.client.post(url, {'website': "x", 'club': self.club.pk}, follow=True)
+        self.assertContains(response, "Requête invalide détectée")
+        self.assertEqual(Candidature.objects.count(), 0)
+
+    def test_metriques_staff(self):
+        self.verdict(website="x")
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+        response = self.client.get(reverse('staff:metriques'))
+        self.assertContains(response, "1 rejeté(s)")
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 22 — Tentatives de connexion
+# ═══════════════════════════════════════════════════
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TentativesConnexionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_superuser(username="admin", password="bon-mot-de-passe", email="admin@club.re")
+
+    def echouer(self, nb, url_name='login', username="admin"):
+        for _ in range(nb):
+            self.client.post(reverse(url_name), {'username': username, 'password': "faux"})
+
+    def test_blocage_avant_authenticate(self):
+        """Après 5 échecs, même le bon mot de passe est refusé sans authenticate()."""
+        self.echouer(tentatives_connexion.SEUIL_IDENTIFIANT)
+
+        response = self.client.post(reverse('login'), {'username': "ADMIN ", 'password': "bon-mot-de-passe"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertContains(response, "Trop de tentatives", status_code=429)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        self.assertEqual(tentatives_connexion.statistiques()['refusees'], 1)
+
+    def test_blocage_exponentiel_et_reussite(self):
+        self.echouer(tentatives_connexion.SEUIL_IDENTIFIANT)
+        self.assertEqual(tentatives_connexion.verifier(None, "admin"), tentatives_connexion.DUREE_BLOCAGE)
+
+        # Blocage écoulé : un nouvel échec double la durée
+        _, empreinte, _ = tentatives_connexion._cles(None, "admin")[0]
+        cache.delete(f'connexion:blocage:identifiant:{empreinte}')
+        self.echouer(1)
+        self.assertEqual(tentatives_connexion.verifier(None, "admin"), 2 * tentatives_connexion.DUREE_BLOCAGE)
+
+        # Une réussite efface les échecs de l'identifiant
+        tentatives_connexion.enregistrer_succes(None, "admin")
+        self.assertEqual(tentatives_connexion.verifier(None, "admin"), 0)
+
+    def test_blocage_par_ip(self):
+        """Plusieurs identifiants depuis la même IP : bloqués au seuil de l'IP."""
+        for i in range(tentatives_connexion.SEUIL_IP):
+            self.echouer(1, username=f"robot{i}")
+        self.assertGreater(tentatives_connexion.verifier(RequestFactory().get('/'), "autre"), 0)
+
+    def test_admin(self):
+        """La connexion de l'admin Django partage les mêmes compteurs."""
+        self.echouer(tentatives_connexion.SEUIL_IDENTIFIANT, url_name='admin:login')
+        response = self.client.post(reverse('admin:login'), {'username': "admin", 'password': "bon-mot-de-passe"})
+        self.assertContains(response, "Trop de tentatives")
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+        self.client.force_login(User.objects.get(username="admin"))
+        response = self.client.get(reverse('staff:metriques'))
+        self.assertContains(response, "tentative(s) refusée(s)")
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 23 — Salle d'attente
+# ═══════════════════════════════════════════════════
+
+class SalleAttenteTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        # Réglages et file en cache : rien ne doit rester actif pour les tests suivants
+        self.addCleanup(cache.clear)
+        salle_attente.enregistrer_reglages(True, 1)
+
+    def occuper(self):
+        """Une page en cours de calcul : l'unique jeton est pris"""
+        jeton = salle_attente.prendre_jeton(1)
+        self.assertIsNotNone(jeton)
+        return jeton
+
+    def ticket(self, response):
+        """Numéro du ticket posé par la page d'attente (cookie signé)"""
+        cookie = response.cookies[salle_attente.COOKIE_TICKET].value
+        signeur = signing.get_cookie_signer(salt=salle_attente.COOKIE_TICKET * 2)
+        return int(signeur.unsign(cookie))
+
+    def test_admission_sous_la_limite(self):
+        response = self.client.get(reverse('declaration'))
+        self.assertEqual(response.status_code, 200)
+        # Jeton rendu à la fin de la page
+        self.assertIsNotNone(salle_attente.prendre_jeton(1))
+
+    def test_attente_au_dela_de_la_limite(self):
+        self.occuper()
+        response = self.client.get(reverse('declaration'))
+
+        self.assertContains(response, "Salle d'attente", status_code=503)
+        self.assertEqual(response.context['position'], 1)
+        self.assertEqual(response['Retry-After'], str(salle_attente.DELAI_ESSAI))
+        self.assertEqual(self.ticket(response), 1)
+
+        # Ticket en main : la page d'attente se recharge sans requête SQL
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('declaration')).status_code, 503)
+
+    def test_tickets_distribues_par_la_base(self):
+        """Les numéros viennent de FileAttente (UPDATE atomique) : la copie en cache peut se perdre."""
+        self.assertEqual(salle_attente.distribuer_ticket(), 1)
+        cache.delete_many([salle_attente.CLE_TICKETS, salle_attente.CLE_APPEL])
+        self.assertEqual(salle_attente.distribuer_ticket(), 2)
+
+        # Un appel ne dépasse jamais le dernier ticket distribué
+        salle_attente.appeler(5)
+        file = FileAttente.objects.get(pk=salle_attente.FILE)
+        self.assertEqual((file.dernier_ticket, file.dernier_appel), (2, 2))
+        self.assertEqual(salle_attente.etat()['en_attente'], 0)
+
+    def test_nouveau_venu_derriere_la_file(self):
+        """Une place libre ne profite pas à un nouveau venu s'il y a des tickets en attente."""
+        jeton = self.occuper()
+        self.client.get(reverse('declaration'))
+        salle_attente.rendre_jeton(jeton)
+
+        # La place revient au ticket 1, appelé par rendre_jeton() : le nouveau venu prend le 2
+        response = Client().get(reverse('candidature_form', args=[1]))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.ticket(response), 2)
+        self.assertEqual(self.client.get(reverse('declaration')).status_code, 200)
+
+    def test_file_dans_l_ordre_des_tickets(self):
+        """Une place libérée va au ticket appelé, pas au suivant ni à un ticket forgé."""
+        jeton = self.occuper()
+        premier, second = Client(), Client()
+        self.assertEqual(self.ticket(premier.get(reverse('declaration'))), 1)
+        self.assertEqual(self.ticket(second.get(reverse('declaration'))), 2)
+        salle_attente.rendre_jeton(jeton)
+
+        self.assertEqual(second.get(reverse('declaration')).status_code, 503)
+        forge = Client()
+        forge.cookies[salle_attente.COOKIE_TICKET] = '1'
+        self.assertEqual(forge.get(reverse('declaration')).status_code, 503)
+        self.assertEqual(premier.get(reverse('declaration')).status_code, 200)
+        # La page du ticket 1 terminée, le 2 est appelé
+        self.assertEqual(second.get(reverse('declaration')).status_code, 200)
+
+    def test_appele_absent(self):
+        """Un ticket appelé qui ne revient pas ne bloque pas la file au-delà de DELAI_APPEL."""
+        jeton = self.occuper()
+        Client().get(reverse('declaration'))       # ticket 1, parti
+        second = Client()
+        second.get(reverse('declaration'))          # ticket 2
+        salle_attente.rendre_jeton(jeton)
+
+        self.assertEqual(second.get(reverse('declaration')).status_code, 503)
+        cache.set(salle_attente.CLE_APPELE_LE, time.time() - salle_attente.DELAI_APPEL - 1)
+        self.assertEqual(second.get(reverse('declaration')).status_code, 200)
+
+    def test_ticket_admis_apres_liberation(self):
+        jeton = self.occuper()
+        self.client.get(reverse('declaration'))
+        salle_attente.rendre_jeton(jeton)
+
+        response = self.client.get(reverse('declaration'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[salle_attente.COOKIE_TICKET].value, '')
+        self.assertEqual(salle_attente.etat()['en_attente'], 0)
+
+    def test_post_jamais_refoule(self):
+        self.occuper()
+        response = self.client.post(reverse('declaration'), {})
+        self.assertNotEqual(response.status_code, 503)
+
+    def test_desactivee_et_staff(self):
+        self.occuper()
+        staff = User.objects.create_user(username="staff", password="x", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse('declaration')).status_code, 200)
+
+        salle_attente.enregistrer_reglages(False, 1)
+        self.assertEqual(Client().get(reverse('declaration')).status_code, 200)
+
+    def test_reglages_staff(self):
+        staff = User.objects.create_user(username="staff", password="x", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.post(reverse('staff:salle_attente'), {'max_simultanes': '12'}, follow=True)
+        self.assertContains(response, "désactivée.")
+        self.assertEqual(salle_attente.get_reglages(), {'active': False, 'max_simultanes': 12})
+
+        self.client.post(reverse('staff:salle_attente'), {'active': 'on', 'max_simultanes': '0'})
+        self.assertFalse(salle_attente.get_reglages()['active'])
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 24 — Réception différée des déclarations
+# ═══════════════════════════════════════════════════
+
+@override_settings(DECLARATIONS_DIFFEREES=True)
+class ReceptionTests(TestCase):
+
+    def setUp(self):
+        self.tournoi = creer_tournoi(capacite_max=4)
+
+    def envoyer(self, nom_club, nb, **kwargs):
+        donnees = donnees_declaration(
+            self.tournoi, creer_club(nom_club),
+            equipes=[(f"{nom_club} {i}", "") for i in range(1, nb + 1)], **kwargs
+        )
+        return self.client.post(reverse('declaration'), donnees)
+
+    def test_envoi_mis_en_file(self):
+        """La vue n'écrit que la ligne reçue ; la page de suivi indique l'enregistrement en cours."""
+        response = self.envoyer("A", 2)
+
+        recue = DeclarationRecue.objects.get()
+        self.assertRedirects(response, reverse('declaration_recue', args=[recue.cle_soumission]),
+                             fetch_redirect_response=False)
+        self.assertFalse(Declaration.objects.exists())
+        self.assertEqual(recue.equipes, [["A 1", ""], ["A 2", ""]])
+
+        response = self.client.get(response.url)
+        self.assertContains(response, "en cours d'enregistrement")
+
+    def test_double_envoi(self):
+        cle = str(uuid.uuid4())
+        club = creer_club("TGV")
+        donnees = donnees_declaration(self.tournoi, club, cle_soumission=cle)
+        self.client.post(reverse('declaration'), donnees)
+        self.client.post(reverse('declaration'), donnees)
+        self.assertEqual(DeclarationRecue.objects.count(), 1)
+
+    def test_traitement_par_lot(self):
+        """Capacité et FIFO comme la voie directe ; une invalidation, des INSERT groupés."""
+        self.envoyer("A", 3)
+        self.envoyer("B", 2)   # ne tient pas : liste d'attente
+        self.envoyer("C", 1)   # tiendrait, mais ne passe pas devant B
+        version = get_version_tournoi(self.tournoi.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = reception.traiter_file()
+
+        self.assertEqual((resultat['inscrites'], resultat['liste_attente'], resultat['lots']), (1, 2, 1))
+        statuts = dict(Declaration.objects.values_list('club__nom', 'statut'))
+        self.assertEqual(statuts, {
+            "A": StatutDeclaration.INSCRITE,
+            "B": StatutDeclaration.LISTE_ATTENTE,
+            "C": StatutDeclaration.LISTE_ATTENTE,
+        })
+        self.tournoi.refresh_from_db()
+        self.assertEqual(self.tournoi.nb_equipes_inscrites, 3)
+        self.assertEqual(Equipe.objects.filter(tournoi=self.tournoi).count(), 6)
+        self.assertEqual(EmailOutbox.objects.count(), 3)
+        self.assertEqual(DocumentRecherche.objects.filter(type_objet=TypeDocument.DECLARATION).count(), 3)
+        self.assertNotEqual(get_version_tournoi(self.tournoi.pk), version)
+        self.assertFalse(DeclarationRecue.objects.exclude(statut=StatutReception.TRAITEE).exists())
+
+        # La page de suivi affiche maintenant la confirmation
+        recue = DeclarationRecue.objects.get(club__nom="B")
+        response = self.client.get(reverse('declaration_recue', args=[recue.cle_soumission]))
+        self.assertContains(response, "liste d'attente")
+
+        # Le retrait d'une déclaration créée par lot promeut la liste d'attente
+        Declaration.objects.get(club__nom="A").retirer()
+        self.assertEqual(Declaration.objects.get(club__nom="B").statut, StatutDeclaration.INSCRITE)
+
+    def test_echec_isole(self):
+        """Une ligne en erreur n'empêche pas l'enregistrement des autres."""
+        self.envoyer("A", 1)
+        self.envoyer("B", 1)
+        DeclarationRecue.objects.filter(club__nom="A").update(equipes=[["A 1", "", "en trop"]])
+
+        resultat = reception.traiter_file()
+
+        self.assertEqual((resultat['inscrites'], resultat['echecs']), (1, 1))
+        self.assertEqual(list(Declaration.objects.values_list('club__nom', flat=True)), ["B"])
+        recue = DeclarationRecue.objects.get(club__nom="A")
+        self.assertEqual(recue.statut, StatutReception.EN_ATTENTE)
+        self.assertIn("ValueError", recue.derniere_erreur)
+
+        # Dernier essai raté : ECHEC
+        DeclarationRecue.objects.filter(pk=recue.pk).update(
+            prochain_essai=timezone.now(), tentatives=reception.MAX_TENTATIVES,
+        )
+        reception.traiter_file()
+        self.assertEqual(DeclarationRecue.objects.get(pk=recue.pk).statut, StatutReception.ECHEC)
+
+
+# ═══════════════════════════════════════════════════
+# GROUPE 25 — Mode dégradé (instantanés, disjoncteur)
+# ═══════════════════════════════════════════════════
+
+class ResilienceTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        # Disjoncteur ouvert ou instantanés : à ne pas laisser aux tests suivants
+        self.addCleanup(cache.clear)
+        self.base_en_panne = False
+
+        @resilience.avec_instantane
+        def vue(request):
+            if self.base_en_panne:
+                raise OperationalError("(2013, 'Lost connection to MySQL server')")
+            return HttpResponse('<main role="main"><p>Tournois</p></main>')
+
+        self.vue = vue
+
+    def get(self, user=None):
+        request = RequestFactory().get('/consultation/')
+        request.user = user or AnonymousUser()
+        return self.vue(request)
+
+    def test_instantane_servi_si_la_base_tombe(self):
+        self.get()
+        self.base_en_panne = True
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Tournois")
+        self.assertContains(response, "données du")
+
+    def test_sans_instantane_page_503(self):
+        self.base_en_panne = True
+        response = self.get()
+        self.assertEqual(response.status_code, 503)
+        self.assertContains(response, "momentanément indisponible", status_code=503)
+
+    def test_rendu_staff_non_conserve(self):
+        """Une page rendue pour un utilisateur connecté n'est pas resservie aux visiteurs."""
+        self.get(user=User(username="staff", is_staff=True))
+        self.base_en_panne = True
+        self.assertEqual(self.get().status_code, 503)
+
+    def test_disjoncteur(self):
+        """Ouvert après SEUIL_ECHECS erreurs : plus d'appel à la base ; une requête d'essai le referme."""
+        self.get()
+        self.base_en_panne = True
+        for _ in range(resilience.SEUIL_ECHECS):
+            self.get()
+        self.assertEqual(resilience.disjoncteur_base.etat(), 'ouvert')
+
+        # La base est revenue, mais le disjoncteur ouvert ne l'interroge pas encore
+        self.base_en_panne = False
+        self.assertContains(self.get(), "données du")
+
+        # Fin de l'ouverture : une requête d'essai réussit et referme
+        cache.set(resilience.disjoncteur_base.cle_ouvert, 0, None)
+        self.assertEqual(resilience.disjoncteur_base.etat(), 'demi_ouvert')
+        self.assertNotContains(self.get(), "données du")
+        self.assertEqual(resilience.disjoncteur_base.etat(), 'ferme')
+        self.assertEqual(resilience.statistiques()['ouvertures'], 1)
+
+    def test_page_publique_sans_requete_sql(self):
+        """Disjoncteur ouvert : la vraie page de consultation est servie sans toucher la base."""
+        creer_tournoi()
+        self.assertEqual(self.client.get(reverse('consultation')).status_code, 200)
+
+        resilience.disjoncteur_base.ouvrir()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('consultation'))
+        self.assertContains(response, "données du")
+
+
+    def test_instantane_sans_enregistrer_la_session(self):
+        """Visiteur avec une session (en base) : l'instantané ne la réenregistre pas."""
+        creer_tournoi()
+        session = self.client.session
+        session['vu'] = True
+        session.save()
+        self.assertEqual(self.client.get(reverse('consultation')).status_code, 200)
+
+        resilience.disjoncteur_base.ouvrir()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('consultation'))
+        self.assertContains(response, "données du")
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertTrue(self.client.session['vu'])
+
+# ═══════════════════════════════════════════════════
+# GROUPE 26 — API JSON en lecture seule
+# ═══════════════════════════════════════════════════
+
+class ApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        aujourdhui = timezone.localdate()
+        self.tournois = [creer_tournoi(date_tournoi=aujourdhui + timedelta(days=j), capacite_max=6) for j in (3, 1, 2)]
+        self.passe = creer_tournoi(date_tournoi=aujourdhui - timedelta(days=5))
+        creer_tournoi(est_publie=False)
+
+        self.tournoi = self.tournois[1]
+        form = DeclarationForm(donnees_declaration(self.tournoi, creer_club("TGV"), equipes=[("TGV 1", "HAUTE"), ("TGV 2", "")]))
+        self.assertTrue(form.is_valid(), form.errors)
+        self.declaration = form.save()
+
+    def get(self, url, **parametres):
+        return self.client.get(url, parametres)
+
+    def test_tournois_a_venir_pagines(self):
+        """Ordre par date, curseur jusqu'à la dernière page, tournois non publiés ou passés exclus."""
+        response = self.get(reverse('api:tournois'), limite=2)
+        donnees = response.json()
+        self.assertEqual([t['id'] for t in donnees['resultats']], [self.tournois[1].pk, self.tournois[2].pk])
+        self.assertIn('max-age', response['Cache-Control'])
+
+        donnees = self.client.get(donnees['suivant']).json()
+        self.assertEqual([t['id'] for t in donnees['resultats']], [self.tournois[0].pk])
+        self.assertIsNone(donnees['suivant'])
+
+        donnees = self.get(reverse('api:tournois'), periode='passes').json()
+        self.assertEqual([t['id'] for t in donnees['resultats']], [self.passe.pk])
+
+    def test_projection_fields(self):
+        donnees = self.get(
+            reverse('api:tournoi', args=[self.tournoi.pk]),
+            fields='places_restantes,nb_declarations,poules',
+        ).json()
+        self.assertEqual(donnees, {
+            'id': self.tournoi.pk,
+            'places_restantes': 4,
+            'nb_declarations': 1,
+            'poules': {'HAUTE': 1, 'AUCUNE': 1},
+        })
+
+        response = self.get(reverse('api:tournois'), fields='date,email')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json()['erreur'])
+
+    def test_effectifs_sans_donnees_personnelles(self):
+        resultats = self.get(reverse('api:declarations', args=[self.tournoi.pk])).json()['resultats']
+        self.assertEqual(resultats[0]['club'], "TGV")
+        self.assertEqual(resultats[0]['equipes'], [{'nom': "TGV 1", 'poule': "HAUTE"}, {'nom': "TGV 2", 'poule': None}])
+        self.assertNotIn('email_club', resultats[0])
+        self.assertNotIn('declarant', resultats[0])
+
+        non_publie = Tournoi.objects.get(est_publie=False)
+        self.assertEqual(self.get(reverse('api:declarations', args=[non_publie.pk])).status_code, 404)
+
+    def test_lectures_sur_la_base_principale(self):
+        """L'ETag suit la version courante : les données ne viennent jamais de la réplique."""
+        vue = api.vue_api(lambda request: HttpResponse(Tournoi.objects.all().db))
+        self.assertEqual(vue(RequestFactory().get('/')).content, b'default')
+
+    def test_etag_et_304(self):
+        """Même version : 304 sans construire la réponse ; une nouvelle candidature change l'ETag."""
+        url = reverse('api:candidatures', args=[self.tournoi.pk])
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Candidature.objects.create(
+                tournoi=self.tournoi, club=creer_club("Organisateur"), declarant="Jean Dupont",
+                email_contact="jean@club.re",
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['club'] for c in response.json()['resultats']], ["Organisateur"])
+        self.assertNotIn('email_contact', response.json()['resultats'][0])
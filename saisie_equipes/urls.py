@@ -1,5 +1,5 @@
 from django.urls import path, include
-from .views import  accueil_view, declaration_view, confirmation_view, consultation_view, consultation_passee_view, candidature_liste_view, mes_candidatures_view, candidature_form_view   # non de la def dans views.py,
+from .views import  accueil_view, declaration_view, confirmation_view, declaration_recue_view, consultation_view, consultation_passee_view, candidature_liste_view, mes_candidatures_view, candidature_form_view, clubs_autocompletion_view   # non de la def dans views.py,
 from .auth_views import login_view, logout_view
 
 
@@ -7,14 +7,17 @@ urlpatterns = [
     path("", accueil_view, name="accueil"),  # Page d'accueil
     path("declaration/", declaration_view, name="declaration"),
     path("confirmation/", confirmation_view, name="confirmation"),
+    path("declaration/recue/<uuid:cle>/", declaration_recue_view, name="declaration_recue"),
     path("consultation/", consultation_view, name="consultation"),
     path("consultation-archive/", consultation_passee_view, name="consultation_archive"),
     path("candidature/", candidature_liste_view, name="candidature_liste"),
     path("candidature/<int:tournoi_id>/", candidature_form_view, name="candidature_form"),
     path("candidature/mes-candidatures/", mes_candidatures_view, name="mes_candidatures"),
+    path("clubs/autocompletion/", clubs_autocompletion_view, name="clubs_autocompletion"),
     path("login/", login_view, name="login"),
     path("logout/", logout_view, name="logout"),
     path('staff/', include('saisie_equipes.urls_staff')),
+    path('api/v1/', include('saisie_equipes.urls_api')),
 
 
 
@@ -0,0 +1,20 @@
+"""
+═══════════════════════════════════════════════════
+🔌 URLS API - LECTURE SEULE, VERSION 1
+═══════════════════════════════════════════════════
+
+Toutes les URLs commençant par /api/v1/ (voir api.py)
+"""
+
+from django.urls import path
+from .api import candidatures_view, declarations_view, tournoi_view, tournois_view
+
+# Namespace pour les URLs de l'API
+app_name = 'api'
+
+urlpatterns = [
+    path('tournois/', tournois_view, name='tournois'),
+    path('tournois/<int:tournoi_id>/', tournoi_view, name='tournoi'),
+    path('tournois/<int:tournoi_id>/declarations/', declarations_view, name='declarations'),
+    path('tournois/<int:tournoi_id>/candidatures/', candidatures_view, name='candidatures'),
+]
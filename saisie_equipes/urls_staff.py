@@ -25,6 +25,26 @@ from .views_staff import (
     
     # Consultation Déclarations (Étape 4)
     declarations_liste_view,
+
+    # Répartition par poule
+    poules_view,
+    poules_json_view,
+
+    # Travaux en arrière-plan
+    jobs_liste_view,
+    job_detail_view,
+    job_json_view,
+    job_telecharger_view,
+
+    # Métriques techniques
+    metriques_view,
+    salle_attente_view,
+
+    # Recherche globale
+    recherche_view,
+
+    # Doublons de clubs
+    clubs_doublons_view,
 )
 
 # Namespace pour les URLs staff
@@ -54,4 +74,36 @@ urlpatterns = [
     # 📊 CONSULTATION DÉCLARATIONS (Étape 4)
     # ═══════════════════════════════════════════════════
     path('declarations/', declarations_liste_view, name='declarations_liste'),
+
+    # ═══════════════════════════════════════════════════
+    # 🏆 RÉPARTITION PAR POULE
+    # ═══════════════════════════════════════════════════
+    path('poules/', poules_view, name='poules'),
+    path('poules/json/', poules_json_view, name='poules_json'),
+    path('poules/<int:tournoi_id>/', poules_view, name='poules_detail'),
+    path('poules/<int:tournoi_id>/json/', poules_json_view, name='poules_detail_json'),
+
+    # ═══════════════════════════════════════════════════
+    # ⚙️ TRAVAUX EN ARRIÈRE-PLAN
+    # ═══════════════════════════════════════════════════
+    path('jobs/', jobs_liste_view, name='jobs_liste'),
+    path('jobs/<int:job_id>/', job_detail_view, name='job_detail'),
+    path('jobs/<int:job_id>/json/', job_json_view, name='job_json'),
+    path('jobs/<int:job_id>/telecharger/', job_telecharger_view, name='job_telecharger'),
+
+    # ═══════════════════════════════════════════════════
+    # 📈 MÉTRIQUES TECHNIQUES
+    # ═══════════════════════════════════════════════════
+    path('metriques/', metriques_view, name='metriques'),
+    path('salle-attente/', salle_attente_view, name='salle_attente'),
+
+    # ═══════════════════════════════════════════════════
+    # 🔎 RECHERCHE GLOBALE
+    # ═══════════════════════════════════════════════════
+    path('recherche/', recherche_view, name='recherche'),
+
+    # ═══════════════════════════════════════════════════
+    # 🔀 DOUBLONS DE CLUBS
+    # ═══════════════════════════════════════════════════
+    path('clubs/doublons/', clubs_doublons_view, name='clubs_doublons'),
 ]
@@ -1,20 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.contrib import messages
-from datetime import datetime, timedelta
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.db import IntegrityError
 import json  # 🆕 Pour sérialiser les poules en JSON
 import logging
 logger = logging.getLogger('saisie_equipes')
 
 from .forms import DeclarationForm, CandidatureForm
-from .models import Declaration, Tournoi, Candidature
+from .models import Declaration, DeclarationRecue, StatutDeclaration, StatutReception, Tournoi, Candidature
+from .decorators import using_replica
+from .resilience import avec_instantane
+from .autocompletion import rechercher_clubs
+from . import antispam, reception
 
 
 def test_404(request):
     raise Http404("Page de test pour 404")
 
 
+@avec_instantane
+@using_replica
 def accueil_view(request):
     """Page d'accueil avec navigation principale"""
     today = timezone.now().date()
@@ -30,7 +36,7 @@ def accueil_view(request):
         est_publie=True
     ).count()
 
-    total_declarations = Declaration.objects.count()
+    total_declarations = Declaration.objects.filter(statut=StatutDeclaration.INSCRITE).count()
 
     context = {
         'tournois_a_venir': tournois_a_venir,
@@ -41,80 +47,77 @@ def accueil_view(request):
     return render(request, 'saisie_equipes/accueil.html', context)
 
 
+def _confirmer_declaration(request, declaration):
+    """Message et données de la page de confirmation d'une déclaration"""
+    request.session["confirmation_data"] = {
+        "declarant": declaration.declarant,
+        "club": str(declaration.club),
+        "nombre_equipes": declaration.nombre_equipes,
+        "categorie_age": declaration.tournoi.get_categorie_age_display(),
+        "liste_attente": declaration.est_en_liste_attente(),
+    }
+
+    if declaration.est_en_liste_attente():
+        messages.warning(request, f"⏳ Tournoi complet : la déclaration de {declaration.club} est placée en liste d'attente.")
+    else:
+        messages.success(request, f"✅ Déclaration enregistrée avec succès pour {declaration.club}!")
+    return redirect("confirmation")
+
+
 def declaration_view(request):
     """Formulaire de déclaration d'équipe"""
 
-    # 🆕 Préparer les données des poules par tournoi (nécessaire pour GET et POST)
-    tournois_poules = {}
-    for tournoi in Tournoi.objects.filter(est_publie=True):
-        tournois_poules[tournoi.id] = tournoi.poules_disponibles or []
-
     if request.method == "POST":
-        # 🕐 VÉRIFICATION TEMPORELLE - Anti-robot
-        form_start_time = request.session.get('form_start_time')
-        if form_start_time:
-            try:
-                start_time = datetime.fromisoformat(form_start_time)
-                elapsed = timezone.now().replace(tzinfo=None) - start_time
-
-                # Trop rapide = robot probable
-                if elapsed < timedelta(seconds=3):
-                    messages.error(request, "⚠️ Veuillez prendre le temps de remplir le formulaire correctement.")
-                    return redirect("declaration")
-
-                # Trop lent = session expirée
-                if elapsed > timedelta(minutes=30):
-                    messages.warning(request, "⏰ Session expirée pour des raisons de sécurité. Veuillez recommencer.")
-                    return redirect("declaration")
-
-            except (ValueError, TypeError):
-                messages.warning(request, "Session invalide détectée. Formulaire réinitialisé.")
-                return redirect("declaration")
-
-        # 📊 LIMITATION PAR IP - Anti-spam
-        ip_address = request.META.get('REMOTE_ADDR', 'unknown')
-        session_key = f'submissions_{ip_address.replace(".", "_")}'
-        submissions_today = request.session.get(session_key, 0)
-
-        if submissions_today >= 5:
-            messages.error(request, "🚫 Vous avez atteint la limite de déclarations pour cette session. Réessayez plus tard.")
+        # 🛡️ ANTI-SPAM - honeypot, délai, envois, contenu : avant toute requête SQL
+        verdict = antispam.evaluer(request, 'declaration')
+        if verdict.bloque:
+            messages.add_message(request, verdict.niveau, verdict.message)
             return redirect("declaration")
 
-        # 🔍 TRAITEMENT DU FORMULAIRE
+        # 🔑 DOUBLE ENVOI - même clé de soumission : on renvoie la déclaration déjà créée
         form = DeclarationForm(request.POST)
+        existante = form.get_soumission_existante()
+        if existante:
+            logger.info(f"Double envoi absorbé (déclaration {existante.pk})")
+            return _confirmer_declaration(request, existante)
+
+        # 🔍 TRAITEMENT DU FORMULAIRE
         if form.is_valid():
+            # 📥 PIC DE TRAFIC - mise en file, enregistrement par lots hors requête
+            if reception.est_active():
+                recue = reception.recevoir(form)
+                antispam.enregistrer_soumission(request, form.get_cle_soumission())
+                return redirect("declaration_recue", cle=recue.cle_soumission)
+
             try:
                 declaration = form.save()
 
-                # 📈 COMPTEUR DE SOUMISSIONS
-                request.session[session_key] = submissions_today + 1
-                request.session.set_expiry(3600)
-
-                # 🧹 NETTOYER LA SESSION
-                if 'form_start_time' in request.session:
-                    del request.session['form_start_time']
+                # 📈 COMPTEUR DE SOUMISSIONS (et fin du délai de saisie)
+                antispam.enregistrer_soumission(request, form.get_cle_soumission())
 
                 # ✅ DONNÉES DE CONFIRMATION
-                request.session["confirmation_data"] = {
-                    "declarant": declaration.declarant,
-                    "club": str(declaration.club),
-                    "nombre_equipes": declaration.nombre_equipes,
-                    "categorie_age": declaration.tournoi.get_categorie_age_display(),
-                }
-
-                messages.success(request, f"✅ Déclaration enregistrée avec succès pour {declaration.club}!")
-                return redirect("confirmation")
+                return _confirmer_declaration(request, declaration)
 
             except Exception as e:
+                # Envoi simultané avec la même clé : l'autre requête a gagné
+                existante = isinstance(e, IntegrityError) and form.get_soumission_existante()
+                if existante:
+                    return _confirmer_declaration(request, existante)
+
                 messages.error(request, "❌ Erreur lors de l'enregistrement. Veuillez réessayer.")
                 logger.error(f"Erreur sauvegarde déclaration: {e}", exc_info=True)
         else:
             messages.error(request, "❌ Veuillez corriger les erreurs signalées ci-dessous.")
     else:
         # 🆕 NOUVEAU FORMULAIRE
-        request.session['form_start_time'] = timezone.now().replace(tzinfo=None).isoformat()
+        antispam.demarrer_formulaire(request)
         form = DeclarationForm()
 
+    # 🆕 Préparer les données des poules par tournoi (formulaire affiché ou réaffiché)
+    tournois_poules = {}
+    for tournoi in Tournoi.objects.filter(est_publie=True):
+        tournois_poules[tournoi.id] = tournoi.poules_disponibles or []
+
     # 🆕 Contexte enrichi avec les poules par tournoi
     context = {
         "form": form,
@@ -130,6 +133,33 @@ def confirmation_view(request):
     return render(request, "saisie_equipes/confirmation.html", {"data": confirmation_data})
 
 
+def declaration_recue_view(request, cle):
+    """
+    Suivi d'une déclaration reçue en mode différé (voir reception.py)
+
+    « En cours d'enregistrement » (la page se recharge) jusqu'à son
+    traitement, puis la confirmation habituelle.
+    """
+    recue = get_object_or_404(
+        DeclarationRecue.objects.select_related('club', 'tournoi', 'declaration'),
+        cle_soumission=cle,
+    )
+
+    return render(request, "saisie_equipes/confirmation.html", {
+        "data": {
+            "declarant": recue.declarant,
+            "club": str(recue.club),
+            "nombre_equipes": recue.nombre_equipes,
+            "categorie_age": recue.tournoi.get_categorie_age_display(),
+            "liste_attente": recue.declaration is not None and recue.declaration.est_en_liste_attente(),
+        },
+        "en_cours": recue.statut in (StatutReception.EN_ATTENTE, StatutReception.EN_COURS),
+        "echec": recue.statut == StatutReception.ECHEC,
+    })
+
+
+@avec_instantane
+@using_replica
 def consultation_view(request):
     """
     ✨ NOUVEAU : Version simplifiée utilisant les objets Tournoi
@@ -153,6 +183,8 @@ def consultation_view(request):
     })
 
 
+@avec_instantane
+@using_replica
 def consultation_passee_view(request):
     """
     ✨ NOUVEAU : Version simplifiée pour les tournois passés
@@ -172,6 +204,8 @@ def consultation_passee_view(request):
         'type': 'passés',
     })
 
+@avec_instantane
+@using_replica
 def candidature_liste_view(request):
     """
     Liste des tournois disponibles pour candidater
@@ -219,6 +253,13 @@ def candidature_form_view(request, tournoi_id):
     Args:
         tournoi_id: ID du tournoi pour lequel candidater
     """
+    # 🛡️ ANTI-SPAM - mêmes règles que la déclaration, avant toute requête SQL
+    if request.method == 'POST':
+        verdict = antispam.evaluer(request, 'candidature')
+        if verdict.bloque:
+            messages.add_message(request, verdict.niveau, verdict.message)
+            return redirect('candidature_form', tournoi_id=tournoi_id)
+
     tournoi = get_object_or_404(Tournoi, pk=tournoi_id)
 
     # Vérifier que le tournoi accepte encore les candidatures
@@ -233,27 +274,39 @@ def candidature_form_view(request, tournoi_id):
 
     if request.method == 'POST':
         form = CandidatureForm(request.POST)
+        message_succes = (
+            f"✅ Candidature enregistrée avec succès pour le tournoi du "
+            f"{tournoi.date.strftime('%d/%m/%Y')} ! "
+            f"Vous serez contacté une fois votre candidature traitée."
+        )
+
+        # 🔑 DOUBLE ENVOI - même clé de soumission : déjà enregistrée
+        if form.get_soumission_existante():
+            messages.success(request, message_succes)
+            return redirect('candidature_liste')
 
         if form.is_valid():
             try:
                 candidature = form.save()
+                antispam.enregistrer_soumission(request, form.get_cle_soumission())
 
-                messages.success(
-                    request,
-                    f"✅ Candidature enregistrée avec succès pour le tournoi du "
-                    f"{tournoi.date.strftime('%d/%m/%Y')} ! "
-                    f"Vous serez contacté une fois votre candidature traitée."
-                )
+                messages.success(request, message_succes)
 
                 return redirect('candidature_liste')
 
             except Exception as e:
+                # Envoi simultané avec la même clé : l'autre requête a gagné
+                if isinstance(e, IntegrityError) and form.get_soumission_existante():
+                    messages.success(request, message_succes)
+                    return redirect('candidature_liste')
+
                 messages.error(request, "❌ Erreur lors de l'enregistrement. Veuillez réessayer.")
                 logger.error(f"Erreur sauvegarde candidature: {e}", exc_info=True)
         else:
             messages.error(request, "❌ Veuillez corriger les erreurs signalées ci-dessous.")
     else:
         # Pré-remplir le formulaire avec le tournoi
+        antispam.demarrer_formulaire(request)
         form = CandidatureForm(initial={'tournoi': tournoi})
 
     return render(request, 'saisie_equipes/candidature_form.html', {
@@ -262,6 +315,7 @@ def candidature_form_view(request, tournoi_id):
     })
 
 
+@using_replica
 def mes_candidatures_view(request):
     """
     Liste des candidatures (filtrable par club si souhaité)
@@ -294,3 +348,16 @@ def mes_candidatures_view(request):
     })
 
 
+def clubs_autocompletion_view(request):
+    """
+    🔤 Clubs correspondant à ?q= (JSON), pour les formulaires publics
+
+    Servi par l'index en mémoire (voir autocompletion.py) : pas de
+    requête SQL tant que la liste des clubs ne change pas.
+    """
+    resultats = rechercher_clubs(request.GET.get('q', '')[:100])
+
+    return JsonResponse(
+        {'resultats': [{'id': club_id, 'nom': nom} for club_id, nom in resultats]},
+        json_dumps_params={'ensure_ascii': False},
+    )
@@ -9,16 +9,33 @@ Accessible uniquement aux utilisateurs avec is_staff=True
 VERSION 4 : Ajout consultation déclarations (Étape 4)
 """
 
-import csv
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.utils.http import urlencode
 from .decorators import staff_or_superuser_required
 from django.contrib import messages
 from django.utils import timezone
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.models import Count, Sum, Q
 
-from .models import Candidature, Tournoi, Declaration, StatutCandidature
+from .models import (
+    Candidature, Tournoi, Declaration, Job, DocumentRecherche,
+    StatutCandidature, StatutTournoi, TypeDocument,
+)
 from .forms import TournoiForm
+from .syntheses import get_repartitions_poules
+from .services_candidatures import valider_candidatures, refuser_candidatures
+from .exports import get_filtres_declarations, filtrer_declarations
+from .jobs import lancer_job
+from .connexions import metriques_workers
+from .sessions import sessions_en_base, statistiques_sessions
+from .antispam import statistiques as statistiques_antispam
+from .tentatives_connexion import statistiques as statistiques_connexions
+from .salle_attente import enregistrer_reglages, etat as etat_salle_attente
+from .resilience import statistiques as statistiques_resilience
+from .recherche import ids_correspondants, rechercher
+from .doublons import ErreurFusion, SEUIL_DOUBLON, fusionner_clubs, trouver_doublons
 
 
 # ═══════════════════════════════════════════════════
@@ -181,14 +198,10 @@ def tournois_liste_view(request):
     if statut != 'tous':
         tournois = tournois.filter(statut=statut)
 
-    # Filtre recherche
+    # Filtre recherche (index plein texte, voir recherche.py)
     recherche = request.GET.get('q', '')
     if recherche:
-        tournois = tournois.filter(
-            Q(categorie_age__icontains=recherche) |
-            Q(club_organisateur__nom__icontains=recherche) |
-            Q(lieu__icontains=recherche)
-        )
+        tournois = tournois.filter(pk__in=ids_correspondants(recherche, TypeDocument.TOURNOI))
 
     # ═══════════════════════════════════════════════════
     # ENRICHISSEMENT DES DONNÉES
@@ -272,8 +285,8 @@ def tournoi_edit_view(request, tournoi_id):
     if request.method == 'POST':
         # Vérifier si c'est une suppression
         if 'delete' in request.POST:
-            # Vérifier s'il y a des déclarations
-            nb_declarations = tournoi.get_nb_declarations()
+            # Vérifier s'il y a des déclarations (retirées et liste d'attente comprises)
+            nb_declarations = tournoi.declarations.count()
 
             if nb_declarations > 0:
                 messages.error(
@@ -301,12 +314,21 @@ def tournoi_edit_view(request, tournoi_id):
                     f"💾 Tournoi modifié avec succès : {tournoi}"
                 )
 
+                # La capacité a pu augmenter : inscrire la liste d'attente
+                if 'capacite_max' in form.changed_data:
+                    promues = tournoi.promouvoir_liste_attente()
+                    if promues:
+                        messages.info(
+                            request,
+                            f"🎟️ {len(promues)} déclaration(s) sortie(s) de la liste d'attente."
+                        )
+
                 return redirect('staff:tournois_liste')
     else:
         form = TournoiForm(instance=tournoi)
 
-    # Statistiques du tournoi
-    nb_declarations = tournoi.get_nb_declarations()
+    # Statistiques du tournoi (toutes les déclarations : elles bloquent la suppression)
+    nb_declarations = tournoi.declarations.count()
     nb_equipes = tournoi.get_nb_equipes_total()
     nb_candidatures = tournoi.get_nb_candidatures()
     nb_candidatures_en_attente = tournoi.get_candidatures_en_attente().count()
@@ -338,7 +360,13 @@ def candidatures_liste_view(request):
     - Statut (tous, en attente, validées, refusées)
     - Tournoi (filtre par tournoi spécifique)
     - Recherche par club
+
+    POST : décision groupée sur les candidatures cochées
+    (valider / refuser, voir services_candidatures.py)
     """
+    if request.method == 'POST':
+        return _decision_groupee(request)
+
     # Récupérer toutes les candidatures
     candidatures = Candidature.objects.select_related(
         'tournoi', 'club', 'traite_par'
@@ -358,14 +386,10 @@ def candidatures_liste_view(request):
     if tournoi_id:
         candidatures = candidatures.filter(tournoi_id=tournoi_id)
 
-    # Filtre recherche (club)
+    # Filtre recherche (club, déclarant, lieu... : index plein texte)
     recherche = request.GET.get('q', '')
     if recherche:
-        candidatures = candidatures.filter(
-            Q(club__nom__icontains=recherche) |
-            Q(declarant__icontains=recherche) |
-            Q(lieu__icontains=recherche)
-        )
+        candidatures = candidatures.filter(pk__in=ids_correspondants(recherche, TypeDocument.CANDIDATURE))
 
     # ═══════════════════════════════════════════════════
     # STATISTIQUES
@@ -399,6 +423,48 @@ def candidatures_liste_view(request):
     return render(request, 'staff/candidature_liste_staff.html', context)
 
 
+def _decision_groupee(request):
+    """Valide ou refuse les candidatures cochées puis revient à la liste filtrée"""
+    retour = redirect(f"{request.path}?{request.GET.urlencode()}" if request.GET else request.path)
+
+    ids = [i for i in request.POST.getlist('candidatures') if i.isdigit()]
+    if not ids:
+        messages.warning(request, "⚠️ Aucune candidature sélectionnée.")
+        return retour
+
+    action = request.POST.get('action')
+
+    if action == 'valider':
+        resultat = valider_candidatures(ids, request.user)
+        messages.success(
+            request,
+            f"✅ {resultat['validees']} candidature(s) validée(s), "
+            f"{resultat['refusees_auto']} candidature(s) concurrente(s) refusée(s) automatiquement."
+        )
+        if resultat['ignorees']:
+            messages.warning(
+                request,
+                f"⚠️ {resultat['ignorees']} candidature(s) non validée(s) : déjà traitée(s) "
+                f"ou tournoi ayant déjà un organisateur."
+            )
+
+    elif action == 'refuser':
+        raison = request.POST.get('raison_refus', '').strip()
+        if not raison:
+            messages.error(request, "❌ Veuillez indiquer une raison pour le refus.")
+            return retour
+
+        resultat = refuser_candidatures(ids, request.user, raison)
+        messages.success(request, f"✅ {resultat['refusees']} candidature(s) refusée(s).")
+        if resultat['ignorees']:
+            messages.warning(request, f"⚠️ {resultat['ignorees']} candidature(s) déjà traitée(s).")
+
+    else:
+        messages.error(request, "❌ Action inconnue.")
+
+    return retour
+
+
 @staff_or_superuser_required
 def candidature_valider_view(request, candidature_id):
     """
@@ -425,7 +491,10 @@ def candidature_valider_view(request, candidature_id):
         if 'confirmer' in request.POST:
             try:
                 # Utiliser la méthode du modèle
-                candidature.valider(request.user)
+                resultat = candidature.valider(request.user)
+                if not resultat:
+                    messages.warning(request, f"⚠️ {resultat.message}")
+                    return redirect('staff:candidatures_liste')
 
                 messages.success(
                     request,
@@ -483,7 +552,10 @@ def candidature_refuser_view(request, candidature_id):
         else:
             try:
                 # Utiliser la méthode du modèle
-                candidature.refuser(request.user, raison)
+                resultat = candidature.refuser(request.user, raison)
+                if not resultat:
+                    messages.warning(request, f"⚠️ {resultat.message}")
+                    return redirect('staff:candidatures_liste')
 
                 messages.success(
                     request,
@@ -526,97 +598,37 @@ def declarations_liste_view(request):
     Fonctionnalités :
     - Statistiques (total déclarations, équipes, clubs)
     - Tri par date déclaration (desc)
-    - Export CSV optionnel
+    - Export CSV (POST action=export → job en arrière-plan) ; l'ancien
+      lien GET ?export=csv renvoie vers la liste filtrée avec un message
     """
-    # Récupérer toutes les déclarations
-    declarations = Declaration.objects.select_related(
-        'club', 'tournoi'
-    ).order_by('-date_declaration')
-
     # ═══════════════════════════════════════════════════
-    # FILTRES
+    # EXPORT CSV (job en arrière-plan, mêmes filtres que la liste)
     # ═══════════════════════════════════════════════════
 
-    # Filtre tournoi
-    tournoi_id = request.GET.get('tournoi', '')
-    if tournoi_id:
-        declarations = declarations.filter(tournoi_id=tournoi_id)
-
-    # Filtre club
-    club_id = request.GET.get('club', '')
-    if club_id:
-        declarations = declarations.filter(club_id=club_id)
-
-    # Filtre catégorie
-    categorie = request.GET.get('categorie', '')
-    if categorie:
-        declarations = declarations.filter(tournoi__categorie_age=categorie)
+    filtres = get_filtres_declarations(request.GET)
 
-    # Filtre sexe
-    sexe = request.GET.get('sexe', '')
-    if sexe:
-        declarations = declarations.filter(tournoi__sexe=sexe)
+    if request.method == 'POST' and request.POST.get('action') == 'export':
+        job = lancer_job('export_declarations', request.user, **filtres)
+        messages.info(request, "📥 Export lancé : le fichier sera disponible sur cette page.")
+        return redirect('staff:job_detail', job_id=job.id)
 
-    # Filtre zone
-    zone = request.GET.get('zone', '')
-    if zone:
-        declarations = declarations.filter(tournoi__zone=zone)
-
-    # Filtre recherche
-    recherche = request.GET.get('q', '')
-    if recherche:
-        declarations = declarations.filter(
-            Q(club__nom__icontains=recherche) |
-            Q(declarant__icontains=recherche) |
-            Q(remarques__icontains=recherche)
-        )
+    if request.GET.get('export') == 'csv':
+        # Ancien lien (favoris) : pas de job lancé par un simple GET
+        messages.info(request, "📥 L'export se lance désormais avec le bouton « Exporter CSV » de la liste.")
+        return redirect(f"{request.path}?{urlencode(filtres)}" if filtres else request.path)
 
     # ═══════════════════════════════════════════════════
-    # EXPORT CSV (si demandé)
+    # FILTRES
     # ═══════════════════════════════════════════════════
 
-    if request.GET.get('export') == 'csv':
-        # Créer la réponse CSV
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = 'attachment; filename="declarations_volleychamp.csv"'
-
-        # BOM UTF-8 pour Excel
-        response.write('\ufeff')
-
-        writer = csv.writer(response, delimiter=';')
-
-        # En-têtes
-        writer.writerow([
-            'Date déclaration',
-            'Club',
-            'Déclarant',
-            'Email',
-            'Tournoi',
-            'Date tournoi',
-            'Catégorie',
-            'Sexe',
-            'Zone',
-            'Nombre équipes',
-            'Remarques'
-        ])
-
-        # Données
-        for d in declarations:
-            writer.writerow([
-                d.date_declaration.strftime('%d/%m/%Y %H:%M'),
-                d.club.nom,
-                d.declarant,
-                d.email_club,
-                str(d.tournoi),
-                d.tournoi.date.strftime('%d/%m/%Y'),
-                d.tournoi.get_categorie_age_display(),
-                d.tournoi.get_sexe_display(),
-                d.tournoi.get_zone_display() if d.tournoi.zone else 'Toutes zones',
-                d.nombre_equipes,
-                d.remarques if d.remarques else ''
-            ])
-
-        return response
+    declarations = filtrer_declarations(filtres)
+
+    tournoi_id = filtres.get('tournoi', '')
+    club_id = filtres.get('club', '')
+    categorie = filtres.get('categorie', '')
+    sexe = filtres.get('sexe', '')
+    zone = filtres.get('zone', '')
+    recherche = filtres.get('q', '')
 
     # ═══════════════════════════════════════════════════
     # STATISTIQUES
@@ -673,3 +685,304 @@ def declarations_liste_view(request):
     }
 
     return render(request, 'staff/declaration_liste_staff.html', context)
+
+
+# ═══════════════════════════════════════════════════
+# 🏆 RÉPARTITION DES ÉQUIPES PAR POULE
+# ═══════════════════════════════════════════════════
+
+def _get_repartitions(tournoi_id):
+    """
+    Tournois concernés et leur répartition par poule
+
+    - tournoi_id fourni : ce tournoi seulement (404 s'il n'existe pas)
+    - sinon : tous les tournois à venir, non annulés
+    """
+    if tournoi_id is not None:
+        tournois = [get_object_or_404(Tournoi.objects.select_related('club_organisateur'), id=tournoi_id)]
+    else:
+        tournois = list(
+            Tournoi.objects.filter(
+                date__gte=timezone.now().date()
+            ).exclude(
+                statut=StatutTournoi.ANNULE
+            ).select_related('club_organisateur').order_by('date', 'categorie_age')
+        )
+
+    repartitions = get_repartitions_poules([t.id for t in tournois])
+    return [(tournoi, repartitions[tournoi.id]) for tournoi in tournois]
+
+
+@staff_or_superuser_required
+def poules_view(request, tournoi_id=None):
+    """
+    🏆 Effectifs par poule (Haute / Basse / Unique)
+
+    Pour un tournoi ou pour tous les tournois à venir :
+    - nombre d'équipes par poule
+    - liste des équipes (avec leur club) de chaque poule
+
+    Les données viennent du cache, invalidé dès qu'une déclaration
+    du tournoi change (voir syntheses.py et signals.py).
+    """
+    context = {
+        'tournois_repartitions': _get_repartitions(tournoi_id),
+        'tournoi_unique': tournoi_id is not None,
+    }
+
+    return render(request, 'staff/poules_repartition.html', context)
+
+
+@staff_or_superuser_required
+def poules_json_view(request, tournoi_id=None):
+    """
+    🏆 Effectifs par poule au format JSON
+
+    Même contenu que poules_view, pour les outils des organisateurs.
+    """
+    tournois = []
+    for tournoi, repartition in _get_repartitions(tournoi_id):
+        tournois.append({
+            'id': tournoi.id,
+            'tournoi': str(tournoi),
+            'date': tournoi.date.isoformat(),
+            'categorie_age': tournoi.categorie_age,
+            'sexe': tournoi.sexe,
+            'zone': tournoi.zone,
+            'statut': tournoi.statut,
+            'club_organisateur': tournoi.club_organisateur.nom if tournoi.club_organisateur else None,
+            'nb_equipes': repartition['total'],
+            'comptes': repartition['comptes'],
+            'poules': repartition['poules'],
+        })
+
+    return JsonResponse(
+        {'tournois': tournois},
+        json_dumps_params={'ensure_ascii': False},
+    )
+
+
+# ═══════════════════════════════════════════════════
+# ⚙️ TRAVAUX EN ARRIÈRE-PLAN
+# ═══════════════════════════════════════════════════
+
+def _job_en_dict(job):
+    return {
+        'id': job.id,
+        'type': job.type_job,
+        'libelle': job.get_type_display(),
+        'statut': job.statut,
+        'statut_libelle': job.get_statut_display(),
+        'progression': job.progression,
+        'message': job.message,
+        'fini': job.est_fini(),
+        'telechargement': (
+            reverse('staff:job_telecharger', args=[job.id]) if job.resultat else None
+        ),
+    }
+
+
+@staff_or_superuser_required
+def jobs_liste_view(request):
+    """
+    ⚙️ Derniers travaux en arrière-plan (exports, imports)
+
+    Les jobs sont exécutés par la commande run_jobs.
+    """
+    context = {
+        'jobs': Job.objects.select_related('cree_par')[:50],
+    }
+
+    return render(request, 'staff/job_liste.html', context)
+
+
+@staff_or_superuser_required
+def job_detail_view(request, job_id):
+    """
+    ⚙️ Suivi d'un job : progression (rafraîchie en JavaScript), puis téléchargement
+    """
+    job = get_object_or_404(Job, pk=job_id)
+
+    return render(request, 'staff/job_detail.html', {
+        'job': job,
+        'job_json': _job_en_dict(job),
+    })
+
+
+@staff_or_superuser_required
+def job_json_view(request, job_id):
+    """⚙️ État d'un job au format JSON (interrogé par la page de suivi)"""
+    job = get_object_or_404(Job, pk=job_id)
+    return JsonResponse(_job_en_dict(job), json_dumps_params={'ensure_ascii': False})
+
+
+@staff_or_superuser_required
+def job_telecharger_view(request, job_id):
+    """
+    📥 Fichier produit par un job
+
+    Servi par Django (et non par /media/) : réservé au staff.
+    """
+    job = get_object_or_404(Job, pk=job_id)
+    if not job.resultat:
+        raise Http404("Ce job n'a pas produit de fichier.")
+
+    try:
+        fichier = job.resultat.open('rb')
+    except FileNotFoundError:
+        raise Http404("Le fichier de ce job n'existe plus.")
+
+    return FileResponse(fichier, as_attachment=True, filename=job.resultat.name.rsplit('/', 1)[-1])
+
+
+# ═══════════════════════════════════════════════════
+# 📈 MÉTRIQUES TECHNIQUES
+# ═══════════════════════════════════════════════════
+
+@staff_or_superuser_required
+def metriques_view(request):
+    """
+    📈 Connexions à la base (par worker), table des sessions, anti-spam,
+    tentatives de connexion, salle d'attente, mode dégradé
+
+    Chaque worker publie ses compteurs dans le cache toutes les 30 s
+    (voir connexions.py) : les autres workers peuvent être un peu en retard.
+    """
+    base = connections[DEFAULT_DB_ALIAS].settings_dict
+
+    context = {
+        'connexions': metriques_workers(),
+        'conn_max_age': base['CONN_MAX_AGE'],
+        'conn_health_checks': base['CONN_HEALTH_CHECKS'],
+        'sessions': statistiques_sessions() if sessions_en_base() else None,
+        'antispam': statistiques_antispam(),
+        'tentatives': statistiques_connexions(),
+        'salle_attente': etat_salle_attente(),
+        'resilience': statistiques_resilience(),
+    }
+
+    return render(request, 'staff/metriques.html', context)
+
+
+@staff_or_superuser_required
+def salle_attente_view(request):
+    """
+    🚦 Active / désactive la salle d'attente et règle le nombre de pages
+    calculées simultanément (voir salle_attente.py)
+    """
+    if request.method != 'POST':
+        return redirect('staff:metriques')
+
+    max_simultanes = request.POST.get('max_simultanes', '')
+    if not max_simultanes.isdigit() or int(max_simultanes) < 1:
+        messages.error(request, "❌ Le nombre de pages simultanées doit être un entier positif.")
+        return redirect('staff:metriques')
+
+    active = 'active' in request.POST
+    enregistrer_reglages(active, int(max_simultanes))
+    if active:
+        messages.success(request, f"✅ Salle d'attente activée ({max_simultanes} page(s) simultanée(s) au plus).")
+    else:
+        messages.success(request, "✅ Salle d'attente désactivée.")
+    return redirect('staff:metriques')
+
+
+# ═══════════════════════════════════════════════════
+# 🔎 RECHERCHE GLOBALE
+# ═══════════════════════════════════════════════════
+
+def _lien_resultat(document, recherche):
+    """Tournoi : sa fiche ; candidature / déclaration : la liste filtrée sur son tournoi"""
+    if document.type_objet == TypeDocument.TOURNOI:
+        return reverse('staff:tournoi_edit', args=[document.objet_id])
+
+    liste = 'staff:candidatures_liste' if document.type_objet == TypeDocument.CANDIDATURE else 'staff:declarations_liste'
+    return f"{reverse(liste)}?{urlencode({'tournoi': document.tournoi_id, 'q': recherche})}"
+
+
+@staff_or_superuser_required
+def recherche_view(request):
+    """
+    🔎 Recherche dans les tournois, candidatures et déclarations
+
+    Une seule requête plein texte (voir recherche.py), résultats classés
+    par pertinence.
+    """
+    recherche = request.GET.get('q', '').strip()
+    resultats = []
+
+    if recherche:
+        trouves = rechercher(recherche)
+
+        ids_par_type = {}
+        for type_objet, objet_id, _ in trouves:
+            ids_par_type.setdefault(type_objet, []).append(objet_id)
+
+        filtre = Q(pk__in=[])
+        for type_objet, ids in ids_par_type.items():
+            filtre |= Q(type_objet=type_objet, objet_id__in=ids)
+        documents = {
+            (document.type_objet, document.objet_id): document
+            for document in DocumentRecherche.objects.filter(filtre)
+        }
+
+        for type_objet, objet_id, score in trouves:
+            document = documents.get((type_objet, objet_id))
+            if document is not None:
+                resultats.append({
+                    'type': document.get_type_objet_display(),
+                    'titre': document.titre,
+                    'lien': _lien_resultat(document, recherche),
+                    'score': score,
+                })
+
+    return render(request, 'staff/recherche.html', {
+        'recherche': recherche,
+        'resultats': resultats,
+    })
+
+
+# ═══════════════════════════════════════════════════
+# 🔀 DOUBLONS DE CLUBS
+# ═══════════════════════════════════════════════════
+
+@staff_or_superuser_required
+def clubs_doublons_view(request):
+    """
+    🔀 Clubs probablement en double, et leur fusion
+
+    GET : groupes de noms voisins (voir doublons.py), le club le plus
+    utilisé proposé comme club conservé.
+    POST : fusion des clubs cochés dans le club conservé choisi.
+    """
+    if request.method == 'POST':
+        cible = request.POST.get('cible', '')
+        doublons = [i for i in request.POST.getlist('doublons') if i.isdigit() and i != cible]
+
+        if not cible.isdigit() or not doublons:
+            messages.warning(request, "⚠️ Choisissez le club conservé et au moins un doublon.")
+            return redirect('staff:clubs_doublons')
+
+        try:
+            resultat = fusionner_clubs(int(cible), doublons)
+        except ErreurFusion as e:
+            messages.error(request, f"❌ {e}")
+        else:
+            messages.success(
+                request,
+                f"✅ {resultat['clubs']} club(s) fusionné(s) : {resultat['declarations']} déclaration(s), "
+                f"{resultat['candidatures']} candidature(s) et {resultat['tournois']} tournoi(s) rattaché(s)."
+            )
+            if resultat['declarations_recues']:
+                messages.info(request, f"📥 {resultat['declarations_recues']} envoi(s) en attente d'enregistrement rattaché(s).")
+        return redirect('staff:clubs_doublons')
+
+    try:
+        seuil = min(max(float(request.GET.get('seuil', SEUIL_DOUBLON)), 0.3), 1.0)
+    except ValueError:
+        seuil = SEUIL_DOUBLON
+
+    return render(request, 'staff/clubs_doublons.html', {
+        'groupes': trouver_doublons(seuil),
+        'seuil': seuil,
+    })
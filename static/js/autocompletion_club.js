@@ -0,0 +1,170 @@
+/**
+ * ═══════════════════════════════════════════════════
+ * 🔤 AUTOCOMPLÉTION DU CLUB
+ * Fichier : static/js/autocompletion_club.js
+ * ═══════════════════════════════════════════════════
+ *
+ * Amélioration progressive des <select data-autocompletion="URL"> :
+ * - un champ de recherche remplace visuellement le select
+ * - les suggestions viennent de l'URL (?q=...), tolérantes aux fautes
+ * - le choix est recopié dans le select, qui reste celui envoyé
+ * - sans JavaScript (ou si l'URL ne répond pas), le select reste utilisable
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const DELAI_FRAPPE_MS = 150;
+
+    document.querySelectorAll('select[data-autocompletion]').forEach(function(select) {
+        const url = select.dataset.autocompletion;
+
+        const conteneur = document.createElement('div');
+        conteneur.className = 'autocompletion';
+
+        const champ = document.createElement('input');
+        champ.type = 'search';
+        champ.id = select.id + '_recherche';
+        champ.className = select.className;
+        champ.placeholder = 'Tapez le nom de votre club...';
+        champ.autocomplete = 'off';
+        champ.setAttribute('role', 'combobox');
+        champ.setAttribute('aria-expanded', 'false');
+        champ.setAttribute('aria-controls', select.id + '_suggestions');
+
+        const liste = document.createElement('ul');
+        liste.id = select.id + '_suggestions';
+        liste.className = 'autocompletion-suggestions';
+        liste.setAttribute('role', 'listbox');
+        liste.hidden = true;
+
+        conteneur.append(champ, liste);
+        select.before(conteneur);
+        select.hidden = true;
+
+        // Un select masqué et requis bloquerait l'envoi sans message
+        champ.required = select.required;
+        select.required = false;
+
+        // Le label pointe maintenant vers le champ de recherche
+        const label = document.querySelector('label[for="' + select.id + '"]');
+        if (label) {
+            label.htmlFor = champ.id;
+        }
+
+        if (select.value) {
+            champ.value = select.options[select.selectedIndex].text;
+        }
+
+        let suggestions = [];
+        let active = -1;
+        let minuterie = null;
+        let derniereRequete = 0;
+
+        /**
+         * Revient au select d'origine (le service ne répond pas)
+         */
+        function revenirAuSelect() {
+            conteneur.remove();
+            select.hidden = false;
+            select.required = champ.required;
+            if (label) {
+                label.htmlFor = select.id;
+            }
+        }
+
+        function fermer() {
+            liste.hidden = true;
+            champ.setAttribute('aria-expanded', 'false');
+            active = -1;
+        }
+
+        function afficher() {
+            liste.innerHTML = '';
+            suggestions.forEach(function(club, index) {
+                const element = document.createElement('li');
+                element.textContent = club.nom;
+                element.setAttribute('role', 'option');
+                element.classList.toggle('active', index === active);
+                element.addEventListener('mousedown', function(event) {
+                    event.preventDefault();  // garder le focus sur le champ
+                    choisir(club);
+                });
+                liste.appendChild(element);
+            });
+            liste.hidden = suggestions.length === 0;
+            champ.setAttribute('aria-expanded', String(!liste.hidden));
+        }
+
+        /**
+         * Recopie le club choisi dans le select (change → noms d'équipes)
+         */
+        function choisir(club) {
+            let option = select.querySelector('option[value="' + club.id + '"]');
+            if (!option) {
+                // Club créé après l'affichage de la page
+                option = new Option(club.nom, club.id);
+                select.add(option);
+            }
+            select.value = String(club.id);
+            select.dispatchEvent(new Event('change'));
+            champ.value = club.nom;
+            fermer();
+        }
+
+        function chercher() {
+            const requete = champ.value.trim();
+            if (!requete) {
+                suggestions = [];
+                afficher();
+                return;
+            }
+
+            const numero = ++derniereRequete;
+            fetch(url + '?q=' + encodeURIComponent(requete), {headers: {'Accept': 'application/json'}})
+                .then(function(reponse) {
+                    if (!reponse.ok) {
+                        throw new Error(reponse.status);
+                    }
+                    return reponse.json();
+                })
+                .then(function(donnees) {
+                    // Une réponse plus ancienne arrivée en retard est ignorée
+                    if (numero !== derniereRequete) {
+                        return;
+                    }
+                    suggestions = donnees.resultats;
+                    active = suggestions.length ? 0 : -1;
+                    afficher();
+                })
+                .catch(revenirAuSelect);
+        }
+
+        champ.addEventListener('input', function() {
+            // Texte modifié : le club précédemment choisi ne vaut plus
+            if (select.value) {
+                select.value = '';
+                select.dispatchEvent(new Event('change'));
+            }
+            clearTimeout(minuterie);
+            minuterie = setTimeout(chercher, DELAI_FRAPPE_MS);
+        });
+
+        champ.addEventListener('keydown', function(event) {
+            if (liste.hidden) {
+                return;
+            }
+            if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {
+                event.preventDefault();
+                const pas = event.key === 'ArrowDown' ? 1 : -1;
+                active = (active + pas + suggestions.length) % suggestions.length;
+                afficher();
+            } else if (event.key === 'Enter' && active >= 0) {
+                event.preventDefault();
+                choisir(suggestions[active]);
+            } else if (event.key === 'Escape') {
+                fermer();
+            }
+        });
+
+        champ.addEventListener('blur', fermer);
+    });
+});